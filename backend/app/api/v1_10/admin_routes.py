@@ -1,86 +1,184 @@
 from __future__ import annotations
 
-import threading
-import uuid
-from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional
 
-from fastapi import APIRouter, Body, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response, status
 from pydantic import BaseModel, Field
 
 from ...core.logging import get_logger
+from ...core.query_stats import QueryStat, query_stats
 from ...core.security import get_current_user
 from ...core.settings import get_settings
+from ...jobs.handlers import enqueue_job
+from ...jobs.timings import ScheduledJobTiming, scheduled_job_timings
 from ...models.user import User
-from ...services.compare_kb_sync import CompareKbSyncService
-from ...services.dialog_etl import DialogETLService
-from ...services.faq_extraction import FAQExtractionService
+from ...services.job_queue import JobConflictError, JobInfo, JobNotFoundError, job_queue
 
 
 logger = get_logger(__name__)
 settings = get_settings()
 router = APIRouter(prefix="/api/v1.10/admin", tags=["admin"])
 
-etl_service = DialogETLService()
-faq_service = FAQExtractionService()
-compare_sync_service = CompareKbSyncService()
 
-_JOB_LOCK = threading.Lock()
+def _enqueue_single_flight(kind: str, payload: Optional[dict] = None) -> JobInfo:
+    try:
+        return enqueue_job(kind, payload)
+    except JobConflictError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
 
 
-@dataclass(frozen=True)
-class _RunningJob:
-    job_id: str
-    started_at: datetime
-    thread: threading.Thread
+class TriggerAggregationRequest(BaseModel):
+    start_time: datetime = Field(..., alias="startTime")
+    end_time: datetime = Field(..., alias="endTime")
+    profile: bool = Field(default=False, description="Write a collapsed-stack profile of this run")
 
 
-_RUNNING_JOBS: dict[str, _RunningJob] = {}
+class TriggerExtractionRequest(BaseModel):
+    limit: Optional[int] = Field(default=None, ge=1, le=1000)
+    profile: bool = Field(default=False, description="Write a collapsed-stack profile of this run")
 
 
-def _get_running_job(kind: str) -> Optional[_RunningJob]:
-    job = _RUNNING_JOBS.get(kind)
-    if job is None:
-        return None
-    if job.thread.is_alive():
-        return job
-    _RUNNING_JOBS.pop(kind, None)
-    return None
+class TriggerTaxonomyCandidatesRequest(BaseModel):
+    month: Optional[str] = Field(
+        default=None,
+        pattern=r"^\d{4}-(0[1-9]|1[0-2])$",
+        description="YYYY-MM to advance only that month; omitted: the previous and the current month",
+    )
 
 
-def _clear_running_job(kind: str, job_id: str) -> None:
-    job = _RUNNING_JOBS.get(kind)
-    if job is None or job.job_id != job_id:
-        return
-    _RUNNING_JOBS.pop(kind, None)
+class TriggerJobResponse(BaseModel):
+    job_id: str = Field(..., alias="jobId")
+    message: str
 
 
-def _ensure_single_flight(kind: str) -> None:
-    running = _get_running_job(kind)
-    if running is None:
-        return
-    raise HTTPException(
-        status_code=status.HTTP_409_CONFLICT,
-        detail=(
-            f"{kind} job already running: jobId={running.job_id} "
-            f"startedAt={running.started_at.isoformat()}"
-        ),
-    )
+class JobStatusResponse(BaseModel):
+    job_id: str = Field(..., alias="jobId")
+    kind: str
+    status: str
+    progress_current: int = Field(..., alias="progressCurrent")
+    progress_total: Optional[int] = Field(default=None, alias="progressTotal")
+    progress_message: Optional[str] = Field(default=None, alias="progressMessage")
+    attempts: int
+    max_attempts: int = Field(..., alias="maxAttempts")
+    cancel_requested: bool = Field(..., alias="cancelRequested")
+    worker_id: Optional[str] = Field(default=None, alias="workerId")
+    error: Optional[str] = None
+    created_at: datetime = Field(..., alias="createdAt")
+    started_at: Optional[datetime] = Field(default=None, alias="startedAt")
+    heartbeat_at: Optional[datetime] = Field(default=None, alias="heartbeatAt")
+    finished_at: Optional[datetime] = Field(default=None, alias="finishedAt")
+
+    class Config:
+        populate_by_name = True
+
+    @classmethod
+    def from_job(cls, job: JobInfo) -> "JobStatusResponse":
+        return cls(
+            job_id=job.job_id,
+            kind=job.kind,
+            status=job.status,
+            progress_current=job.progress_current,
+            progress_total=job.progress_total,
+            progress_message=job.progress_message,
+            attempts=job.attempts,
+            max_attempts=job.max_attempts,
+            cancel_requested=job.cancel_requested,
+            worker_id=job.worker_id,
+            error=job.error,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            heartbeat_at=job.heartbeat_at,
+            finished_at=job.finished_at,
+        )
 
 
-class TriggerAggregationRequest(BaseModel):
-    start_time: datetime = Field(..., alias="startTime")
-    end_time: datetime = Field(..., alias="endTime")
+class ScheduledJobTimingResponse(BaseModel):
+    job_id: str = Field(..., alias="jobId")
+    runs: int
+    failures: int
+    missed: int
+    skipped: int
+    running: bool
+    last_status: Optional[str] = Field(default=None, alias="lastStatus")
+    last_error: Optional[str] = Field(default=None, alias="lastError")
+    last_started_at: Optional[datetime] = Field(default=None, alias="lastStartedAt")
+    last_finished_at: Optional[datetime] = Field(default=None, alias="lastFinishedAt")
+    last_start_delay_ms: Optional[float] = Field(default=None, alias="lastStartDelayMs")
+    last_duration_ms: Optional[float] = Field(default=None, alias="lastDurationMs")
+    max_duration_ms: Optional[float] = Field(default=None, alias="maxDurationMs")
+    next_run_time: Optional[datetime] = Field(default=None, alias="nextRunTime")
+
+    class Config:
+        populate_by_name = True
+
+    @classmethod
+    def from_timing(cls, timing: ScheduledJobTiming) -> "ScheduledJobTimingResponse":
+        return cls(
+            job_id=timing.job_id,
+            runs=timing.runs,
+            failures=timing.failures,
+            missed=timing.missed,
+            skipped=timing.skipped,
+            running=timing.running,
+            last_status=timing.last_status,
+            last_error=timing.last_error,
+            last_started_at=timing.last_started_at,
+            last_finished_at=timing.last_finished_at,
+            last_start_delay_ms=timing.last_start_delay_ms,
+            last_duration_ms=timing.last_duration_ms,
+            max_duration_ms=timing.max_duration_ms,
+            next_run_time=timing.next_run_time,
+        )
 
 
-class TriggerExtractionRequest(BaseModel):
-    limit: Optional[int] = Field(default=None, ge=1, le=1000)
+class QueryStatResponse(BaseModel):
+    engine: str
+    fingerprint: str
+    count: int
+    total_ms: float = Field(..., alias="totalMs")
+    avg_ms: float = Field(..., alias="avgMs")
+    p50_ms: float = Field(..., alias="p50Ms")
+    p95_ms: float = Field(..., alias="p95Ms")
+    p99_ms: float = Field(..., alias="p99Ms")
+    max_ms: float = Field(..., alias="maxMs")
+    slow_count: int = Field(..., alias="slowCount")
+    n_plus_one_count: int = Field(..., alias="nPlusOneCount")
+    last_n_plus_one_scope: Optional[str] = Field(default=None, alias="lastNPlusOneScope")
+    parameter_shape: Optional[str] = Field(default=None, alias="parameterShape")
+
+    class Config:
+        populate_by_name = True
+
+    @classmethod
+    def from_stat(cls, stat: QueryStat) -> "QueryStatResponse":
+        return cls(
+            engine=stat.engine,
+            fingerprint=stat.fingerprint,
+            count=stat.count,
+            total_ms=round(stat.total_ms, 3),
+            avg_ms=round(stat.avg_ms, 3),
+            p50_ms=round(stat.p50_ms, 3),
+            p95_ms=round(stat.p95_ms, 3),
+            p99_ms=round(stat.p99_ms, 3),
+            max_ms=round(stat.max_ms, 3),
+            slow_count=stat.slow_count,
+            n_plus_one_count=stat.n_plus_one_count,
+            last_n_plus_one_scope=stat.last_n_plus_one_scope,
+            parameter_shape=stat.parameter_shape,
+        )
 
 
-class TriggerJobResponse(BaseModel):
-    job_id: str = Field(..., alias="jobId")
-    message: str
+class QueryStatsReportResponse(BaseModel):
+    enabled: bool
+    since: datetime
+    slow_query_ms: float = Field(..., alias="slowQueryMs")
+    n_plus_one_threshold: int = Field(..., alias="nPlusOneThreshold")
+    dropped: int
+    queries: List[QueryStatResponse]
+
+    class Config:
+        populate_by_name = True
 
 
 def _coerce_range_to_dates(start: datetime, end: datetime) -> tuple[datetime, datetime]:
@@ -108,47 +206,6 @@ def _coerce_range_to_dates(start: datetime, end: datetime) -> tuple[datetime, da
     return start_day, end_day_exclusive
 
 
-def _run_aggregation_job(job_id: str, start_time: datetime, end_time: datetime) -> None:
-    try:
-        logger.info("Admin aggregation job %s started: %s -> %s", job_id, start_time, end_time)
-        current = start_time.date()
-        last = (end_time - timedelta(microseconds=1)).date()
-        while current <= last:
-            etl_service.run_for_date(current)
-            current += timedelta(days=1)
-        logger.info("Admin aggregation job %s completed", job_id)
-    except Exception:  # pylint: disable=broad-except
-        logger.exception("Admin aggregation job %s failed", job_id)
-    finally:
-        with _JOB_LOCK:
-            _clear_running_job("aggregation", job_id)
-
-
-def _run_extraction_job(job_id: str, limit: Optional[int]) -> None:
-    try:
-        logger.info("Admin extraction job %s started (limit=%s)", job_id, limit)
-        faq_service.run(limit=limit)
-        compare_sync_service.run()
-        logger.info("Admin extraction job %s completed", job_id)
-    except Exception:  # pylint: disable=broad-except
-        logger.exception("Admin extraction job %s failed", job_id)
-    finally:
-        with _JOB_LOCK:
-            _clear_running_job("extraction", job_id)
-
-
-def _run_compare_kb_sync_job(job_id: str) -> None:
-    try:
-        logger.info("Admin compare KB sync job %s started", job_id)
-        compare_sync_service.run()
-        logger.info("Admin compare KB sync job %s completed", job_id)
-    except Exception:  # pylint: disable=broad-except
-        logger.exception("Admin compare KB sync job %s failed", job_id)
-    finally:
-        with _JOB_LOCK:
-            _clear_running_job("compare_kb_sync", job_id)
-
-
 @router.post(
     "/trigger-aggregation",
     response_model=TriggerJobResponse,
@@ -164,20 +221,10 @@ def trigger_aggregation(
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
-    with _JOB_LOCK:
-        _ensure_single_flight("aggregation")
-        job_id = f"agg-{uuid.uuid4().hex}"
-        thread = threading.Thread(
-            target=_run_aggregation_job,
-            args=(job_id, start_time, end_time),
-            daemon=True,
-        )
-        _RUNNING_JOBS["aggregation"] = _RunningJob(
-            job_id=job_id,
-            started_at=datetime.utcnow(),
-            thread=thread,
-        )
-        thread.start()
+    job_id = _enqueue_single_flight(
+        "aggregation",
+        {"start_time": start_time.isoformat(), "end_time": end_time.isoformat(), "profile": body.profile},
+    ).job_id
 
     return TriggerJobResponse(
         jobId=job_id,
@@ -195,20 +242,7 @@ def trigger_extraction(
     current_user: User = Depends(get_current_user),
 ) -> TriggerJobResponse:
     _ = current_user  # login-only gate, no RBAC in v1.10
-    with _JOB_LOCK:
-        _ensure_single_flight("extraction")
-        job_id = f"ext-{uuid.uuid4().hex}"
-        thread = threading.Thread(
-            target=_run_extraction_job,
-            args=(job_id, body.limit),
-            daemon=True,
-        )
-        _RUNNING_JOBS["extraction"] = _RunningJob(
-            job_id=job_id,
-            started_at=datetime.utcnow(),
-            thread=thread,
-        )
-        thread.start()
+    job_id = _enqueue_single_flight("extraction", {"limit": body.limit, "profile": body.profile}).job_id
 
     return TriggerJobResponse(
         jobId=job_id,
@@ -225,22 +259,91 @@ def trigger_compare_kb_sync(
     current_user: User = Depends(get_current_user),
 ) -> TriggerJobResponse:
     _ = current_user  # login-only gate, no RBAC in v1.10
-    with _JOB_LOCK:
-        _ensure_single_flight("compare_kb_sync")
-        job_id = f"compare-sync-{uuid.uuid4().hex}"
-        thread = threading.Thread(
-            target=_run_compare_kb_sync_job,
-            args=(job_id,),
-            daemon=True,
-        )
-        _RUNNING_JOBS["compare_kb_sync"] = _RunningJob(
-            job_id=job_id,
-            started_at=datetime.utcnow(),
-            thread=thread,
-        )
-        thread.start()
+    job_id = _enqueue_single_flight("compare_kb_sync").job_id
 
     return TriggerJobResponse(
         jobId=job_id,
         message="Compare KB sync task triggered.",
     )
+
+
+@router.post(
+    "/trigger-taxonomy-candidates",
+    response_model=TriggerJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def trigger_taxonomy_candidates(
+    body: TriggerTaxonomyCandidatesRequest = Body(default_factory=TriggerTaxonomyCandidatesRequest),
+    current_user: User = Depends(get_current_user),
+) -> TriggerJobResponse:
+    _ = current_user  # login-only gate, no RBAC in v1.10
+    job_id = _enqueue_single_flight("taxonomy_candidates", {"month": body.month}).job_id
+
+    return TriggerJobResponse(
+        jobId=job_id,
+        message="Taxonomy candidate aggregation triggered.",
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+def get_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+) -> JobStatusResponse:
+    _ = current_user  # login-only gate, no RBAC in v1.10
+    try:
+        return JobStatusResponse.from_job(job_queue.get(job_id))
+    except JobNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=JobStatusResponse)
+def cancel_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+) -> JobStatusResponse:
+    _ = current_user  # login-only gate, no RBAC in v1.10
+    try:
+        return JobStatusResponse.from_job(job_queue.request_cancel(job_id))
+    except JobNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+
+
+@router.get("/scheduler/jobs", response_model=List[ScheduledJobTimingResponse])
+def list_scheduled_job_timings(
+    current_user: User = Depends(get_current_user),
+) -> List[ScheduledJobTimingResponse]:
+    """Timings of this instance's cron jobs (each API replica reports its own)."""
+    _ = current_user  # login-only gate, no RBAC in v1.10
+    return [ScheduledJobTimingResponse.from_timing(timing) for timing in scheduled_job_timings.snapshot()]
+
+
+@router.get("/db/queries", response_model=QueryStatsReportResponse)
+def list_query_stats(
+    limit: int = Query(20, ge=1, le=200),
+    order_by: str = Query("total", alias="orderBy"),
+    current_user: User = Depends(get_current_user),
+) -> QueryStatsReportResponse:
+    """Top SQL fingerprints of this process since start or the last reset (each replica reports its own)."""
+    _ = current_user  # login-only gate, no RBAC in v1.10
+    try:
+        top = query_stats.top(limit=limit, order_by=order_by)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return QueryStatsReportResponse(
+        enabled=query_stats.enabled,
+        since=query_stats.since,
+        slow_query_ms=query_stats.slow_query_ms,
+        n_plus_one_threshold=query_stats.n_plus_one_threshold,
+        dropped=query_stats.dropped,
+        queries=[QueryStatResponse.from_stat(stat) for stat in top],
+    )
+
+
+@router.post("/db/queries/reset", status_code=status.HTTP_204_NO_CONTENT, response_class=Response)
+def reset_query_stats(
+    current_user: User = Depends(get_current_user),
+) -> Response:
+    _ = current_user  # login-only gate, no RBAC in v1.10
+    query_stats.reset()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional, Set
+import os
+import tempfile
+import threading
+from typing import Dict, List, Optional, Set, Tuple
 
-from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
 
 from ...core.security import get_current_user
 from ...models.user import User
@@ -11,16 +15,29 @@ from ...schemas.kb_taxonomy import (
     KbTaxonomyCaseOut,
     KbTaxonomyCreateCaseRequest,
     KbTaxonomyCreateNodeRequest,
+    KbTaxonomyImportDiffSummary,
+    KbTaxonomyImportPreviewResponse,
     KbTaxonomyImportSummary,
     KbTaxonomyImportValidateResponse,
     KbTaxonomyNodeDetail,
     KbTaxonomyPathSegment,
+    KbTaxonomySubtreeCaseListResponse,
+    KbTaxonomySubtreeStats,
     KbTaxonomyTreeNode,
     KbTaxonomyTreeResponse,
     KbTaxonomyUpdateCaseRequest,
     KbTaxonomyUpdateNodeRequest,
 )
-from ...services.kb_taxonomy import KbTaxonomyService, NotFoundError, SCOPE_TO_DOMAIN_ZH, ValidationError
+from ...services.kb_taxonomy import (
+    ImportPlan,
+    KbTaxonomyService,
+    NotFoundError,
+    SCOPE_TO_DOMAIN_ZH,
+    ValidationError,
+    iter_csv_chunks,
+    write_xlsx_file,
+)
+from ...services.kb_taxonomy_cache import TaxonomySnapshot, taxonomy_snapshots
 
 
 router = APIRouter(prefix="/api/v1.12/kb-taxonomy", tags=["kb-taxonomy"])
@@ -44,49 +61,63 @@ def _require_scope(user: User, scope: str) -> str:
     return scope
 
 
-def _build_tree(nodes) -> List[KbTaxonomyTreeNode]:
-    by_parent: Dict[Optional[int], List[KbTaxonomyTreeNode]] = {}
-    for node in nodes:
-        item = KbTaxonomyTreeNode(
-            id=int(node.id),
-            name=node.name,
-            level=int(node.level),
-            parent_id=int(node.parent_id) if node.parent_id is not None else None,
-            children=[],
-        )
-        by_parent.setdefault(item.parent_id, []).append(item)
-
-    for siblings in by_parent.values():
-        siblings.sort(key=lambda x: (x.name, x.id))
-
+def _build_tree(snapshot: TaxonomySnapshot) -> List[KbTaxonomyTreeNode]:
     def attach(parent_id: Optional[int]) -> List[KbTaxonomyTreeNode]:
-        children = by_parent.get(parent_id, [])
-        for child in children:
-            child.children = attach(child.id)
-        return children
+        items: List[KbTaxonomyTreeNode] = []
+        for child_id in snapshot.children.get(parent_id, ()):
+            node = snapshot.nodes[child_id]
+            items.append(
+                KbTaxonomyTreeNode(
+                    id=node.id,
+                    name=node.name,
+                    level=node.level,
+                    parent_id=node.parent_id,
+                    children=attach(node.id),
+                )
+            )
+        return items
 
     return attach(None)
 
 
-def _path_for_node(node_id: int) -> List[KbTaxonomyPathSegment]:
-    segments: List[KbTaxonomyPathSegment] = []
-    current_id: Optional[int] = node_id
-    while current_id is not None:
-        node = service.get_node(current_id)
-        segments.append(KbTaxonomyPathSegment(id=int(node.id), name=node.name, level=int(node.level)))
-        current_id = int(node.parent_id) if node.parent_id is not None else None
-    segments.reverse()
-    return segments
+# Rendered tree JSON per scope, keyed by the snapshot ETag it was built from.
+_tree_bodies: Dict[str, Tuple[str, bytes]] = {}
+_tree_bodies_lock = threading.Lock()
+
+
+def _tree_body(snapshot: TaxonomySnapshot) -> bytes:
+    with _tree_bodies_lock:
+        cached = _tree_bodies.get(snapshot.scope)
+    if cached is not None and cached[0] == snapshot.etag:
+        return cached[1]
+    body = KbTaxonomyTreeResponse(items=_build_tree(snapshot)).model_dump_json(by_alias=True).encode("utf-8")
+    with _tree_bodies_lock:
+        _tree_bodies[snapshot.scope] = (snapshot.etag, body)
+    return body
+
+
+def _path_for_node(node_id: int, scope: str) -> List[KbTaxonomyPathSegment]:
+    snapshot = taxonomy_snapshots.get(scope)
+    if node_id in snapshot.nodes:
+        nodes = snapshot.path(node_id)
+    else:
+        # Created by another process since the snapshot was taken; primary-key lookups of the ids in its path.
+        nodes = service.get_ancestors(node_id)
+    return [KbTaxonomyPathSegment(id=int(node.id), name=node.name, level=int(node.level)) for node in nodes]
 
 
 @router.get("/tree", response_model=KbTaxonomyTreeResponse)
-def get_tree(
+async def get_tree(
     scope: str = Query(...),
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
-) -> KbTaxonomyTreeResponse:
+) -> Response:
     scope = _require_scope(current_user, scope)
-    nodes = service.list_tree(scope)
-    return KbTaxonomyTreeResponse(items=_build_tree(nodes))
+    snapshot = await taxonomy_snapshots.get_async(scope)
+    headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+    if if_none_match and snapshot.etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=_tree_body(snapshot), media_type="application/json", headers=headers)
 
 
 @router.get("/nodes/{node_id}", response_model=KbTaxonomyNodeDetail)
@@ -96,10 +127,12 @@ def get_node_detail(
     current_user: User = Depends(get_current_user),
 ) -> KbTaxonomyNodeDetail:
     scope = _require_scope(current_user, scope)
-    try:
-        node = service.get_node(node_id)
-    except NotFoundError as exc:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    node = taxonomy_snapshots.get(scope).nodes.get(node_id)
+    if node is None:
+        try:
+            node = service.get_node(node_id)
+        except NotFoundError as exc:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
     if node.scope_code != scope:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Node not found")
 
@@ -110,29 +143,75 @@ def get_node_detail(
         name=node.name,
         parent_id=int(node.parent_id) if node.parent_id is not None else None,
         definition=node.definition,
-        path=_path_for_node(int(node.id)),
+        path=_path_for_node(int(node.id), node.scope_code),
     )
 
 
 @router.get("/nodes/{node_id}/cases", response_model=KbTaxonomyCaseListResponse)
-def list_cases(
+async def list_cases(
     node_id: int,
     scope: str = Query(...),
     keyword: Optional[str] = Query(None),
     current_user: User = Depends(get_current_user),
 ) -> KbTaxonomyCaseListResponse:
     scope = _require_scope(current_user, scope)
-    try:
-        node = service.get_node(node_id)
-    except NotFoundError as exc:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    node = (await taxonomy_snapshots.get_async(scope)).nodes.get(node_id)
+    if node is None:
+        try:
+            node = await service.get_node_async(node_id)
+        except NotFoundError as exc:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
     if node.scope_code != scope:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Node not found")
 
-    items = service.list_cases(node_id=node_id, keyword=keyword.strip() if keyword else None)
+    items = await service.list_cases_async(node_id=node_id, keyword=keyword.strip() if keyword else None)
     return KbTaxonomyCaseListResponse(items=[KbTaxonomyCaseOut.from_orm(i) for i in items])
 
 
+@router.get("/nodes/{node_id}/subtree/stats", response_model=KbTaxonomySubtreeStats)
+def get_subtree_stats(
+    node_id: int,
+    scope: str = Query(...),
+    current_user: User = Depends(get_current_user),
+) -> KbTaxonomySubtreeStats:
+    scope = _require_scope(current_user, scope)
+    try:
+        nodes_by_level, case_count = service.subtree_stats(scope=scope, node_id=node_id)
+    except NotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    except ValidationError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return KbTaxonomySubtreeStats(node_id=node_id, nodes_by_level=nodes_by_level, case_count=case_count)
+
+
+@router.get("/nodes/{node_id}/subtree/cases", response_model=KbTaxonomySubtreeCaseListResponse)
+def list_subtree_cases(
+    node_id: int,
+    scope: str = Query(...),
+    keyword: Optional[str] = Query(None),
+    after_id: Optional[int] = Query(None, alias="afterId"),
+    limit: int = Query(100, ge=1, le=500),
+    current_user: User = Depends(get_current_user),
+) -> KbTaxonomySubtreeCaseListResponse:
+    scope = _require_scope(current_user, scope)
+    try:
+        items = service.list_subtree_cases(
+            scope=scope,
+            node_id=node_id,
+            keyword=keyword.strip() if keyword else None,
+            after_id=after_id,
+            limit=limit,
+        )
+    except NotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    except ValidationError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return KbTaxonomySubtreeCaseListResponse(
+        items=[KbTaxonomyCaseOut.from_orm(i) for i in items],
+        next_after_id=int(items[-1].id) if len(items) == limit else None,
+    )
+
+
 @router.post("/nodes", response_model=KbTaxonomyNodeDetail, status_code=status.HTTP_201_CREATED)
 def create_node(
     body: KbTaxonomyCreateNodeRequest,
@@ -157,7 +236,7 @@ def create_node(
         name=node.name,
         parent_id=int(node.parent_id) if node.parent_id is not None else None,
         definition=node.definition,
-        path=_path_for_node(int(node.id)),
+        path=_path_for_node(int(node.id), node.scope_code),
     )
 
 
@@ -182,7 +261,7 @@ def update_node(
         name=node.name,
         parent_id=int(node.parent_id) if node.parent_id is not None else None,
         definition=node.definition,
-        path=_path_for_node(int(node.id)),
+        path=_path_for_node(int(node.id), node.scope_code),
     )
 
 
@@ -247,39 +326,137 @@ def delete_case(
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
+def _resolve_import_plan(
+    *,
+    scope: str,
+    file: Optional[UploadFile],
+    upload_token: Optional[str],
+    current_user: User,
+) -> Tuple[Optional[ImportPlan], List[dict]]:
+    if upload_token:
+        plan = service.recall_plan(upload_token, scope=scope, owner_id=int(current_user.id))
+        if plan is None:
+            return None, [{"row": 1, "column": "file", "message": "上传凭证已失效，请重新上传文件"}]
+        return plan, []
+    if file is None:
+        return None, [{"row": 1, "column": "file", "message": "请上传文件"}]
+    # UploadFile is already spooled to a temp file; parse it in place instead of reading it into memory.
+    return service.import_validate(scope=scope, fileobj=file.file, filename=file.filename or "")
+
+
+@router.get("/export")
+def export_taxonomy(
+    scope: str = Query(...),
+    fmt: str = Query("csv", alias="format"),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    scope = _require_scope(current_user, scope)
+    if fmt not in ("csv", "xlsx"):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="format must be csv|xlsx")
+
+    headers = {"Content-Disposition": f'attachment; filename="kb_taxonomy_{scope}.{fmt}"'}
+    if fmt == "csv":
+        return StreamingResponse(
+            iter_csv_chunks(service.iter_export_rows(scope)),
+            media_type="text/csv; charset=utf-8",
+            headers=headers,
+        )
+
+    # XLSX is a zip and must be finalized before sending, so build it in a temp file and stream that.
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        write_xlsx_file(service.iter_export_rows(scope), path)
+    except Exception:
+        os.unlink(path)
+        raise
+
+    def iter_file():
+        try:
+            with open(path, "rb") as fh:
+                while True:
+                    chunk = fh.read(64 * 1024)
+                    if not chunk:
+                        break
+                    yield chunk
+        finally:
+            os.unlink(path)
+
+    return StreamingResponse(
+        iter_file(),
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        headers=headers,
+    )
+
+
 @router.post("/import/validate", response_model=KbTaxonomyImportValidateResponse)
-async def import_validate(
+def import_validate(
     scope: str = Query(...),
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
 ) -> KbTaxonomyImportValidateResponse:
     scope = _require_scope(current_user, scope)
-    raw = await file.read()
-    plan, errors = service.import_validate(scope=scope, raw=raw, filename=file.filename or "")
+    plan, errors = _resolve_import_plan(scope=scope, file=file, upload_token=None, current_user=current_user)
     if errors or plan is None:
         return KbTaxonomyImportValidateResponse(ok=False, errors=errors)
     return KbTaxonomyImportValidateResponse(
         ok=True,
         summary=KbTaxonomyImportSummary(categories=plan.category_count, cases=plan.case_count),
         errors=[],
+        upload_token=service.remember_plan(plan, owner_id=int(current_user.id)),
+    )
+
+
+# Path lists in the preview are truncated; the counts are always complete.
+MAX_PREVIEW_PATHS = 200
+
+
+@router.post("/import/preview", response_model=KbTaxonomyImportPreviewResponse)
+def import_preview(
+    scope: str = Query(...),
+    upload_token: Optional[str] = Query(None, alias="uploadToken"),
+    file: Optional[UploadFile] = File(None),
+    current_user: User = Depends(get_current_user),
+) -> KbTaxonomyImportPreviewResponse:
+    scope = _require_scope(current_user, scope)
+    plan, errors = _resolve_import_plan(scope=scope, file=file, upload_token=upload_token, current_user=current_user)
+    if errors or plan is None:
+        return KbTaxonomyImportPreviewResponse(ok=False, errors=errors)
+
+    diff = service.import_preview(scope=scope, plan=plan)
+    changed_paths = list(dict.fromkeys([n.path for n, _ in diff.definition_changed] + [n.path for n in diff.cases_changed]))
+    return KbTaxonomyImportPreviewResponse(
+        ok=True,
+        diff=KbTaxonomyImportDiffSummary(
+            added=len(diff.added),
+            removed=len(diff.removed),
+            definition_changed=len(diff.definition_changed),
+            cases_changed=len(diff.cases_changed),
+            unchanged=diff.unchanged,
+            added_paths=[list(p) for p in diff.added[:MAX_PREVIEW_PATHS]],
+            removed_paths=[list(n.path) for n in diff.removed[:MAX_PREVIEW_PATHS]],
+            changed_paths=[list(p) for p in changed_paths[:MAX_PREVIEW_PATHS]],
+        ),
     )
 
 
 @router.post("/import/execute", response_model=KbTaxonomyImportValidateResponse)
-async def import_execute(
+def import_execute(
     scope: str = Query(...),
-    file: UploadFile = File(...),
+    upload_token: Optional[str] = Query(None, alias="uploadToken"),
+    file: Optional[UploadFile] = File(None),
     current_user: User = Depends(get_current_user),
 ) -> KbTaxonomyImportValidateResponse:
     scope = _require_scope(current_user, scope)
-    raw = await file.read()
-    plan, errors = service.import_validate(scope=scope, raw=raw, filename=file.filename or "")
+    plan, errors = _resolve_import_plan(scope=scope, file=file, upload_token=upload_token, current_user=current_user)
     if errors or plan is None:
         return KbTaxonomyImportValidateResponse(ok=False, errors=errors)
     try:
-        executed = service.import_execute(scope=scope, raw=raw, filename=file.filename or "")
+        executed = service.import_execute(scope=scope, plan=plan)
     except ValidationError as exc:
         return KbTaxonomyImportValidateResponse(ok=False, errors=[{"row": 1, "column": "file", "message": str(exc)}])
+    if upload_token:
+        service.forget_plan(upload_token)
 
     return KbTaxonomyImportValidateResponse(
         ok=True,
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List, Set
+from typing import List, Optional, Set
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 
@@ -9,12 +9,23 @@ from ...models.user import User
 from ...schemas.kb_taxonomy_review import (
     KbTaxonomyReviewAcceptRequest,
     KbTaxonomyReviewActionResponse,
+    KbTaxonomyReviewBatchAcceptRequest,
+    KbTaxonomyReviewBatchActionResponse,
+    KbTaxonomyReviewBatchDiscardRequest,
+    KbTaxonomyReviewCaseListResponse,
     KbTaxonomyReviewCaseOut,
     KbTaxonomyReviewItemOut,
     KbTaxonomyReviewListResponse,
     KbTaxonomyReviewPathSegment,
 )
-from ...services.kb_taxonomy_review import KbTaxonomyReviewService, NotFoundError, ValidationError
+from ...services.kb_taxonomy_review import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    BatchAcceptData,
+    KbTaxonomyReviewService,
+    NotFoundError,
+    ValidationError,
+)
 
 
 router = APIRouter(prefix="/api/v1.14/kb-taxonomy-review", tags=["kb-taxonomy-review"])
@@ -39,10 +50,21 @@ def _require_scope(user: User, scope: str) -> str:
 @router.get("/pending", response_model=KbTaxonomyReviewListResponse)
 def list_pending_review_items(
     scope: str = Query(...),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    include_cases: bool = Query(True, alias="includeCases"),
     current_user: User = Depends(get_current_user),
 ) -> KbTaxonomyReviewListResponse:
     scope = _require_scope(current_user, scope)
-    items, case_map = service.list_pending(scope)
+    try:
+        items, case_map, next_cursor = service.list_pending(
+            scope,
+            limit=limit,
+            cursor=cursor,
+            include_cases=include_cases,
+        )
+    except ValidationError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
     response_items: List[KbTaxonomyReviewItemOut] = []
     for item in items:
@@ -62,7 +84,23 @@ def list_pending_review_items(
             )
         )
 
-    return KbTaxonomyReviewListResponse(items=response_items)
+    return KbTaxonomyReviewListResponse(items=response_items, next_cursor=next_cursor)
+
+
+@router.get("/items/{review_item_id}/cases", response_model=KbTaxonomyReviewCaseListResponse)
+def list_review_item_cases(
+    review_item_id: int,
+    scope: str = Query(...),
+    current_user: User = Depends(get_current_user),
+) -> KbTaxonomyReviewCaseListResponse:
+    scope = _require_scope(current_user, scope)
+    try:
+        cases = service.list_item_cases(review_item_id=review_item_id, scope=scope)
+    except NotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    except PermissionError as exc:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(exc)) from exc
+    return KbTaxonomyReviewCaseListResponse(items=[KbTaxonomyReviewCaseOut.from_orm(c) for c in cases])
 
 
 @router.post(
@@ -115,3 +153,50 @@ def discard_review_item(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(exc)) from exc
 
     return KbTaxonomyReviewActionResponse(message="discarded")
+
+
+@router.post("/items/batch-accept", response_model=KbTaxonomyReviewBatchActionResponse)
+def batch_accept_review_items(
+    body: KbTaxonomyReviewBatchAcceptRequest,
+    current_user: User = Depends(get_current_user),
+) -> KbTaxonomyReviewBatchActionResponse:
+    scope = _require_scope(current_user, body.scope)
+    try:
+        count = service.batch_accept(
+            scope=scope,
+            items=[
+                BatchAcceptData(
+                    review_item_id=item.id,
+                    l3_name=item.l3_name,
+                    definition=item.definition,
+                    cases=item.cases,
+                )
+                for item in body.items
+            ],
+        )
+    except NotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    except ValidationError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except PermissionError as exc:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(exc)) from exc
+
+    return KbTaxonomyReviewBatchActionResponse(count=count)
+
+
+@router.post("/items/batch-discard", response_model=KbTaxonomyReviewBatchActionResponse)
+def batch_discard_review_items(
+    body: KbTaxonomyReviewBatchDiscardRequest,
+    current_user: User = Depends(get_current_user),
+) -> KbTaxonomyReviewBatchActionResponse:
+    scope = _require_scope(current_user, body.scope)
+    try:
+        count = service.batch_discard(scope=scope, review_item_ids=body.ids)
+    except NotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    except ValidationError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except PermissionError as exc:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(exc)) from exc
+
+    return KbTaxonomyReviewBatchActionResponse(count=count)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from ...core.security import get_current_user
 from ...core.logging import get_logger
@@ -73,6 +73,7 @@ def update_scenario(scenario_id: int, body: ScenarioUpdate) -> ScenarioOut:
 @router.post("/scenarios/{scenario_id}/trigger-sync", response_model=ScenarioSyncResult)
 def trigger_sync(
     scenario_id: int,
+    force: bool = Query(default=False, description="Push even if no knowledge changed since the last sync"),
     current_user: User = Depends(get_current_user),
 ) -> ScenarioSyncResult:
     if scenario_id != current_user.scenario_id:
@@ -82,10 +83,16 @@ def trigger_sync(
         )
 
     run_id = uuid4().hex[:8]
-    logger.info("AICO sync requested (run_id=%s, scenario_id=%s, user_id=%s)", run_id, scenario_id, current_user.id)
+    logger.info(
+        "AICO sync requested (run_id=%s, scenario_id=%s, user_id=%s, force=%s)",
+        run_id,
+        scenario_id,
+        current_user.id,
+        force,
+    )
 
     try:
-        result = sync_orchestrator.run_for_scenario(scenario_id, run_id=run_id)
+        result = sync_orchestrator.run_for_scenario(scenario_id, run_id=run_id, skip_unchanged=not force)
     except AicoSyncError as exc:
         logger.exception("AICO sync failed (run_id=%s, scenario_id=%s): %s", run_id, scenario_id, exc)
         raise HTTPException(
@@ -4,39 +4,35 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 
-from ...core.security import get_current_user
+from ...core.security import CurrentContext, get_current_context
 from ...core.logging import get_logger
-from ...models.user import User
 from ...schemas.review import (
     CreateKnowledgeItemRequest,
     CreateKnowledgeItemResponse,
     DiscardPendingFAQResponse,
     PendingFAQItem,
     PendingFAQListResponse,
+    ReviewDashboardStatsResponse,
 )
 from ...services.review import NotFoundError, ReviewService
-from ...services.scenario import ScenarioService
+from ...services.status_counters import status_counters
 
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/api/v1.4", tags=["review"])
 review_service = ReviewService()
-scenario_service = ScenarioService()
 
 
 @router.get("/pending-faqs", response_model=PendingFAQListResponse)
-def list_pending_faqs(
+async def list_pending_faqs(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100, alias="pageSize"),
     keyword: Optional[str] = Query(None),
-    current_user: User = Depends(get_current_user),
+    context: CurrentContext = Depends(get_current_context),
 ) -> PendingFAQListResponse:
-    try:
-        scenario = scenario_service.get_scenario(current_user.scenario_id)
-    except NotFoundError as exc:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)) from exc
+    scenario = context.scenario
 
-    items, total = review_service.list_pending_faqs(
+    items, total = await review_service.list_pending_faqs_async(
         page=page,
         page_size=page_size,
         keyword=keyword,
@@ -57,12 +53,9 @@ def list_pending_faqs(
 )
 def create_knowledge_item(
     body: CreateKnowledgeItemRequest,
-    current_user: User = Depends(get_current_user),
+    context: CurrentContext = Depends(get_current_context),
 ) -> CreateKnowledgeItemResponse:
-    try:
-        scenario = scenario_service.get_scenario(current_user.scenario_id)
-    except NotFoundError as exc:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)) from exc
+    scenario = context.scenario
 
     try:
         item = review_service.accept_pending_faq(
@@ -85,12 +78,9 @@ def create_knowledge_item(
 @router.delete("/pending-faqs/{pending_faq_id}", response_model=DiscardPendingFAQResponse)
 def discard_pending_faq(
     pending_faq_id: int,
-    current_user: User = Depends(get_current_user),
+    context: CurrentContext = Depends(get_current_context),
 ) -> DiscardPendingFAQResponse:
-    try:
-        scenario = scenario_service.get_scenario(current_user.scenario_id)
-    except NotFoundError as exc:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)) from exc
+    scenario = context.scenario
 
     try:
         review_service.discard_pending_faq(pending_faq_id, allowed_group_code=scenario.source_group_code)
@@ -100,3 +90,17 @@ def discard_pending_faq(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(exc)) from exc
 
     return DiscardPendingFAQResponse(message=f"Pending FAQ with id {pending_faq_id} has been discarded.")
+
+
+@router.get("/dashboard/stats", response_model=ReviewDashboardStatsResponse)
+def get_dashboard_stats(
+    context: CurrentContext = Depends(get_current_context),
+) -> ReviewDashboardStatsResponse:
+    scenario = context.scenario
+
+    return ReviewDashboardStatsResponse(
+        scenario_id=context.user.scenario_id,
+        source_group_code=scenario.source_group_code,
+        pending_faqs=status_counters.pending_counts(scenario.source_group_code),
+        knowledge_items=status_counters.knowledge_counts(context.user.scenario_id),
+    )
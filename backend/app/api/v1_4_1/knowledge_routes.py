@@ -21,14 +21,14 @@ knowledge_service = KnowledgeService()
 
 
 @router.get("/knowledge-items", response_model=KnowledgeListResponse)
-def list_knowledge_items(
+async def list_knowledge_items(
     status: str = Query("active", pattern="^(active|disabled)$"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100, alias="pageSize"),
     keyword: Optional[str] = Query(None),
     current_user: User = Depends(get_current_user),
 ) -> KnowledgeListResponse:
-    items, total = knowledge_service.list_items(
+    items, total = await knowledge_service.list_items_async(
         scenario_id=current_user.scenario_id,
         status=status,
         page=page,
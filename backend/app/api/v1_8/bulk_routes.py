@@ -1,22 +1,29 @@
 from __future__ import annotations
 
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, status
 
-from ...core.security import get_current_user
-from ...models.user import User
+from ...core.security import CurrentContext, get_current_context
+from ...jobs.handlers import enqueue_job
 from ...schemas.review import (
     BulkCreateKnowledgeItemsRequest,
     BulkCreateKnowledgeItemsResponse,
     BulkDiscardPendingFaqsRequest,
     BulkDiscardPendingFaqsResponse,
+    BulkJobChunkResponse,
+    BulkJobResponse,
+    MatchingPendingFaqsRequest,
+    MatchingPendingFaqsResponse,
+    StartBulkJobRequest,
 )
-from ...services.review import NotFoundError, ReviewService
-from ...services.scenario import ScenarioService
+from ...services.job_queue import JobConflictError
+from ...services.review import NotFoundError, PendingFAQFilter, ReviewService
+from ...services.review_bulk_jobs import REVIEW_BULK_JOB_KIND, BulkJobState, review_bulk_jobs
 
 
 router = APIRouter(prefix="/api/v1.8", tags=["review-bulk"])
 review_service = ReviewService()
-scenario_service = ScenarioService()
 
 
 @router.post(
@@ -26,12 +33,9 @@ scenario_service = ScenarioService()
 )
 def bulk_create_knowledge_items(
     body: BulkCreateKnowledgeItemsRequest,
-    current_user: User = Depends(get_current_user),
+    context: CurrentContext = Depends(get_current_context),
 ) -> BulkCreateKnowledgeItemsResponse:
-    try:
-        scenario = scenario_service.get_scenario(current_user.scenario_id)
-    except NotFoundError as exc:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)) from exc
+    scenario = context.scenario
 
     payloads = [
         {
@@ -46,7 +50,7 @@ def bulk_create_knowledge_items(
     try:
         created_count = review_service.bulk_accept_pending_faqs(
             payloads=payloads,
-            scenario_id=current_user.scenario_id,
+            scenario_id=context.user.scenario_id,
             allowed_group_code=scenario.source_group_code,
         )
     except NotFoundError as exc:
@@ -65,12 +69,9 @@ def bulk_create_knowledge_items(
 )
 def bulk_discard_pending_faqs(
     body: BulkDiscardPendingFaqsRequest,
-    current_user: User = Depends(get_current_user),
+    context: CurrentContext = Depends(get_current_context),
 ) -> BulkDiscardPendingFaqsResponse:
-    try:
-        scenario = scenario_service.get_scenario(current_user.scenario_id)
-    except NotFoundError as exc:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)) from exc
+    scenario = context.scenario
 
     try:
         discarded_count = review_service.bulk_discard_pending_faqs(
@@ -85,3 +86,128 @@ def bulk_discard_pending_faqs(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
     return BulkDiscardPendingFaqsResponse(discardedCount=discarded_count)
+
+
+def _to_pending_filter(body: MatchingPendingFaqsRequest, source_group_code: Optional[str]) -> PendingFAQFilter:
+    return PendingFAQFilter(
+        source_group_code=source_group_code,
+        keyword=body.keyword,
+        created_from=body.created_from,
+        created_to=body.created_to,
+        status=body.status,
+    )
+
+
+@router.post("/pending-faqs/accept-matching", response_model=MatchingPendingFaqsResponse)
+def accept_matching_pending_faqs(
+    body: MatchingPendingFaqsRequest,
+    context: CurrentContext = Depends(get_current_context),
+) -> MatchingPendingFaqsResponse:
+    scenario = context.scenario
+
+    try:
+        matched, applied = review_service.accept_matching(
+            pending_filter=_to_pending_filter(body, scenario.source_group_code),
+            scenario_id=context.user.scenario_id,
+            dry_run=body.dry_run,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    return MatchingPendingFaqsResponse(matched_count=matched, applied_count=applied, dry_run=body.dry_run)
+
+
+@router.post("/pending-faqs/discard-matching", response_model=MatchingPendingFaqsResponse)
+def discard_matching_pending_faqs(
+    body: MatchingPendingFaqsRequest,
+    context: CurrentContext = Depends(get_current_context),
+) -> MatchingPendingFaqsResponse:
+    scenario = context.scenario
+
+    try:
+        matched, applied = review_service.discard_matching(
+            pending_filter=_to_pending_filter(body, scenario.source_group_code),
+            dry_run=body.dry_run,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    return MatchingPendingFaqsResponse(matched_count=matched, applied_count=applied, dry_run=body.dry_run)
+
+
+def _to_bulk_job_response(job: BulkJobState) -> BulkJobResponse:
+    return BulkJobResponse(
+        job_id=job.job_id,
+        action=job.action,
+        status=job.status,
+        total=job.total,
+        processed=job.processed,
+        applied=job.applied,
+        skipped=job.skipped,
+        failed_chunks=job.failed_chunks,
+        chunks=[
+            BulkJobChunkResponse(
+                index=chunk.index,
+                requested=chunk.requested,
+                applied=chunk.applied,
+                skipped=chunk.skipped,
+                error=chunk.error,
+            )
+            for chunk in list(job.chunks)
+        ],
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+@router.post(
+    "/bulk-jobs",
+    response_model=BulkJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def start_bulk_job(
+    body: StartBulkJobRequest,
+    context: CurrentContext = Depends(get_current_context),
+) -> BulkJobResponse:
+    scenario = context.scenario
+
+    pending_filter = None
+    if body.filter is not None:
+        pending_filter = PendingFAQFilter(
+            keyword=body.filter.keyword,
+            created_from=body.filter.created_from,
+            created_to=body.filter.created_to,
+        )
+
+    try:
+        payload = review_bulk_jobs.build_payload(
+            action=body.action,
+            scenario_id=context.user.scenario_id,
+            allowed_group_code=scenario.source_group_code,
+            pending_faq_ids=body.pending_faq_ids,
+            pending_filter=pending_filter,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    try:
+        job = enqueue_job(
+            REVIEW_BULK_JOB_KIND, payload, active_key=review_bulk_jobs.active_key(context.user.scenario_id)
+        )
+    except JobConflictError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+
+    return _to_bulk_job_response(BulkJobState.from_job(job))
+
+
+@router.get("/bulk-jobs/{job_id}", response_model=BulkJobResponse)
+def get_bulk_job(
+    job_id: str,
+    context: CurrentContext = Depends(get_current_context),
+) -> BulkJobResponse:
+    job = review_bulk_jobs.get_job(job_id)
+    if job is None or job.scenario_id != context.user.scenario_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Bulk job not found")
+    return _to_bulk_job_response(job)
@@ -1,31 +1,121 @@
 from __future__ import annotations
 
+import time
 from contextlib import contextmanager
+from typing import Optional
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
+from .metrics import DB_POOL_CHECKED_OUT, DB_POOL_CHECKOUT_SECONDS, DB_POOL_CHECKOUT_TIMEOUTS
+from .query_stats import query_stats
 from .settings import get_settings
 
 
 settings = get_settings()
 
-SOURCE_ENGINE = create_engine(
-    settings.database.source_url,
-    pool_pre_ping=True,
-    pool_recycle=3600,
-    future=True,
-)
-TARGET_ENGINE = create_engine(
-    settings.database.target_url,
-    pool_pre_ping=True,
-    pool_recycle=3600,
-    future=True,
-)
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    metrics_label = "default"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS.inc(engine=self.metrics_label)
+            raise
+        DB_POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - started, engine=self.metrics_label)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics_label = self.metrics_label
+        return pool
+
+
+class TimedAsyncQueuePool(TimedQueuePool, AsyncAdaptedQueuePool):
+    """TimedQueuePool for asyncio engines; checkouts wait on an asyncio queue instead of a thread lock."""
+
+
+def _create_engine(url: str, label: str, **engine_kwargs):
+    engine = create_engine(
+        url,
+        pool_pre_ping=True,
+        pool_recycle=3600,
+        poolclass=TimedQueuePool,
+        future=True,
+        **engine_kwargs,
+    )
+    engine.pool.metrics_label = label
+    # Read through the engine: the pool object is replaced if the engine is disposed.
+    DB_POOL_CHECKED_OUT.set_function(lambda: engine.pool.checkedout(), engine=label)
+    if query_stats.enabled:
+        _install_query_hooks(engine, label)
+    return engine
+
+
+def _create_async_engine(url: str, label: str, **engine_kwargs) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        pool_pre_ping=True,
+        pool_recycle=3600,
+        poolclass=TimedAsyncQueuePool,
+        **engine_kwargs,
+    )
+    # Pool and cursor events live on the sync facade the asyncio engine wraps.
+    sync_engine = engine.sync_engine
+    sync_engine.pool.metrics_label = label
+    DB_POOL_CHECKED_OUT.set_function(lambda: sync_engine.pool.checkedout(), engine=label)
+    if query_stats.enabled:
+        _install_query_hooks(sync_engine, label)
+    return engine
+
+
+def _install_query_hooks(engine, label: str) -> None:
+    """Time every cursor execution on `engine` into `query_stats` (fingerprints, slow log, N+1)."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        context._query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        started = getattr(context, "_query_started", None)
+        if started is None:
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        query_stats.record(label, statement, parameters, executemany, elapsed_ms)
+
+
+SOURCE_ENGINE = _create_engine(settings.database.source_url, "source")
+TARGET_ENGINE = _create_engine(settings.database.target_url, "target")
 
 SourceSessionLocal = sessionmaker(bind=SOURCE_ENGINE, autocommit=False, autoflush=False, expire_on_commit=False, future=True)
 TargetSessionLocal = sessionmaker(bind=TARGET_ENGINE, autocommit=False, autoflush=False, expire_on_commit=False, future=True)
 
+# Optional asyncio engine on the target database for the hot read routes (DB_ASYNC=true).
+# When it is off, the async service methods run their sync counterparts on the threadpool.
+ASYNC_TARGET_ENGINE: Optional[AsyncEngine] = (
+    _create_async_engine(
+        settings.database.async_target_url,
+        "target_async",
+        pool_size=settings.database.async_pool_size,
+    )
+    if settings.database.async_enabled
+    else None
+)
+AsyncTargetSessionLocal: Optional[async_sessionmaker] = (
+    async_sessionmaker(bind=ASYNC_TARGET_ENGINE, autoflush=False, expire_on_commit=False)
+    if ASYNC_TARGET_ENGINE is not None
+    else None
+)
+
 
 @contextmanager
 def get_source_session() -> Session:
@@ -0,0 +1,310 @@
+"""
+In-process metrics rendered in the Prometheus text format at `/metrics`.
+
+A deliberately small registry (counters, gauges, histograms with labels) so no client
+library or external service is needed. Every metric the app records is declared at the
+bottom of this module; call sites only do `METRIC.inc(...)` / `METRIC.observe(...)`.
+"""
+
+from __future__ import annotations
+
+import bisect
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+
+LabelValues = Tuple[str, ...]
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+BATCH_BUCKETS = (0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1200.0, 1800.0, 3600.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, object]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in values]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._functions: Dict[LabelValues, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def set_function(self, func: Callable[[], float], **labels: object) -> None:
+        """Read the value from `func` at scrape time."""
+        key = self._key(labels)
+        with self._lock:
+            self._functions[key] = func
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+            functions = dict(self._functions)
+        for key, func in functions.items():
+            try:
+                values[key] = float(func())
+            except Exception:  # pylint: disable=broad-except
+                continue
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(values.items())
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [count per bucket..., count in +Inf], sum
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    def time(self, **labels: object) -> "_Timer":
+        return _Timer(self, labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = {key: (list(counts), total[0]) for key, (counts, total) in self._values.items()}
+        lines = []
+        for key, (counts, total) in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class _Timer:
+    def __init__(self, histogram: Histogram, labels: Dict[str, object]) -> None:
+        self.histogram = histogram
+        self.labels = labels
+        self.started = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+registry = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds",
+    "API request latency by route template",
+    ["method", "route", "status"],
+)
+ETL_DIALOG_ROWS_READ = registry.counter(
+    "etl_dialog_rows_read_total", "Source dialog rows read by the ETL", ["group_code"]
+)
+ETL_CONVERSATIONS = registry.counter(
+    "etl_conversations_total", "Conversations built by the ETL by outcome (inserted/skipped)", ["group_code", "outcome"]
+)
+ETL_GROUP_SECONDS = registry.histogram(
+    "etl_group_duration_seconds", "Time to process one group for one day", ["group_code"], BATCH_BUCKETS
+)
+FAQ_EXTRACTION_CONVERSATIONS = registry.counter(
+    "faq_extraction_conversations_total", "Conversations finished by FAQ extraction by final status", ["status"]
+)
+FAQ_EXTRACTION_SECONDS = registry.histogram(
+    "faq_extraction_conversation_seconds", "Time to extract (and review) one conversation", [], BATCH_BUCKETS
+)
+PENDING_FAQ_TRANSITIONS = registry.counter(
+    "pending_faq_status_transitions_total", "Pending FAQ status changes", ["from_status", "to_status"]
+)
+AICO_REQUEST_SECONDS = registry.histogram(
+    "aico_request_duration_seconds", "AICO HTTP call latency", ["endpoint", "method", "status"]
+)
+AICO_REQUEST_ERRORS = registry.counter(
+    "aico_request_errors_total", "AICO HTTP calls that failed without a response", ["endpoint", "error"]
+)
+AICO_SYNC_STEP_SECONDS = registry.histogram(
+    "aico_sync_step_duration_seconds", "Duration of AICO knowledge sync steps", ["step"], BATCH_BUCKETS
+)
+AICO_SYNC_RUNS = registry.counter("aico_sync_runs_total", "AICO knowledge syncs by result", ["status"])
+DB_POOL_CHECKOUT_SECONDS = registry.histogram(
+    "db_pool_checkout_wait_seconds", "Time to get a connection from the SQLAlchemy pool", ["engine"]
+)
+DB_POOL_CHECKOUT_TIMEOUTS = registry.counter(
+    "db_pool_checkout_timeouts_total", "Pool checkouts that gave up waiting for a connection", ["engine"]
+)
+DB_POOL_CHECKED_OUT = registry.gauge("db_pool_checked_out", "Connections currently checked out", ["engine"])
+
+
+_NUMERIC_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+class MetricsTransport(httpx.HTTPTransport):
+    """
+    httpx transport that records AICO call latency and errors.
+
+    The `endpoint` label is the request path with numeric segments collapsed, or an explicit
+    `extensions={"metrics_endpoint": ...}` for URLs that embed ids (e.g. chatbot run URLs).
+    """
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        endpoint = request.extensions.get("metrics_endpoint") or _NUMERIC_SEGMENT.sub("/:id", request.url.path)
+        started = time.perf_counter()
+        try:
+            response = super().handle_request(request)
+        except httpx.HTTPError as exc:
+            AICO_REQUEST_ERRORS.inc(endpoint=endpoint, error=exc.__class__.__name__)
+            raise
+        AICO_REQUEST_SECONDS.observe(
+            time.perf_counter() - started, endpoint=endpoint, method=request.method, status=response.status_code
+        )
+        return response
+
+
+class HttpMetricsMiddleware:
+    """ASGI middleware timing each HTTP request, labelled by the matched route template."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status_code = [500]
+
+        async def send_wrapper(message) -> None:
+            if message["type"] == "http.response.start":
+                status_code[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            # Unmatched paths share one label so scans cannot blow up the series count.
+            template = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started, method=scope.get("method", ""), route=template, status=status_code[0]
+            )
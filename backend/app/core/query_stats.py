@@ -0,0 +1,228 @@
+"""
+Per-statement SQL timings collected from SQLAlchemy cursor events (see `core/db.py`).
+
+Statements are grouped by fingerprint: bind placeholders and literals become `?` and
+expanded `IN (...)` lists collapse to one entry, so `id = 1` and `id = 2` share a row.
+Queries slower than `DB_SLOW_QUERY_MS` are logged with the shape (names and types, never
+values) of their bind parameters. Inside a `query_scope` (one per HTTP request, job or
+ETL group) a fingerprint executed `DB_N_PLUS_ONE_THRESHOLD` times or more is reported as
+a likely N+1 pattern.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from datetime import datetime
+from functools import lru_cache
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+from .logging import get_logger
+from .settings import get_settings
+
+
+logger = get_logger(__name__)
+
+SAMPLE_WINDOW = 512
+MAX_FINGERPRINTS = 2000
+LOGGED_STATEMENT_LENGTH = 2000
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|:\w+|\?")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    return _IN_LIST.sub("(?, ...)", normalized)
+
+
+def parameter_shape(parameters: object, executemany: bool = False) -> str:
+    """Bind parameter names and types, without values (safe to log)."""
+    if executemany and isinstance(parameters, (list, tuple)):
+        first = parameters[0] if parameters else None
+        return f"{len(parameters)} x {parameter_shape(first)}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    return "()" if parameters is None else type(parameters).__name__
+
+
+@dataclass
+class QueryStat:
+    engine: str
+    fingerprint: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    slow_count: int = 0
+    n_plus_one_count: int = 0
+    last_n_plus_one_scope: Optional[str] = None
+    parameter_shape: Optional[str] = None
+    p50_ms: float = 0.0
+    p95_ms: float = 0.0
+    p99_ms: float = 0.0
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+
+class QueryScope:
+    """Fingerprints executed within one request or job."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.counts: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, key: Tuple[str, str]) -> None:
+        with self._lock:
+            self.counts[key] += 1
+
+
+_current_scope: ContextVar[Optional[QueryScope]] = ContextVar("query_scope", default=None)
+
+
+class QueryStats:
+    """Process-wide statement stats; percentiles cover the last `SAMPLE_WINDOW` runs of each fingerprint."""
+
+    def __init__(self, slow_query_ms: float, n_plus_one_threshold: int, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.slow_query_ms = slow_query_ms
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], QueryStat] = {}
+        self._samples: Dict[Tuple[str, str], Deque[float]] = {}
+        self.dropped = 0
+        self.since = datetime.now()
+
+    def record(self, engine: str, statement: str, parameters: object, executemany: bool, elapsed_ms: float) -> None:
+        if not self.enabled:
+            return
+        key = (engine, fingerprint(statement))
+        slow = elapsed_ms >= self.slow_query_ms
+        with self._lock:
+            stat = self._stats.get(key)
+            if stat is None:
+                if len(self._stats) >= MAX_FINGERPRINTS:
+                    self.dropped += 1
+                else:
+                    stat = self._stats[key] = QueryStat(engine=engine, fingerprint=key[1])
+                    self._samples[key] = deque(maxlen=SAMPLE_WINDOW)
+            if stat is not None:
+                stat.count += 1
+                stat.total_ms += elapsed_ms
+                stat.max_ms = max(stat.max_ms, elapsed_ms)
+                stat.slow_count += slow
+                self._samples[key].append(elapsed_ms)
+        scope = _current_scope.get()
+        if scope is not None:
+            scope.record(key)
+        if slow:
+            shape = parameter_shape(parameters, executemany)
+            if stat is not None:
+                stat.parameter_shape = shape
+            logger.warning(
+                "Slow query on %s (%.0f ms%s): %s params=%s",
+                engine,
+                elapsed_ms,
+                f", in {scope.name}" if scope is not None else "",
+                _WHITESPACE.sub(" ", statement).strip()[:LOGGED_STATEMENT_LENGTH],
+                shape,
+            )
+
+    def close_scope(self, scope: QueryScope) -> None:
+        repeated = [(key, count) for key, count in scope.counts.items() if count >= self.n_plus_one_threshold]
+        for (engine, query), count in repeated:
+            with self._lock:
+                stat = self._stats.get((engine, query))
+                if stat is not None:
+                    stat.n_plus_one_count += 1
+                    stat.last_n_plus_one_scope = scope.name
+            logger.warning("Possible N+1 in %s: %d x on %s: %s", scope.name, count, engine, query)
+
+    def top(self, limit: int = 20, order_by: str = "total") -> List[QueryStat]:
+        with self._lock:
+            snapshot = []
+            for key, stat in self._stats.items():
+                samples = sorted(self._samples[key])
+                copy = replace(stat)
+                copy.p50_ms, copy.p95_ms, copy.p99_ms = (_percentile(samples, q) for q in (0.5, 0.95, 0.99))
+                snapshot.append(copy)
+        sort_keys = {
+            "total": lambda stat: stat.total_ms,
+            "count": lambda stat: stat.count,
+            "avg": lambda stat: stat.avg_ms,
+            "max": lambda stat: stat.max_ms,
+            "p95": lambda stat: stat.p95_ms,
+            "slow": lambda stat: stat.slow_count,
+            "n_plus_one": lambda stat: stat.n_plus_one_count,
+        }
+        if order_by not in sort_keys:
+            raise ValueError(f"order_by must be one of {', '.join(sort_keys)}")
+        return sorted(snapshot, key=sort_keys[order_by], reverse=True)[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._samples.clear()
+            self.dropped = 0
+            self.since = datetime.now()
+
+
+def _percentile(sorted_samples: List[float], q: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = min(int(q * len(sorted_samples)), len(sorted_samples) - 1)
+    return sorted_samples[index]
+
+
+_settings = get_settings().query_stats
+query_stats = QueryStats(
+    slow_query_ms=_settings.slow_query_ms,
+    n_plus_one_threshold=_settings.n_plus_one_threshold,
+    enabled=_settings.enabled,
+)
+
+
+@contextmanager
+def query_scope(name: str) -> Iterator[QueryScope]:
+    """Attribute queries run in this context (not in threads it starts) to `name` for N+1 detection."""
+    scope = QueryScope(name)
+    token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_scope.reset(token)
+        query_stats.close_scope(scope)
+
+
+class QueryScopeMiddleware:
+    """ASGI middleware opening a query scope per HTTP request, named after the matched route."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not query_stats.enabled:
+            await self.app(scope, receive, send)
+            return
+        with query_scope(scope.get("path", "")) as queries:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                route = scope.get("route")
+                queries.name = f"{scope.get('method', '')} {getattr(route, 'path', None) or scope.get('path', '')}"
+
@@ -1,22 +1,39 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional
 
 import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from starlette.concurrency import run_in_threadpool
 
-from .db import TargetSessionLocal
+from .cache import TTLCache
+from .db import AsyncTargetSessionLocal, TargetSessionLocal
 from .logging import get_logger
 from .settings import get_settings
+from ..models.scenario import Scenario
 from ..models.user import User
 from ..services.review import NotFoundError
+from ..services.scenario import ScenarioService
 
 
 logger = get_logger(__name__)
 settings = get_settings()
 http_bearer = HTTPBearer(auto_error=False)
+scenario_service = ScenarioService()
+
+# Entries are detached User rows. Nothing in the app writes users, so there is no
+# invalidation: a deactivation or role change made in the DB is picked up when the
+# entry expires, or immediately on that user's next login (which re-caches the row).
+_user_cache: TTLCache[int, User] = TTLCache(settings.cache.user_ttl_seconds)
+
+
+@dataclass(frozen=True)
+class CurrentContext:
+    user: User
+    scenario: Scenario
 
 
 def hash_password(plain_password: str) -> str:
@@ -49,7 +66,7 @@ def create_access_token(
     return token
 
 
-def _get_user_by_id(user_id: int) -> User:
+def _load_user(user_id: int) -> User:
     with TargetSessionLocal() as session:
         user = session.get(User, user_id)
         if user is None:
@@ -57,7 +74,25 @@ def _get_user_by_id(user_id: int) -> User:
         return user
 
 
-def get_current_user(
+async def _load_user_async(user_id: int) -> User:
+    if AsyncTargetSessionLocal is None:
+        return await run_in_threadpool(_load_user, user_id)
+    async with AsyncTargetSessionLocal() as session:
+        user = await session.get(User, user_id)
+    if user is None:
+        raise NotFoundError(f"User {user_id} not found")
+    return user
+
+
+async def _get_user_by_id(user_id: int) -> User:
+    return await _user_cache.get_or_load_async(user_id, lambda: _load_user_async(user_id))
+
+
+def cache_user(user: User) -> None:
+    _user_cache.set(int(user.id), user)
+
+
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(http_bearer),
 ) -> User:
     if credentials is None:
@@ -99,7 +134,7 @@ def get_current_user(
         )
 
     try:
-        user = _get_user_by_id(user_id)
+        user = await _get_user_by_id(user_id)
     except NotFoundError as exc:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -113,3 +148,17 @@ def get_current_user(
         )
 
     return user
+
+
+async def get_current_context(
+    current_user: User = Depends(get_current_user),
+) -> CurrentContext:
+    """Resolve the authenticated user and their bound scenario once per request."""
+    try:
+        scenario = await scenario_service.get_scenario_async(current_user.scenario_id)
+    except NotFoundError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(exc),
+        ) from exc
+    return CurrentContext(user=current_user, scenario=scenario)
@@ -7,7 +7,7 @@ from typing import Dict, Optional
 from urllib.parse import parse_qsl, urlparse
 
 from pydantic import BaseModel, Field
-from sqlalchemy.engine import URL
+from sqlalchemy.engine import URL, make_url
 
 
 BASE_DIR = Path(__file__).resolve().parents[3]
@@ -194,14 +194,74 @@ def _resolve_database_url(prefix: Optional[str] = None, fallback: Optional[str]
 class DatabaseSettings(BaseModel):
     source_url: str = Field(..., description="SQLAlchemy URL for the source database")
     target_url: str = Field(..., description="SQLAlchemy URL for the target database")
+    async_enabled: bool = Field(
+        default=(_get_env_value("DB_ASYNC", default="false") or "").lower() in ("1", "true", "yes", "on"),
+        description="Serve the hot read routes from an asyncio engine on the target database",
+    )
+    async_driver: str = Field(
+        default=_get_env_value("DB_ASYNC_DRIVER", default="aiomysql"),
+        description="SQLAlchemy asyncio MySQL driver: aiomysql or asyncmy",
+    )
+    async_pool_size: int = Field(
+        default=int(_get_env_value("DB_ASYNC_POOL_SIZE", default="20")),
+        ge=1,
+        description="Connections in the asyncio engine pool; bounds concurrent async reads",
+    )
+
+    @property
+    def async_target_url(self) -> str:
+        url = make_url(self.target_url).set(drivername=f"mysql+{self.async_driver}")
+        return url.render_as_string(hide_password=False)
 
 
 class SchedulerSettings(BaseModel):
     cron_expression: str = Field(default="0 1 * * *", description="Cron for the daily ETL job")
     faq_cron_expression: str = Field(default="0 3 * * *", description="Cron for the daily FAQ extraction job")
+    taxonomy_candidate_cron_expression: str = Field(
+        default="20 * * * *",
+        description="Cron for the incremental work order category aggregation (taxonomy candidates)",
+    )
     timezone: str = Field(default="Asia/Shanghai")
     max_workers: int = Field(default=4, ge=1, le=64)
     faq_max_workers: int = Field(default=5, ge=1, le=32)
+    pipeline_enabled: bool = Field(
+        default=False,
+        description="Hand conversations inserted by the ETL straight to FAQ extraction workers",
+    )
+    pipeline_sync_delay_seconds: float = Field(
+        default=60.0,
+        ge=0,
+        description="Idle time after the last extracted conversation before compare KB sync runs",
+    )
+    leader_election: bool = Field(
+        default=False,
+        description="Only the instance holding the scheduler lease runs cron jobs",
+    )
+    lease_ttl_seconds: float = Field(
+        default=30.0,
+        ge=3,
+        description="How long a scheduler lease lasts without renewal before another instance takes over",
+    )
+    executor_workers: int = Field(
+        default=2,
+        ge=1,
+        le=16,
+        description="Threads that run scheduled job callables, off the API event loop",
+    )
+    scenario_sync_enabled: bool = Field(
+        default=True,
+        description="Register a knowledge sync job per active scenario from scenarios.sync_schedule",
+    )
+    scenario_sync_stagger_seconds: float = Field(
+        default=60.0,
+        ge=0,
+        description="Offset between scenario sync jobs that share the same cron",
+    )
+    scenario_sync_refresh_seconds: float = Field(
+        default=300.0,
+        ge=10,
+        description="How often scenario sync jobs are re-read from the scenarios table",
+    )
 
 
 class AicoSettings(BaseModel):
@@ -231,6 +291,11 @@ class AicoSettings(BaseModel):
     chatbot_api_key: str = Field(default=_get_env_value("AICO_CHATBOT_API_KEY", default=""))
     auto_review_url: str = Field(default=_get_env_value("AICO_AUTO_REVIEW_URL", default=""))
     compare_review_url: str = Field(default=_get_env_value("AICO_COMPARE_REVIEW_URL", default=""))
+    sync_max_per_host: int = Field(
+        default=int(_get_env_value("AICO_SYNC_MAX_PER_HOST", default="2")),
+        ge=1,
+        description="Knowledge syncs a process runs against one AICO host at the same time",
+    )
 
 
 class AuthSettings(BaseModel):
@@ -248,6 +313,75 @@ class AuthSettings(BaseModel):
     )
 
 
+class CacheSettings(BaseModel):
+    status_counter_ttl_seconds: float = Field(
+        default=float(_get_env_value("STATUS_COUNTER_TTL_SECONDS", default="60")),
+        description="How long cached status counters are trusted before being re-seeded from the DB",
+    )
+    user_ttl_seconds: float = Field(
+        default=float(_get_env_value("USER_CACHE_TTL_SECONDS", default="30")),
+        description="TTL for cached User lookups on authenticated requests (0 disables)",
+    )
+    scenario_ttl_seconds: float = Field(
+        default=float(_get_env_value("SCENARIO_CACHE_TTL_SECONDS", default="30")),
+        description="TTL for cached Scenario lookups (0 disables)",
+    )
+    taxonomy_ttl_seconds: float = Field(
+        default=float(_get_env_value("TAXONOMY_CACHE_TTL_SECONDS", default="300")),
+        description="Max age of a cached per-scope taxonomy snapshot before it is reloaded",
+    )
+
+
+class JobSettings(BaseModel):
+    run_in_api: bool = Field(
+        default=(_get_env_value("JOB_WORKER_IN_API", default="true") or "").lower() in ("1", "true", "yes", "on"),
+        description="Run a background job worker pool inside the API process",
+    )
+    concurrency: int = Field(
+        default=int(_get_env_value("JOB_WORKER_CONCURRENCY", default="2")),
+        ge=1,
+        le=32,
+        description="Jobs a worker process runs at the same time",
+    )
+    poll_interval_seconds: float = Field(
+        default=float(_get_env_value("JOB_POLL_INTERVAL_SECONDS", default="2")),
+        description="How often idle workers look for queued jobs",
+    )
+    heartbeat_timeout_seconds: float = Field(
+        default=float(_get_env_value("JOB_HEARTBEAT_TIMEOUT_SECONDS", default="120")),
+        description="Running jobs without a heartbeat for this long are treated as lost and re-queued",
+    )
+    profile_dir: str = Field(
+        default=_get_env_value("JOB_PROFILE_DIR", default=str(BASE_DIR / "profiles")),
+        description="Where collapsed-stack profiles of jobs triggered with profile=true are written",
+    )
+    profile_interval_ms: float = Field(
+        default=float(_get_env_value("JOB_PROFILE_INTERVAL_MS", default="10")),
+        ge=1,
+        description="Sampling interval of the job profiler",
+    )
+    profile_max_seconds: float = Field(
+        default=float(_get_env_value("JOB_PROFILE_MAX_SECONDS", default="7200")),
+        description="The profiler stops sampling after this long; the job itself keeps running",
+    )
+
+
+class QueryStatsSettings(BaseModel):
+    enabled: bool = Field(
+        default=(_get_env_value("DB_QUERY_STATS", default="true") or "").lower() in ("1", "true", "yes", "on"),
+        description="Time every SQL statement by fingerprint (slow-query log, N+1 detection, admin report)",
+    )
+    slow_query_ms: float = Field(
+        default=float(_get_env_value("DB_SLOW_QUERY_MS", default="500")),
+        description="Statements taking at least this long are logged with their bind parameter shapes",
+    )
+    n_plus_one_threshold: int = Field(
+        default=int(_get_env_value("DB_N_PLUS_ONE_THRESHOLD", default="20")),
+        ge=2,
+        description="Executions of one fingerprint within a request or job reported as a likely N+1",
+    )
+
+
 class Settings(BaseModel):
     app_name: str = "dialog-etl-service"
     environment: str = Field(default=_get_env_value("APP_ENV", default="prod"))
@@ -256,6 +390,9 @@ class Settings(BaseModel):
     scheduler: SchedulerSettings
     aico: AicoSettings = AicoSettings()
     auth: AuthSettings = AuthSettings()
+    cache: CacheSettings = CacheSettings()
+    jobs: JobSettings = JobSettings()
+    query_stats: QueryStatsSettings = QueryStatsSettings()
 
 
 @lru_cache
@@ -267,9 +404,18 @@ def get_settings() -> Settings:
     scheduler = SchedulerSettings(
         cron_expression=_get_env_value("ETL_CRON", default="0 1 * * *"),
         faq_cron_expression=_get_env_value("FAQ_CRON", default="0 3 * * *"),
+        taxonomy_candidate_cron_expression=_get_env_value("TAXONOMY_CANDIDATE_CRON", default="20 * * * *"),
         timezone=_get_env_value("APP_TIMEZONE", default="Asia/Shanghai"),
         max_workers=int(_get_env_value("ETL_MAX_WORKERS", default="4")),
         faq_max_workers=int(_get_env_value("FAQ_MAX_WORKERS", default="5")),
+        pipeline_enabled=(_get_env_value("EXTRACTION_PIPELINE", default="false") or "").lower() in ("1", "true", "yes", "on"),
+        pipeline_sync_delay_seconds=float(_get_env_value("PIPELINE_SYNC_DELAY_SECONDS", default="60")),
+        leader_election=(_get_env_value("SCHEDULER_LEADER_ELECTION", default="false") or "").lower() in ("1", "true", "yes", "on"),
+        lease_ttl_seconds=float(_get_env_value("SCHEDULER_LEASE_TTL_SECONDS", default="30")),
+        executor_workers=int(_get_env_value("SCHEDULER_EXECUTOR_WORKERS", default="2")),
+        scenario_sync_enabled=(_get_env_value("SCENARIO_SYNC_ENABLED", default="true") or "").lower() in ("1", "true", "yes", "on"),
+        scenario_sync_stagger_seconds=float(_get_env_value("SCENARIO_SYNC_STAGGER_SECONDS", default="60")),
+        scenario_sync_refresh_seconds=float(_get_env_value("SCENARIO_SYNC_REFRESH_SECONDS", default="300")),
     )
     database = DatabaseSettings(
         source_url=_resolve_database_url(f"{profile_prefix}SRC_", fallback=default_url) if profile_prefix else _resolve_database_url("SRC_", fallback=default_url),
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ..core.logging import get_logger
+from ..services.aico_sync import AicoSyncError, AicoSyncOrchestrator
+from ..services.compare_kb_sync import CompareKbSyncService
+from ..services.dialog_etl import ETL_THREAD_PREFIX, DialogETLService
+from ..services.faq_extraction import EXTRACTION_THREAD_PREFIX, FAQExtractionService
+from ..services.job_queue import JobContext, JobInfo, job_queue
+from ..services.review_bulk_jobs import REVIEW_BULK_JOB_KIND, review_bulk_jobs
+from ..services.taxonomy_candidate import TaxonomyCandidateService
+
+
+logger = get_logger(__name__)
+
+etl_service = DialogETLService()
+faq_service = FAQExtractionService()
+compare_sync_service = CompareKbSyncService()
+aico_sync_orchestrator = AicoSyncOrchestrator()
+taxonomy_candidate_service = TaxonomyCandidateService()
+
+
+@dataclass(frozen=True)
+class JobKind:
+    handler: Callable[[JobContext], None]
+    max_attempts: int
+    # Name prefixes of the executor threads the handler fans out to, sampled with the job thread.
+    profile_threads: Tuple[str, ...] = ()
+
+
+def run_aggregation(ctx: JobContext) -> None:
+    start_time = datetime.fromisoformat(ctx.payload["start_time"])
+    end_time = datetime.fromisoformat(ctx.payload["end_time"])
+    current = start_time.date()
+    last = (end_time - timedelta(microseconds=1)).date()
+    total = (last - current).days + 1
+    done = 0
+    ctx.progress(done, total, "aggregating")
+    while current <= last:
+        etl_service.run_for_date(current)
+        done += 1
+        ctx.progress(done, total, current.isoformat())
+        current += timedelta(days=1)
+
+
+def run_extraction(ctx: JobContext) -> None:
+    ctx.progress(0, 2, "extracting FAQs")
+    result = faq_service.run(limit=ctx.payload.get("limit"))
+    ctx.progress(1, 2, f"{result.faqs_created} FAQs created; compare KB sync")
+    compare_sync_service.run(skip_unchanged=True)
+    ctx.progress(2, 2, "done")
+
+
+def run_compare_kb_sync(ctx: JobContext) -> None:
+    ctx.progress(0, 1, "compare KB sync")
+    compare_sync_service.run(skip_unchanged=bool(ctx.payload.get("skip_unchanged")))
+    ctx.progress(1, 1, "done")
+
+
+def run_scenario_sync(ctx: JobContext) -> None:
+    scenario_id = int(ctx.payload["scenario_id"])
+    ctx.progress(0, 1, f"sync scenario {scenario_id}")
+    if ctx.payload.get("compare"):
+        results = compare_sync_service.run(scenario_ids=[scenario_id], skip_unchanged=True)
+        failed = [result for result in results if result.status == "failed"]
+        if failed:
+            raise AicoSyncError(failed[0].message)
+        message = results[0].message if results else "Not synced: AICO host uses another compare scenario."
+    else:
+        run_id = f"sched-{scenario_id}-{uuid.uuid4().hex[:8]}"
+        message = aico_sync_orchestrator.run_for_scenario(scenario_id, run_id=run_id, skip_unchanged=True).message
+    ctx.progress(1, 1, message)
+
+
+def run_review_bulk(ctx: JobContext) -> None:
+    review_bulk_jobs.run(ctx)
+
+
+def run_taxonomy_candidates(ctx: JobContext) -> None:
+    month = ctx.payload.get("month")
+    ctx.progress(0, 1, f"aggregate work order categories {month or 'incremental'}")
+    if month:
+        year, month_number = (int(part) for part in month.split("-"))
+        results = [taxonomy_candidate_service.aggregate_month(year, month_number)]
+    else:
+        results = taxonomy_candidate_service.run_incremental()
+    summary = {
+        result.month: {
+            "scanned": result.scanned,
+            "counted": result.counted,
+            "moved": result.moved,
+            "ignored": result.ignored,
+            "watermark": result.watermark.isoformat() if result.watermark else None,
+        }
+        for result in results
+    }
+    message = "; ".join(f"{result.month} counted:{result.counted}" for result in results)
+    ctx.progress(1, 1, message, result=summary)
+
+
+# ETL and extraction skip rows that are already done, so they are safe to retry.
+JOB_KINDS: Dict[str, JobKind] = {
+    "aggregation": JobKind(handler=run_aggregation, max_attempts=3, profile_threads=(ETL_THREAD_PREFIX,)),
+    "extraction": JobKind(handler=run_extraction, max_attempts=2, profile_threads=(EXTRACTION_THREAD_PREFIX,)),
+    "compare_kb_sync": JobKind(handler=run_compare_kb_sync, max_attempts=2),
+    "scenario_sync": JobKind(handler=run_scenario_sync, max_attempts=2),
+    # Not retried: a second attempt would report the first attempt's rows as skipped.
+    REVIEW_BULK_JOB_KIND: JobKind(handler=run_review_bulk, max_attempts=1),
+    # Each batch commits with its watermark, so a retry resumes where the failed attempt stopped.
+    "taxonomy_candidates": JobKind(handler=run_taxonomy_candidates, max_attempts=2),
+}
+
+
+def enqueue_job(kind: str, payload: Optional[Dict[str, Any]] = None, active_key: Optional[str] = None) -> JobInfo:
+    """Queue a job of a registered kind; raises JobConflictError if one with the same key is already active."""
+    spec = JOB_KINDS[kind]
+    return job_queue.enqueue(kind, payload, max_attempts=spec.max_attempts, active_key=active_key)
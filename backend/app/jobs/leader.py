@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import os
+import socket
+import threading
+import uuid
+from datetime import timedelta
+from typing import Optional
+
+from sqlalchemy import case, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from ..core.db import TargetSessionLocal
+from ..core.logging import get_logger
+from ..models.scheduler_lease import SchedulerLease
+
+
+logger = get_logger(__name__)
+
+
+class LeaseLeaderElector:
+    """
+    Leader election over a single row in `scheduler_leases`.
+
+    Every instance tries to take or renew the lease every `ttl / 3` seconds. A renewal only
+    succeeds for the current holder, or for anyone once `expires_at` has passed, so when
+    the leader dies another instance takes over within one TTL. All times are the
+    database's NOW(), so clock skew between hosts does not matter.
+    """
+
+    def __init__(self, name: str, ttl_seconds: float, holder_id: Optional[str] = None) -> None:
+        self.name = name
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.holder_id = holder_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._is_leader = False
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._is_leader
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self.renew()
+        self._thread = threading.Thread(target=self._loop, name=f"leader-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._thread = None
+        if self._is_leader:
+            self.release()
+
+    def renew(self) -> bool:
+        """Take or extend the lease; returns whether this instance is the leader afterwards."""
+        try:
+            leader = self._try_acquire()
+        except Exception:  # pylint: disable=broad-except
+            # Without a working DB we cannot prove the lease is still ours.
+            logger.exception("Scheduler lease %s renewal failed", self.name)
+            leader = False
+        if leader != self._is_leader:
+            logger.info(
+                "Scheduler lease %s %s by %s",
+                self.name,
+                "acquired" if leader else "lost",
+                self.holder_id,
+            )
+        self._is_leader = leader
+        return leader
+
+    def release(self) -> None:
+        try:
+            with TargetSessionLocal() as session:
+                with session.begin():
+                    session.execute(
+                        update(SchedulerLease)
+                        .where(SchedulerLease.name == self.name, SchedulerLease.holder == self.holder_id)
+                        .values(expires_at=func.now())
+                        .execution_options(synchronize_session=False)
+                    )
+            logger.info("Scheduler lease %s released by %s", self.name, self.holder_id)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Scheduler lease %s release failed", self.name)
+        self._is_leader = False
+
+    def _try_acquire(self) -> bool:
+        with TargetSessionLocal() as session:
+            with session.begin():
+                now = session.execute(select(func.now())).scalar_one()
+                result = session.execute(
+                    update(SchedulerLease)
+                    .where(
+                        SchedulerLease.name == self.name,
+                        or_(SchedulerLease.holder == self.holder_id, SchedulerLease.expires_at <= now),
+                    )
+                    # acquired_at first: MySQL evaluates SET left to right with updated values.
+                    .ordered_values(
+                        (
+                            SchedulerLease.acquired_at,
+                            case((SchedulerLease.holder == self.holder_id, SchedulerLease.acquired_at), else_=now),
+                        ),
+                        (SchedulerLease.holder, self.holder_id),
+                        (SchedulerLease.expires_at, now + self.ttl),
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount:
+                    return True
+                exists = session.execute(
+                    select(SchedulerLease.name).where(SchedulerLease.name == self.name)
+                ).scalar_one_or_none()
+                if exists is not None:
+                    return False
+        try:
+            with TargetSessionLocal() as session:
+                with session.begin():
+                    session.add(
+                        SchedulerLease(
+                            name=self.name,
+                            holder=self.holder_id,
+                            expires_at=now + self.ttl,
+                            acquired_at=now,
+                        )
+                    )
+        except IntegrityError:
+            return False
+        return True
+
+    def _loop(self) -> None:
+        interval = max(self.ttl.total_seconds() / 3, 1.0)
+        while not self._stopping.wait(interval):
+            self.renew()
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from ..core.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+_THREAD_SUFFIX = re.compile(r"[-_]?\d+(?:_\d+)?$")
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler writing collapsed stacks (`frame;frame;frame count` lines,
+    the input format of flamegraph.pl / speedscope).
+
+    A background thread snapshots `sys._current_frames()` every `interval_seconds` and keeps
+    the stacks of the thread that started the profiler plus threads whose name starts with
+    one of `thread_prefixes` (e.g. the ETL's executor). Profiled code is never traced, so the
+    cost is one stack walk per watched thread per tick. Threads blocked on the DB or AICO
+    show up in socket reads, which is the point: the profile shows where wall time goes.
+    Sampling stops after `max_seconds` so a forgotten flag cannot grow memory forever.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float = 0.01,
+        thread_prefixes: Sequence[str] = (),
+        max_seconds: float = 7200.0,
+    ) -> None:
+        self.interval_seconds = interval_seconds
+        self.thread_prefixes = tuple(thread_prefixes)
+        self.max_seconds = max_seconds
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.truncated = False
+        self._owner_ident: Optional[int] = None
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._labels: Dict[object, str] = {}
+
+    def start(self) -> None:
+        self._owner_ident = threading.get_ident()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def write(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lines = [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+        path.write_text("\n".join(lines) + "\n" if lines else "", encoding="utf-8")
+
+    def _run(self) -> None:
+        deadline = time.monotonic() + self.max_seconds
+        while not self._stopping.wait(self.interval_seconds):
+            if time.monotonic() >= deadline:
+                self.truncated = True
+                logger.warning("Sampling profiler stopped after %.0fs (max duration)", self.max_seconds)
+                return
+            self.sample()
+
+    def sample(self) -> None:
+        threads = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():  # pylint: disable=protected-access
+            name = threads.get(ident)
+            if name is None or not self._watched(ident, name):
+                continue
+            frames: List[str] = []
+            while frame is not None:
+                frames.append(self._label(frame.f_code))
+                frame = frame.f_back
+            frames.append(_THREAD_SUFFIX.sub("", name) or name)
+            self.stacks[";".join(reversed(frames))] += 1
+        self.samples += 1
+
+    def _watched(self, ident: int, name: str) -> bool:
+        return ident == self._owner_ident or name.startswith(self.thread_prefixes)
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+            self._labels[code] = label
+        return label
+
+
+def _short_path(filename: str) -> str:
+    filename = filename.replace("\\", "/")
+    if "/backend/app/" in filename:
+        return "backend/app/" + filename.split("/backend/app/", 1)[1]
+    if "/site-packages/" in filename:
+        return filename.split("/site-packages/", 1)[1]
+    return filename.rsplit("/", 1)[-1]
+
+
+@contextmanager
+def profile_run(
+    output_path: Path,
+    interval_seconds: float,
+    thread_prefixes: Sequence[str] = (),
+    max_seconds: float = 7200.0,
+) -> Iterator[SamplingProfiler]:
+    """Sample the calling thread (and `thread_prefixes` threads) until the block exits, then write `output_path`."""
+    profiler = SamplingProfiler(interval_seconds, thread_prefixes, max_seconds)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        try:
+            profiler.write(output_path)
+            logger.info(
+                "Profile written to %s (%d samples, %d distinct stacks%s)",
+                output_path,
+                profiler.samples,
+                len(profiler.stacks),
+                ", truncated" if profiler.truncated else "",
+            )
+        except OSError:
+            logger.exception("Failed to write profile %s", output_path)
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from apscheduler.triggers.base import BaseTrigger
+from apscheduler.triggers.cron import CronTrigger
+
+from ..services.compare_kb_sync import COMPARE_SUFFIXES
+
+
+JOB_ID_PREFIX = "scenario_sync:"
+
+
+@dataclass(frozen=True)
+class ScenarioSyncPlan:
+    scenario_id: int
+    scenario_code: str
+    cron: str
+    offset_seconds: float
+
+    @property
+    def job_id(self) -> str:
+        return f"{JOB_ID_PREFIX}{self.scenario_id}"
+
+    @property
+    def is_compare(self) -> bool:
+        return self.scenario_code.endswith(COMPARE_SUFFIXES)
+
+
+class OffsetTrigger(BaseTrigger):
+    """Fires `offset` after every fire time of the wrapped trigger."""
+
+    def __init__(self, trigger: BaseTrigger, offset: timedelta) -> None:
+        self.trigger = trigger
+        self.offset = offset
+
+    def get_next_fire_time(self, previous_fire_time: Optional[datetime], now: datetime) -> Optional[datetime]:
+        previous = previous_fire_time - self.offset if previous_fire_time is not None else None
+        next_fire_time = self.trigger.get_next_fire_time(previous, now - self.offset)
+        return next_fire_time + self.offset if next_fire_time is not None else None
+
+    def __str__(self) -> str:
+        return f"{self.trigger} +{int(self.offset.total_seconds())}s"
+
+
+def plan_scenario_syncs(
+    scenarios: Iterable[Tuple[int, str, Optional[str]]],
+    stagger_seconds: float,
+) -> List[ScenarioSyncPlan]:
+    """
+    One plan per (id, scenario_code, sync_schedule) row. Scenarios sharing a cron are spread
+    `stagger_seconds` apart in id order, so they do not all hit AICO in the same minute.
+    """
+    plans: List[ScenarioSyncPlan] = []
+    per_cron: Dict[str, int] = {}
+    for scenario_id, scenario_code, sync_schedule in sorted(scenarios, key=lambda row: row[0]):
+        cron = " ".join((sync_schedule or "").split())
+        if not cron:
+            continue
+        slot = per_cron.get(cron, 0)
+        per_cron[cron] = slot + 1
+        plans.append(
+            ScenarioSyncPlan(
+                scenario_id=scenario_id,
+                scenario_code=(scenario_code or "").strip(),
+                cron=cron,
+                offset_seconds=slot * stagger_seconds,
+            )
+        )
+    return plans
+
+
+def build_trigger(plan: ScenarioSyncPlan, timezone: str) -> BaseTrigger:
+    """Raises ValueError for an invalid cron expression."""
+    trigger = CronTrigger.from_crontab(plan.cron, timezone=timezone)
+    if plan.offset_seconds:
+        return OffsetTrigger(trigger, timedelta(seconds=plan.offset_seconds))
+    return trigger
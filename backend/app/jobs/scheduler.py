@@ -1,13 +1,27 @@
 from __future__ import annotations
 
+from datetime import datetime, time, timedelta
+from functools import wraps
+from typing import Callable, Dict, Optional
+
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+from sqlalchemy import select
 
+from ..core.db import TargetSessionLocal
 from ..core.logging import get_logger
 from ..core.settings import get_settings
-from ..services.compare_kb_sync import CompareKbSyncService
+from ..models.scenario import Scenario
 from ..services.dialog_etl import DialogETLService
+from ..services.extraction_pipeline import extraction_pipeline
 from ..services.faq_extraction import FAQExtractionService
+from ..services.job_queue import JobConflictError
+from .handlers import enqueue_job
+from .leader import LeaseLeaderElector
+from .scenario_sync import ScenarioSyncPlan, build_trigger, plan_scenario_syncs
+from .timings import scheduled_job_timings
 
 
 logger = get_logger(__name__)
@@ -16,10 +30,24 @@ settings = get_settings()
 
 class SchedulerManager:
     def __init__(self) -> None:
-        self.scheduler = AsyncIOScheduler(timezone=settings.scheduler.timezone)
+        # Job callables are sync and do DB work; run them on a dedicated thread pool so the
+        # API event loop (which AsyncIOScheduler shares) never waits on a scheduled job.
+        self.scheduler = AsyncIOScheduler(
+            timezone=settings.scheduler.timezone,
+            executors={"default": ThreadPoolExecutor(settings.scheduler.executor_workers)},
+        )
+        self.timings = scheduled_job_timings
+        self.timings.attach(self.scheduler)
         self.etl_service = DialogETLService()
         self.faq_service = FAQExtractionService()
-        self.compare_sync_service = CompareKbSyncService()
+        self.pipeline = extraction_pipeline if settings.scheduler.pipeline_enabled else None
+        # Every replica runs APScheduler; with leader election only the lease holder acts on a trigger.
+        self.elector = (
+            LeaseLeaderElector("scheduler", settings.scheduler.lease_ttl_seconds)
+            if settings.scheduler.leader_election
+            else None
+        )
+        self._scenario_sync_plans: Dict[str, ScenarioSyncPlan] = {}
         self._configure_jobs()
 
     def _log_job_plan(self) -> None:
@@ -41,7 +69,7 @@ class SchedulerManager:
             timezone=settings.scheduler.timezone,
         )
         self.scheduler.add_job(
-            self._run_daily_etl,
+            self.timings.track("daily_dialog_etl", self._leader_only(self._run_daily_etl)),
             trigger=etl_trigger,
             id="daily_dialog_etl",
             replace_existing=True,
@@ -54,7 +82,7 @@ class SchedulerManager:
             timezone=settings.scheduler.timezone,
         )
         self.scheduler.add_job(
-            self._run_daily_faq_extraction,
+            self.timings.track("daily_faq_extraction", self._leader_only(self._run_daily_faq_extraction)),
             trigger=faq_trigger,
             id="daily_faq_extraction",
             replace_existing=True,
@@ -62,6 +90,32 @@ class SchedulerManager:
             coalesce=True,
         )
 
+        candidate_trigger = CronTrigger.from_crontab(
+            settings.scheduler.taxonomy_candidate_cron_expression,
+            timezone=settings.scheduler.timezone,
+        )
+        self.scheduler.add_job(
+            self.timings.track("taxonomy_candidate_aggregation", self._leader_only(self._run_taxonomy_candidates)),
+            trigger=candidate_trigger,
+            id="taxonomy_candidate_aggregation",
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+        )
+
+        if settings.scheduler.scenario_sync_enabled:
+            # Scenario rows change at runtime, so per-scenario jobs are (re)built from the
+            # table periodically, starting right after the scheduler comes up.
+            self.scheduler.add_job(
+                self.timings.track("scenario_sync_refresh", self._refresh_scenario_sync_jobs),
+                trigger=IntervalTrigger(seconds=settings.scheduler.scenario_sync_refresh_seconds),
+                id="scenario_sync_refresh",
+                replace_existing=True,
+                max_instances=1,
+                coalesce=True,
+                next_run_time=datetime.now(self.scheduler.timezone),
+            )
+
     def start(self) -> None:
         if not self.scheduler.running:
             logger.info(
@@ -70,21 +124,119 @@ class SchedulerManager:
                 settings.scheduler.faq_cron_expression,
                 settings.scheduler.timezone,
             )
+            if self.elector is not None:
+                self.elector.start()
             self.scheduler.start()
             self._log_job_plan()
+            if self.pipeline is not None:
+                self.pipeline.start()
 
     def shutdown(self) -> None:
         if self.scheduler.running:
             logger.info("Shutting down scheduler")
             self.scheduler.shutdown(wait=False)
+        if self.elector is not None:
+            self.elector.stop()
+        if self.pipeline is not None:
+            self.pipeline.stop()
+
+    def _leader_only(self, func: Callable[[], None]) -> Callable[[], None]:
+        @wraps(func)
+        def runner() -> None:
+            if self.elector is not None and not self.elector.renew():
+                logger.info("Skipping %s: scheduler lease held by another instance.", func.__name__)
+                return
+            func()
+
+        return runner
+
+    def _refresh_scenario_sync_jobs(self) -> None:
+        with TargetSessionLocal() as session:
+            rows = session.execute(
+                select(Scenario.id, Scenario.scenario_code, Scenario.sync_schedule).where(Scenario.is_active.is_(True))
+            ).all()
+        plans = {
+            plan.job_id: plan
+            for plan in plan_scenario_syncs(rows, settings.scheduler.scenario_sync_stagger_seconds)
+        }
+
+        for job_id in set(self._scenario_sync_plans) - set(plans):
+            if self.scheduler.get_job(job_id) is not None:
+                self.scheduler.remove_job(job_id)
+            self._scenario_sync_plans.pop(job_id, None)
+            self.timings.forget(job_id)
+            logger.info("Scenario sync job removed: %s", job_id)
+
+        for job_id, plan in plans.items():
+            if self._scenario_sync_plans.get(job_id) == plan:
+                continue
+            try:
+                trigger = build_trigger(plan, settings.scheduler.timezone)
+            except ValueError as exc:
+                logger.warning(
+                    "Invalid sync_schedule %r for scenario_id=%s; not scheduled: %s", plan.cron, plan.scenario_id, exc
+                )
+                if self.scheduler.get_job(job_id) is not None:
+                    self.scheduler.remove_job(job_id)
+                self._scenario_sync_plans[job_id] = plan
+                continue
+            self.scheduler.add_job(
+                self.timings.track(job_id, self._leader_only(self._scenario_sync_runner(plan))),
+                trigger=trigger,
+                id=job_id,
+                replace_existing=True,
+                max_instances=1,
+                coalesce=True,
+            )
+            self._scenario_sync_plans[job_id] = plan
+            logger.info("Scenario sync job scheduled: id=%s trigger=%s", job_id, trigger)
+
+    def _scenario_sync_runner(self, plan: ScenarioSyncPlan) -> Callable[[], None]:
+        def run_scenario_sync() -> None:
+            logger.info("Scheduled sync triggered for scenario_id=%s (%s)", plan.scenario_id, plan.scenario_code)
+            self._enqueue(
+                "scenario_sync",
+                {"scenario_id": plan.scenario_id, "compare": plan.is_compare},
+                active_key=plan.job_id,
+            )
+
+        return run_scenario_sync
 
     def _run_daily_etl(self) -> None:
         target_date = self.etl_service.default_target_date()
         logger.info("Scheduled ETL triggered for %s", target_date.isoformat())
-        self.etl_service.run_for_date(target_date)
+        start = datetime.combine(target_date, time.min)
+        self._enqueue(
+            "aggregation",
+            {"start_time": start.isoformat(), "end_time": (start + timedelta(days=1)).isoformat()},
+        )
 
     def _run_daily_faq_extraction(self) -> None:
+        if self.pipeline is not None:
+            # Pipeline mode: the ETL already hands over new conversations; this only sweeps
+            # leftovers (restarts, failed hand-offs). Compare sync follows once the queue drains.
+            submitted = self.pipeline.submit(self.faq_service.fetch_unprocessed_ids())
+            logger.info("Scheduled FAQ sweep queued %d conversations.", submitted)
+            if submitted:
+                return
+            logger.info("Scheduled compare KB sync triggered.")
+            self._enqueue("compare_kb_sync", {"skip_unchanged": True})
+            return
+
         logger.info("Scheduled FAQ extraction triggered.")
-        self.faq_service.run()
-        logger.info("Scheduled compare KB sync triggered.")
-        self.compare_sync_service.run()
+        self._enqueue("extraction", {"limit": None})
+
+    def _run_taxonomy_candidates(self) -> None:
+        logger.info("Scheduled work order category aggregation triggered.")
+        self._enqueue("taxonomy_candidates", {})
+
+    @staticmethod
+    def _enqueue(kind: str, payload: dict, active_key: Optional[str] = None) -> None:
+        # Runs on whichever job worker claims it. If a job of this kind is still active
+        # (e.g. triggered from the admin page), this run is skipped.
+        try:
+            job = enqueue_job(kind, payload, active_key=active_key)
+        except JobConflictError as exc:
+            logger.warning("Scheduled %s job skipped: %s", kind, exc)
+            return
+        logger.info("Scheduled %s job queued: %s", kind, job.job_id)
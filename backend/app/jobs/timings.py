@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Callable, Dict, List, Optional
+
+from apscheduler.events import (
+    EVENT_JOB_ERROR,
+    EVENT_JOB_EXECUTED,
+    EVENT_JOB_MAX_INSTANCES,
+    EVENT_JOB_MISSED,
+    JobEvent,
+)
+
+from ..core.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+ERROR_MAX_LENGTH = 500
+
+
+@dataclass
+class ScheduledJobTiming:
+    job_id: str
+    runs: int = 0
+    failures: int = 0
+    missed: int = 0
+    skipped: int = 0
+    running: bool = False
+    last_status: Optional[str] = None
+    last_error: Optional[str] = None
+    last_started_at: Optional[datetime] = None
+    last_finished_at: Optional[datetime] = None
+    last_start_delay_ms: Optional[float] = None
+    last_duration_ms: Optional[float] = None
+    max_duration_ms: Optional[float] = None
+    next_run_time: Optional[datetime] = None
+
+
+class ScheduledJobTimings:
+    """
+    In-process timings of APScheduler jobs.
+
+    `track` wraps a job callable and records when it started, how long it ran and how it
+    ended. Scheduler events add how late the run started compared to its scheduled time
+    (waiting for a free executor thread shows up here) and count misfires and runs
+    skipped because the previous one was still going.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._timings: Dict[str, ScheduledJobTiming] = {}
+        self._started: Dict[str, datetime] = {}
+        self._scheduler = None
+
+    def attach(self, scheduler) -> None:
+        self._scheduler = scheduler
+        scheduler.add_listener(
+            self._on_event, EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES
+        )
+
+    def track(self, job_id: str, func: Callable[[], None]) -> Callable[[], None]:
+        with self._lock:
+            self._get(job_id)
+
+        @wraps(func)
+        def runner() -> None:
+            started = time.monotonic()
+            with self._lock:
+                timing = self._get(job_id)
+                timing.running = True
+                timing.last_started_at = datetime.now()
+                self._started[job_id] = datetime.now(timezone.utc)
+            status, error = "succeeded", None
+            try:
+                func()
+            except Exception as exc:  # pylint: disable=broad-except
+                status, error = "failed", (str(exc) or exc.__class__.__name__)[:ERROR_MAX_LENGTH]
+                raise
+            finally:
+                duration_ms = (time.monotonic() - started) * 1000
+                with self._lock:
+                    timing.running = False
+                    timing.runs += 1
+                    timing.failures += status == "failed"
+                    timing.last_status = status
+                    timing.last_error = error
+                    timing.last_finished_at = datetime.now()
+                    timing.last_duration_ms = duration_ms
+                    timing.max_duration_ms = max(timing.max_duration_ms or 0.0, duration_ms)
+                logger.info("Scheduled job %s %s in %.0f ms", job_id, status, duration_ms)
+
+        return runner
+
+    def forget(self, job_id: str) -> None:
+        with self._lock:
+            self._timings.pop(job_id, None)
+            self._started.pop(job_id, None)
+
+    def snapshot(self) -> List[ScheduledJobTiming]:
+        with self._lock:
+            timings = [replace(timing) for timing in self._timings.values()]
+        if self._scheduler is not None:
+            for timing in timings:
+                job = self._scheduler.get_job(timing.job_id)
+                timing.next_run_time = job.next_run_time if job is not None else None
+        return sorted(timings, key=lambda timing: timing.job_id)
+
+    def _on_event(self, event: JobEvent) -> None:
+        with self._lock:
+            timing = self._get(event.job_id)
+            if event.code in (EVENT_JOB_EXECUTED, EVENT_JOB_ERROR):
+                # Fired after the run finished, so `track` has already stored its start time.
+                started_at = self._started.pop(event.job_id, None)
+                if started_at is not None:
+                    delay = (started_at - event.scheduled_run_time).total_seconds() * 1000
+                    timing.last_start_delay_ms = max(delay, 0.0)
+            elif event.code == EVENT_JOB_MISSED:
+                timing.missed += 1
+            else:
+                timing.skipped += 1
+        if event.code == EVENT_JOB_MISSED:
+            logger.warning("Scheduled job %s missed its run time %s", event.job_id, event.scheduled_run_time)
+        elif event.code == EVENT_JOB_MAX_INSTANCES:
+            logger.warning("Scheduled job %s skipped: previous run still in progress", event.job_id)
+
+    def _get(self, job_id: str) -> ScheduledJobTiming:
+        timing = self._timings.get(job_id)
+        if timing is None:
+            timing = self._timings[job_id] = ScheduledJobTiming(job_id=job_id)
+        return timing
+
+
+scheduled_job_timings = ScheduledJobTimings()
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import os
+import signal
+import socket
+import threading
+import uuid
+from contextlib import nullcontext
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from ..core.logging import configure_logging, get_logger
+from ..core.query_stats import query_scope
+from ..core.settings import get_settings
+from ..services.job_queue import JobCancelled, JobContext, JobInfo, JobQueueService, job_queue
+from .handlers import JOB_KINDS, JobKind
+from .profiling import profile_run
+
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+class JobWorkerPool:
+    """
+    Threads that claim and run jobs from `background_jobs`.
+
+    One pool runs inside the API process by default (JOB_WORKER_IN_API); long ETL and
+    extraction jobs can instead be moved to dedicated processes started with
+    `python -m backend.app.jobs.worker`. Several pools can run at once: claiming uses
+    SKIP LOCKED, so each job is picked up by exactly one of them.
+    """
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        kinds: Optional[Iterable[str]] = None,
+        poll_interval_seconds: Optional[float] = None,
+        heartbeat_timeout_seconds: Optional[float] = None,
+        queue: Optional[JobQueueService] = None,
+    ) -> None:
+        self.concurrency = concurrency or settings.jobs.concurrency
+        self.kinds = list(kinds) if kinds is not None else list(JOB_KINDS)
+        self.poll_interval_seconds = (
+            poll_interval_seconds if poll_interval_seconds is not None else settings.jobs.poll_interval_seconds
+        )
+        self.heartbeat_timeout = timedelta(
+            seconds=heartbeat_timeout_seconds
+            if heartbeat_timeout_seconds is not None
+            else settings.jobs.heartbeat_timeout_seconds
+        )
+        self.queue = queue or job_queue
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._active: Dict[str, JobContext] = {}
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stopping.clear()
+        self._threads = [
+            threading.Thread(target=self._run_loop, name=f"job-worker-{index}", daemon=True)
+            for index in range(self.concurrency)
+        ]
+        self._threads.append(threading.Thread(target=self._heartbeat_loop, name="job-worker-heartbeat", daemon=True))
+        for thread in self._threads:
+            thread.start()
+        logger.info(
+            "Job worker %s started (concurrency=%d kinds=%s)", self.worker_id, self.concurrency, ",".join(self.kinds)
+        )
+
+    def stop(self) -> None:
+        """Stop claiming new jobs. Jobs still running are re-queued by heartbeat timeout if the process exits."""
+        self._stopping.set()
+        self._threads = []
+        logger.info("Job worker %s stopping (%d jobs running)", self.worker_id, len(self._active))
+
+    def _run_loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                job = self.queue.claim(self.worker_id, self.kinds)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Job worker %s failed to claim a job", self.worker_id)
+                job = None
+            if job is None:
+                self._stopping.wait(self.poll_interval_seconds)
+                continue
+            self._execute(job)
+
+    def _execute(self, job: JobInfo) -> None:
+        ctx = JobContext(self.queue, job)
+        with self._lock:
+            self._active[job.job_id] = ctx
+        try:
+            logger.info("Job %s (%s) started", job.job_id, job.kind)
+            spec = JOB_KINDS[job.kind]
+            with query_scope(f"job:{job.kind}"), self._profiled(job, spec):
+                spec.handler(ctx)
+        except JobCancelled:
+            logger.info("Job %s (%s) cancelled", job.job_id, job.kind)
+            self._record(self.queue.cancelled, job.job_id, self.worker_id)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.exception("Job %s (%s) failed", job.job_id, job.kind)
+            self._record(self.queue.fail, job.job_id, self.worker_id, str(exc) or exc.__class__.__name__)
+        else:
+            logger.info("Job %s (%s) completed", job.job_id, job.kind)
+            self._record(self.queue.complete, job.job_id, self.worker_id)
+        finally:
+            with self._lock:
+                self._active.pop(job.job_id, None)
+
+    @staticmethod
+    def _profiled(job: JobInfo, spec: JobKind):
+        """Sample this run when it was triggered with `profile: true`; other runs are untouched."""
+        if not job.payload.get("profile"):
+            return nullcontext()
+        output_path = Path(settings.jobs.profile_dir) / f"{job.kind}-{job.job_id}-{job.attempts}.collapsed"
+        return profile_run(
+            output_path,
+            interval_seconds=settings.jobs.profile_interval_ms / 1000,
+            thread_prefixes=spec.profile_threads,
+            max_seconds=settings.jobs.profile_max_seconds,
+        )
+
+    @staticmethod
+    def _record(settle, job_id: str, *args) -> None:
+        # If the outcome cannot be written the job is left running and recovered by heartbeat timeout.
+        try:
+            settle(job_id, *args)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Failed to record the outcome of job %s", job_id)
+
+    def _heartbeat_loop(self) -> None:
+        interval = max(self.heartbeat_timeout.total_seconds() / 3, 1.0)
+        while not self._stopping.wait(interval):
+            with self._lock:
+                active = dict(self._active)
+            try:
+                for job_id in self.queue.heartbeat(self.worker_id, list(active)):
+                    active[job_id].cancel_event.set()
+                self.queue.requeue_stale(self.heartbeat_timeout)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Job worker %s heartbeat failed", self.worker_id)
+
+
+def main() -> None:
+    configure_logging(settings.log_level)
+    kinds = [kind.strip() for kind in os.getenv("JOB_WORKER_KINDS", "").split(",") if kind.strip()]
+    pool = JobWorkerPool(kinds=kinds or None)
+    stopped = threading.Event()
+
+    def _handle_signal(signum, _frame) -> None:
+        logger.info("Job worker received signal %s", signum)
+        stopped.set()
+
+    signal.signal(signal.SIGTERM, _handle_signal)
+    signal.signal(signal.SIGINT, _handle_signal)
+    pool.start()
+    while not stopped.wait(1.0):
+        pass
+    pool.stop()
+
+
+if __name__ == "__main__":
+    main()
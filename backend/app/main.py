@@ -4,7 +4,7 @@ import logging
 import os
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from .api.v1.routes import router as etl_router
@@ -18,22 +18,30 @@ from .api.v1_10 import router as admin_router
 from .api.v1_12 import router as kb_taxonomy_router
 from .api.v1_14 import router as kb_taxonomy_review_router
 from .core.logging import configure_logging
+from .core.metrics import CONTENT_TYPE, HttpMetricsMiddleware, registry
+from .core.query_stats import QueryScopeMiddleware
 from .core.settings import get_settings
 from .jobs.scheduler import SchedulerManager
+from .jobs.worker import JobWorkerPool
 
 
 settings = get_settings()
 configure_logging(settings.log_level)
 logger = logging.getLogger(__name__)
 scheduler_manager = SchedulerManager()
+job_worker_pool = JobWorkerPool() if settings.jobs.run_in_api else None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     scheduler_manager.start()
+    if job_worker_pool is not None:
+        job_worker_pool.start()
     try:
         yield
     finally:
+        if job_worker_pool is not None:
+            job_worker_pool.stop()
         scheduler_manager.shutdown()
 
 
@@ -91,6 +99,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(HttpMetricsMiddleware)
+app.add_middleware(QueryScopeMiddleware)
 
 app.include_router(etl_router)
 app.include_router(faq_router)
@@ -107,3 +117,8 @@ app.include_router(kb_taxonomy_review_router)
 @app.get("/health", tags=["system"])
 def healthcheck() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@app.get("/metrics", tags=["system"], include_in_schema=False)
+def metrics() -> Response:
+    return Response(registry.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from datetime import datetime
+from enum import Enum
+
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, String, Text, func
+
+from .base import Base
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+ACTIVE_JOB_STATUSES = (JobStatus.QUEUED.value, JobStatus.RUNNING.value)
+
+
+class BackgroundJob(Base):
+    __tablename__ = "background_jobs"
+    __table_args__ = (Index("idx_background_jobs_status_run_after", "status", "run_after"),)
+
+    id = Column(String(64), primary_key=True)
+    kind = Column(String(32), nullable=False, index=True)
+    # Equals `kind` (or a narrower key such as "scenario_sync:12") while the job is
+    # queued/running and NULL afterwards; the unique index makes "one active job per key"
+    # hold across processes.
+    active_kind = Column(String(32), nullable=True, unique=True)
+    status = Column(String(20), nullable=False, default=JobStatus.QUEUED.value)
+    # MEDIUMTEXT in MySQL: review_bulk payloads carry up to 20000 ids.
+    payload = Column(Text, nullable=True, comment="JSON")
+    progress_current = Column(Integer, nullable=False, default=0)
+    progress_total = Column(Integer, nullable=True)
+    progress_message = Column(String(255), nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=1)
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    worker_id = Column(String(128), nullable=True)
+    error = Column(Text, nullable=True)
+    # Handler-defined JSON summary written with progress, e.g. totals and failed chunks of review_bulk jobs.
+    result = Column(Text, nullable=True, comment="JSON")
+    run_after = Column(DateTime, nullable=False, default=datetime.utcnow)
+    heartbeat_at = Column(DateTime, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    created_at = Column(
+        DateTime,
+        nullable=False,
+        server_default=func.now(),
+        default=datetime.utcnow,
+    )
+    updated_at = Column(
+        DateTime,
+        nullable=False,
+        server_default=func.now(),
+        default=datetime.utcnow,
+        onupdate=func.now(),
+    )
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import BigInteger, Column, DateTime, Integer, String, Text, func
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, Text, func
 
 from .base import Base
 
@@ -39,12 +39,14 @@ class PendingFAQ(Base):
 
 class KnowledgeItem(Base):
     __tablename__ = "knowledge_items"
+    __table_args__ = (Index("idx_knowledge_items_scenario_revision", "scenario_id", "revision"),)
 
     id = Column(BigInteger, primary_key=True, autoincrement=True, comment="唯一主键")
     scenario_id = Column(Integer, nullable=False, index=True, comment="所属场景ID，对应scenarios表")
     question = Column(Text, nullable=False, comment="审核通过后的标准问题")
     answer = Column(Text, nullable=False, comment="审核通过后的标准答案")
     status = Column(String(20), nullable=False, default="active", comment="状态: active, disabled")
+    revision = Column(BigInteger, nullable=False, default=0, comment="最后一次修改时场景的knowledge_revision")
     created_at = Column(
         DateTime,
         nullable=False,
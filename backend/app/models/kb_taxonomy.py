@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, SmallInteger, String, Text, func
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer, SmallInteger, String, Text, func
 
 from .base import Base
 
@@ -16,6 +16,7 @@ class KbTaxonomyNode(Base):
     name = Column(String(128), nullable=False)
     parent_id = Column(BigInteger, ForeignKey("kb_taxonomy_nodes.id"), nullable=True)
     definition = Column(Text, nullable=True, comment="Only level=3")
+    path = Column(String(255), nullable=True, index=True, comment="Materialized ancestor ids, e.g. /1/2/3/")
     created_at = Column(
         DateTime,
         nullable=False,
@@ -56,3 +57,33 @@ class KbTaxonomyCase(Base):
         onupdate=func.now(),
     )
 
+
+class KbTaxonomyScopeVersion(Base):
+    __tablename__ = "kb_taxonomy_scope_versions"
+
+    scope_code = Column(String(16), primary_key=True, comment="water|bus|bike")
+    version = Column(BigInteger, nullable=False, default=0, comment="Incremented by every transaction that writes the scope")
+    updated_at = Column(
+        DateTime,
+        nullable=False,
+        server_default=func.now(),
+        default=datetime.utcnow,
+        onupdate=func.now(),
+    )
+
+
+class KbTaxonomyImportPlan(Base):
+    __tablename__ = "kb_taxonomy_import_plans"
+
+    token = Column(String(32), primary_key=True)
+    scope_code = Column(String(16), nullable=False, comment="water|bus|bike")
+    owner_id = Column(Integer, nullable=False)
+    # LONGTEXT in MySQL: a plan holds every validated row of the upload.
+    plan = Column(Text, nullable=False, comment="JSON")
+    expires_at = Column(DateTime, nullable=False, index=True)
+    created_at = Column(
+        DateTime,
+        nullable=False,
+        server_default=func.now(),
+        default=datetime.utcnow,
+    )
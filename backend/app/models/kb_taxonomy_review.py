@@ -2,13 +2,16 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, String, Text, func
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, String, Text, func
 
 from .base import Base
 
 
 class KbTaxonomyReviewItem(Base):
     __tablename__ = "kb_taxonomy_review_items"
+    __table_args__ = (
+        Index("idx_kb_taxonomy_review_scope_status_created", "scope_code", "status", "created_at"),
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     scope_code = Column(String(16), nullable=False, index=True, comment="water|bus|bike")
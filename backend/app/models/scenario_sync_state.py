@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String, Text, func
+
+from .base import Base
+
+
+class ScenarioSyncState(Base):
+    __tablename__ = "scenario_sync_states"
+
+    scenario_id = Column(Integer, primary_key=True, autoincrement=False)
+    # Bumped in the same transaction as every knowledge_items write of the scenario; the
+    # written rows carry the new value in knowledge_items.revision.
+    knowledge_revision = Column(BigInteger, nullable=False, default=0)
+    # knowledge_revision and AICO target (sha256) as of the last successful knowledge sync.
+    synced_revision = Column(BigInteger, nullable=True)
+    synced_target = Column(String(64), nullable=True)
+    # sha256 of the AICO target plus every (id, question, answer) pushed by the last successful sync.
+    content_fingerprint = Column(String(64), nullable=True)
+    item_count = Column(Integer, nullable=False, default=0)
+    last_status = Column(String(20), nullable=True)
+    last_message = Column(Text, nullable=True)
+    last_attempt_at = Column(DateTime, nullable=True)
+    last_success_at = Column(DateTime, nullable=True)
+    updated_at = Column(
+        DateTime,
+        nullable=False,
+        server_default=func.now(),
+        default=datetime.utcnow,
+        onupdate=func.now(),
+    )
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    SmallInteger,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+)
+
+from .base import Base
+
+
+class WorkOrder(Base):
+    """Read-only source table with manually labelled work orders."""
+
+    __tablename__ = "work_order"
+
+    id = Column(BigInteger, primary_key=True)
+    group_code = Column(Integer, nullable=True, comment="1=水务, 2=公交")
+    nature = Column(String(128), nullable=True)
+    ticket_type = Column(Text, nullable=True, comment="公交: JSON 数组字符串")
+    work_order_type_details = Column(String(255), nullable=True)
+    appeal_content = Column(Text, nullable=True)
+    update_time = Column(DateTime, nullable=True)
+
+
+class WorkOrderCategoryCounter(Base):
+    __tablename__ = "work_order_category_counters"
+    __table_args__ = (
+        UniqueConstraint(
+            "scope_code",
+            "stat_month",
+            "l1_name",
+            "l2_name",
+            "l3_name",
+            name="uk_work_order_category_counters_key",
+        ),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    scope_code = Column(String(16), nullable=False, comment="water|bus|bike")
+    stat_month = Column(String(7), nullable=False, comment="YYYY-MM (update_time)")
+    l1_name = Column(String(128), nullable=False, default="", comment="Empty for bus/bike")
+    l2_name = Column(String(128), nullable=False)
+    l3_name = Column(String(128), nullable=False)
+    occurrence_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(
+        DateTime,
+        nullable=False,
+        server_default=func.now(),
+        default=datetime.utcnow,
+    )
+    updated_at = Column(
+        DateTime,
+        nullable=False,
+        server_default=func.now(),
+        default=datetime.utcnow,
+        onupdate=func.now(),
+    )
+
+
+class WorkOrderCategoryHit(Base):
+    """Which counter a work order was last counted in, so re-updated rows are not counted twice."""
+
+    __tablename__ = "work_order_category_hits"
+
+    work_order_id = Column(BigInteger, primary_key=True, autoincrement=False)
+    counter_id = Column(
+        BigInteger,
+        ForeignKey("work_order_category_counters.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    updated_at = Column(
+        DateTime,
+        nullable=False,
+        server_default=func.now(),
+        default=datetime.utcnow,
+        onupdate=func.now(),
+    )
+
+
+class WorkOrderCategorySample(Base):
+    __tablename__ = "work_order_category_samples"
+    __table_args__ = (UniqueConstraint("counter_id", "slot", name="uk_work_order_category_samples_slot"),)
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    counter_id = Column(
+        BigInteger,
+        ForeignKey("work_order_category_counters.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    slot = Column(SmallInteger, nullable=False, comment="Reservoir slot, 0..size-1")
+    work_order_id = Column(BigInteger, nullable=False)
+    appeal_content = Column(Text, nullable=False)
+    updated_at = Column(
+        DateTime,
+        nullable=False,
+        server_default=func.now(),
+        default=datetime.utcnow,
+        onupdate=func.now(),
+    )
+
+
+class WorkOrderAggregationWatermark(Base):
+    __tablename__ = "work_order_aggregation_watermarks"
+
+    stat_month = Column(String(7), primary_key=True, comment="YYYY-MM")
+    last_update_time = Column(DateTime, nullable=False)
+    last_work_order_id = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(
+        DateTime,
+        nullable=False,
+        server_default=func.now(),
+        default=datetime.utcnow,
+        onupdate=func.now(),
+    )
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -46,6 +46,17 @@ class KbTaxonomyCaseListResponse(BaseModel):
     items: List[KbTaxonomyCaseOut]
 
 
+class KbTaxonomySubtreeStats(BaseModel):
+    node_id: int = Field(..., serialization_alias="nodeId")
+    nodes_by_level: Dict[int, int] = Field(default_factory=dict, serialization_alias="nodesByLevel")
+    case_count: int = Field(..., serialization_alias="caseCount")
+
+
+class KbTaxonomySubtreeCaseListResponse(BaseModel):
+    items: List[KbTaxonomyCaseOut]
+    next_after_id: Optional[int] = Field(default=None, serialization_alias="nextAfterId")
+
+
 class KbTaxonomyTreeResponse(BaseModel):
     items: List[KbTaxonomyTreeNode]
 
@@ -104,3 +115,21 @@ class KbTaxonomyImportValidateResponse(BaseModel):
     ok: bool
     summary: Optional[KbTaxonomyImportSummary] = None
     errors: List[KbTaxonomyImportError] = Field(default_factory=list)
+    upload_token: Optional[str] = Field(default=None, serialization_alias="uploadToken")
+
+
+class KbTaxonomyImportDiffSummary(BaseModel):
+    added: int
+    removed: int
+    definition_changed: int = Field(..., serialization_alias="definitionChanged")
+    cases_changed: int = Field(..., serialization_alias="casesChanged")
+    unchanged: int
+    added_paths: List[List[str]] = Field(default_factory=list, serialization_alias="addedPaths")
+    removed_paths: List[List[str]] = Field(default_factory=list, serialization_alias="removedPaths")
+    changed_paths: List[List[str]] = Field(default_factory=list, serialization_alias="changedPaths")
+
+
+class KbTaxonomyImportPreviewResponse(BaseModel):
+    ok: bool
+    diff: Optional[KbTaxonomyImportDiffSummary] = None
+    errors: List[KbTaxonomyImportError] = Field(default_factory=list)
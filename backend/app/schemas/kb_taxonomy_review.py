@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -22,11 +22,16 @@ class KbTaxonomyReviewItemOut(BaseModel):
     scope_code: str = Field(..., serialization_alias="scopeCode")
     path: List[KbTaxonomyReviewPathSegment]
     definition: str
-    cases: List[KbTaxonomyReviewCaseOut]
+    cases: List[KbTaxonomyReviewCaseOut] = Field(default_factory=list)
 
 
 class KbTaxonomyReviewListResponse(BaseModel):
     items: List[KbTaxonomyReviewItemOut]
+    next_cursor: Optional[str] = Field(default=None, serialization_alias="nextCursor")
+
+
+class KbTaxonomyReviewCaseListResponse(BaseModel):
+    items: List[KbTaxonomyReviewCaseOut]
 
 
 class KbTaxonomyReviewAcceptRequest(BaseModel):
@@ -41,3 +46,27 @@ class KbTaxonomyReviewAcceptRequest(BaseModel):
 
 class KbTaxonomyReviewActionResponse(BaseModel):
     message: str
+
+
+class KbTaxonomyReviewBatchAcceptItem(BaseModel):
+    id: int
+    l3_name: Optional[str] = Field(default=None, alias="l3Name")
+    definition: Optional[str] = None
+    cases: Optional[List[str]] = None
+
+    class Config:
+        populate_by_name = True
+
+
+class KbTaxonomyReviewBatchAcceptRequest(BaseModel):
+    scope: str
+    items: List[KbTaxonomyReviewBatchAcceptItem]
+
+
+class KbTaxonomyReviewBatchDiscardRequest(BaseModel):
+    scope: str
+    ids: List[int]
+
+
+class KbTaxonomyReviewBatchActionResponse(BaseModel):
+    count: int
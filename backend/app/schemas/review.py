@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -67,3 +68,69 @@ class BulkDiscardPendingFaqsRequest(BaseModel):
 
 class BulkDiscardPendingFaqsResponse(BaseModel):
     discardedCount: int
+
+
+class ReviewDashboardStatsResponse(BaseModel):
+    scenario_id: int = Field(..., serialization_alias="scenarioId")
+    source_group_code: Optional[str] = Field(default=None, serialization_alias="sourceGroupCode")
+    pending_faqs: Dict[str, int] = Field(default_factory=dict, serialization_alias="pendingFaqs")
+    knowledge_items: Dict[str, int] = Field(default_factory=dict, serialization_alias="knowledgeItems")
+
+
+class PendingFaqFilterPayload(BaseModel):
+    keyword: Optional[str] = None
+    created_from: Optional[datetime] = Field(default=None, alias="createdFrom")
+    created_to: Optional[datetime] = Field(default=None, alias="createdTo")
+
+    class Config:
+        populate_by_name = True
+
+
+class StartBulkJobRequest(BaseModel):
+    action: Literal["accept", "discard"]
+    pending_faq_ids: Optional[List[int]] = Field(default=None, alias="pendingFaqIds")
+    filter: Optional[PendingFaqFilterPayload] = None
+
+    class Config:
+        populate_by_name = True
+
+
+class BulkJobChunkResponse(BaseModel):
+    index: int
+    requested: int
+    applied: int
+    skipped: int
+    error: Optional[str] = None
+
+
+class BulkJobResponse(BaseModel):
+    job_id: str = Field(..., serialization_alias="jobId")
+    action: str
+    status: str
+    total: Optional[int] = None
+    processed: int = 0
+    applied: int = 0
+    skipped: int = 0
+    failed_chunks: int = Field(default=0, serialization_alias="failedChunks")
+    chunks: List[BulkJobChunkResponse] = Field(default_factory=list)
+    error: Optional[str] = None
+    created_at: datetime = Field(..., serialization_alias="createdAt")
+    started_at: Optional[datetime] = Field(default=None, serialization_alias="startedAt")
+    finished_at: Optional[datetime] = Field(default=None, serialization_alias="finishedAt")
+
+
+class MatchingPendingFaqsRequest(BaseModel):
+    keyword: Optional[str] = None
+    created_from: Optional[datetime] = Field(default=None, alias="createdFrom")
+    created_to: Optional[datetime] = Field(default=None, alias="createdTo")
+    status: Literal["pending", "auto_rejected"] = "pending"
+    dry_run: bool = Field(default=False, alias="dryRun")
+
+    class Config:
+        populate_by_name = True
+
+
+class MatchingPendingFaqsResponse(BaseModel):
+    matched_count: int = Field(..., serialization_alias="matchedCount")
+    applied_count: int = Field(..., serialization_alias="appliedCount")
+    dry_run: bool = Field(..., serialization_alias="dryRun")
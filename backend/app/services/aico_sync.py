@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import csv
+import hashlib
 import io
 import json
 import os
+import threading
 import time
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Dict, Iterator, Optional
 
 import httpx
 from sqlalchemy import select
@@ -15,14 +18,23 @@ from sqlalchemy.orm import Session
 
 from ..core.db import TargetSessionLocal
 from ..core.logging import get_logger
+from ..core.metrics import AICO_SYNC_RUNS, AICO_SYNC_STEP_SECONDS, MetricsTransport
 from ..core.settings import get_settings
 from ..models.faq_review import KnowledgeItem
 from ..models.scenario import Scenario
+from ..models.scenario_sync_state import ScenarioSyncState
+from .knowledge_revision import changed_item_ids
+from .scenario import invalidate_cached_scenario
 
 
 logger = get_logger(__name__)
 settings = get_settings()
 
+# Syncs hold an AICO host for minutes (upload, split polling); cap how many run against one
+# host at a time from this process, whether started by the scheduler, a job or the API.
+_host_slots: Dict[str, threading.BoundedSemaphore] = {}
+_host_slots_lock = threading.Lock()
+
 
 class AicoSyncError(Exception):
     pass
@@ -50,7 +62,12 @@ class AicoSyncOrchestrator:
         # 与 upload 的 split_config.type 对齐（研发提供的示例为 3: 按行）
         return 3
 
-    def run_for_scenario(self, scenario_id: int, run_id: str) -> SyncRunResult:
+    def run_for_scenario(self, scenario_id: int, run_id: str, skip_unchanged: bool = False) -> SyncRunResult:
+        """
+        Sync the scenario's active knowledge items. With `skip_unchanged`, return "skipped" without
+        loading any items when nothing was written since the last successful sync to the same
+        AICO target (knowledge_revision == synced_revision).
+        """
         started_at = time.monotonic()
         logger.info("[run_id=%s] Sync start (scenario_id=%s)", run_id, scenario_id)
         with TargetSessionLocal() as session:
@@ -60,6 +77,32 @@ class AicoSyncOrchestrator:
             if not scenario.is_active:
                 raise AicoSyncError(f"Scenario {scenario_id} is inactive")
 
+            aico_scenario = self._select_aico_scenario(session, scenario)
+            target_key = self._target_key(aico_scenario)
+            state = session.get(ScenarioSyncState, scenario_id)
+            revision = int(state.knowledge_revision or 0) if state is not None else 0
+            if state is not None and state.synced_revision is not None and state.synced_target == target_key:
+                if skip_unchanged and state.synced_revision == revision:
+                    logger.info(
+                        "[run_id=%s] Sync skipped: no knowledge changes since revision %s (%dms)",
+                        run_id,
+                        revision,
+                        int((time.monotonic() - started_at) * 1000),
+                    )
+                    message = "No knowledge changes since the last successful sync."
+                    self._record_sync_state(scenario_id, "skipped", message)
+                    AICO_SYNC_RUNS.inc(status="skipped")
+                    return SyncRunResult(
+                        scenario_id=scenario_id, items=int(state.item_count or 0), status="skipped", message=message
+                    )
+                logger.info(
+                    "[run_id=%s] %d knowledge items changed since revision %s (now %s)",
+                    run_id,
+                    len(changed_item_ids(session, scenario_id, int(state.synced_revision))),
+                    state.synced_revision,
+                    revision,
+                )
+
             items = (
                 session.execute(
                     select(KnowledgeItem).where(
@@ -71,8 +114,6 @@ class AicoSyncOrchestrator:
                 .all()
             )
 
-            aico_scenario = self._select_aico_scenario(session, scenario)
-
             # detach from session to avoid accidental lazy-load after close
             session.expunge(scenario)
             if aico_scenario is not scenario:
@@ -88,6 +129,8 @@ class AicoSyncOrchestrator:
             allow_empty=False,
             source_label="knowledge items",
             skip_message="No active knowledge items to sync.",
+            skip_unchanged=skip_unchanged,
+            revision=revision,
         )
         return result
 
@@ -101,11 +144,21 @@ class AicoSyncOrchestrator:
         allow_empty: bool,
         source_label: str,
         skip_message: str,
+        skip_unchanged: bool = False,
+        revision: Optional[int] = None,
     ) -> SyncRunResult:
+        """
+        Push `items` to the scenario's AICO knowledge base (delete old files, upload, split, online).
+
+        With `skip_unchanged`, nothing is pushed when the items and AICO target are identical to
+        the last successful sync of this scenario (see `scenario_sync_states`). `revision` is the
+        knowledge_revision the items were read at; it is recorded as synced on success.
+        """
         started_at = time.monotonic()
         if not items and not allow_empty:
             elapsed_ms = int((time.monotonic() - started_at) * 1000)
             logger.info("[run_id=%s] Sync skipped: no items (%dms)", run_id, elapsed_ms)
+            AICO_SYNC_RUNS.inc(status="skipped")
             return SyncRunResult(
                 scenario_id=scenario.id,
                 items=0,
@@ -113,6 +166,55 @@ class AicoSyncOrchestrator:
                 message=skip_message,
             )
 
+        target_key = self._target_key(aico_scenario)
+        fingerprint = self._content_fingerprint(target_key, items)
+        if skip_unchanged and self._is_unchanged(scenario.id, fingerprint):
+            elapsed_ms = int((time.monotonic() - started_at) * 1000)
+            logger.info("[run_id=%s] Sync skipped: content unchanged since last success (%dms)", run_id, elapsed_ms)
+            message = "No changes since the last successful sync."
+            self._record_sync_state(scenario.id, "skipped", message, revision=revision, target_key=target_key)
+            AICO_SYNC_RUNS.inc(status="skipped")
+            return SyncRunResult(scenario_id=scenario.id, items=len(items), status="skipped", message=message)
+
+        with self._host_slot(run_id):
+            try:
+                result = self._push_items(
+                    scenario=scenario,
+                    aico_scenario=aico_scenario,
+                    items=items,
+                    run_id=run_id,
+                    source_label=source_label,
+                    skip_message=skip_message,
+                )
+            except Exception as exc:
+                # The old AICO files may already be deleted: forget the last success so the next
+                # skip_unchanged run pushes again instead of trusting a partial knowledge base.
+                self._record_sync_state(scenario.id, "failed", str(exc) or exc.__class__.__name__, invalidate=True)
+                AICO_SYNC_RUNS.inc(status="failed")
+                raise
+        AICO_SYNC_RUNS.inc(status=result.status)
+        self._record_sync_state(
+            scenario.id,
+            result.status,
+            result.message,
+            fingerprint=fingerprint,
+            item_count=result.items,
+            revision=revision,
+            target_key=target_key,
+        )
+        return result
+
+    def _push_items(
+        self,
+        *,
+        scenario: Scenario,
+        aico_scenario: Scenario,
+        items: list[object],
+        run_id: str,
+        source_label: str,
+        skip_message: str,
+    ) -> SyncRunResult:
+        started_at = time.monotonic()
         logger.info(
             "[run_id=%s] Loaded %d %s (scenario_code=%s)",
             run_id,
@@ -136,15 +238,18 @@ class AicoSyncOrchestrator:
                 scenario.scenario_code,
             )
 
+        step_started = time.monotonic()
         token, aico_scenario = self._ensure_token_and_cache(aico_scenario, run_id)
         pid, aico_scenario = self._ensure_pid_and_cache(aico_scenario, token, run_id)
         kb_id, aico_scenario = self._ensure_kb_id_and_cache(aico_scenario, token, pid, run_id)
+        AICO_SYNC_STEP_SECONDS.observe(time.monotonic() - step_started, step="resolve_context")
         logger.info("[run_id=%s] Resolved AICO context: pid=%s kb_id=%s", run_id, pid, kb_id)
 
         # V1.11: 上传前先清理旧文件（先删后增）
         step_started = time.monotonic()
         logger.info("[run_id=%s] Step: cleanup old files ...", run_id)
         self._cleanup_old_files(token, pid, kb_id, scenario.scenario_code, aico_scenario.aico_user_id, run_id)
+        AICO_SYNC_STEP_SECONDS.observe(time.monotonic() - step_started, step="cleanup")
         logger.info(
             "[run_id=%s] Step: cleanup old files done (%dms)",
             run_id,
@@ -171,6 +276,7 @@ class AicoSyncOrchestrator:
         step_started = time.monotonic()
         logger.info("[run_id=%s] Step: upload file ...", run_id)
         _file_id = self._upload_file(token, pid, kb_id, file_name, file_bytes, run_id)
+        AICO_SYNC_STEP_SECONDS.observe(time.monotonic() - step_started, step="upload")
         logger.info(
             "[run_id=%s] Step: upload file done (file_id=%s, %dms)",
             run_id,
@@ -181,6 +287,7 @@ class AicoSyncOrchestrator:
         step_started = time.monotonic()
         logger.info("[run_id=%s] Step: wait split complete ...", run_id)
         self._wait_for_split_complete(token, pid, kb_id, file_name, run_id)
+        AICO_SYNC_STEP_SECONDS.observe(time.monotonic() - step_started, step="split")
         logger.info(
             "[run_id=%s] Step: wait split complete done (%dms)",
             run_id,
@@ -190,6 +297,7 @@ class AicoSyncOrchestrator:
         step_started = time.monotonic()
         logger.info("[run_id=%s] Step: online all ...", run_id)
         self._online_all(token, pid, kb_id, run_id)
+        AICO_SYNC_STEP_SECONDS.observe(time.monotonic() - step_started, step="online")
         logger.info(
             "[run_id=%s] Step: online all done (%dms)",
             run_id,
@@ -205,6 +313,81 @@ class AicoSyncOrchestrator:
             message=f"Synced {len(items)} items to AICO.",
         )
 
+    def _target_key(self, aico_scenario: Scenario) -> str:
+        target = (
+            str(self.aico_settings.host or ""),
+            str(aico_scenario.id),
+            aico_scenario.aico_project_name or "",
+            aico_scenario.aico_kb_name or "",
+        )
+        return hashlib.sha256("\x1f".join(target).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _content_fingerprint(target_key: str, items: list[object]) -> str:
+        digest = hashlib.sha256(target_key.encode("ascii"))
+        for item in sorted(items, key=lambda item: item.id):
+            digest.update(f"\x1e{item.id}\x1f{item.question or ''}\x1f{item.answer or ''}".encode("utf-8"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def _is_unchanged(scenario_id: int, fingerprint: str) -> bool:
+        with TargetSessionLocal() as session:
+            state = session.get(ScenarioSyncState, scenario_id)
+            return state is not None and state.content_fingerprint == fingerprint
+
+    @staticmethod
+    def _record_sync_state(
+        scenario_id: int,
+        status: str,
+        message: str,
+        *,
+        fingerprint: Optional[str] = None,
+        item_count: Optional[int] = None,
+        revision: Optional[int] = None,
+        target_key: Optional[str] = None,
+        invalidate: bool = False,
+    ) -> None:
+        now = datetime.utcnow()
+        try:
+            with TargetSessionLocal() as session:
+                with session.begin():
+                    state = session.get(ScenarioSyncState, scenario_id, with_for_update=True)
+                    if state is None:
+                        state = ScenarioSyncState(scenario_id=scenario_id, item_count=0)
+                        session.add(state)
+                    state.last_status = status
+                    state.last_message = message
+                    state.last_attempt_at = now
+                    if fingerprint is not None:
+                        state.content_fingerprint = fingerprint
+                        state.item_count = item_count or 0
+                        state.last_success_at = now
+                    if revision is not None:
+                        state.synced_revision = revision
+                        state.synced_target = target_key
+                    if invalidate:
+                        state.content_fingerprint = None
+                        state.synced_revision = None
+                        state.synced_target = None
+        except Exception:  # pylint: disable=broad-except
+            # Bookkeeping only: a missing state row just means the next run pushes again.
+            logger.exception("Failed to record sync state (scenario_id=%s)", scenario_id)
+
+    @contextmanager
+    def _host_slot(self, run_id: str) -> Iterator[None]:
+        host = str(self.aico_settings.host or "")
+        with _host_slots_lock:
+            slot = _host_slots.get(host)
+            if slot is None:
+                slot = _host_slots[host] = threading.BoundedSemaphore(self.aico_settings.sync_max_per_host)
+        if not slot.acquire(blocking=False):
+            logger.info("[run_id=%s] Waiting for a free AICO sync slot (host=%s)", run_id, host)
+            slot.acquire()
+        try:
+            yield
+        finally:
+            slot.release()
+
     def _select_aico_scenario(self, session: Session, scenario: Scenario) -> Scenario:
         # Keep knowledge items bound to the user's scenario_id, but allow AICO config
         # switching based on current AICO_HOST. Since scenario_code is unique, the common
@@ -286,7 +469,7 @@ class AicoSyncOrchestrator:
         timeout = httpx.Timeout(self.aico_settings.timeout_seconds)
         # trust_env=False 避免受本机 HTTP(S)_PROXY / ALL_PROXY 等环境变量影响，
         # 从而不再要求 socksio 依赖。
-        return httpx.Client(timeout=timeout, trust_env=False)
+        return httpx.Client(timeout=timeout, trust_env=False, transport=MetricsTransport())
 
     def _ensure_token_and_cache(self, scenario: Scenario, run_id: str) -> tuple[str, Scenario]:
         # 使用“无时区”的 UTC 时间，避免和数据库取出的 naive datetime 相减时报错
@@ -335,6 +518,7 @@ class AicoSyncOrchestrator:
                     session.commit()
                     session.refresh(db_scenario)
                     scenario = db_scenario
+            invalidate_cached_scenario(scenario.id)
 
         return token, scenario
 
@@ -373,6 +557,7 @@ class AicoSyncOrchestrator:
                     session.commit()
                     session.refresh(db_scenario)
                     scenario = db_scenario
+            invalidate_cached_scenario(scenario.id)
 
         return pid, scenario
 
@@ -408,6 +593,7 @@ class AicoSyncOrchestrator:
                     session.commit()
                     session.refresh(db_scenario)
                     scenario = db_scenario
+            invalidate_cached_scenario(scenario.id)
 
         return kb_id, scenario
 
@@ -6,7 +6,7 @@ from sqlalchemy import select
 
 from ..core.db import TargetSessionLocal
 from ..core.logging import get_logger
-from ..core.security import create_access_token, verify_password
+from ..core.security import cache_user, create_access_token, verify_password
 from ..models.scenario import Scenario
 from ..models.user import User
 from .review import NotFoundError
@@ -37,6 +37,8 @@ class AuthService:
             # detach from session
             session.expunge(user)
 
+        # Refresh the auth cache so a fresh login always sees the latest user row.
+        cache_user(user)
         return user
 
     def get_scenario(self, scenario_id: int) -> Scenario:
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import uuid
 from dataclasses import dataclass
-from typing import List
+from typing import Iterable, List, Optional
 
 from sqlalchemy import select
 from sqlalchemy.orm import object_session
@@ -30,8 +30,8 @@ class CompareKbSyncService:
     def __init__(self) -> None:
         self.orchestrator = AicoSyncOrchestrator()
 
-    def run(self) -> List[SyncRunResult]:
-        tasks = self._collect_tasks()
+    def run(self, scenario_ids: Optional[Iterable[int]] = None, skip_unchanged: bool = False) -> List[SyncRunResult]:
+        tasks = self._collect_tasks(scenario_ids)
         results: list[SyncRunResult] = []
         for task in tasks:
             run_id = f"compare-{task.scenario.id}-{uuid.uuid4().hex[:8]}"
@@ -44,6 +44,7 @@ class CompareKbSyncService:
                     allow_empty=True,
                     source_label="pending FAQs",
                     skip_message="No pending FAQs to sync.",
+                    skip_unchanged=skip_unchanged,
                 )
                 results.append(result)
             except AicoSyncError as exc:
@@ -64,18 +65,17 @@ class CompareKbSyncService:
 
         return results
 
-    def _collect_tasks(self) -> list[CompareSyncTask]:
+    def _collect_tasks(self, scenario_ids: Optional[Iterable[int]] = None) -> list[CompareSyncTask]:
         tasks: list[CompareSyncTask] = []
         with TargetSessionLocal() as session:
             def _safe_expunge(obj: object) -> None:
                 if object_session(obj) is session:
                     session.expunge(obj)
 
-            scenarios = (
-                session.execute(select(Scenario).where(Scenario.is_active.is_(True)))
-                .scalars()
-                .all()
-            )
+            stmt = select(Scenario).where(Scenario.is_active.is_(True))
+            if scenario_ids is not None:
+                stmt = stmt.where(Scenario.id.in_(list(scenario_ids)))
+            scenarios = session.execute(stmt).scalars().all()
             for scenario in scenarios:
                 code = (scenario.scenario_code or "").strip()
                 if not code or not code.endswith(COMPARE_SUFFIXES):
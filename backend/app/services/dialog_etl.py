@@ -3,7 +3,8 @@ from __future__ import annotations
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import date, datetime, time, timedelta
-from typing import List, Optional, Sequence, Tuple
+from time import perf_counter
+from typing import Callable, List, Optional, Sequence, Tuple
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from sqlalchemy import and_, select
@@ -11,13 +12,18 @@ from sqlalchemy.exc import IntegrityError
 
 from ..core.db import SourceSessionLocal, TargetSessionLocal
 from ..core.logging import get_logger
+from ..core.metrics import ETL_CONVERSATIONS, ETL_DIALOG_ROWS_READ, ETL_GROUP_SECONDS
+from ..core.query_stats import query_scope
 from ..core.settings import get_settings
 from ..models.dialog import ConversationStatus, PeopleCustomerDialog, PreparedConversation
+from .extraction_pipeline import extraction_pipeline
 
 
 logger = get_logger(__name__)
 settings = get_settings()
 
+ETL_THREAD_PREFIX = "etl-group"
+
 
 @dataclass
 class GroupProcessingResult:
@@ -37,9 +43,18 @@ class ETLRunResult:
 
 
 class DialogETLService:
-    def __init__(self, max_workers: Optional[int] = None, timezone: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        timezone: Optional[str] = None,
+        on_inserted: Optional[Callable[[List[int]], object]] = None,
+    ) -> None:
         self.max_workers = max_workers or settings.scheduler.max_workers
         self.timezone = timezone or settings.scheduler.timezone
+        # Called with the ids of each group's newly committed conversations.
+        if on_inserted is None and settings.scheduler.pipeline_enabled:
+            on_inserted = extraction_pipeline.submit
+        self.on_inserted = on_inserted
 
     def run_for_date(self, target_date: date) -> ETLRunResult:
         start_dt, end_dt = self._compute_date_range(target_date)
@@ -49,9 +64,9 @@ class DialogETLService:
             return ETLRunResult(target_date, 0, 0, 0, 0)
 
         results: List[GroupProcessingResult] = []
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=ETL_THREAD_PREFIX) as executor:
             future_map = {
-                executor.submit(self._process_group_code, code, start_dt, end_dt): code for code in group_codes
+                executor.submit(self._process_group_code_scoped, code, start_dt, end_dt): code for code in group_codes
             }
             for future in as_completed(future_map):
                 code = future_map[future]
@@ -111,7 +126,13 @@ class DialogETLService:
             result = session.execute(stmt)
             return [row[0] for row in result]
 
+    def _process_group_code_scoped(self, group_code: str, start: datetime, end: datetime) -> GroupProcessingResult:
+        # Worker threads do not inherit the job's query scope; give each group its own.
+        with query_scope(f"etl:{group_code}"):
+            return self._process_group_code(group_code, start, end)
+
     def _process_group_code(self, group_code: str, start: datetime, end: datetime) -> GroupProcessingResult:
+        started = perf_counter()
         stmt = (
             select(PeopleCustomerDialog)
             .where(
@@ -129,11 +150,14 @@ class DialogETLService:
         )
         with SourceSessionLocal() as source_session:
             dialogs: Sequence[PeopleCustomerDialog] = source_session.execute(stmt).scalars().all()
+        ETL_DIALOG_ROWS_READ.inc(len(dialogs), group_code=group_code)
 
         inserted = 0
         skipped = 0
         conversations_total = 0
 
+        new_conversations: List[PreparedConversation] = []
+
         with TargetSessionLocal() as target_session:
             buffer: list[PeopleCustomerDialog] = []
             current_call_id: Optional[str] = None
@@ -158,6 +182,7 @@ class DialogETLService:
                     conversation_time=conversation_time,
                 )
                 target_session.add(conversation)
+                new_conversations.append(conversation)
                 inserted += 1
 
             for dialog in dialogs:
@@ -175,6 +200,16 @@ class DialogETLService:
                 target_session.rollback()
                 raise
 
+        if self.on_inserted is not None and new_conversations:
+            try:
+                self.on_inserted([int(conversation.id) for conversation in new_conversations])
+            except Exception:  # pylint: disable=broad-except
+                # The rows are committed; the FAQ sweep picks them up if the hand-off fails.
+                logger.exception("Failed to publish new conversations for group %s", group_code)
+
+        ETL_CONVERSATIONS.inc(inserted, group_code=group_code, outcome="inserted")
+        ETL_CONVERSATIONS.inc(skipped, group_code=group_code, outcome="skipped")
+        ETL_GROUP_SECONDS.observe(perf_counter() - started, group_code=group_code)
         return GroupProcessingResult(group_code, conversations_total, inserted, skipped)
 
     @staticmethod
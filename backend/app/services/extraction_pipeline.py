@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from ..core.logging import get_logger
+from ..core.settings import get_settings
+from .faq_extraction import FAQExtractionService
+from .job_queue import JobConflictError, JobInfo
+
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+EnqueueJob = Callable[[str, Dict[str, Any]], JobInfo]
+
+
+def _enqueue_job(kind: str, payload: Dict[str, Any]) -> JobInfo:
+    # Imported on use: jobs.handlers imports the ETL service, which imports this module.
+    from ..jobs.handlers import enqueue_job
+
+    return enqueue_job(kind, payload)
+
+
+@dataclass
+class PipelineStats:
+    running: bool
+    queued: int
+    in_flight: int
+    processed: int
+    faqs_created: int
+    compare_syncs: int
+
+
+class ExtractionPipeline:
+    """
+    In-process hand-off from the ETL to FAQ extraction.
+
+    `submit` queues prepared_conversations ids (duplicates of ids still queued or being
+    processed are dropped) and a fixed pool of daemon workers extracts them as they arrive.
+    Once the queue has been idle for `sync_delay_seconds` after creating FAQs, one
+    compare_kb_sync job is queued for everything extracted since the previous one, so the
+    sync runs on a job worker like every other compare sync. If one is already active the
+    pipeline tries again after the next delay rather than relying on a sync that may have
+    started before these FAQs were written.
+
+    The queue is not persisted: ids lost on restart stay `unprocessed` and are picked up by
+    the FAQ cron sweep.
+    """
+
+    def __init__(
+        self,
+        faq_service: Optional[FAQExtractionService] = None,
+        enqueue_job: Optional[EnqueueJob] = None,
+        workers: Optional[int] = None,
+        sync_delay_seconds: Optional[float] = None,
+    ) -> None:
+        self.faq_service = faq_service or FAQExtractionService()
+        self.enqueue_job = enqueue_job or _enqueue_job
+        self.workers = workers or settings.scheduler.faq_max_workers
+        self.sync_delay_seconds = (
+            sync_delay_seconds if sync_delay_seconds is not None else settings.scheduler.pipeline_sync_delay_seconds
+        )
+        self._queue: "queue.Queue[Optional[int]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending: Set[int] = set()
+        self._threads: List[threading.Thread] = []
+        self._stopping = threading.Event()
+        self._sync_requested = threading.Event()
+        self._processed = 0
+        self._faqs_created = 0
+        self._created_since_sync = 0
+        self._compare_syncs = 0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            self._stopping.clear()
+            self._threads = [
+                threading.Thread(target=self._work, name=f"extraction-pipeline-{index}", daemon=True)
+                for index in range(self.workers)
+            ]
+            self._threads.append(threading.Thread(target=self._sync_loop, name="extraction-pipeline-sync", daemon=True))
+            threads = list(self._threads)
+        for thread in threads:
+            thread.start()
+        logger.info("Extraction pipeline started with %d workers", self.workers)
+
+    def stop(self) -> None:
+        with self._lock:
+            threads, self._threads = self._threads, []
+        if not threads:
+            return
+        self._stopping.set()
+        self._sync_requested.set()
+        for _ in range(self.workers):
+            self._queue.put(None)
+        logger.info("Extraction pipeline stopping (%d ids left queued)", len(self._pending))
+
+    def submit(self, conversation_ids: Iterable[int]) -> int:
+        self.start()
+        accepted = 0
+        with self._lock:
+            for conv_id in conversation_ids:
+                conv_id = int(conv_id)
+                if conv_id in self._pending:
+                    continue
+                self._pending.add(conv_id)
+                self._queue.put(conv_id)
+                accepted += 1
+        if accepted:
+            logger.info("Extraction pipeline accepted %d conversations", accepted)
+        return accepted
+
+    def stats(self) -> PipelineStats:
+        with self._lock:
+            return PipelineStats(
+                running=bool(self._threads),
+                queued=self._queue.qsize(),
+                in_flight=len(self._pending),
+                processed=self._processed,
+                faqs_created=self._faqs_created,
+                compare_syncs=self._compare_syncs,
+            )
+
+    def _work(self) -> None:
+        while True:
+            conv_id = self._queue.get()
+            if conv_id is None:
+                return
+            created = False
+            try:
+                created = self.faq_service.process_conversation(conv_id)
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.exception("Pipeline FAQ extraction failed for conversation %s: %s", conv_id, exc)
+            finally:
+                with self._lock:
+                    self._pending.discard(conv_id)
+                    self._processed += 1
+                    if created:
+                        self._faqs_created += 1
+                        self._created_since_sync += 1
+                    idle = not self._pending
+                    should_sync = idle and self._created_since_sync > 0
+                if should_sync:
+                    self._sync_requested.set()
+
+    def _sync_loop(self) -> None:
+        while not self._stopping.is_set():
+            self._sync_requested.wait()
+            self._sync_requested.clear()
+            if self._stopping.wait(self.sync_delay_seconds):
+                return
+            with self._lock:
+                if self._pending or self._created_since_sync == 0:
+                    # More work arrived; the worker that drains it requests the sync again.
+                    continue
+                created, self._created_since_sync = self._created_since_sync, 0
+            logger.info("Extraction pipeline idle after %d new FAQs; queueing compare KB sync", created)
+            try:
+                job = self.enqueue_job("compare_kb_sync", {"skip_unchanged": True})
+            except JobConflictError as exc:
+                logger.info("Pipeline compare KB sync deferred: %s", exc)
+                self._retry_sync(created)
+                continue
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.exception("Pipeline compare KB sync could not be queued: %s", exc)
+                self._retry_sync(created)
+                continue
+            logger.info("Pipeline compare KB sync queued: %s", job.job_id)
+            with self._lock:
+                self._compare_syncs += 1
+
+    def _retry_sync(self, created: int) -> None:
+        with self._lock:
+            self._created_since_sync += created
+        self._sync_requested.set()
+
+
+extraction_pipeline = ExtractionPipeline()
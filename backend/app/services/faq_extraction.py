@@ -14,14 +14,18 @@ from sqlalchemy import and_, select
 
 from ..core.db import TargetSessionLocal
 from ..core.logging import get_logger
+from ..core.metrics import FAQ_EXTRACTION_CONVERSATIONS, FAQ_EXTRACTION_SECONDS, MetricsTransport
 from ..core.settings import get_settings
 from ..models.dialog import ConversationStatus, PreparedConversation
 from ..models.faq_review import PendingFAQ
+from .status_counters import status_counters
 
 
 logger = get_logger(__name__)
 settings = get_settings()
 
+EXTRACTION_THREAD_PREFIX = "faq-extraction"
+
 
 @dataclass
 class FAQExtractionResult:
@@ -37,7 +41,7 @@ class FAQExtractionService:
         self.auto_review_retry_delay_seconds = 5
 
     def run(self, target_date: Optional[date] = None, limit: Optional[int] = None) -> FAQExtractionResult:
-        ids = self._fetch_unprocessed_ids(target_date)
+        ids = self.fetch_unprocessed_ids(target_date)
 
         if limit is not None:
             ids = ids[:limit]
@@ -59,7 +63,7 @@ class FAQExtractionService:
         end = start + timedelta(days=1)
         return start, end
 
-    def _fetch_unprocessed_ids(self, target_date: Optional[date]) -> list[int]:
+    def fetch_unprocessed_ids(self, target_date: Optional[date] = None) -> list[int]:
         stmt = select(PreparedConversation.id).where(
             PreparedConversation.status == ConversationStatus.UNPROCESSED.value,
         )
@@ -78,8 +82,8 @@ class FAQExtractionService:
 
     def _process_batch(self, ids: list[int]) -> int:
         created = 0
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_map = {executor.submit(self._process_single, conv_id): conv_id for conv_id in ids}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=EXTRACTION_THREAD_PREFIX) as executor:
+            future_map = {executor.submit(self.process_conversation, conv_id): conv_id for conv_id in ids}
             for future in as_completed(future_map):
                 conv_id = future_map[future]
                 try:
@@ -91,13 +95,26 @@ class FAQExtractionService:
                     created += 1
         return created
 
-    def _process_single(self, conv_id: int) -> bool:
+    def process_conversation(self, conv_id: int) -> bool:
+        started = time.perf_counter()
+        try:
+            created, final_status = self._process_conversation(conv_id)
+        except Exception:
+            FAQ_EXTRACTION_CONVERSATIONS.inc(status="error")
+            raise
+        if final_status is not None:
+            FAQ_EXTRACTION_CONVERSATIONS.inc(status=final_status)
+            FAQ_EXTRACTION_SECONDS.observe(time.perf_counter() - started)
+        return created
+
+    def _process_conversation(self, conv_id: int) -> Tuple[bool, Optional[str]]:
+        """Returns whether a pending FAQ was created and the conversation's final status (None if not claimed)."""
         with TargetSessionLocal() as session:
             conv = session.get(PreparedConversation, conv_id)
             if conv is None:
-                return False
+                return False, None
             if conv.status != ConversationStatus.UNPROCESSED.value:
-                return False
+                return False, None
 
             conv.status = ConversationStatus.PROCESSING.value
             session.commit()
@@ -107,7 +124,7 @@ class FAQExtractionService:
             if not full_text:
                 conv.status = ConversationStatus.PROCESSED_NO_FAQ.value
                 session.commit()
-                return False
+                return False, ConversationStatus.PROCESSED_NO_FAQ.value
 
             try:
                 reply_text = self._call_aico(full_text)
@@ -115,19 +132,19 @@ class FAQExtractionService:
                 logger.exception("AICO call failed for conversation %s: %s", conv.call_id, exc)
                 conv.status = ConversationStatus.FAILED.value
                 session.commit()
-                return False
+                return False, ConversationStatus.FAILED.value
 
             parsed = reply_text.strip()
             if parsed == "否":
                 conv.status = ConversationStatus.PROCESSED_NO_FAQ.value
                 session.commit()
-                return False
+                return False, ConversationStatus.PROCESSED_NO_FAQ.value
 
             question, answer = self._parse_question_answer(parsed)
             if not question or not answer:
                 conv.status = ConversationStatus.PROCESSED_NO_FAQ.value
                 session.commit()
-                return False
+                return False, ConversationStatus.PROCESSED_NO_FAQ.value
 
             pending_status = self._determine_pending_status(question, answer, conv.call_id)
             faq = PendingFAQ(
@@ -141,9 +158,11 @@ class FAQExtractionService:
             session.add(faq)
             conv.status = ConversationStatus.COMPLETED.value
             session.commit()
+            group_code = conv.group_code
 
+        status_counters.apply_pending(group_code, None, pending_status)
         logger.info("Created pending FAQ from conversation %s", conv_id)
-        return True
+        return True, ConversationStatus.COMPLETED.value
 
     def _determine_pending_status(self, question: str, answer: str, call_id: str) -> str:
         try:
@@ -303,13 +322,22 @@ class FAQExtractionService:
             "Authorization": f"Bearer {settings.aico.chatbot_api_key}",
         }
         payload = {"query": full_text, "stream": False}
+        # Run URLs embed the app id, so label metrics by role instead of path.
+        if target_url == settings.aico.auto_review_url:
+            endpoint = "chatbot:auto_review"
+        elif target_url == settings.aico.compare_review_url:
+            endpoint = "chatbot:compare_review"
+        else:
+            endpoint = "chatbot:extraction"
 
         timeout = httpx.Timeout(settings.aico.timeout_seconds)
 
         # trust_env=False 避免受本机 HTTP(S)_PROXY / ALL_PROXY 等环境变量影响，
         # 从而不再要求 socksio 依赖。
-        with httpx.Client(timeout=timeout, trust_env=False) as client:
-            response = client.post(target_url, headers=headers, json=payload)
+        with httpx.Client(timeout=timeout, trust_env=False, transport=MetricsTransport()) as client:
+            response = client.post(
+                target_url, headers=headers, json=payload, extensions={"metrics_endpoint": endpoint}
+            )
             response.raise_for_status()
             data = response.json()
 
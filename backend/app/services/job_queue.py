@@ -0,0 +1,368 @@
+from __future__ import annotations
+
+import json
+import threading
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+
+from ..core.db import TargetSessionLocal
+from ..core.logging import get_logger
+from ..models.background_job import BackgroundJob, JobStatus
+
+
+logger = get_logger(__name__)
+
+RETRY_BACKOFF = timedelta(seconds=30)
+PROGRESS_MESSAGE_MAX_LENGTH = 255
+
+
+class JobConflictError(Exception):
+    def __init__(self, running: "JobInfo") -> None:
+        super().__init__(
+            f"{running.kind} job already running: jobId={running.job_id} "
+            f"startedAt={(running.started_at or running.created_at).isoformat()}"
+        )
+        self.running = running
+
+
+class JobNotFoundError(Exception):
+    pass
+
+
+class JobCancelled(Exception):
+    """Raised inside a handler when cancellation of its job was requested."""
+
+
+@dataclass(frozen=True)
+class JobInfo:
+    job_id: str
+    kind: str
+    status: str
+    payload: Dict[str, Any]
+    progress_current: int
+    progress_total: Optional[int]
+    progress_message: Optional[str]
+    attempts: int
+    max_attempts: int
+    cancel_requested: bool
+    worker_id: Optional[str]
+    error: Optional[str]
+    result: Dict[str, Any]
+    heartbeat_at: Optional[datetime]
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    created_at: datetime
+
+    @classmethod
+    def from_model(cls, job: BackgroundJob) -> "JobInfo":
+        return cls(
+            job_id=job.id,
+            kind=job.kind,
+            status=job.status,
+            payload=json.loads(job.payload) if job.payload else {},
+            progress_current=int(job.progress_current or 0),
+            progress_total=job.progress_total,
+            progress_message=job.progress_message,
+            attempts=int(job.attempts or 0),
+            max_attempts=int(job.max_attempts or 1),
+            cancel_requested=bool(job.cancel_requested),
+            worker_id=job.worker_id,
+            error=job.error,
+            result=json.loads(job.result) if job.result else {},
+            heartbeat_at=job.heartbeat_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+            created_at=job.created_at,
+        )
+
+
+class JobContext:
+    """Handed to job handlers for progress reporting and cooperative cancellation."""
+
+    def __init__(self, queue: "JobQueueService", job: JobInfo) -> None:
+        self.queue = queue
+        self.job_id = job.job_id
+        self.worker_id = job.worker_id
+        self.kind = job.kind
+        self.payload = job.payload
+        self.attempt = job.attempts
+        self.cancel_event = threading.Event()
+
+    def progress(
+        self,
+        current: int,
+        total: Optional[int] = None,
+        message: Optional[str] = None,
+        result: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.check_cancelled()
+        if self.queue.report_progress(self.job_id, self.worker_id, current, total, message, result=result):
+            self.cancel_event.set()
+            self.check_cancelled()
+
+    def check_cancelled(self) -> None:
+        if self.cancel_event.is_set():
+            raise JobCancelled(self.job_id)
+
+
+class JobQueueService:
+    """
+    Jobs persisted in `background_jobs` so every API/worker process sees the same state.
+
+    Workers claim queued jobs with SELECT ... FOR UPDATE SKIP LOCKED, keep `heartbeat_at`
+    fresh while running and record the outcome. Running jobs whose heartbeat is older than
+    the timeout (worker crashed or restarted) are re-queued until `max_attempts` is used up.
+    """
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: Optional[Dict[str, Any]] = None,
+        *,
+        max_attempts: int = 1,
+        job_id: Optional[str] = None,
+        active_key: Optional[str] = None,
+    ) -> JobInfo:
+        """
+        Queue a job. Only one job per `active_key` (default: the kind) can be queued or
+        running at a time; a second enqueue raises JobConflictError.
+        """
+        active_key = active_key or kind
+        job = BackgroundJob(
+            id=job_id or f"{kind}-{uuid.uuid4().hex}",
+            kind=kind,
+            active_kind=active_key,
+            status=JobStatus.QUEUED.value,
+            payload=json.dumps(payload or {}, ensure_ascii=False, default=str),
+            max_attempts=max(1, max_attempts),
+            run_after=datetime.utcnow(),
+        )
+        try:
+            with TargetSessionLocal() as session:
+                with session.begin():
+                    session.add(job)
+        except IntegrityError:
+            running = self.get_active(active_key)
+            if running is None:
+                raise
+            raise JobConflictError(running) from None
+        logger.info("Job %s queued (kind=%s)", job.id, kind)
+        return JobInfo.from_model(job)
+
+    def get(self, job_id: str) -> JobInfo:
+        with TargetSessionLocal() as session:
+            job = session.get(BackgroundJob, job_id)
+            if job is None:
+                raise JobNotFoundError(f"任务不存在: {job_id}")
+            return JobInfo.from_model(job)
+
+    def get_active(self, active_key: str) -> Optional[JobInfo]:
+        with TargetSessionLocal() as session:
+            job = session.execute(
+                select(BackgroundJob).where(BackgroundJob.active_kind == active_key)
+            ).scalar_one_or_none()
+            return JobInfo.from_model(job) if job is not None else None
+
+    def request_cancel(self, job_id: str) -> JobInfo:
+        """Queued jobs are cancelled at once; running ones stop at their next progress check."""
+        now = datetime.utcnow()
+        with TargetSessionLocal() as session:
+            with session.begin():
+                job = session.get(BackgroundJob, job_id, with_for_update=True)
+                if job is None:
+                    raise JobNotFoundError(f"任务不存在: {job_id}")
+                if job.status == JobStatus.QUEUED.value:
+                    self._finish(job, JobStatus.CANCELLED, now)
+                elif job.status == JobStatus.RUNNING.value:
+                    job.cancel_requested = True
+                info = JobInfo.from_model(job)
+        logger.info("Cancel requested for job %s (status=%s)", job_id, info.status)
+        return info
+
+    def claim(self, worker_id: str, kinds: Iterable[str]) -> Optional[JobInfo]:
+        kinds = list(kinds)
+        if not kinds:
+            return None
+        now = datetime.utcnow()
+        with TargetSessionLocal() as session:
+            with session.begin():
+                job = session.execute(
+                    select(BackgroundJob)
+                    .where(
+                        BackgroundJob.status == JobStatus.QUEUED.value,
+                        BackgroundJob.run_after <= now,
+                        BackgroundJob.kind.in_(kinds),
+                    )
+                    .order_by(BackgroundJob.run_after, BackgroundJob.created_at)
+                    .limit(1)
+                    .with_for_update(skip_locked=True)
+                ).scalar_one_or_none()
+                if job is None:
+                    return None
+                job.status = JobStatus.RUNNING.value
+                job.worker_id = worker_id
+                job.attempts = int(job.attempts or 0) + 1
+                job.heartbeat_at = now
+                job.started_at = job.started_at or now
+                job.error = None
+                info = JobInfo.from_model(job)
+        logger.info("Job %s claimed by %s (attempt %d/%d)", info.job_id, worker_id, info.attempts, info.max_attempts)
+        return info
+
+    def heartbeat(self, worker_id: str, job_ids: List[str]) -> List[str]:
+        """Refresh the heartbeat of jobs held by `worker_id`; returns those asked to cancel."""
+        if not job_ids:
+            return []
+        with TargetSessionLocal() as session:
+            with session.begin():
+                session.execute(
+                    update(BackgroundJob)
+                    .where(
+                        BackgroundJob.id.in_(job_ids),
+                        BackgroundJob.worker_id == worker_id,
+                        BackgroundJob.status == JobStatus.RUNNING.value,
+                    )
+                    .values(heartbeat_at=datetime.utcnow())
+                    .execution_options(synchronize_session=False)
+                )
+                rows = session.execute(
+                    select(BackgroundJob.id).where(
+                        BackgroundJob.id.in_(job_ids),
+                        BackgroundJob.cancel_requested.is_(True),
+                    )
+                ).all()
+        return [row[0] for row in rows]
+
+    def report_progress(
+        self,
+        job_id: str,
+        worker_id: str,
+        current: int,
+        total: Optional[int] = None,
+        message: Optional[str] = None,
+        *,
+        result: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Record progress (also counts as a heartbeat); returns whether the handler should stop.
+
+        Only the worker currently holding the job may write. If the job was re-queued after a
+        heartbeat timeout (and possibly claimed by another worker), nothing is updated and True
+        is returned so the stale handler stops instead of masking the new attempt.
+        """
+        values: Dict[str, Any] = {"progress_current": int(current), "heartbeat_at": datetime.utcnow()}
+        if total is not None:
+            values["progress_total"] = int(total)
+        if message is not None:
+            values["progress_message"] = message[:PROGRESS_MESSAGE_MAX_LENGTH]
+        if result is not None:
+            values["result"] = json.dumps(result, ensure_ascii=False, default=str)
+        with TargetSessionLocal() as session:
+            with session.begin():
+                updated = session.execute(
+                    update(BackgroundJob)
+                    .where(
+                        BackgroundJob.id == job_id,
+                        BackgroundJob.worker_id == worker_id,
+                        BackgroundJob.status == JobStatus.RUNNING.value,
+                    )
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+                if updated.rowcount == 0:
+                    logger.warning("Job %s is no longer held by %s; stopping its handler", job_id, worker_id)
+                    return True
+                cancel_requested = session.execute(
+                    select(BackgroundJob.cancel_requested).where(BackgroundJob.id == job_id)
+                ).scalar_one_or_none()
+        return bool(cancel_requested)
+
+    def complete(self, job_id: str, worker_id: str) -> None:
+        self._settle(job_id, worker_id, JobStatus.SUCCEEDED)
+
+    def cancelled(self, job_id: str, worker_id: str) -> None:
+        self._settle(job_id, worker_id, JobStatus.CANCELLED)
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> None:
+        """Re-queue with backoff while attempts remain, otherwise mark failed."""
+        self._settle(job_id, worker_id, JobStatus.FAILED, error=error, retry=True)
+
+    def requeue_stale(self, heartbeat_timeout: timedelta) -> int:
+        now = datetime.utcnow()
+        recovered = 0
+        with TargetSessionLocal() as session:
+            with session.begin():
+                stale = (
+                    session.execute(
+                        select(BackgroundJob)
+                        .where(
+                            BackgroundJob.status == JobStatus.RUNNING.value,
+                            BackgroundJob.heartbeat_at < now - heartbeat_timeout,
+                        )
+                        .with_for_update(skip_locked=True)
+                    )
+                    .scalars()
+                    .all()
+                )
+                for job in stale:
+                    logger.warning("Job %s lost its worker %s (last heartbeat %s)", job.id, job.worker_id, job.heartbeat_at)
+                    self._retry_or_fail(job, "worker heartbeat timed out", now)
+                    recovered += 1
+        return recovered
+
+    def _settle(
+        self,
+        job_id: str,
+        worker_id: str,
+        outcome: JobStatus,
+        *,
+        error: Optional[str] = None,
+        retry: bool = False,
+    ) -> None:
+        now = datetime.utcnow()
+        with TargetSessionLocal() as session:
+            with session.begin():
+                job = session.execute(
+                    select(BackgroundJob)
+                    .where(
+                        BackgroundJob.id == job_id,
+                        BackgroundJob.worker_id == worker_id,
+                        BackgroundJob.status == JobStatus.RUNNING.value,
+                    )
+                    .with_for_update()
+                ).scalar_one_or_none()
+                if job is None:
+                    # Re-queued after a heartbeat timeout: the outcome belongs to a stale attempt.
+                    logger.warning("Ignoring %s from %s for job %s it no longer holds", outcome.value, worker_id, job_id)
+                    return
+                if retry:
+                    self._retry_or_fail(job, error or "", now)
+                else:
+                    self._finish(job, outcome, now)
+                status = job.status
+        logger.info("Job %s -> %s", job_id, status)
+
+    def _retry_or_fail(self, job: BackgroundJob, error: str, now: datetime) -> None:
+        job.error = error
+        if job.cancel_requested:
+            self._finish(job, JobStatus.CANCELLED, now)
+        elif int(job.attempts or 0) < int(job.max_attempts or 1):
+            job.status = JobStatus.QUEUED.value
+            job.worker_id = None
+            job.run_after = now + RETRY_BACKOFF * int(job.attempts or 1)
+        else:
+            self._finish(job, JobStatus.FAILED, now)
+
+    @staticmethod
+    def _finish(job: BackgroundJob, outcome: JobStatus, now: datetime) -> None:
+        job.status = outcome.value
+        job.active_kind = None
+        job.finished_at = now
+
+
+job_queue = JobQueueService()
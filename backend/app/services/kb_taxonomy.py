@@ -2,14 +2,21 @@ from __future__ import annotations
 
 import csv
 import io
-from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional, Tuple
-
-from sqlalchemy import delete, select
+import json
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, delete, func, insert, select, update
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased
+from starlette.concurrency import run_in_threadpool
 
-from ..core.db import TargetSessionLocal
-from ..models.kb_taxonomy import KbTaxonomyCase, KbTaxonomyNode
+from ..core.db import AsyncTargetSessionLocal, TargetSessionLocal
+from ..models.kb_taxonomy import KbTaxonomyCase, KbTaxonomyImportPlan, KbTaxonomyNode
+from .kb_taxonomy_cache import bump_taxonomy_version
 
 
 class KbTaxonomyError(Exception):
@@ -42,6 +49,27 @@ class ImportPlan:
     case_count: int
 
 
+@dataclass(frozen=True)
+class ExistingNode:
+    id: int
+    path: Tuple[str, ...]
+    definition: Optional[str] = None
+    cases: Tuple[str, ...] = ()
+
+
+@dataclass
+class ImportDiff:
+    added: List[Tuple[str, ...]] = field(default_factory=list)
+    removed: List[ExistingNode] = field(default_factory=list)
+    definition_changed: List[Tuple[ExistingNode, str]] = field(default_factory=list)
+    cases_changed: List[ExistingNode] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.definition_changed or self.cases_changed)
+
+
 SCOPE_TO_DOMAIN_ZH = {
     "water": "水务",
     "bus": "公交",
@@ -49,6 +77,10 @@ SCOPE_TO_DOMAIN_ZH = {
 }
 
 REQUIRED_COLUMNS = ["业务域", "一级", "二级", "三级", "定义"]
+IMPORT_CASE_CHUNK_SIZE = 1000
+IMPORT_PLAN_TTL_SECONDS = 600
+# Nodes with more cases than this continue on extra rows with the same path, which import merges back.
+EXPORT_MAX_CASE_COLUMNS = 20
 
 
 def _normalize_cell(value: Optional[str]) -> str:
@@ -57,77 +89,143 @@ def _normalize_cell(value: Optional[str]) -> str:
     return str(value).strip()
 
 
-def _read_csv_bytes(raw: bytes) -> Tuple[List[str], List[Tuple[int, Dict[str, str]]]]:
-    text = raw.decode("utf-8-sig", errors="replace")
-    reader = csv.DictReader(io.StringIO(text))
-    headers = [h.strip() for h in (reader.fieldnames or []) if h is not None]
-    rows: List[Tuple[int, Dict[str, str]]] = []
-    for row_number, row in enumerate(reader, start=2):  # header=1
-        normalized: Dict[str, str] = {}
-        for key, value in (row or {}).items():
-            if key is None:
-                continue
-            normalized[key.strip()] = _normalize_cell(value)
-        if not any(v for v in normalized.values()):
-            continue
-        rows.append((row_number, normalized))
-    return headers, rows
+TabularRows = Iterator[Tuple[int, Dict[str, str]]]
 
 
-def _read_xlsx_bytes(raw: bytes) -> Tuple[List[str], List[Tuple[int, Dict[str, str]]]]:
+@contextmanager
+def _open_csv_stream(fileobj: BinaryIO) -> Iterator[Tuple[List[str], TabularRows]]:
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        reader = csv.DictReader(text)
+        headers = [h.strip() for h in (reader.fieldnames or []) if h is not None]
+
+        def iter_rows() -> TabularRows:
+            for row_number, row in enumerate(reader, start=2):  # header=1
+                normalized: Dict[str, str] = {}
+                for key, value in (row or {}).items():
+                    if key is None:
+                        continue
+                    normalized[key.strip()] = _normalize_cell(value)
+                if not any(v for v in normalized.values()):
+                    continue
+                yield row_number, normalized
+
+        yield headers, iter_rows()
+    finally:
+        # Detach so the wrapper does not close the caller's file.
+        text.detach()
+
+
+@contextmanager
+def _open_xlsx_stream(fileobj: BinaryIO) -> Iterator[Tuple[List[str], TabularRows]]:
     try:
         import openpyxl
     except Exception as exc:  # pragma: no cover
         raise RuntimeError("Missing dependency: openpyxl") from exc
 
-    wb = openpyxl.load_workbook(io.BytesIO(raw), read_only=True, data_only=True)
-    ws = wb.active
-
-    rows_iter = ws.iter_rows(values_only=True)
-    header_row = next(rows_iter, None)
-    if header_row is None:
-        return [], []
-
-    headers = [(_normalize_cell(h) if h is not None else "") for h in header_row]
-    headers = [h.strip() for h in headers]
-
-    rows: List[Tuple[int, Dict[str, str]]] = []
-    for excel_row_number, values in enumerate(rows_iter, start=2):  # header=1
-        normalized: Dict[str, str] = {}
-        any_value = False
-        for idx, header in enumerate(headers):
-            if not header:
-                continue
-            cell = values[idx] if idx < len(values) else None
-            val = _normalize_cell(cell)
-            if val:
-                any_value = True
-            normalized[header] = val
-        if not any_value:
-            continue
-        rows.append((excel_row_number, normalized))
-
-    return headers, rows
-
-
-def _read_tabular_bytes(raw: bytes, filename: str) -> Tuple[List[str], List[Tuple[int, Dict[str, str]]]]:
+    wb = openpyxl.load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        rows_iter = ws.iter_rows(values_only=True)
+        header_row = next(rows_iter, None)
+        if header_row is None:
+            yield [], iter(())
+            return
+
+        headers = [(_normalize_cell(h) if h is not None else "") for h in header_row]
+        headers = [h.strip() for h in headers]
+
+        def iter_rows() -> TabularRows:
+            for excel_row_number, values in enumerate(rows_iter, start=2):  # header=1
+                normalized: Dict[str, str] = {}
+                any_value = False
+                for idx, header in enumerate(headers):
+                    if not header:
+                        continue
+                    cell = values[idx] if idx < len(values) else None
+                    val = _normalize_cell(cell)
+                    if val:
+                        any_value = True
+                    normalized[header] = val
+                if not any_value:
+                    continue
+                yield excel_row_number, normalized
+
+        yield headers, iter_rows()
+    finally:
+        wb.close()
+
+
+def _open_tabular_stream(fileobj: BinaryIO, filename: str):
+    """Return a context manager yielding the header row and a lazy iterator over the non-empty rows."""
     lower = (filename or "").lower()
     if lower.endswith(".xlsx"):
-        return _read_xlsx_bytes(raw)
+        return _open_xlsx_stream(fileobj)
     if lower.endswith(".csv") or not lower:
-        return _read_csv_bytes(raw)
+        return _open_csv_stream(fileobj)
     raise ValidationError("仅支持CSV或XLSX文件")
 
 
+def iter_csv_chunks(rows: Iterable[List[str]], rows_per_chunk: int = 500) -> Iterator[bytes]:
+    """Encode rows as UTF-8 CSV (with BOM so Excel detects the encoding), yielding every `rows_per_chunk` rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= rows_per_chunk:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate(0)
+            pending = 0
+    tail = buffer.getvalue()
+    if tail:
+        yield tail.encode("utf-8")
+
+
+def write_xlsx_file(rows: Iterable[List[str]], path: str) -> None:
+    """Write rows to `path` with openpyxl's write-only mode, which does not keep cells in memory."""
+    try:
+        import openpyxl
+    except Exception as exc:  # pragma: no cover
+        raise RuntimeError("Missing dependency: openpyxl") from exc
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+
+
 def _extract_case_columns(headers: Iterable[str]) -> List[str]:
     return [h for h in headers if h.startswith("案例")]
 
 
 def build_import_plan(scope: str, raw: bytes, filename: str) -> Tuple[Optional[ImportPlan], List[dict]]:
+    return build_import_plan_from_stream(scope, io.BytesIO(raw), filename)
+
+
+def build_import_plan_from_stream(
+    scope: str,
+    fileobj: BinaryIO,
+    filename: str,
+) -> Tuple[Optional[ImportPlan], List[dict]]:
+    """Validate and build the plan in a single pass over `fileobj`, which must be seekable for XLSX."""
     try:
-        headers, rows = _read_tabular_bytes(raw, filename)
+        stream = _open_tabular_stream(fileobj, filename)
     except ValidationError as exc:
         return None, [{"row": 1, "column": "file", "message": str(exc)}]
+    with stream as (headers, rows):
+        return _build_plan_from_rows(scope, headers, rows)
+
+
+def _build_plan_from_rows(
+    scope: str,
+    headers: List[str],
+    rows: TabularRows,
+) -> Tuple[Optional[ImportPlan], List[dict]]:
     errors: List[dict] = []
 
     missing = [c for c in REQUIRED_COLUMNS if c not in headers]
@@ -228,6 +326,181 @@ def build_import_plan(scope: str, raw: bytes, filename: str) -> Tuple[Optional[I
     return ImportPlan(scope=scope, rows=import_rows, category_count=len(unique_categories), case_count=case_count), []
 
 
+def _dump_plan(plan: ImportPlan) -> str:
+    rows = [[r.domain, r.l1, r.l2, r.l3, r.definition, r.cases] for r in plan.rows]
+    return json.dumps(
+        {"scope": plan.scope, "categories": plan.category_count, "cases": plan.case_count, "rows": rows},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+
+
+def _load_plan(raw: str) -> ImportPlan:
+    data = json.loads(raw)
+    return ImportPlan(
+        scope=data["scope"],
+        rows=[
+            ImportRow(domain=domain, l1=l1, l2=l2, l3=l3, definition=definition, cases=list(cases))
+            for domain, l1, l2, l3, definition, cases in data["rows"]
+        ],
+        category_count=data["categories"],
+        case_count=data["cases"],
+    )
+
+
+def build_node_path(parent_path: Optional[str], node_id: int) -> str:
+    return f"{parent_path or '/'}{node_id}/"
+
+
+def fill_missing_paths(session, scope: str, max_level: int = 3) -> None:
+    """Set `path` for nodes inserted without one, top level first so parents are always filled."""
+    parent = aliased(KbTaxonomyNode)
+    for level in range(1, max_level + 1):
+        rows = session.execute(
+            select(KbTaxonomyNode.id, parent.path)
+            .outerjoin(parent, parent.id == KbTaxonomyNode.parent_id)
+            .where(
+                KbTaxonomyNode.scope_code == scope,
+                KbTaxonomyNode.level == level,
+                KbTaxonomyNode.path.is_(None),
+            )
+        ).all()
+        if not rows:
+            continue
+        session.execute(
+            update(KbTaxonomyNode.__table__)
+            .where(KbTaxonomyNode.__table__.c.id == bindparam("node_id"))
+            .values(path=bindparam("node_path")),
+            [{"node_id": int(node_id), "node_path": build_node_path(parent_path, int(node_id))} for node_id, parent_path in rows],
+        )
+
+
+def bulk_insert_rows(session, scope: str, rows: Sequence[ImportRow]) -> Dict[Tuple[str, str, str], int]:
+    """
+    Insert the nodes and cases of `rows` level by level and return the L3 id per (l1, l2, l3).
+
+    Each level is one executemany (rewritten by the driver into multi-row INSERTs);
+    generated ids are read back by (parent_id, name), which the unique key
+    uq_kb_taxonomy_nodes_scope_parent_name guarantees to be unambiguous.
+    Paths that already exist in the scope are reused rather than inserted.
+    """
+    node_table = KbTaxonomyNode.__table__
+
+    def existing_ids(level: int) -> Dict[Tuple[Optional[int], str], int]:
+        result = session.execute(
+            select(KbTaxonomyNode.id, KbTaxonomyNode.parent_id, KbTaxonomyNode.name).where(
+                KbTaxonomyNode.scope_code == scope,
+                KbTaxonomyNode.level == level,
+            )
+        ).all()
+        return {
+            (int(r.parent_id) if r.parent_id is not None else None, r.name): int(r.id) for r in result
+        }
+
+    l1_ids = existing_ids(1)
+    new_l1 = list(dict.fromkeys(r.l1 for r in rows if (None, r.l1) not in l1_ids))
+    if new_l1:
+        session.execute(
+            insert(node_table),
+            [
+                {"scope_code": scope, "level": 1, "name": name, "parent_id": None, "definition": None}
+                for name in new_l1
+            ],
+        )
+        l1_ids = existing_ids(1)
+
+    l2_ids = existing_ids(2)
+    new_l2 = list(
+        dict.fromkeys(
+            (l1_ids[(None, r.l1)], r.l2) for r in rows if (l1_ids[(None, r.l1)], r.l2) not in l2_ids
+        )
+    )
+    if new_l2:
+        session.execute(
+            insert(node_table),
+            [
+                {"scope_code": scope, "level": 2, "name": name, "parent_id": parent_id, "definition": None}
+                for parent_id, name in new_l2
+            ],
+        )
+        l2_ids = existing_ids(2)
+
+    l3_ids = existing_ids(3)
+    new_l3: Dict[Tuple[int, str], str] = {}
+    for r in rows:
+        key = (l2_ids[(l1_ids[(None, r.l1)], r.l2)], r.l3)
+        if key not in l3_ids and key not in new_l3:
+            new_l3[key] = r.definition
+    if new_l3:
+        session.execute(
+            insert(node_table),
+            [
+                {"scope_code": scope, "level": 3, "name": name, "parent_id": parent_id, "definition": definition}
+                for (parent_id, name), definition in new_l3.items()
+            ],
+        )
+        l3_ids = existing_ids(3)
+
+    path_ids: Dict[Tuple[str, str, str], int] = {}
+    case_params: List[dict] = []
+    for r in rows:
+        l3_id = l3_ids[(l2_ids[(l1_ids[(None, r.l1)], r.l2)], r.l3)]
+        path_ids[(r.l1, r.l2, r.l3)] = l3_id
+        case_params.extend({"node_id": l3_id, "content": content} for content in r.cases)
+
+    for offset in range(0, len(case_params), IMPORT_CASE_CHUNK_SIZE):
+        session.execute(insert(KbTaxonomyCase.__table__), case_params[offset : offset + IMPORT_CASE_CHUNK_SIZE])
+
+    if new_l1 or new_l2 or new_l3:
+        fill_missing_paths(session, scope)
+
+    return path_ids
+
+
+def diff_import_plan(existing: Sequence[ExistingNode], rows: Sequence[ImportRow]) -> ImportDiff:
+    """
+    Compare the current scope (nodes keyed by their name path) with the rows of an import.
+
+    Paths are compared per level, so renaming a node shows up as one removal plus
+    one addition. Case sets are compared ignoring order; any difference replaces
+    all cases of that L3 node.
+    """
+    desired_paths: Dict[Tuple[str, ...], None] = {}
+    desired_l3: Dict[Tuple[str, str, str], Tuple[str, List[str]]] = {}
+    for row in rows:
+        desired_paths.setdefault((row.l1,), None)
+        desired_paths.setdefault((row.l1, row.l2), None)
+        desired_paths.setdefault((row.l1, row.l2, row.l3), None)
+        _, cases = desired_l3.setdefault((row.l1, row.l2, row.l3), (row.definition, []))
+        cases.extend(row.cases)
+
+    current = {node.path: node for node in existing}
+    diff = ImportDiff()
+    for path in desired_paths:
+        if path not in current:
+            diff.added.append(path)
+
+    for path, node in current.items():
+        if path not in desired_paths:
+            diff.removed.append(node)
+            continue
+        if len(path) != 3:
+            diff.unchanged += 1
+            continue
+        definition, cases = desired_l3[path]
+        changed = False
+        if (node.definition or "") != definition:
+            diff.definition_changed.append((node, definition))
+            changed = True
+        if sorted(node.cases) != sorted(cases):
+            diff.cases_changed.append(node)
+            changed = True
+        if not changed:
+            diff.unchanged += 1
+
+    return diff
+
+
 class KbTaxonomyService:
     def _assert_unique_sibling_name(
         self,
@@ -269,13 +542,105 @@ class KbTaxonomyService:
             session.expunge(node)
             return node
 
-    def list_cases(self, node_id: int, keyword: Optional[str]) -> List[KbTaxonomyCase]:
+    async def get_node_async(self, node_id: int) -> KbTaxonomyNode:
+        if AsyncTargetSessionLocal is None:
+            return await run_in_threadpool(self.get_node, node_id)
+        async with AsyncTargetSessionLocal() as session:
+            node = await session.get(KbTaxonomyNode, node_id)
+        if node is None:
+            raise NotFoundError(f"Node {node_id} not found")
+        return node
+
+    def get_ancestors(self, node_id: int) -> List[KbTaxonomyNode]:
+        """Return the node and its ancestors, root first, looked up by the ids in its materialized path."""
+        with TargetSessionLocal() as session:
+            path = session.execute(select(KbTaxonomyNode.path).where(KbTaxonomyNode.id == node_id)).scalar_one_or_none()
+            if not path:
+                return []
+            ancestor_ids = [int(part) for part in path.strip("/").split("/") if part]
+            nodes = (
+                session.execute(
+                    select(KbTaxonomyNode)
+                    .where(KbTaxonomyNode.id.in_(ancestor_ids))
+                    .order_by(KbTaxonomyNode.level.asc())
+                )
+                .scalars()
+                .all()
+            )
+            for node in nodes:
+                session.expunge(node)
+            return nodes
+
+    def subtree_stats(self, *, scope: str, node_id: int) -> Tuple[Dict[int, int], int]:
+        """Return (descendant node count per level, case count) for the subtree under `node_id`."""
+        with TargetSessionLocal() as session:
+            node = session.get(KbTaxonomyNode, node_id)
+            if node is None or node.scope_code != scope:
+                raise NotFoundError(f"Node {node_id} not found")
+            if not node.path:
+                raise ValidationError("节点路径尚未生成")
+            prefix = f"{node.path}%"
+
+            level_rows = session.execute(
+                select(KbTaxonomyNode.level, func.count())
+                .where(KbTaxonomyNode.path.like(prefix), KbTaxonomyNode.id != node_id)
+                .group_by(KbTaxonomyNode.level)
+            ).all()
+            case_count = session.execute(
+                select(func.count(KbTaxonomyCase.id))
+                .join(KbTaxonomyNode, KbTaxonomyNode.id == KbTaxonomyCase.node_id)
+                .where(KbTaxonomyNode.path.like(prefix))
+            ).scalar_one()
+
+        return {int(level): int(count) for level, count in level_rows}, int(case_count)
+
+    def list_subtree_cases(
+        self,
+        *,
+        scope: str,
+        node_id: int,
+        keyword: Optional[str],
+        after_id: Optional[int],
+        limit: int,
+    ) -> List[KbTaxonomyCase]:
+        """Cases attached anywhere under `node_id`, keyset-paginated by case id."""
         with TargetSessionLocal() as session:
-            stmt = select(KbTaxonomyCase).where(KbTaxonomyCase.node_id == node_id).order_by(KbTaxonomyCase.id.asc())
+            node = session.get(KbTaxonomyNode, node_id)
+            if node is None or node.scope_code != scope:
+                raise NotFoundError(f"Node {node_id} not found")
+            if not node.path:
+                raise ValidationError("节点路径尚未生成")
+
+            stmt = (
+                select(KbTaxonomyCase)
+                .join(KbTaxonomyNode, KbTaxonomyNode.id == KbTaxonomyCase.node_id)
+                .where(KbTaxonomyNode.path.like(f"{node.path}%"))
+                .order_by(KbTaxonomyCase.id.asc())
+                .limit(limit)
+            )
             if keyword:
                 stmt = stmt.where(KbTaxonomyCase.content.like(f"%{keyword}%"))
+            if after_id is not None:
+                stmt = stmt.where(KbTaxonomyCase.id > after_id)
             return session.execute(stmt).scalars().all()
 
+    def list_cases(self, node_id: int, keyword: Optional[str]) -> List[KbTaxonomyCase]:
+        with TargetSessionLocal() as session:
+            return session.execute(self._cases_stmt(node_id, keyword)).scalars().all()
+
+    async def list_cases_async(self, node_id: int, keyword: Optional[str]) -> List[KbTaxonomyCase]:
+        if AsyncTargetSessionLocal is None:
+            return await run_in_threadpool(self.list_cases, node_id, keyword)
+        async with AsyncTargetSessionLocal() as session:
+            return (await session.execute(self._cases_stmt(node_id, keyword))).scalars().all()
+
+    @staticmethod
+    def _cases_stmt(node_id: int, keyword: Optional[str]):
+        stmt = select(KbTaxonomyCase).where(KbTaxonomyCase.node_id == node_id).order_by(KbTaxonomyCase.id.asc())
+        if keyword:
+            stmt = stmt.where(KbTaxonomyCase.content.like(f"%{keyword}%"))
+        return stmt
+
     def create_node(
         self,
         *,
@@ -298,6 +663,7 @@ class KbTaxonomyService:
             raise ValidationError("definition is required for level 3")
 
         with TargetSessionLocal() as session:
+            parent_path: Optional[str] = None
             if parent_id is not None:
                 parent = session.get(KbTaxonomyNode, parent_id)
                 if parent is None:
@@ -308,6 +674,7 @@ class KbTaxonomyService:
                     raise ValidationError("level 2 parent must be level 1")
                 if level == 3 and parent.level != 2:
                     raise ValidationError("level 3 parent must be level 2")
+                parent_path = parent.path
 
             self._assert_unique_sibling_name(session=session, scope=scope, parent_id=parent_id, name=name)
 
@@ -320,13 +687,16 @@ class KbTaxonomyService:
             )
             session.add(node)
             try:
+                session.flush()
+                node.path = build_node_path(parent_path, int(node.id))
+                bump_taxonomy_version(session, scope)
                 session.commit()
             except IntegrityError as exc:
                 session.rollback()
                 raise ValidationError("同级下已存在同名分类") from exc
             session.refresh(node)
             session.expunge(node)
-            return node
+        return node
 
     def update_node(self, *, node_id: int, scope: str, name: Optional[str], definition: Optional[str]) -> KbTaxonomyNode:
         with TargetSessionLocal() as session:
@@ -358,13 +728,14 @@ class KbTaxonomyService:
                 node.definition = definition
 
             try:
+                bump_taxonomy_version(session, scope)
                 session.commit()
             except IntegrityError as exc:
                 session.rollback()
                 raise ValidationError("同级下已存在同名分类") from exc
             session.refresh(node)
             session.expunge(node)
-            return node
+        return node
 
     def delete_node(self, *, node_id: int, scope: str) -> None:
         with TargetSessionLocal() as session:
@@ -379,6 +750,7 @@ class KbTaxonomyService:
                 raise ValidationError("请先删除/迁移子节点")
 
             session.delete(node)
+            bump_taxonomy_version(session, scope)
             session.commit()
 
     def create_case(self, *, scope: str, node_id: int, content: str) -> KbTaxonomyCase:
@@ -428,57 +800,191 @@ class KbTaxonomyService:
             session.delete(case)
             session.commit()
 
-    def import_validate(self, *, scope: str, raw: bytes, filename: str) -> Tuple[Optional[ImportPlan], List[dict]]:
-        return build_import_plan(scope, raw, filename=filename)
+    def iter_export_rows(self, scope: str) -> Iterator[List[str]]:
+        """
+        Yield the scope in import format (header first), one row per L3 node.
+
+        Nodes and cases come from a single streamed join ordered by path, so only
+        the cases of the current node are buffered.
+        """
+        domain = SCOPE_TO_DOMAIN_ZH.get(scope)
+        if domain is None:
+            raise ValidationError("非法scope")
+
+        l1 = aliased(KbTaxonomyNode)
+        l2 = aliased(KbTaxonomyNode)
+        l3 = aliased(KbTaxonomyNode)
+        stmt = (
+            select(l1.name, l2.name, l3.name, l3.definition, l3.id, KbTaxonomyCase.content)
+            .join(l2, l2.id == l3.parent_id)
+            .join(l1, l1.id == l2.parent_id)
+            .outerjoin(KbTaxonomyCase, KbTaxonomyCase.node_id == l3.id)
+            .where(l3.scope_code == scope, l3.level == 3)
+            .order_by(l1.name.asc(), l2.name.asc(), l3.name.asc(), l3.id.asc(), KbTaxonomyCase.id.asc())
+            .execution_options(stream_results=True, yield_per=500)
+        )
+
+        with TargetSessionLocal() as session:
+            case_columns = session.execute(
+                select(func.count(KbTaxonomyCase.id))
+                .join(KbTaxonomyNode, KbTaxonomyNode.id == KbTaxonomyCase.node_id)
+                .where(KbTaxonomyNode.scope_code == scope)
+                .group_by(KbTaxonomyCase.node_id)
+                .order_by(func.count(KbTaxonomyCase.id).desc())
+                .limit(1)
+            ).scalar()
+            case_columns = max(1, min(int(case_columns or 0), EXPORT_MAX_CASE_COLUMNS))
+
+            yield [*REQUIRED_COLUMNS, *(f"案例{i}" for i in range(1, case_columns + 1))]
+
+            def emit(prefix: List[str], cases: List[str]) -> Iterator[List[str]]:
+                for offset in range(0, max(len(cases), 1), case_columns):
+                    chunk = cases[offset : offset + case_columns]
+                    yield [*prefix, *chunk, *([""] * (case_columns - len(chunk)))]
+
+            current_id: Optional[int] = None
+            prefix: List[str] = []
+            cases: List[str] = []
+            for l1_name, l2_name, l3_name, definition, node_id, content in session.execute(stmt):
+                if node_id != current_id:
+                    if current_id is not None:
+                        yield from emit(prefix, cases)
+                    current_id = node_id
+                    prefix = [domain, l1_name, l2_name, l3_name, definition or ""]
+                    cases = []
+                if content is not None:
+                    cases.append(content)
+            if current_id is not None:
+                yield from emit(prefix, cases)
+
+    def _load_existing_nodes(self, *, session, scope: str) -> List[ExistingNode]:
+        nodes = session.execute(
+            select(
+                KbTaxonomyNode.id,
+                KbTaxonomyNode.level,
+                KbTaxonomyNode.name,
+                KbTaxonomyNode.parent_id,
+                KbTaxonomyNode.definition,
+            ).where(KbTaxonomyNode.scope_code == scope)
+        ).all()
+        by_id = {int(n.id): n for n in nodes}
+
+        cases: Dict[int, List[str]] = {}
+        case_rows = session.execute(
+            select(KbTaxonomyCase.node_id, KbTaxonomyCase.content)
+            .join(KbTaxonomyNode, KbTaxonomyNode.id == KbTaxonomyCase.node_id)
+            .where(KbTaxonomyNode.scope_code == scope)
+            .order_by(KbTaxonomyCase.id.asc())
+        ).all()
+        for node_id, content in case_rows:
+            cases.setdefault(int(node_id), []).append(content)
+
+        existing: List[ExistingNode] = []
+        for node_id, node in by_id.items():
+            names: List[str] = []
+            current = node
+            while current is not None and len(names) < 3:
+                names.append(current.name)
+                current = by_id.get(int(current.parent_id)) if current.parent_id is not None else None
+            existing.append(
+                ExistingNode(
+                    id=node_id,
+                    path=tuple(reversed(names)),
+                    definition=node.definition,
+                    cases=tuple(cases.get(node_id, ())),
+                )
+            )
+        return existing
+
+    def import_validate(
+        self,
+        *,
+        scope: str,
+        fileobj: BinaryIO,
+        filename: str,
+    ) -> Tuple[Optional[ImportPlan], List[dict]]:
+        return build_import_plan_from_stream(scope, fileobj, filename=filename)
+
+    def remember_plan(self, plan: ImportPlan, owner_id: int) -> str:
+        """
+        Store a validated plan so preview/execute can reuse it without re-uploading and re-parsing.
+
+        Plans live in `kb_taxonomy_import_plans`, so the token works on any worker; expired rows
+        are purged on the next store.
+        """
+        token = uuid.uuid4().hex
+        now = datetime.utcnow()
+        with TargetSessionLocal() as session:
+            with session.begin():
+                session.execute(delete(KbTaxonomyImportPlan).where(KbTaxonomyImportPlan.expires_at <= now))
+                session.add(
+                    KbTaxonomyImportPlan(
+                        token=token,
+                        scope_code=plan.scope,
+                        owner_id=owner_id,
+                        plan=_dump_plan(plan),
+                        expires_at=now + timedelta(seconds=IMPORT_PLAN_TTL_SECONDS),
+                    )
+                )
+        return token
+
+    def recall_plan(self, token: str, *, scope: str, owner_id: int) -> Optional[ImportPlan]:
+        with TargetSessionLocal() as session:
+            stored = session.execute(
+                select(KbTaxonomyImportPlan.plan).where(
+                    KbTaxonomyImportPlan.token == token,
+                    KbTaxonomyImportPlan.scope_code == scope,
+                    KbTaxonomyImportPlan.owner_id == owner_id,
+                    KbTaxonomyImportPlan.expires_at > datetime.utcnow(),
+                )
+            ).scalar_one_or_none()
+        if stored is None:
+            return None
+        return _load_plan(stored)
+
+    def forget_plan(self, token: str) -> None:
+        with TargetSessionLocal() as session:
+            with session.begin():
+                session.execute(delete(KbTaxonomyImportPlan).where(KbTaxonomyImportPlan.token == token))
+
+    def import_preview(self, *, scope: str, plan: ImportPlan) -> ImportDiff:
+        with TargetSessionLocal() as session:
+            existing = self._load_existing_nodes(session=session, scope=scope)
+        return diff_import_plan(existing, plan.rows)
 
-    def import_execute(self, *, scope: str, raw: bytes, filename: str) -> ImportPlan:
-        plan, errors = build_import_plan(scope, raw, filename=filename)
-        if errors or plan is None:
-            raise ValidationError("文件校验失败")
+    def import_execute(self, *, scope: str, plan: ImportPlan) -> ImportPlan:
+        if plan.scope != scope:
+            raise ValidationError("导入范围不一致")
 
         with TargetSessionLocal() as session:
             with session.begin():
-                node_ids_subq = select(KbTaxonomyNode.id).where(KbTaxonomyNode.scope_code == scope)
-                session.execute(delete(KbTaxonomyCase).where(KbTaxonomyCase.node_id.in_(node_ids_subq)))
-                # Delete nodes in leaf-to-root order to satisfy the self-referencing FK on parent_id.
-                for level in (3, 2, 1):
+                diff = diff_import_plan(self._load_existing_nodes(session=session, scope=scope), plan.rows)
+                if diff.is_empty:
+                    return plan
+
+                stale_case_node_ids = [n.id for n in diff.cases_changed]
+                stale_case_node_ids.extend(n.id for n in diff.removed if len(n.path) == 3)
+                if stale_case_node_ids:
+                    session.execute(delete(KbTaxonomyCase).where(KbTaxonomyCase.node_id.in_(stale_case_node_ids)))
+                # Delete removed nodes leaf-to-root to satisfy the self-referencing FK on parent_id.
+                for depth in (3, 2, 1):
+                    removed_ids = [n.id for n in diff.removed if len(n.path) == depth]
+                    if removed_ids:
+                        session.execute(delete(KbTaxonomyNode).where(KbTaxonomyNode.id.in_(removed_ids)))
+
+                for node, definition in diff.definition_changed:
                     session.execute(
-                        delete(KbTaxonomyNode).where(
-                            KbTaxonomyNode.scope_code == scope,
-                            KbTaxonomyNode.level == level,
-                        )
+                        update(KbTaxonomyNode).where(KbTaxonomyNode.id == node.id).values(definition=definition)
                     )
 
-                root_cache: Dict[Tuple[Optional[int], str], KbTaxonomyNode] = {}
-                for row in plan.rows:
-                    l1 = root_cache.get((None, row.l1))
-                    if l1 is None:
-                        l1 = KbTaxonomyNode(scope_code=scope, level=1, name=row.l1, parent_id=None, definition=None)
-                        session.add(l1)
-                        session.flush()
-                        root_cache[(None, row.l1)] = l1
-
-                    l2 = root_cache.get((l1.id, row.l2))
-                    if l2 is None:
-                        l2 = KbTaxonomyNode(scope_code=scope, level=2, name=row.l2, parent_id=l1.id, definition=None)
-                        session.add(l2)
-                        session.flush()
-                        root_cache[(l1.id, row.l2)] = l2
-
-                    l3 = root_cache.get((l2.id, row.l3))
-                    if l3 is None:
-                        l3 = KbTaxonomyNode(
-                            scope_code=scope,
-                            level=3,
-                            name=row.l3,
-                            parent_id=l2.id,
-                            definition=row.definition,
-                        )
-                        session.add(l3)
-                        session.flush()
-                        root_cache[(l2.id, row.l3)] = l3
-
-                    for content in row.cases:
-                        session.add(KbTaxonomyCase(node_id=l3.id, content=content))
+                # New L3 paths get nodes and cases; existing ones with a changed case set only get their cases rewritten.
+                touched = {p for p in diff.added if len(p) == 3}
+                touched.update(n.path for n in diff.cases_changed)
+                bulk_insert_rows(
+                    session,
+                    scope=scope,
+                    rows=[r for r in plan.rows if (r.l1, r.l2, r.l3) in touched],
+                )
+                bump_taxonomy_version(session, scope)
 
         return plan
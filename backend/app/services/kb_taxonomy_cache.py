@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from ..core.db import AsyncTargetSessionLocal, TargetSessionLocal
+from ..core.logging import get_logger
+from ..core.settings import get_settings
+from ..models.kb_taxonomy import KbTaxonomyNode, KbTaxonomyScopeVersion
+
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class TaxonomyNodeInfo:
+    id: int
+    scope_code: str
+    level: int
+    name: str
+    parent_id: Optional[int]
+    definition: Optional[str]
+
+
+@dataclass(frozen=True)
+class TaxonomySnapshot:
+    scope: str
+    version: int
+    nodes: Dict[int, TaxonomyNodeInfo]
+    children: Dict[Optional[int], Tuple[int, ...]]
+    paths: Dict[int, Tuple[int, ...]]
+    etag: str
+    loaded_at: float
+
+    def path(self, node_id: int) -> List[TaxonomyNodeInfo]:
+        return [self.nodes[nid] for nid in self.paths.get(node_id, ())]
+
+
+def bump_taxonomy_version(session: Session, scope: str) -> int:
+    """
+    Increment the scope's taxonomy version inside the caller's transaction and return it.
+
+    Call it from every transaction that writes kb_taxonomy_nodes; the snapshot caches
+    of all processes see the new version as soon as it commits.
+    """
+    table = KbTaxonomyScopeVersion.__table__
+    bump = update(table).where(table.c.scope_code == scope).values(version=table.c.version + 1)
+    if not session.execute(bump).rowcount:
+        try:
+            with session.begin_nested():
+                session.execute(insert(table).values(scope_code=scope, version=1))
+            return 1
+        except IntegrityError:
+            # Another writer created the row first.
+            session.execute(bump)
+    return int(session.execute(select(table.c.version).where(table.c.scope_code == scope)).scalar_one())
+
+
+class TaxonomySnapshotCache:
+    """
+    Per-scope, read-only view of kb_taxonomy_nodes.
+
+    Each read first looks up the scope's row in kb_taxonomy_scope_versions (a
+    primary-key hit) and serves the cached snapshot only if it was built from that
+    version; otherwise the snapshot is rebuilt with a single query. Writers bump the
+    version in their own transaction, so a commit on any worker invalidates every
+    worker's snapshot. The TTL only bounds edits made outside the app.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None) -> None:
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.cache.taxonomy_ttl_seconds
+        self._lock = threading.Lock()
+        self._snapshots: Dict[str, TaxonomySnapshot] = {}
+
+    def get(self, scope: str) -> TaxonomySnapshot:
+        # Version and nodes come from one session, so a snapshot never carries a newer version than its rows.
+        with TargetSessionLocal() as session:
+            version = self._read_version(session.execute(self._version_stmt(scope)))
+            snapshot = self._current(scope, version)
+            if snapshot is not None:
+                return snapshot
+            rows = session.execute(self._nodes_stmt(scope)).all()
+        return self._publish(self._build(scope, version, rows))
+
+    async def get_async(self, scope: str) -> TaxonomySnapshot:
+        """`get` on the asyncio engine (or the threadpool when DB_ASYNC is off)."""
+        if AsyncTargetSessionLocal is None:
+            return await run_in_threadpool(self.get, scope)
+        async with AsyncTargetSessionLocal() as session:
+            version = self._read_version(await session.execute(self._version_stmt(scope)))
+            snapshot = self._current(scope, version)
+            if snapshot is not None:
+                return snapshot
+            rows = (await session.execute(self._nodes_stmt(scope))).all()
+        return self._publish(self._build(scope, version, rows))
+
+    def _current(self, scope: str, version: int) -> Optional[TaxonomySnapshot]:
+        with self._lock:
+            snapshot = self._snapshots.get(scope)
+        if (
+            snapshot is not None
+            and snapshot.version == version
+            and time.monotonic() - snapshot.loaded_at < self.ttl_seconds
+        ):
+            return snapshot
+        return None
+
+    def _publish(self, snapshot: TaxonomySnapshot) -> TaxonomySnapshot:
+        with self._lock:
+            # Don't replace a snapshot built from a newer version by a slower concurrent rebuild.
+            current = self._snapshots.get(snapshot.scope)
+            if current is None or current.version <= snapshot.version:
+                self._snapshots[snapshot.scope] = snapshot
+        return snapshot
+
+    @staticmethod
+    def _version_stmt(scope: str):
+        return select(KbTaxonomyScopeVersion.version).where(KbTaxonomyScopeVersion.scope_code == scope)
+
+    @staticmethod
+    def _read_version(result) -> int:
+        version = result.scalar_one_or_none()
+        return int(version) if version is not None else 0
+
+    @staticmethod
+    def _nodes_stmt(scope: str):
+        return select(
+            KbTaxonomyNode.id,
+            KbTaxonomyNode.level,
+            KbTaxonomyNode.name,
+            KbTaxonomyNode.parent_id,
+            KbTaxonomyNode.definition,
+        ).where(KbTaxonomyNode.scope_code == scope)
+
+    @staticmethod
+    def _build(scope: str, version: int, rows) -> TaxonomySnapshot:
+        nodes: Dict[int, TaxonomyNodeInfo] = {}
+        for row in rows:
+            nodes[int(row.id)] = TaxonomyNodeInfo(
+                id=int(row.id),
+                scope_code=scope,
+                level=int(row.level),
+                name=row.name,
+                parent_id=int(row.parent_id) if row.parent_id is not None else None,
+                definition=row.definition,
+            )
+
+        by_parent: Dict[Optional[int], List[TaxonomyNodeInfo]] = {}
+        for node in nodes.values():
+            by_parent.setdefault(node.parent_id, []).append(node)
+        children = {
+            parent_id: tuple(n.id for n in sorted(siblings, key=lambda n: (n.name, n.id)))
+            for parent_id, siblings in by_parent.items()
+        }
+
+        paths: Dict[int, Tuple[int, ...]] = {}
+        for node_id in nodes:
+            chain: List[int] = []
+            current: Optional[int] = node_id
+            while current is not None and current in nodes and len(chain) < 3:
+                chain.append(current)
+                current = nodes[current].parent_id
+            paths[node_id] = tuple(reversed(chain))
+
+        digest = hashlib.sha1()
+        for node_id in sorted(nodes):
+            node = nodes[node_id]
+            digest.update(f"{node.id}\x1f{node.parent_id}\x1f{node.level}\x1f{node.name}\x1e".encode("utf-8"))
+
+        logger.debug("Taxonomy snapshot loaded for scope=%s (nodes=%d)", scope, len(nodes))
+        return TaxonomySnapshot(
+            scope=scope,
+            version=version,
+            nodes=nodes,
+            children=children,
+            paths=paths,
+            etag=f'"{digest.hexdigest()}"',
+            loaded_at=time.monotonic(),
+        )
+
+
+taxonomy_snapshots = TaxonomySnapshotCache()
@@ -1,12 +1,23 @@
 from __future__ import annotations
 
-from typing import Dict, List, Tuple
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from sqlalchemy import delete, select
+from sqlalchemy import and_, bindparam, delete, insert, or_, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import aliased
 
 from ..core.db import TargetSessionLocal
 from ..models.kb_taxonomy import KbTaxonomyCase, KbTaxonomyNode
 from ..models.kb_taxonomy_review import KbTaxonomyReviewCase, KbTaxonomyReviewItem
+from .kb_taxonomy import SCOPE_TO_DOMAIN_ZH, ImportRow, bulk_insert_rows, fill_missing_paths
+from .kb_taxonomy_cache import bump_taxonomy_version
+
+
+MAX_BATCH_SIZE = 500
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
 
 
 class NotFoundError(Exception):
@@ -17,41 +28,107 @@ class ValidationError(Exception):
     pass
 
 
+@dataclass(frozen=True)
+class BatchAcceptData:
+    review_item_id: int
+    l3_name: Optional[str] = None
+    definition: Optional[str] = None
+    cases: Optional[List[str]] = None
+
+
 class KbTaxonomyReviewService:
-    def list_pending(self, scope: str) -> Tuple[List[KbTaxonomyReviewItem], Dict[int, List[KbTaxonomyReviewCase]]]:
-        with TargetSessionLocal() as session:
-            items = (
-                session.execute(
-                    select(KbTaxonomyReviewItem)
-                    .where(
-                        KbTaxonomyReviewItem.scope_code == scope,
-                        KbTaxonomyReviewItem.status == "pending",
-                    )
-                    .order_by(KbTaxonomyReviewItem.created_at.desc())
+    def list_pending(
+        self,
+        scope: str,
+        *,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        include_cases: bool = True,
+    ) -> Tuple[Sequence[Row], Dict[int, List[KbTaxonomyReviewCase]], Optional[str]]:
+        """
+        Return one page of pending items (newest first) as column projections.
+
+        Pages are keyset-paginated on (created_at, id) so deep pages cost the same as
+        the first; cases are loaded only for the returned page and only when asked.
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        stmt = (
+            select(
+                KbTaxonomyReviewItem.id,
+                KbTaxonomyReviewItem.scope_code,
+                KbTaxonomyReviewItem.l1_name,
+                KbTaxonomyReviewItem.l2_name,
+                KbTaxonomyReviewItem.l3_name,
+                KbTaxonomyReviewItem.definition,
+                KbTaxonomyReviewItem.created_at,
+            )
+            .where(
+                KbTaxonomyReviewItem.scope_code == scope,
+                KbTaxonomyReviewItem.status == "pending",
+            )
+            .order_by(KbTaxonomyReviewItem.created_at.desc(), KbTaxonomyReviewItem.id.desc())
+            .limit(limit + 1)
+        )
+        if cursor:
+            created_at, last_id = self._decode_cursor(cursor)
+            stmt = stmt.where(
+                or_(
+                    KbTaxonomyReviewItem.created_at < created_at,
+                    and_(KbTaxonomyReviewItem.created_at == created_at, KbTaxonomyReviewItem.id < last_id),
                 )
-                .scalars()
-                .all()
             )
 
-            if not items:
-                return [], {}
+        with TargetSessionLocal() as session:
+            items = session.execute(stmt).all()
+            next_cursor = None
+            if len(items) > limit:
+                items = items[:limit]
+                next_cursor = self._encode_cursor(items[-1].created_at, int(items[-1].id))
 
-            item_ids = [int(item.id) for item in items]
-            cases = (
-                session.execute(
-                    select(KbTaxonomyReviewCase)
-                    .where(KbTaxonomyReviewCase.review_item_id.in_(item_ids))
-                    .order_by(KbTaxonomyReviewCase.id.asc())
-                )
-                .scalars()
-                .all()
-            )
+            case_map: Dict[int, List[KbTaxonomyReviewCase]] = {}
+            if include_cases and items:
+                case_map = self._load_cases(session=session, item_ids=[int(item.id) for item in items])
+
+        return items, case_map, next_cursor
+
+    def list_item_cases(self, *, review_item_id: int, scope: str) -> List[KbTaxonomyReviewCase]:
+        with TargetSessionLocal() as session:
+            item_scope = session.execute(
+                select(KbTaxonomyReviewItem.scope_code).where(KbTaxonomyReviewItem.id == review_item_id)
+            ).scalar_one_or_none()
+            if item_scope is None:
+                raise NotFoundError(f"Review item {review_item_id} not found")
+            if item_scope != scope:
+                raise PermissionError("Scope not allowed")
+            return self._load_cases(session=session, item_ids=[review_item_id]).get(review_item_id, [])
 
+    @staticmethod
+    def _load_cases(*, session, item_ids: Sequence[int]) -> Dict[int, List[KbTaxonomyReviewCase]]:
+        cases = (
+            session.execute(
+                select(KbTaxonomyReviewCase)
+                .where(KbTaxonomyReviewCase.review_item_id.in_(item_ids))
+                .order_by(KbTaxonomyReviewCase.id.asc())
+            )
+            .scalars()
+            .all()
+        )
         case_map: Dict[int, List[KbTaxonomyReviewCase]] = {}
-        for item in cases:
-            case_map.setdefault(int(item.review_item_id), []).append(item)
+        for case in cases:
+            case_map.setdefault(int(case.review_item_id), []).append(case)
+        return case_map
 
-        return items, case_map
+    @staticmethod
+    def _encode_cursor(created_at: datetime, item_id: int) -> str:
+        return f"{created_at.isoformat()}|{item_id}"
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        try:
+            created_at, item_id = cursor.rsplit("|", 1)
+            return datetime.fromisoformat(created_at), int(item_id)
+        except ValueError as exc:
+            raise ValidationError("Invalid cursor") from exc
 
     def accept_review_item(
         self,
@@ -100,50 +177,175 @@ class KbTaxonomyReviewService:
                 for content in clean_cases:
                     session.add(KbTaxonomyReviewCase(review_item_id=item.id, content=content))
 
-                l1 = self._get_or_create_node(
+                l3_id = self._upsert_path(
                     session=session,
                     scope=scope,
-                    level=1,
-                    name=item.l1_name,
-                    parent_id=None,
+                    l1_name=item.l1_name,
+                    l2_name=item.l2_name,
+                    l3_name=clean_l3,
+                    definition=clean_definition,
                 )
-                l2 = self._get_or_create_node(
-                    session=session,
-                    scope=scope,
-                    level=2,
-                    name=item.l2_name,
-                    parent_id=int(l1.id),
+
+                session.execute(delete(KbTaxonomyCase).where(KbTaxonomyCase.node_id == l3_id))
+                session.execute(
+                    insert(KbTaxonomyCase.__table__),
+                    [{"node_id": l3_id, "content": content} for content in clean_cases],
                 )
-                l3 = (
-                    session.execute(
-                        select(KbTaxonomyNode).where(
-                            KbTaxonomyNode.scope_code == scope,
-                            KbTaxonomyNode.level == 3,
-                            KbTaxonomyNode.parent_id == l2.id,
-                            KbTaxonomyNode.name == clean_l3,
-                        )
+
+                item.status = "accepted"
+                bump_taxonomy_version(session, scope)
+
+    def batch_accept(self, *, scope: str, items: Sequence[BatchAcceptData]) -> int:
+        """
+        Accept many review items in one transaction; all succeed or none do.
+
+        Omitted l3Name/definition/cases fall back to the stored candidate values.
+        Nodes are created level by level through the import bulk path, so L1/L2
+        nodes shared by several items are resolved once.
+        """
+        ids = [int(data.review_item_id) for data in items]
+        self._validate_batch_ids(ids)
+
+        with TargetSessionLocal() as session:
+            with session.begin():
+                rows = self._lock_pending_items(session=session, scope=scope, ids=ids)
+                stored_cases: Dict[int, List[str]] = {}
+                for review_item_id, content in session.execute(
+                    select(KbTaxonomyReviewCase.review_item_id, KbTaxonomyReviewCase.content)
+                    .where(KbTaxonomyReviewCase.review_item_id.in_(ids))
+                    .order_by(KbTaxonomyReviewCase.id.asc())
+                ).all():
+                    stored_cases.setdefault(int(review_item_id), []).append(content)
+
+                domain = SCOPE_TO_DOMAIN_ZH.get(scope, scope)
+                import_rows: Dict[Tuple[str, str, str], ImportRow] = {}
+                overridden: Dict[int, List[str]] = {}
+                item_updates: List[dict] = []
+                for data in items:
+                    item = rows[int(data.review_item_id)]
+                    l3_name = (data.l3_name if data.l3_name is not None else item.l3_name or "").strip()
+                    definition = (data.definition if data.definition is not None else item.definition or "").strip()
+                    if data.cases is not None:
+                        cases = [(c or "").strip() for c in data.cases]
+                        overridden[int(item.id)] = cases
+                    else:
+                        cases = stored_cases.get(int(item.id), [])
+                    if not l3_name:
+                        raise ValidationError(f"审核项{item.id}：三级分类名称不能为空")
+                    if not definition:
+                        raise ValidationError(f"审核项{item.id}：定义不能为空")
+                    if not cases:
+                        raise ValidationError(f"审核项{item.id}：至少需要一条案例")
+                    if any(not c for c in cases):
+                        raise ValidationError(f"审核项{item.id}：案例内容不能为空")
+
+                    item_updates.append({"item_id": int(item.id), "item_l3_name": l3_name, "item_definition": definition})
+                    # Same path twice in one batch: the later item wins, as with sequential accepts.
+                    import_rows[(item.l1_name, item.l2_name, l3_name)] = ImportRow(
+                        domain=domain,
+                        l1=item.l1_name,
+                        l2=item.l2_name,
+                        l3=l3_name,
+                        definition=definition,
+                        cases=cases,
                     )
-                    .scalars()
-                    .one_or_none()
+
+                review_table = KbTaxonomyReviewItem.__table__
+                session.execute(
+                    update(review_table)
+                    .where(review_table.c.id == bindparam("item_id"))
+                    .values(
+                        l3_name=bindparam("item_l3_name"),
+                        definition=bindparam("item_definition"),
+                        status="accepted",
+                    ),
+                    item_updates,
                 )
-                if l3 is None:
-                    l3 = KbTaxonomyNode(
-                        scope_code=scope,
-                        level=3,
-                        name=clean_l3,
-                        parent_id=int(l2.id),
-                        definition=clean_definition,
+                if overridden:
+                    session.execute(
+                        delete(KbTaxonomyReviewCase).where(KbTaxonomyReviewCase.review_item_id.in_(list(overridden)))
+                    )
+                    session.execute(
+                        insert(KbTaxonomyReviewCase.__table__),
+                        [
+                            {"review_item_id": item_id, "content": content}
+                            for item_id, cases in overridden.items()
+                            for content in cases
+                        ],
                     )
-                    session.add(l3)
-                    session.flush()
-                else:
-                    l3.definition = clean_definition
 
-                session.execute(delete(KbTaxonomyCase).where(KbTaxonomyCase.node_id == l3.id))
-                for content in clean_cases:
-                    session.add(KbTaxonomyCase(node_id=int(l3.id), content=content))
+                # Create missing nodes without cases, then replace definitions and cases of every target L3.
+                path_ids = bulk_insert_rows(
+                    session,
+                    scope=scope,
+                    rows=[replace(row, cases=[]) for row in import_rows.values()],
+                )
+                node_table = KbTaxonomyNode.__table__
+                session.execute(
+                    update(node_table)
+                    .where(node_table.c.id == bindparam("node_id"))
+                    .values(definition=bindparam("node_definition")),
+                    [
+                        {"node_id": path_ids[path], "node_definition": row.definition}
+                        for path, row in import_rows.items()
+                    ],
+                )
+                l3_ids = [path_ids[path] for path in import_rows]
+                session.execute(delete(KbTaxonomyCase).where(KbTaxonomyCase.node_id.in_(l3_ids)))
+                session.execute(
+                    insert(KbTaxonomyCase.__table__),
+                    [
+                        {"node_id": path_ids[path], "content": content}
+                        for path, row in import_rows.items()
+                        for content in row.cases
+                    ],
+                )
+                bump_taxonomy_version(session, scope)
 
-                item.status = "accepted"
+        return len(ids)
+
+    def batch_discard(self, *, scope: str, review_item_ids: Sequence[int]) -> int:
+        ids = [int(i) for i in review_item_ids]
+        self._validate_batch_ids(ids)
+        with TargetSessionLocal() as session:
+            with session.begin():
+                self._lock_pending_items(session=session, scope=scope, ids=ids)
+                session.execute(
+                    update(KbTaxonomyReviewItem)
+                    .where(KbTaxonomyReviewItem.id.in_(ids))
+                    .values(status="discarded")
+                    .execution_options(synchronize_session=False)
+                )
+        return len(ids)
+
+    @staticmethod
+    def _validate_batch_ids(ids: Sequence[int]) -> None:
+        if not ids:
+            raise ValidationError("至少需要选择一条审核项")
+        if len(ids) > MAX_BATCH_SIZE:
+            raise ValidationError(f"单次最多处理 {MAX_BATCH_SIZE} 条审核项")
+        if len(set(ids)) != len(ids):
+            raise ValidationError("包含重复的审核项编号")
+
+    @staticmethod
+    def _lock_pending_items(*, session, scope: str, ids: Sequence[int]) -> Dict[int, KbTaxonomyReviewItem]:
+        rows = (
+            session.execute(
+                select(KbTaxonomyReviewItem).where(KbTaxonomyReviewItem.id.in_(ids)).with_for_update()
+            )
+            .scalars()
+            .all()
+        )
+        by_id = {int(row.id): row for row in rows}
+        for review_item_id in ids:
+            item = by_id.get(review_item_id)
+            if item is None:
+                raise NotFoundError(f"Review item {review_item_id} not found")
+            if item.scope_code != scope:
+                raise PermissionError("Scope not allowed")
+            if item.status != "pending":
+                raise ValidationError(f"审核项{review_item_id}已处理")
+        return by_id
 
     def discard_review_item(self, review_item_id: int, scope: str) -> None:
         with TargetSessionLocal() as session:
@@ -166,36 +368,90 @@ class KbTaxonomyReviewService:
                 item.status = "discarded"
 
     @staticmethod
-    def _get_or_create_node(
+    def _resolve_path_ids(
+        *,
+        session,
+        scope: str,
+        l1_name: str,
+        l2_name: str,
+        l3_name: str,
+    ) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+        """Look up the L1/L2/L3 ids of a name path with a single joined query; missing levels are None."""
+        l1 = aliased(KbTaxonomyNode)
+        l2 = aliased(KbTaxonomyNode)
+        l3 = aliased(KbTaxonomyNode)
+        row = session.execute(
+            select(l1.id, l2.id, l3.id)
+            .select_from(l1)
+            .outerjoin(l2, and_(l2.parent_id == l1.id, l2.level == 2, l2.name == l2_name))
+            .outerjoin(l3, and_(l3.parent_id == l2.id, l3.level == 3, l3.name == l3_name))
+            .where(
+                l1.scope_code == scope,
+                l1.level == 1,
+                l1.parent_id.is_(None),
+                l1.name == l1_name,
+            )
+            .limit(1)
+        ).first()
+        if row is None:
+            return None, None, None
+        return tuple(int(v) if v is not None else None for v in row)  # type: ignore[return-value]
+
+    def _upsert_path(
+        self,
+        *,
+        session,
+        scope: str,
+        l1_name: str,
+        l2_name: str,
+        l3_name: str,
+        definition: str,
+    ) -> int:
+        """Ensure the L1/L2/L3 path exists, set the L3 definition and return the L3 id."""
+        l1_id, l2_id, l3_id = self._resolve_path_ids(
+            session=session,
+            scope=scope,
+            l1_name=l1_name,
+            l2_name=l2_name,
+            l3_name=l3_name,
+        )
+        if l1_id is None:
+            l1_id = self._insert_node(session=session, scope=scope, level=1, name=l1_name, parent_id=None)
+        if l2_id is None:
+            l2_id = self._insert_node(session=session, scope=scope, level=2, name=l2_name, parent_id=l1_id)
+        if l3_id is None:
+            l3_id = self._insert_node(
+                session=session,
+                scope=scope,
+                level=3,
+                name=l3_name,
+                parent_id=l2_id,
+                definition=definition,
+            )
+            fill_missing_paths(session, scope)
+        else:
+            session.execute(
+                update(KbTaxonomyNode).where(KbTaxonomyNode.id == l3_id).values(definition=definition)
+            )
+        return l3_id
+
+    @staticmethod
+    def _insert_node(
         *,
         session,
         scope: str,
         level: int,
         name: str,
         parent_id: int | None,
-    ) -> KbTaxonomyNode:
-        node = (
-            session.execute(
-                select(KbTaxonomyNode).where(
-                    KbTaxonomyNode.scope_code == scope,
-                    KbTaxonomyNode.level == level,
-                    KbTaxonomyNode.parent_id == parent_id,
-                    KbTaxonomyNode.name == name,
-                )
+        definition: str | None = None,
+    ) -> int:
+        result = session.execute(
+            insert(KbTaxonomyNode.__table__).values(
+                scope_code=scope,
+                level=level,
+                name=name,
+                parent_id=parent_id,
+                definition=definition,
             )
-            .scalars()
-            .one_or_none()
-        )
-        if node is not None:
-            return node
-
-        node = KbTaxonomyNode(
-            scope_code=scope,
-            level=level,
-            name=name,
-            parent_id=parent_id,
-            definition=None,
         )
-        session.add(node)
-        session.flush()
-        return node
+        return int(result.inserted_primary_key[0])
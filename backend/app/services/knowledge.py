@@ -3,11 +3,14 @@ from __future__ import annotations
 from typing import List, Optional, Tuple
 
 from sqlalchemy import func, or_, select
+from starlette.concurrency import run_in_threadpool
 
-from ..core.db import TargetSessionLocal
+from ..core.db import AsyncTargetSessionLocal, TargetSessionLocal
 from ..core.logging import get_logger
 from ..models.faq_review import KnowledgeItem
+from .knowledge_revision import bump_knowledge_revision
 from .review import NotFoundError
+from .status_counters import status_counters
 
 
 logger = get_logger(__name__)
@@ -28,6 +31,55 @@ class KnowledgeService:
         if page_size < 1:
             page_size = 1
 
+        filters = self._list_filters(scenario_id, status, keyword)
+        total: Optional[int] = None
+        if status and not keyword:
+            total = status_counters.knowledge_count(scenario_id, status)
+
+        with TargetSessionLocal() as session:
+            if total is None:
+                total = session.execute(self._count_stmt(filters)).scalar_one()
+            rows = session.execute(self._page_stmt(filters, page, page_size)).scalars().all()
+
+        return rows, total
+
+    async def list_items_async(
+        self,
+        *,
+        scenario_id: int,
+        status: str,
+        page: int,
+        page_size: int,
+        keyword: Optional[str] = None,
+    ) -> Tuple[List[KnowledgeItem], int]:
+        """`list_items` on the asyncio engine (or the threadpool when DB_ASYNC is off)."""
+        if AsyncTargetSessionLocal is None:
+            return await run_in_threadpool(
+                lambda: self.list_items(
+                    scenario_id=scenario_id, status=status, page=page, page_size=page_size, keyword=keyword
+                )
+            )
+
+        if page < 1:
+            page = 1
+        if page_size < 1:
+            page_size = 1
+
+        filters = self._list_filters(scenario_id, status, keyword)
+        total: Optional[int] = None
+        if status and not keyword:
+            await status_counters.ensure_fresh_async()
+            total = status_counters.knowledge_count(scenario_id, status)
+
+        async with AsyncTargetSessionLocal() as session:
+            if total is None:
+                total = (await session.execute(self._count_stmt(filters))).scalar_one()
+            rows = (await session.execute(self._page_stmt(filters, page, page_size))).scalars().all()
+
+        return rows, total
+
+    @staticmethod
+    def _list_filters(scenario_id: int, status: str, keyword: Optional[str]) -> list:
         filters = [KnowledgeItem.scenario_id == scenario_id]
         if status:
             filters.append(KnowledgeItem.status == status)
@@ -39,27 +91,21 @@ class KnowledgeService:
                     KnowledgeItem.answer.like(like_pattern),
                 )
             )
-
-        with TargetSessionLocal() as session:
-            total = (
-                session.execute(
-                    select(func.count()).select_from(KnowledgeItem).where(*filters)
-                ).scalar_one()
-            )
-
-            rows = (
-                session.execute(
-                    select(KnowledgeItem)
-                        .where(*filters)
-                        .order_by(KnowledgeItem.updated_at.desc())
-                        .offset((page - 1) * page_size)
-                        .limit(page_size)
-                )
-                .scalars()
-                .all()
-            )
-
-        return rows, total
+        return filters
+
+    @staticmethod
+    def _count_stmt(filters: list):
+        return select(func.count()).select_from(KnowledgeItem).where(*filters)
+
+    @staticmethod
+    def _page_stmt(filters: list, page: int, page_size: int):
+        return (
+            select(KnowledgeItem)
+            .where(*filters)
+            .order_by(KnowledgeItem.updated_at.desc())
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+        )
 
     def get_item(self, *, item_id: int, scenario_id: int) -> KnowledgeItem:
         with TargetSessionLocal() as session:
@@ -86,6 +132,7 @@ class KnowledgeService:
             item = session.get(KnowledgeItem, item_id)
             if item is None or item.scenario_id != scenario_id:
                 raise NotFoundError(f"Knowledge item {item_id} not found")
+            previous_status = item.status
 
             if question is not None:
                 item.question = question
@@ -93,11 +140,14 @@ class KnowledgeService:
                 item.answer = answer
             if status is not None:
                 item.status = status
+            if session.is_modified(item):
+                item.revision = bump_knowledge_revision(session, scenario_id)
 
             session.commit()
             session.refresh(item)
             session.expunge(item)
 
+        status_counters.apply_knowledge(scenario_id, previous_status, item.status)
         logger.info("Updated knowledge item %s", item_id)
         return item
 
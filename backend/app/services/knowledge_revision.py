@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import List
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..models.faq_review import KnowledgeItem
+from ..models.scenario_sync_state import ScenarioSyncState
+
+
+def bump_knowledge_revision(session: Session, scenario_id: int) -> int:
+    """
+    Increment the scenario's knowledge revision inside the caller's transaction and return it.
+
+    Stamp the knowledge_items written in the same transaction with the returned value. The
+    state row stays locked until commit, so concurrent writers of one scenario get distinct,
+    increasing revisions.
+    """
+    table = ScenarioSyncState.__table__
+    bump = (
+        update(table)
+        .where(table.c.scenario_id == scenario_id)
+        .values(knowledge_revision=table.c.knowledge_revision + 1)
+    )
+    if not session.execute(bump).rowcount:
+        try:
+            with session.begin_nested():
+                session.execute(insert(table).values(scenario_id=scenario_id, knowledge_revision=1, item_count=0))
+            return 1
+        except IntegrityError:
+            # Another writer created the row first.
+            session.execute(bump)
+    return int(
+        session.execute(select(table.c.knowledge_revision).where(table.c.scenario_id == scenario_id)).scalar_one()
+    )
+
+
+def changed_item_ids(session: Session, scenario_id: int, since_revision: int) -> List[int]:
+    """Ids of the scenario's knowledge items (any status) written after `since_revision`."""
+    rows = session.execute(
+        select(KnowledgeItem.id).where(
+            KnowledgeItem.scenario_id == scenario_id,
+            KnowledgeItem.revision > since_revision,
+        )
+    ).all()
+    return [int(row[0]) for row in rows]
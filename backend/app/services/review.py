@@ -1,16 +1,24 @@
 from __future__ import annotations
 
-from typing import List, Optional, Sequence, Tuple, TypedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple, TypedDict
 
-from sqlalchemy import func, select
+from sqlalchemy import func, insert, literal, select, update
+from starlette.concurrency import run_in_threadpool
 
-from ..core.db import TargetSessionLocal
+from ..core.db import AsyncTargetSessionLocal, TargetSessionLocal
 from ..core.logging import get_logger
 from ..models.faq_review import KnowledgeItem, PendingFAQ
+from .knowledge_revision import bump_knowledge_revision
+from .status_counters import status_counters
 
 
 logger = get_logger(__name__)
 MAX_BULK_OPERATION_SIZE = 100
+MATCHABLE_PENDING_STATUSES = ("pending", "auto_rejected")
+# Keeps the IN lists of accept/discard-matching statements to a reasonable size.
+MATCHING_ID_BATCH_SIZE = 1000
 
 
 class BulkAcceptData(TypedDict):
@@ -24,6 +32,36 @@ class NotFoundError(Exception):
     pass
 
 
+@dataclass(frozen=True)
+class PendingFAQFilter:
+    """Filter shared by the pending list and the set-based bulk operations."""
+
+    source_group_code: Optional[str] = None
+    keyword: Optional[str] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    status: str = "pending"
+
+    def to_clauses(self) -> list:
+        clauses = [PendingFAQ.status == self.status]
+        if self.keyword:
+            clauses.append(PendingFAQ.question.like(f"%{self.keyword}%"))
+        if self.source_group_code:
+            clauses.append(PendingFAQ.source_group_code == self.source_group_code)
+        if self.created_from is not None:
+            clauses.append(PendingFAQ.created_at >= self.created_from)
+        if self.created_to is not None:
+            clauses.append(PendingFAQ.created_at < self.created_to)
+        return clauses
+
+
+@dataclass
+class BulkChunkResult:
+    requested: int
+    applied: int
+    skipped: int
+
+
 class ReviewService:
     @staticmethod
     def _validate_bulk_size(count: int) -> None:
@@ -32,6 +70,13 @@ class ReviewService:
         if count > MAX_BULK_OPERATION_SIZE:
             raise ValueError(f"单次最多只能处理 {MAX_BULK_OPERATION_SIZE} 条数据")
 
+    @staticmethod
+    def _count_by_group(rows: Sequence[PendingFAQ]) -> Dict[Optional[str], int]:
+        counts: Dict[Optional[str], int] = {}
+        for row in rows:
+            counts[row.source_group_code] = counts.get(row.source_group_code, 0) + 1
+        return counts
+
     def list_pending_faqs(
         self,
         page: int,
@@ -45,33 +90,64 @@ class ReviewService:
         if page_size < 1:
             page_size = 1
 
-        offset = (page - 1) * page_size
-        filters = [PendingFAQ.status == "pending"]
-        if keyword:
-            like_pattern = f"%{keyword}%"
-            filters.append(PendingFAQ.question.like(like_pattern))
-        if source_group_code:
-            filters.append(PendingFAQ.source_group_code == source_group_code)
+        filters = PendingFAQFilter(source_group_code=source_group_code, keyword=keyword).to_clauses()
+
+        # Unfiltered totals come from the cached counters; keyword searches still need COUNT(*).
+        total: Optional[int] = None
+        if not keyword:
+            total = status_counters.pending_count("pending", group_code=source_group_code)
 
         with TargetSessionLocal() as session:
-            total = session.execute(
-                select(func.count()).select_from(PendingFAQ).where(*filters)
-            ).scalar_one()
+            if total is None:
+                total = session.execute(self._pending_count_stmt(filters)).scalar_one()
+            items = session.execute(self._pending_page_stmt(filters, page, page_size)).scalars().all()
 
-            items = (
-                session.execute(
-                    select(PendingFAQ)
-                    .where(*filters)
-                    .order_by(PendingFAQ.created_at.desc())
-                    .offset(offset)
-                    .limit(page_size)
-                )
-                .scalars()
-                .all()
-            )
+        return items, total
+
+    async def list_pending_faqs_async(
+        self,
+        page: int,
+        page_size: int,
+        keyword: Optional[str] = None,
+        source_group_code: Optional[str] = None,
+    ) -> Tuple[List[PendingFAQ], int]:
+        """`list_pending_faqs` on the asyncio engine (or the threadpool when DB_ASYNC is off)."""
+        if AsyncTargetSessionLocal is None:
+            return await run_in_threadpool(self.list_pending_faqs, page, page_size, keyword, source_group_code)
+
+        if page < 1:
+            page = 1
+        if page_size < 1:
+            page_size = 1
+
+        filters = PendingFAQFilter(source_group_code=source_group_code, keyword=keyword).to_clauses()
+
+        total: Optional[int] = None
+        if not keyword:
+            await status_counters.ensure_fresh_async()
+            total = status_counters.pending_count("pending", group_code=source_group_code)
+
+        async with AsyncTargetSessionLocal() as session:
+            if total is None:
+                total = (await session.execute(self._pending_count_stmt(filters))).scalar_one()
+            items = (await session.execute(self._pending_page_stmt(filters, page, page_size))).scalars().all()
 
         return items, total
 
+    @staticmethod
+    def _pending_count_stmt(filters: list):
+        return select(func.count()).select_from(PendingFAQ).where(*filters)
+
+    @staticmethod
+    def _pending_page_stmt(filters: list, page: int, page_size: int):
+        return (
+            select(PendingFAQ)
+            .where(*filters)
+            .order_by(PendingFAQ.created_at.desc())
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+        )
+
     def accept_pending_faq(
         self,
         pending_faq_id: int,
@@ -97,6 +173,7 @@ class ReviewService:
                 question=question,
                 answer=answer,
                 status="active",
+                revision=bump_knowledge_revision(session, scenario_id),
             )
             session.add(item)
 
@@ -104,7 +181,10 @@ class ReviewService:
 
             session.commit()
             session.refresh(item)
+            group_code = pending.source_group_code
 
+        status_counters.apply_pending(group_code, "pending", "processed")
+        status_counters.apply_knowledge(scenario_id, None, "active")
         logger.info("Accepted pending FAQ %s as knowledge item %s", pending_faq_id, item.id)
         return item
 
@@ -123,7 +203,9 @@ class ReviewService:
 
             pending.status = "discarded"
             session.commit()
+            group_code = pending.source_group_code
 
+        status_counters.apply_pending(group_code, "pending", "discarded")
         logger.info("Discarded pending FAQ %s", pending_faq_id)
 
     def bulk_accept_pending_faqs(
@@ -155,6 +237,7 @@ class ReviewService:
                 if missing:
                     raise NotFoundError(f"Pending FAQ {missing[0]} not found")
 
+                revision = bump_knowledge_revision(session, scenario_id)
                 for payload in payloads:
                     pending = pending_map[payload["pending_faq_id"]]
                     if pending.status != "pending":
@@ -173,10 +256,14 @@ class ReviewService:
                         question=payload["question"],
                         answer=payload["answer"],
                         status="active",
+                        revision=revision,
                     )
                     session.add(item)
                     pending.status = "processed"
 
+        for group_code, count in self._count_by_group(pending_rows).items():
+            status_counters.apply_pending(group_code, "pending", "processed", count)
+        status_counters.apply_knowledge(scenario_id, None, "active", len(payloads))
         logger.info("Bulk accepted %s pending FAQs", len(payloads))
         return len(payloads)
 
@@ -218,5 +305,185 @@ class ReviewService:
 
                     pending.status = "discarded"
 
+        for group_code, count in self._count_by_group(pending_rows).items():
+            status_counters.apply_pending(group_code, "pending", "discarded", count)
         logger.info("Bulk discarded %s pending FAQs", len(pending_faq_ids))
         return len(pending_faq_ids)
+
+    def count_matching(self, pending_filter: PendingFAQFilter) -> int:
+        with TargetSessionLocal() as session:
+            return session.execute(
+                select(func.count()).select_from(PendingFAQ).where(*pending_filter.to_clauses())
+            ).scalar_one()
+
+    def iter_matching_id_chunks(self, pending_filter: PendingFAQFilter, chunk_size: int):
+        """Yield id chunks matching the filter using keyset pagination on the primary key."""
+        last_id = 0
+        while True:
+            with TargetSessionLocal() as session:
+                ids = (
+                    session.execute(
+                        select(PendingFAQ.id)
+                        .where(*pending_filter.to_clauses(), PendingFAQ.id > last_id)
+                        .order_by(PendingFAQ.id.asc())
+                        .limit(chunk_size)
+                    )
+                    .scalars()
+                    .all()
+                )
+            if not ids:
+                return
+            last_id = int(ids[-1])
+            yield [int(pid) for pid in ids]
+
+    def apply_bulk_chunk(
+        self,
+        *,
+        action: str,
+        pending_faq_ids: Sequence[int],
+        scenario_id: int,
+        allowed_group_code: Optional[str] = None,
+    ) -> BulkChunkResult:
+        """
+        Accept or discard one chunk in its own transaction.
+
+        Unlike the interactive bulk endpoints, rows that are no longer pending or
+        belong to another group are skipped instead of failing the whole chunk, and
+        accepted rows keep the question/answer text extracted by the AI.
+        """
+        if action not in ("accept", "discard"):
+            raise ValueError(f"Unsupported bulk action: {action}")
+        if not pending_faq_ids:
+            return BulkChunkResult(requested=0, applied=0, skipped=0)
+
+        clauses = [PendingFAQ.id.in_(pending_faq_ids), PendingFAQ.status == "pending"]
+        if allowed_group_code:
+            clauses.append(PendingFAQ.source_group_code == allowed_group_code)
+
+        with TargetSessionLocal() as session:
+            with session.begin():
+                rows = session.execute(
+                    select(
+                        PendingFAQ.id,
+                        PendingFAQ.question,
+                        PendingFAQ.answer,
+                        PendingFAQ.source_group_code,
+                    )
+                    .where(*clauses)
+                    .with_for_update()
+                ).all()
+                if rows:
+                    applied_ids = [int(row.id) for row in rows]
+                    # executemany: one statement for the whole chunk instead of an ORM flush per row
+                    if action == "accept":
+                        revision = bump_knowledge_revision(session, scenario_id)
+                        session.execute(
+                            insert(KnowledgeItem.__table__),
+                            [
+                                {
+                                    "scenario_id": scenario_id,
+                                    "question": row.question,
+                                    "answer": row.answer,
+                                    "status": "active",
+                                    "revision": revision,
+                                }
+                                for row in rows
+                            ],
+                        )
+                    session.execute(
+                        update(PendingFAQ)
+                        .where(PendingFAQ.id.in_(applied_ids))
+                        .values(status="processed" if action == "accept" else "discarded")
+                        .execution_options(synchronize_session=False)
+                    )
+
+        to_status = "processed" if action == "accept" else "discarded"
+        for group_code, count in self._count_by_group(rows).items():
+            status_counters.apply_pending(group_code, "pending", to_status, count)
+        if action == "accept":
+            status_counters.apply_knowledge(scenario_id, None, "active", len(rows))
+
+        return BulkChunkResult(
+            requested=len(pending_faq_ids),
+            applied=len(rows),
+            skipped=len(pending_faq_ids) - len(rows),
+        )
+
+    def accept_matching(
+        self,
+        *,
+        pending_filter: PendingFAQFilter,
+        scenario_id: int,
+        dry_run: bool = False,
+    ) -> Tuple[int, int]:
+        """
+        Accept every FAQ matching the filter: lock the matching ids, then INSERT ... SELECT
+        and UPDATE exactly those ids in one transaction.
+
+        Returns (matched, applied). With dry_run only the matched count is computed.
+        """
+        return self._apply_matching("accept", pending_filter, scenario_id, dry_run)
+
+    def discard_matching(self, *, pending_filter: PendingFAQFilter, dry_run: bool = False) -> Tuple[int, int]:
+        """Discard every FAQ matching the filter (locked id set, one transaction). Returns (matched, applied)."""
+        return self._apply_matching("discard", pending_filter, None, dry_run)
+
+    def _apply_matching(
+        self,
+        action: str,
+        pending_filter: PendingFAQFilter,
+        scenario_id: Optional[int],
+        dry_run: bool,
+    ) -> Tuple[int, int]:
+        if pending_filter.status not in MATCHABLE_PENDING_STATUSES:
+            raise ValueError(f"status 仅支持 {', '.join(MATCHABLE_PENDING_STATUSES)}")
+
+        if dry_run:
+            return self.count_matching(pending_filter), 0
+
+        to_status = "processed" if action == "accept" else "discarded"
+        inserted = 0
+        applied = 0
+        with TargetSessionLocal() as session:
+            with session.begin():
+                # Lock the matching rows first, then insert from and update exactly that id set:
+                # rows extracted or reviewed by someone else mid-operation are left alone.
+                locked = session.execute(
+                    select(PendingFAQ.id, PendingFAQ.source_group_code)
+                    .where(*pending_filter.to_clauses())
+                    .order_by(PendingFAQ.id)
+                    .with_for_update()
+                ).all()
+                if not locked:
+                    return 0, 0
+
+                locked_ids = [int(row.id) for row in locked]
+                revision = bump_knowledge_revision(session, scenario_id) if action == "accept" else None
+                for start in range(0, len(locked_ids), MATCHING_ID_BATCH_SIZE):
+                    batch = locked_ids[start : start + MATCHING_ID_BATCH_SIZE]
+                    if action == "accept":
+                        inserted += session.execute(
+                            insert(KnowledgeItem).from_select(
+                                ["scenario_id", "question", "answer", "status", "revision"],
+                                select(
+                                    literal(scenario_id),
+                                    PendingFAQ.question,
+                                    PendingFAQ.answer,
+                                    literal("active"),
+                                    literal(revision),
+                                ).where(PendingFAQ.id.in_(batch)),
+                            )
+                        ).rowcount
+                    applied += session.execute(
+                        update(PendingFAQ)
+                        .where(PendingFAQ.id.in_(batch))
+                        .values(status=to_status)
+                        .execution_options(synchronize_session=False)
+                    ).rowcount
+
+        for group_code, count in self._count_by_group(locked).items():
+            status_counters.apply_pending(group_code, pending_filter.status, to_status, count)
+        if action == "accept":
+            status_counters.apply_knowledge(scenario_id, None, "active", inserted)
+        logger.info("%s %s pending FAQs matching filter", "Accepted" if action == "accept" else "Discarded", applied)
+        return len(locked), applied
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from ..core.logging import get_logger
+from .job_queue import JobContext, JobInfo, JobNotFoundError, job_queue
+from .review import PendingFAQFilter, ReviewService
+
+
+logger = get_logger(__name__)
+
+REVIEW_BULK_JOB_KIND = "review_bulk"
+BULK_JOB_CHUNK_SIZE = 200
+MAX_BULK_JOB_IDS = 20000
+# Bounds on what a job writes to background_jobs.result (TEXT): filter jobs have no row cap and
+# database error strings include the full SQL.
+MAX_RECORDED_FAILED_CHUNKS = 20
+CHUNK_ERROR_MAX_LENGTH = 500
+
+
+class BulkJobChunksFailed(Exception):
+    pass
+
+
+@dataclass
+class BulkJobChunk:
+    index: int
+    requested: int
+    applied: int
+    skipped: int
+    error: Optional[str] = None
+
+
+@dataclass
+class BulkJobState:
+    job_id: str
+    action: str
+    scenario_id: int
+    status: str = "queued"  # queued|running|succeeded|failed|cancelled
+    total: Optional[int] = None
+    processed: int = 0
+    applied: int = 0
+    skipped: int = 0
+    failed_chunks: int = 0
+    # Only the first MAX_RECORDED_FAILED_CHUNKS failed chunks are kept.
+    chunks: List[BulkJobChunk] = field(default_factory=list)
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @classmethod
+    def from_job(cls, job: JobInfo) -> "BulkJobState":
+        return cls(
+            job_id=job.job_id,
+            action=job.payload["action"],
+            scenario_id=int(job.payload["scenario_id"]),
+            status=job.status,
+            total=job.progress_total,
+            processed=job.progress_current,
+            applied=int(job.result.get("applied", 0)),
+            skipped=int(job.result.get("skipped", 0)),
+            failed_chunks=int(job.result.get("failed_chunks", 0)),
+            chunks=[BulkJobChunk(**chunk) for chunk in job.result.get("chunks", [])],
+            error=job.error,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+        )
+
+
+class ReviewBulkJobService:
+    """
+    Runs large accept/discard requests as `review_bulk` jobs on the background job queue,
+    one transaction per chunk.
+
+    A failed chunk is rolled back on its own and recorded; later chunks still run, so a
+    job can finish with partial results. Running totals and the failed chunks are written to
+    the job row with each progress update, so any process can answer status requests.
+    """
+
+    def __init__(self, review_service: Optional[ReviewService] = None, chunk_size: int = BULK_JOB_CHUNK_SIZE) -> None:
+        self.review_service = review_service or ReviewService()
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def build_payload(
+        *,
+        action: str,
+        scenario_id: int,
+        allowed_group_code: Optional[str],
+        pending_faq_ids: Optional[Sequence[int]] = None,
+        pending_filter: Optional[PendingFAQFilter] = None,
+    ) -> Dict[str, Any]:
+        """Validate a request and return the job payload to enqueue as REVIEW_BULK_JOB_KIND."""
+        if action not in ("accept", "discard"):
+            raise ValueError("action 仅支持 accept 或 discard")
+        if (pending_faq_ids is None) == (pending_filter is None):
+            raise ValueError("pendingFaqIds 与 filter 必须且只能提供一个")
+        payload: Dict[str, Any] = {
+            "action": action,
+            "scenario_id": scenario_id,
+            # The group restriction always comes from the caller's scenario, never from the request.
+            "source_group_code": allowed_group_code,
+        }
+        if pending_faq_ids is not None:
+            pending_faq_ids = list(dict.fromkeys(int(pid) for pid in pending_faq_ids))
+            if not pending_faq_ids:
+                raise ValueError("至少需要选择一条数据进行操作")
+            if len(pending_faq_ids) > MAX_BULK_JOB_IDS:
+                raise ValueError(f"单个批量任务最多处理 {MAX_BULK_JOB_IDS} 条数据")
+            payload["pending_faq_ids"] = pending_faq_ids
+        else:
+            payload["filter"] = {
+                "keyword": pending_filter.keyword,
+                "created_from": pending_filter.created_from.isoformat() if pending_filter.created_from else None,
+                "created_to": pending_filter.created_to.isoformat() if pending_filter.created_to else None,
+            }
+        return payload
+
+    @staticmethod
+    def active_key(scenario_id: int) -> str:
+        """One bulk job per scenario at a time; concurrent jobs would contend for the same rows."""
+        return f"{REVIEW_BULK_JOB_KIND}:{scenario_id}"
+
+    @staticmethod
+    def get_job(job_id: str) -> Optional[BulkJobState]:
+        try:
+            job = job_queue.get(job_id)
+        except JobNotFoundError:
+            return None
+        if job.kind != REVIEW_BULK_JOB_KIND:
+            return None
+        return BulkJobState.from_job(job)
+
+    def run(self, ctx: JobContext) -> None:
+        """Job handler: apply the chunks and report counts after each one."""
+        action = ctx.payload["action"]
+        scenario_id = int(ctx.payload["scenario_id"])
+        allowed_group_code = ctx.payload.get("source_group_code")
+        pending_faq_ids = ctx.payload.get("pending_faq_ids")
+
+        if pending_faq_ids is not None:
+            total = len(pending_faq_ids)
+            chunks: Iterable[List[int]] = (
+                pending_faq_ids[i : i + self.chunk_size] for i in range(0, len(pending_faq_ids), self.chunk_size)
+            )
+        else:
+            filter_payload = ctx.payload["filter"]
+            pending_filter = PendingFAQFilter(
+                source_group_code=allowed_group_code,
+                keyword=filter_payload.get("keyword"),
+                created_from=_parse_datetime(filter_payload.get("created_from")),
+                created_to=_parse_datetime(filter_payload.get("created_to")),
+            )
+            total = self.review_service.count_matching(pending_filter)
+            chunks = self.review_service.iter_matching_id_chunks(pending_filter, self.chunk_size)
+
+        result: Dict[str, Any] = {"applied": 0, "skipped": 0, "failed_chunks": 0, "chunks": []}
+        processed = 0
+        ctx.progress(processed, total, f"{action} 0/{total}", result=result)
+        for index, chunk_ids in enumerate(chunks):
+            chunk = self._run_chunk(ctx.job_id, action, index, chunk_ids, scenario_id, allowed_group_code)
+            if chunk.error:
+                result["failed_chunks"] += 1
+                if len(result["chunks"]) < MAX_RECORDED_FAILED_CHUNKS:
+                    result["chunks"].append(asdict(chunk))
+            result["applied"] += chunk.applied
+            result["skipped"] += chunk.skipped
+            processed += chunk.requested
+            ctx.progress(processed, total, f"{action} {processed}/{total}", result=result)
+
+        failed = result["failed_chunks"]
+        logger.info(
+            "Review bulk job %s finished: applied=%d skipped=%d failed_chunks=%d",
+            ctx.job_id,
+            result["applied"],
+            result["skipped"],
+            failed,
+        )
+        if failed:
+            raise BulkJobChunksFailed(f"{failed} 个分块失败，首个错误: {result['chunks'][0]['error']}")
+
+    def _run_chunk(
+        self,
+        job_id: str,
+        action: str,
+        index: int,
+        chunk_ids: List[int],
+        scenario_id: int,
+        allowed_group_code: Optional[str],
+    ) -> BulkJobChunk:
+        try:
+            result = self.review_service.apply_bulk_chunk(
+                action=action,
+                pending_faq_ids=chunk_ids,
+                scenario_id=scenario_id,
+                allowed_group_code=allowed_group_code,
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.exception("Review bulk job %s chunk %d failed", job_id, index)
+            error = (str(exc) or exc.__class__.__name__)[:CHUNK_ERROR_MAX_LENGTH]
+            return BulkJobChunk(index=index, requested=len(chunk_ids), applied=0, skipped=0, error=error)
+        return BulkJobChunk(index=index, requested=result.requested, applied=result.applied, skipped=result.skipped)
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+review_bulk_jobs = ReviewBulkJobService()
@@ -3,14 +3,25 @@ from __future__ import annotations
 from typing import List, Tuple
 
 from sqlalchemy import func, select
+from starlette.concurrency import run_in_threadpool
 
-from ..core.db import TargetSessionLocal
+from ..core.cache import TTLCache
+from ..core.db import AsyncTargetSessionLocal, TargetSessionLocal
 from ..core.logging import get_logger
+from ..core.settings import get_settings
 from ..models.scenario import Scenario
 from .review import NotFoundError
 
 
 logger = get_logger(__name__)
+settings = get_settings()
+
+# Shared by every ScenarioService instance; entries are detached Scenario rows.
+scenario_cache: TTLCache[int, Scenario] = TTLCache(settings.cache.scenario_ttl_seconds)
+
+
+def invalidate_cached_scenario(scenario_id: int) -> None:
+    scenario_cache.invalidate(scenario_id)
 
 
 class ScenarioService:
@@ -55,12 +66,29 @@ class ScenarioService:
         return scenario
 
     def get_scenario(self, scenario_id: int) -> Scenario:
+        return scenario_cache.get_or_load(scenario_id, lambda: self._load_scenario(scenario_id))
+
+    async def get_scenario_async(self, scenario_id: int) -> Scenario:
+        return await scenario_cache.get_or_load_async(scenario_id, lambda: self._load_scenario_async(scenario_id))
+
+    @staticmethod
+    def _load_scenario(scenario_id: int) -> Scenario:
         with TargetSessionLocal() as session:
             scenario = session.get(Scenario, scenario_id)
             if scenario is None:
                 raise NotFoundError(f"Scenario {scenario_id} not found")
         return scenario
 
+    @classmethod
+    async def _load_scenario_async(cls, scenario_id: int) -> Scenario:
+        if AsyncTargetSessionLocal is None:
+            return await run_in_threadpool(cls._load_scenario, scenario_id)
+        async with AsyncTargetSessionLocal() as session:
+            scenario = await session.get(Scenario, scenario_id)
+        if scenario is None:
+            raise NotFoundError(f"Scenario {scenario_id} not found")
+        return scenario
+
     def update_scenario(self, scenario_id: int, **fields) -> Scenario:
         with TargetSessionLocal() as session:
             scenario = session.get(Scenario, scenario_id)
@@ -74,5 +102,6 @@ class ScenarioService:
             session.commit()
             session.refresh(scenario)
 
+        invalidate_cached_scenario(scenario_id)
         logger.info("Updated scenario %s", scenario_id)
         return scenario
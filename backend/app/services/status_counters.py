@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import func, select
+from starlette.concurrency import run_in_threadpool
+
+from ..core.db import AsyncTargetSessionLocal, TargetSessionLocal
+from ..core.logging import get_logger
+from ..core.metrics import PENDING_FAQ_TRANSITIONS
+from ..core.settings import get_settings
+from ..models.faq_review import KnowledgeItem, PendingFAQ
+
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+PendingKey = Tuple[Optional[str], str]
+KnowledgeKey = Tuple[int, str]
+
+
+class StatusCounterCache:
+    """
+    In-process counts of pending_faqs per (source_group_code, status) and
+    knowledge_items per (scenario_id, status).
+
+    The snapshot is seeded with two GROUP BY queries and then adjusted by the
+    review/extraction services after each successful commit. It is re-seeded
+    once the TTL expires so writes from other processes are picked up.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None) -> None:
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.cache.status_counter_ttl_seconds
+        self._lock = threading.Lock()
+        self._pending: Dict[PendingKey, int] = {}
+        self._knowledge: Dict[KnowledgeKey, int] = {}
+        self._loaded_at: Optional[float] = None
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = None
+
+    def pending_count(self, status: str, group_code: Optional[str] = None) -> int:
+        self._ensure_fresh()
+        with self._lock:
+            if group_code:
+                return self._pending.get((group_code, status), 0)
+            return sum(count for (_, s), count in self._pending.items() if s == status)
+
+    def pending_counts(self, group_code: Optional[str] = None) -> Dict[str, int]:
+        self._ensure_fresh()
+        counts: Dict[str, int] = {}
+        with self._lock:
+            for (code, status), count in self._pending.items():
+                if group_code and code != group_code:
+                    continue
+                counts[status] = counts.get(status, 0) + count
+        return counts
+
+    def knowledge_count(self, scenario_id: int, status: str) -> int:
+        self._ensure_fresh()
+        with self._lock:
+            return self._knowledge.get((scenario_id, status), 0)
+
+    def knowledge_counts(self, scenario_id: int) -> Dict[str, int]:
+        self._ensure_fresh()
+        with self._lock:
+            return {status: count for (sid, status), count in self._knowledge.items() if sid == scenario_id}
+
+    def apply_pending(
+        self,
+        group_code: Optional[str],
+        from_status: Optional[str],
+        to_status: Optional[str],
+        count: int = 1,
+    ) -> None:
+        """Move `count` pending FAQs between statuses. Call only after the change is committed."""
+        if count <= 0:
+            return
+        PENDING_FAQ_TRANSITIONS.inc(count, from_status=from_status or "none", to_status=to_status or "none")
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            if from_status:
+                key = (group_code, from_status)
+                self._pending[key] = max(self._pending.get(key, 0) - count, 0)
+            if to_status:
+                key = (group_code, to_status)
+                self._pending[key] = self._pending.get(key, 0) + count
+
+    def apply_knowledge(
+        self,
+        scenario_id: int,
+        from_status: Optional[str],
+        to_status: Optional[str],
+        count: int = 1,
+    ) -> None:
+        """Move `count` knowledge items between statuses. Call only after the change is committed."""
+        if count <= 0 or from_status == to_status:
+            return
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            if from_status:
+                key = (scenario_id, from_status)
+                self._knowledge[key] = max(self._knowledge.get(key, 0) - count, 0)
+            if to_status:
+                key = (scenario_id, to_status)
+                self._knowledge[key] = self._knowledge.get(key, 0) + count
+
+    def _is_fresh(self) -> bool:
+        with self._lock:
+            loaded_at = self._loaded_at
+        return loaded_at is not None and time.monotonic() - loaded_at < self.ttl_seconds
+
+    def _ensure_fresh(self) -> None:
+        if self._is_fresh():
+            return
+        self._reload()
+
+    async def ensure_fresh_async(self) -> None:
+        """Re-seed through the asyncio engine if stale, so the count getters do not block the event loop."""
+        if self._is_fresh():
+            return
+        if AsyncTargetSessionLocal is None:
+            await run_in_threadpool(self._reload)
+            return
+        async with AsyncTargetSessionLocal() as session:
+            pending_rows = (await session.execute(self._pending_counts_stmt())).all()
+            knowledge_rows = (await session.execute(self._knowledge_counts_stmt())).all()
+        self._publish(pending_rows, knowledge_rows)
+
+    @staticmethod
+    def _pending_counts_stmt():
+        return select(PendingFAQ.source_group_code, PendingFAQ.status, func.count()).group_by(
+            PendingFAQ.source_group_code, PendingFAQ.status
+        )
+
+    @staticmethod
+    def _knowledge_counts_stmt():
+        return select(KnowledgeItem.scenario_id, KnowledgeItem.status, func.count()).group_by(
+            KnowledgeItem.scenario_id, KnowledgeItem.status
+        )
+
+    def _reload(self) -> None:
+        with TargetSessionLocal() as session:
+            pending_rows = session.execute(self._pending_counts_stmt()).all()
+            knowledge_rows = session.execute(self._knowledge_counts_stmt()).all()
+        self._publish(pending_rows, knowledge_rows)
+
+    def _publish(self, pending_rows, knowledge_rows) -> None:
+        pending = {(code, status): int(count) for code, status, count in pending_rows}
+        knowledge = {(int(sid), status): int(count) for sid, status, count in knowledge_rows}
+        with self._lock:
+            self._pending = pending
+            self._knowledge = knowledge
+            self._loaded_at = time.monotonic()
+        logger.debug(
+            "Status counters reloaded (pending keys=%d knowledge keys=%d)",
+            len(pending),
+            len(knowledge),
+        )
+
+
+status_counters = StatusCounterCache()
@@ -0,0 +1,487 @@
+from __future__ import annotations
+
+import json
+import random
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy import and_, bindparam, func, or_, select, update
+
+from ..core.db import SourceSessionLocal, TargetSessionLocal
+from ..core.logging import get_logger
+from ..core.settings import get_settings
+from ..models.work_order import (
+    WorkOrder,
+    WorkOrderAggregationWatermark,
+    WorkOrderCategoryCounter,
+    WorkOrderCategoryHit,
+    WorkOrderCategorySample,
+)
+from .kb_taxonomy_cache import taxonomy_snapshots
+
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+CANDIDATE_THRESHOLD = 50
+SAMPLE_SIZE = 20
+SCAN_BATCH_SIZE = 1000
+# Rows whose update_time is this recent are left for the next run, so a transaction that
+# commits slightly out of order is not skipped by the watermark.
+WATERMARK_LAG = timedelta(minutes=5)
+MAX_NAME_LENGTH = 128
+
+# group_code=2: nature -> (scope_code, expected ticket_type array length)
+BUS_LAYOUTS: Dict[str, Tuple[str, int]] = {
+    "自行车": ("bike", 2),
+    "公交": ("bus", 3),
+}
+# Level of kb_taxonomy_nodes that holds the "三级" name of each scope.
+EXISTENCE_LEVEL: Dict[str, int] = {"water": 3, "bus": 3, "bike": 2}
+
+
+@dataclass(frozen=True)
+class CategoryKey:
+    scope_code: str
+    l1: str
+    l2: str
+    l3: str
+
+
+@dataclass
+class CandidateCategory:
+    scope_code: str
+    month: str
+    l1_name: Optional[str]
+    l2_name: str
+    l3_name: str
+    count: int
+    samples: List[str] = field(default_factory=list)
+
+
+@dataclass
+class AggregationRunResult:
+    month: str
+    scanned: int = 0
+    counted: int = 0
+    moved: int = 0
+    ignored: int = 0
+    watermark: Optional[datetime] = None
+
+
+@dataclass
+class _MonthState:
+    counter_ids: Dict[CategoryKey, int]
+    counts: Dict[int, int]
+    filled: Dict[int, int]
+
+
+def parse_work_order_category(
+    group_code: object,
+    nature: Optional[str],
+    ticket_type: Optional[str],
+    type_details: Optional[str],
+) -> Optional[CategoryKey]:
+    """Map a work_order row to its (scope, l1, l2, l3) per prd1.16, or None if it should be skipped."""
+    code = str(group_code).strip() if group_code is not None else ""
+    nature = (nature or "").strip()
+    if code == "1":
+        names = [nature, (ticket_type or "").strip(), (type_details or "").strip()]
+        scope = "water"
+    elif code == "2":
+        layout = BUS_LAYOUTS.get(nature)
+        if layout is None:
+            return None
+        scope, expected_length = layout
+        try:
+            values = json.loads(ticket_type or "")
+        except (TypeError, ValueError):
+            return None
+        if not isinstance(values, list) or len(values) != expected_length:
+            return None
+        names = ["", str(values[0]).strip(), str(values[-1]).strip()]
+    else:
+        return None
+
+    if not names[1] or not names[2] or (scope == "water" and not names[0]):
+        return None
+    if any(len(name) > MAX_NAME_LENGTH for name in names):
+        return None
+    return CategoryKey(scope_code=scope, l1=names[0], l2=names[1], l3=names[2])
+
+
+def reservoir_slot(seen: int, filled: int, size: int, rng: random.Random) -> Optional[int]:
+    """
+    Algorithm R: slot for the `seen`-th item (1-based) of a stream, or None to drop it.
+
+    While the reservoir is not full every item is kept; afterwards the item replaces
+    a random slot with probability size/seen.
+    """
+    if filled < size:
+        return filled
+    index = rng.randrange(seen)
+    return index if index < size else None
+
+
+def month_bounds(year: int, month: int) -> Tuple[datetime, datetime]:
+    start = datetime(year, month, 1)
+    end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+    return start, end
+
+
+class TaxonomyCandidateService:
+    """
+    Incremental monthly counters of work_order L3 categories missing from kb_taxonomy_nodes.
+
+    Each run reads only rows with update_time past the month's watermark and adds them to
+    per-(scope, month, l1, l2, l3) counters. Every counted work order is remembered in
+    work_order_category_hits, so a row updated again moves between counters instead of
+    being counted twice. Up to `sample_size` appeal_content samples are kept per counter
+    by reservoir sampling during the same scan.
+    """
+
+    _run_lock = threading.Lock()
+
+    def __init__(
+        self,
+        batch_size: int = SCAN_BATCH_SIZE,
+        sample_size: int = SAMPLE_SIZE,
+        rng: Optional[random.Random] = None,
+        timezone: Optional[str] = None,
+    ) -> None:
+        self.batch_size = batch_size
+        self.sample_size = sample_size
+        self.rng = rng or random.Random()
+        self.timezone = timezone or settings.scheduler.timezone
+        self._name_sets: Dict[str, Tuple[str, FrozenSet[str]]] = {}
+
+    def run_incremental(self, now: Optional[datetime] = None) -> List[AggregationRunResult]:
+        """Advance the previous and the current month; the previous one only picks up late updates."""
+        now = now or self._local_now()
+        current = (now.year, now.month)
+        previous = (now.year - 1, 12) if now.month == 1 else (now.year, now.month - 1)
+        return [self.aggregate_month(year, month, now=now) for year, month in (previous, current)]
+
+    def aggregate_month(self, year: int, month: int, now: Optional[datetime] = None) -> AggregationRunResult:
+        stat_month = f"{year:04d}-{month:02d}"
+        start, end = month_bounds(year, month)
+        upper = min(end, (now or self._local_now()) - WATERMARK_LAG)
+        result = AggregationRunResult(month=stat_month)
+        if upper <= start:
+            return result
+
+        with self._run_lock:
+            state, watermark = self._load_month_state(stat_month)
+            result.watermark = watermark[0] if watermark else None
+            while True:
+                rows = self._fetch_batch(start, upper, watermark)
+                if not rows:
+                    break
+                watermark = (rows[-1].update_time, int(rows[-1].id))
+                self._apply_batch(stat_month, rows, state, watermark, result)
+                result.watermark = watermark[0]
+                if len(rows) < self.batch_size:
+                    break
+
+        logger.info(
+            "Work order aggregation %s - scanned:%d counted:%d moved:%d ignored:%d",
+            stat_month,
+            result.scanned,
+            result.counted,
+            result.moved,
+            result.ignored,
+        )
+        return result
+
+    def list_candidates(
+        self, year: int, month: int, threshold: int = CANDIDATE_THRESHOLD
+    ) -> List[CandidateCategory]:
+        """Categories of the month at or above the threshold that are still missing from the taxonomy."""
+        stat_month = f"{year:04d}-{month:02d}"
+        with TargetSessionLocal() as session:
+            counters = session.execute(
+                select(
+                    WorkOrderCategoryCounter.id,
+                    WorkOrderCategoryCounter.scope_code,
+                    WorkOrderCategoryCounter.l1_name,
+                    WorkOrderCategoryCounter.l2_name,
+                    WorkOrderCategoryCounter.l3_name,
+                    WorkOrderCategoryCounter.occurrence_count,
+                )
+                .where(
+                    WorkOrderCategoryCounter.stat_month == stat_month,
+                    WorkOrderCategoryCounter.occurrence_count >= threshold,
+                )
+                .order_by(WorkOrderCategoryCounter.occurrence_count.desc(), WorkOrderCategoryCounter.id)
+            ).all()
+            # A name may have been added to the taxonomy after it was counted.
+            counters = [row for row in counters if row.l3_name not in self.existing_names(row.scope_code)]
+
+            samples: Dict[int, List[str]] = defaultdict(list)
+            if counters:
+                sample_rows = session.execute(
+                    select(WorkOrderCategorySample.counter_id, WorkOrderCategorySample.appeal_content)
+                    .where(WorkOrderCategorySample.counter_id.in_([row.id for row in counters]))
+                    .order_by(WorkOrderCategorySample.counter_id, WorkOrderCategorySample.slot)
+                ).all()
+                for sample in sample_rows:
+                    samples[int(sample.counter_id)].append(sample.appeal_content)
+
+        return [
+            CandidateCategory(
+                scope_code=row.scope_code,
+                month=stat_month,
+                l1_name=row.l1_name or None,
+                l2_name=row.l2_name,
+                l3_name=row.l3_name,
+                count=int(row.occurrence_count),
+                samples=samples.get(int(row.id), []),
+            )
+            for row in counters
+        ]
+
+    def existing_names(self, scope: str) -> FrozenSet[str]:
+        snapshot = taxonomy_snapshots.get(scope)
+        cached = self._name_sets.get(scope)
+        if cached is not None and cached[0] == snapshot.etag:
+            return cached[1]
+        level = EXISTENCE_LEVEL.get(scope, 3)
+        names = frozenset(node.name for node in snapshot.nodes.values() if node.level == level)
+        self._name_sets[scope] = (snapshot.etag, names)
+        return names
+
+    @staticmethod
+    def _classify(row, existing: Dict[str, FrozenSet[str]]) -> Optional[CategoryKey]:
+        key = parse_work_order_category(row.group_code, row.nature, row.ticket_type, row.work_order_type_details)
+        if key is None or key.l3 in existing[key.scope_code]:
+            return None
+        return key
+
+    def _local_now(self) -> datetime:
+        try:
+            tz = ZoneInfo(self.timezone)
+        except ZoneInfoNotFoundError:
+            tz = ZoneInfo("UTC")
+        return datetime.now(tz).replace(tzinfo=None)
+
+    @staticmethod
+    def _load_month_state(stat_month: str) -> Tuple[_MonthState, Optional[Tuple[datetime, int]]]:
+        with TargetSessionLocal() as session:
+            counters = session.execute(
+                select(
+                    WorkOrderCategoryCounter.id,
+                    WorkOrderCategoryCounter.scope_code,
+                    WorkOrderCategoryCounter.l1_name,
+                    WorkOrderCategoryCounter.l2_name,
+                    WorkOrderCategoryCounter.l3_name,
+                    WorkOrderCategoryCounter.occurrence_count,
+                ).where(WorkOrderCategoryCounter.stat_month == stat_month)
+            ).all()
+            filled = dict(
+                session.execute(
+                    select(WorkOrderCategorySample.counter_id, func.count(WorkOrderCategorySample.id))
+                    .join(WorkOrderCategoryCounter, WorkOrderCategoryCounter.id == WorkOrderCategorySample.counter_id)
+                    .where(WorkOrderCategoryCounter.stat_month == stat_month)
+                    .group_by(WorkOrderCategorySample.counter_id)
+                ).all()
+            )
+            mark = session.get(WorkOrderAggregationWatermark, stat_month)
+
+        state = _MonthState(
+            counter_ids={
+                CategoryKey(row.scope_code, row.l1_name, row.l2_name, row.l3_name): int(row.id) for row in counters
+            },
+            counts={int(row.id): int(row.occurrence_count) for row in counters},
+            filled={int(counter_id): int(count) for counter_id, count in filled.items()},
+        )
+        watermark = (mark.last_update_time, int(mark.last_work_order_id)) if mark is not None else None
+        return state, watermark
+
+    def _fetch_batch(
+        self, start: datetime, upper: datetime, watermark: Optional[Tuple[datetime, int]]
+    ) -> Sequence:
+        stmt = select(
+            WorkOrder.id,
+            WorkOrder.group_code,
+            WorkOrder.nature,
+            WorkOrder.ticket_type,
+            WorkOrder.work_order_type_details,
+            WorkOrder.appeal_content,
+            WorkOrder.update_time,
+        ).where(WorkOrder.update_time >= start, WorkOrder.update_time < upper)
+        if watermark is not None:
+            last_time, last_id = watermark
+            stmt = stmt.where(
+                or_(
+                    WorkOrder.update_time > last_time,
+                    and_(WorkOrder.update_time == last_time, WorkOrder.id > last_id),
+                )
+            )
+        stmt = stmt.order_by(WorkOrder.update_time, WorkOrder.id).limit(self.batch_size)
+        with SourceSessionLocal() as session:
+            return session.execute(stmt).all()
+
+    def _apply_batch(
+        self,
+        stat_month: str,
+        rows: Sequence,
+        state: _MonthState,
+        watermark: Tuple[datetime, int],
+        result: AggregationRunResult,
+    ) -> None:
+        # One snapshot version check per scope and batch, outside the write transaction.
+        existing = {scope: self.existing_names(scope) for scope in EXISTENCE_LEVEL}
+        with TargetSessionLocal() as session:
+            with session.begin():
+                previous_hits: Dict[int, int] = dict(
+                    session.execute(
+                        select(WorkOrderCategoryHit.work_order_id, WorkOrderCategoryHit.counter_id).where(
+                            WorkOrderCategoryHit.work_order_id.in_([int(row.id) for row in rows])
+                        )
+                    ).all()
+                )
+                deltas: Dict[int, int] = defaultdict(int)
+                hit_inserts: List[Dict[str, int]] = []
+                hit_updates: List[Dict[str, int]] = []
+                hit_deletes: List[int] = []
+                sample_inserts: List[Dict[str, object]] = []
+                sample_updates: List[Dict[str, object]] = []
+
+                for row in rows:
+                    result.scanned += 1
+                    work_order_id = int(row.id)
+                    key = self._classify(row, existing)
+                    counter_id = self._counter_id(session, state, stat_month, key) if key is not None else None
+                    previous = previous_hits.get(work_order_id)
+                    if previous == counter_id:
+                        if counter_id is None:
+                            result.ignored += 1
+                        continue
+
+                    if previous is not None:
+                        deltas[previous] -= 1
+                        if previous in state.counts:
+                            state.counts[previous] -= 1
+                        result.moved += 1
+                    if counter_id is None:
+                        hit_deletes.append(work_order_id)
+                        continue
+
+                    deltas[counter_id] += 1
+                    state.counts[counter_id] = state.counts.get(counter_id, 0) + 1
+                    target = hit_updates if previous is not None else hit_inserts
+                    target.append({"hit_work_order_id": work_order_id, "hit_counter_id": counter_id})
+                    result.counted += 1
+
+                    content = (row.appeal_content or "").strip()
+                    if not content:
+                        continue
+                    filled = state.filled.get(counter_id, 0)
+                    slot = reservoir_slot(state.counts[counter_id], filled, self.sample_size, self.rng)
+                    if slot is None:
+                        continue
+                    params = {
+                        "sample_counter_id": counter_id,
+                        "sample_slot": slot,
+                        "sample_work_order_id": work_order_id,
+                        "sample_content": content,
+                    }
+                    if slot == filled:
+                        state.filled[counter_id] = filled + 1
+                        sample_inserts.append(params)
+                    else:
+                        sample_updates.append(params)
+
+                self._write_batch(
+                    session, deltas, hit_inserts, hit_updates, hit_deletes, sample_inserts, sample_updates
+                )
+                session.merge(
+                    WorkOrderAggregationWatermark(
+                        stat_month=stat_month,
+                        last_update_time=watermark[0],
+                        last_work_order_id=watermark[1],
+                    )
+                )
+
+    @staticmethod
+    def _counter_id(session, state: _MonthState, stat_month: str, key: CategoryKey) -> int:
+        counter_id = state.counter_ids.get(key)
+        if counter_id is not None:
+            return counter_id
+        counter = WorkOrderCategoryCounter(
+            scope_code=key.scope_code,
+            stat_month=stat_month,
+            l1_name=key.l1,
+            l2_name=key.l2,
+            l3_name=key.l3,
+            occurrence_count=0,
+        )
+        session.add(counter)
+        session.flush()
+        counter_id = int(counter.id)
+        state.counter_ids[key] = counter_id
+        state.counts[counter_id] = 0
+        return counter_id
+
+    @staticmethod
+    def _write_batch(
+        session,
+        deltas: Dict[int, int],
+        hit_inserts: List[Dict[str, int]],
+        hit_updates: List[Dict[str, int]],
+        hit_deletes: List[int],
+        sample_inserts: List[Dict[str, object]],
+        sample_updates: List[Dict[str, object]],
+    ) -> None:
+        changed = [{"delta_counter_id": cid, "delta": delta} for cid, delta in deltas.items() if delta]
+        if changed:
+            session.execute(
+                update(WorkOrderCategoryCounter.__table__)
+                .where(WorkOrderCategoryCounter.id == bindparam("delta_counter_id"))
+                .values(occurrence_count=WorkOrderCategoryCounter.occurrence_count + bindparam("delta")),
+                changed,
+            )
+        if hit_deletes:
+            session.execute(
+                WorkOrderCategoryHit.__table__.delete().where(WorkOrderCategoryHit.work_order_id.in_(hit_deletes))
+            )
+        if hit_inserts:
+            session.execute(
+                WorkOrderCategoryHit.__table__.insert().values(
+                    work_order_id=bindparam("hit_work_order_id"),
+                    counter_id=bindparam("hit_counter_id"),
+                ),
+                hit_inserts,
+            )
+        if hit_updates:
+            session.execute(
+                update(WorkOrderCategoryHit.__table__)
+                .where(WorkOrderCategoryHit.work_order_id == bindparam("hit_work_order_id"))
+                .values(counter_id=bindparam("hit_counter_id")),
+                hit_updates,
+            )
+        # Inserts first: a slot filled earlier in this batch may be replaced later in it.
+        if sample_inserts:
+            session.execute(
+                WorkOrderCategorySample.__table__.insert().values(
+                    counter_id=bindparam("sample_counter_id"),
+                    slot=bindparam("sample_slot"),
+                    work_order_id=bindparam("sample_work_order_id"),
+                    appeal_content=bindparam("sample_content"),
+                ),
+                sample_inserts,
+            )
+        if sample_updates:
+            session.execute(
+                update(WorkOrderCategorySample.__table__)
+                .where(
+                    WorkOrderCategorySample.counter_id == bindparam("sample_counter_id"),
+                    WorkOrderCategorySample.slot == bindparam("sample_slot"),
+                )
+                .values(work_order_id=bindparam("sample_work_order_id"), appeal_content=bindparam("sample_content")),
+                sample_updates,
+            )
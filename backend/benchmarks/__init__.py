@@ -0,0 +1 @@
+"""End-to-end benchmarks (ETL, FAQ extraction, knowledge sync) with synthetic data and a mock AICO."""
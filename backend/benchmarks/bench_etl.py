@@ -0,0 +1,72 @@
+"""
+ETL throughput: dialog rows read and conversations written per second.
+
+    python -m backend.benchmarks.bench_etl --groups 6 --calls-per-day 5000 --skew 1.2
+
+A second pass over the same days measures the all-skipped path (re-runs after a failure).
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from . import common
+from .synthetic import DialogProfile, load_dialogs
+
+from backend.app.core.db import SourceSessionLocal
+from backend.app.services.dialog_etl import DialogETLService
+
+
+FIRST_DAY = date(2025, 1, 1)
+
+
+def main() -> None:
+    parser = common.base_parser(__doc__, with_mock=False)
+    parser.add_argument("--groups", type=int, default=4)
+    parser.add_argument("--calls-per-day", type=int, default=500)
+    parser.add_argument("--days", type=int, default=1)
+    parser.add_argument("--turns-min", type=int, default=6)
+    parser.add_argument("--turns-max", type=int, default=20)
+    parser.add_argument("--skew", type=float, default=1.0, help="group size skew (0 = even)")
+    parser.add_argument("--workers", type=int, default=4, help="ETL_MAX_WORKERS")
+    args = parser.parse_args()
+
+    database = common.setup_database(args)
+    try:
+        profile = DialogProfile(
+            groups=args.groups,
+            calls_per_day=args.calls_per_day,
+            days=args.days,
+            turns_min=args.turns_min,
+            turns_max=args.turns_max,
+            skew=args.skew,
+            seed=args.seed,
+        )
+        with SourceSessionLocal() as session:
+            rows, load_seconds = common.timed(lambda: load_dialogs(session, profile, FIRST_DAY))
+
+        common.start_measuring()
+        service = DialogETLService(max_workers=args.workers)
+        days = [FIRST_DAY + timedelta(days=offset) for offset in range(args.days)]
+        runs, seconds = common.timed(lambda: [service.run_for_date(day) for day in days])
+        _, rerun_seconds = common.timed(lambda: [service.run_for_date(day) for day in days])
+
+        conversations = sum(run.conversations_total for run in runs)
+        results = {
+            "dialog_rows": rows,
+            "conversations": conversations,
+            "inserted": sum(run.inserted for run in runs),
+            "load_seconds": round(load_seconds, 3),
+            "etl_seconds": round(seconds, 3),
+            "rows_per_second": common.rate(rows, seconds),
+            "conversations_per_second": common.rate(conversations, seconds),
+            "rerun_seconds": round(rerun_seconds, 3),
+            "rerun_rows_per_second": common.rate(rows, rerun_seconds),
+        }
+        common.write_report("etl", args, database, results)
+    finally:
+        database.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+FAQ extraction throughput against the mock AICO chatbot: conversations finished per second.
+
+    python -m backend.benchmarks.bench_extraction --conversations 500 --workers 5 --latency chatbot=800
+
+Conversations are produced by running the ETL over synthetic dialogs (not timed). Each
+conversation costs one extraction call plus up to two review calls, so throughput is
+bounded by roughly workers / (3 x chatbot latency).
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from datetime import date
+
+from sqlalchemy import select
+
+from . import common
+from .mock_aico import MockAicoServer, mock_config_from_args
+from .synthetic import DialogProfile, load_dialogs
+
+from backend.app.core.db import SourceSessionLocal, TargetSessionLocal
+from backend.app.models.dialog import PreparedConversation
+from backend.app.models.faq_review import PendingFAQ
+from backend.app.services.dialog_etl import DialogETLService
+from backend.app.services.faq_extraction import FAQExtractionService
+
+
+FIRST_DAY = date(2025, 1, 1)
+
+
+def main() -> None:
+    parser = common.base_parser(__doc__)
+    parser.add_argument("--conversations", type=int, default=200)
+    parser.add_argument("--groups", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=5, help="FAQ_MAX_WORKERS")
+    parser.add_argument("--retry-delay", type=float, default=5.0, help="review retry delay in seconds")
+    args = parser.parse_args()
+
+    database = common.setup_database(args)
+    try:
+        with MockAicoServer(mock_config_from_args(args)) as mock:
+            common.use_mock_aico(mock)
+            profile = DialogProfile(groups=args.groups, calls_per_day=args.conversations, seed=args.seed)
+            with SourceSessionLocal() as session:
+                load_dialogs(session, profile, FIRST_DAY)
+            DialogETLService().run_for_date(FIRST_DAY)
+
+            common.start_measuring()
+            service = FAQExtractionService(max_workers=args.workers)
+            service.auto_review_retry_delay_seconds = args.retry_delay
+            result, seconds = common.timed(service.run)
+
+            with TargetSessionLocal() as session:
+                conversation_statuses = Counter(session.execute(select(PreparedConversation.status)).scalars())
+                faq_statuses = Counter(session.execute(select(PendingFAQ.status)).scalars())
+            results = {
+                "conversations": result.conversations_total,
+                "faqs_created": result.faqs_created,
+                "extraction_seconds": round(seconds, 3),
+                "conversations_per_second": common.rate(result.conversations_total, seconds),
+                "conversation_statuses": dict(sorted(conversation_statuses.items())),
+                "pending_faq_statuses": dict(sorted(faq_statuses.items())),
+            }
+            common.write_report("extraction", args, database, results, mock)
+    finally:
+        database.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Knowledge sync end-to-end time against the mock AICO knowledge APIs.
+
+    python -m backend.benchmarks.bench_sync --items 5000 --repeat 3 --latency upload=500 --split-seconds 3
+
+Each repeat forces a full push (cleanup, upload, split wait, online). A final run with
+skip_unchanged measures the no-change path used by scheduled syncs.
+"""
+
+from __future__ import annotations
+
+import statistics
+
+from sqlalchemy import insert
+
+from . import common
+from .mock_aico import MockAicoServer, mock_config_from_args
+from .synthetic import load_knowledge_items
+
+from backend.app.core.db import TargetSessionLocal
+from backend.app.models.scenario import Scenario
+from backend.app.services.aico_sync import AicoSyncOrchestrator
+
+
+SCENARIO_ID = 1
+
+
+def main() -> None:
+    parser = common.base_parser(__doc__)
+    parser.add_argument("--items", type=int, default=2000, help="active knowledge items in the scenario")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    database = common.setup_database(args)
+    try:
+        with MockAicoServer(mock_config_from_args(args)) as mock:
+            common.use_mock_aico(mock)
+            with TargetSessionLocal() as session:
+                session.execute(
+                    insert(Scenario.__table__),
+                    {
+                        "id": SCENARIO_ID,
+                        "scenario_code": "bench",
+                        "scenario_name": "bench",
+                        "is_active": True,
+                        "aico_username": "bench",
+                        "aico_user_id": 1,
+                        "aico_project_name": "bench-project",
+                        "aico_kb_name": "bench-kb",
+                        "aico_host": mock.host,
+                    },
+                )
+                load_knowledge_items(session, SCENARIO_ID, args.items, seed=args.seed)
+
+            common.start_measuring()
+            orchestrator = AicoSyncOrchestrator()
+            durations = []
+            for attempt in range(args.repeat):
+                result, seconds = common.timed(
+                    lambda: orchestrator.run_for_scenario(SCENARIO_ID, run_id=f"bench-{attempt}")
+                )
+                if result.status != "success":
+                    raise SystemExit(f"Sync {attempt} ended with {result.status}: {result.message}")
+                durations.append(seconds)
+            skipped, skip_seconds = common.timed(
+                lambda: orchestrator.run_for_scenario(SCENARIO_ID, run_id="bench-skip", skip_unchanged=True)
+            )
+
+            results = {
+                "items": args.items,
+                "runs": len(durations),
+                "sync_seconds": [round(value, 3) for value in durations],
+                "sync_seconds_median": round(statistics.median(durations), 3),
+                "sync_seconds_max": round(max(durations), 3),
+                "items_per_second": common.rate(args.items, statistics.median(durations)),
+                "unchanged_status": skipped.status,
+                "unchanged_seconds": round(skip_seconds, 3),
+            }
+            common.write_report("sync", args, database, results, mock)
+    finally:
+        database.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""
+Micro-benchmarks for the pure per-record functions on the ETL, extraction, taxonomy and sync paths.
+
+    python -m backend.benchmarks.micro run                       # print items/s per benchmark
+    python -m backend.benchmarks.micro run --save backend/benchmarks/baselines/micro.json
+    python -m backend.benchmarks.micro compare --threshold 0.15  # exit 1 on a regression
+
+Each benchmark times one call over a batch of Chinese-text fixtures and reports items per
+second from the fastest of `--repeat` rounds (the least noisy statistic on a shared
+machine). Baselines are machine-specific: refresh them with `run --save` on the machine
+that runs `compare`, in the same commit as an intended speed change.
+"""
+
+from __future__ import annotations
+
+from . import common  # noqa: F401 - sets the placeholder DATABASE_URL before app imports
+
+import argparse
+import csv
+import io
+import json
+import random
+import re
+import sys
+import timeit
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .synthetic import DialogProfile, TOPICS, generate_dialogs, generate_knowledge_items
+
+from backend.app.api.v1_12.kb_taxonomy_routes import _build_tree
+from backend.app.models.dialog import PeopleCustomerDialog
+from backend.app.models.faq_review import KnowledgeItem
+from backend.app.models.scenario import Scenario
+from backend.app.services.aico_sync import AicoSyncOrchestrator
+from backend.app.services.dialog_etl import DialogETLService
+from backend.app.services.faq_extraction import FAQExtractionService
+from backend.app.services.kb_taxonomy import REQUIRED_COLUMNS, SCOPE_TO_DOMAIN_ZH, build_import_plan
+from backend.app.services.kb_taxonomy_cache import TaxonomyNodeInfo, TaxonomySnapshot
+
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baselines" / "micro.json"
+DEFAULT_THRESHOLD = 0.15
+
+
+@dataclass(frozen=True)
+class MicroBenchmark:
+    name: str
+    # Builds the fixtures once and returns (call over one batch, items in the batch).
+    setup: Callable[[], Tuple[Callable[[], object], int]]
+
+
+@dataclass(frozen=True)
+class MicroResult:
+    name: str
+    items: int
+    seconds_per_call: float
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.seconds_per_call if self.seconds_per_call > 0 else 0.0
+
+
+BENCHMARKS: Dict[str, MicroBenchmark] = {}
+
+
+def micro_benchmark(name: str):
+    def register(setup: Callable[[], Tuple[Callable[[], object], int]]):
+        BENCHMARKS[name] = MicroBenchmark(name, setup)
+        return setup
+
+    return register
+
+
+# --- fixtures -----------------------------------------------------------------------
+
+
+@micro_benchmark("etl.build_conversation_text")
+def _bench_build_conversation_text():
+    profile = DialogProfile(groups=4, calls_per_day=200, turns_min=6, turns_max=30)
+    calls: Dict[str, List[PeopleCustomerDialog]] = {}
+    for row in generate_dialogs(profile, datetime(2025, 1, 1).date()):
+        calls.setdefault(row["call_id"], []).append(PeopleCustomerDialog(**row))
+    conversations = list(calls.values())
+    build = DialogETLService._build_conversation_text  # pylint: disable=protected-access
+    return (lambda: [build(records) for records in conversations]), len(conversations)
+
+
+@micro_benchmark("extraction.parse_question_answer")
+def _bench_parse_question_answer():
+    rng = random.Random(42)
+    replies: List[str] = []
+    for index in range(1000):
+        _, questions, answers = TOPICS[index % len(TOPICS)]
+        question, answer = rng.choice(questions), rng.choice(answers)
+        replies.append(
+            rng.choice(
+                [
+                    f"问题：{question}\n答案：{answer}",
+                    f"  问题：{question}？\n\n答案：{answer}。如仍有疑问可拨打服务热线。\n",
+                    f"根据对话内容整理如下：\n问题：{question}\n答案：{answer}",
+                    answer,
+                ]
+            )
+        )
+    parse = FAQExtractionService._parse_question_answer  # pylint: disable=protected-access
+    return (lambda: [parse(raw) for raw in replies]), len(replies)
+
+
+@micro_benchmark("extraction.parse_auto_review_json")
+def _bench_parse_auto_review_json():
+    rng = random.Random(42)
+    templates = [
+        lambda decision: json.dumps({"result": decision}),
+        lambda decision: json.dumps({"reason": "答案与知识库一致", "autoReviewResult": decision}, ensure_ascii=False),
+        lambda decision: json.dumps({"评审意见": "答案缺少办理地点", "结论": decision.upper()}, ensure_ascii=False),
+        lambda decision: json.dumps([{"问题": "水费怎么交", "decision": decision}], ensure_ascii=False),
+        lambda decision: f"审核结果：{decision}，理由：答案准确",
+    ]
+    replies = [rng.choice(templates)(rng.choice(["approved", "rejected"])) for _ in range(1000)]
+    parse = FAQExtractionService._parse_auto_review_json  # pylint: disable=protected-access
+    return (lambda: [parse(raw) for raw in replies]), len(replies)
+
+
+@micro_benchmark("taxonomy.build_import_plan")
+def _bench_build_import_plan():
+    rng = random.Random(42)
+    domain = SCOPE_TO_DOMAIN_ZH["water"]
+    case_columns = [f"案例{index}" for index in range(1, 6)]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(REQUIRED_COLUMNS + case_columns)
+    rows = 0
+    for l1 in ["供水服务", "水费缴纳", "管网维修", "水质问题", "用户报装"]:
+        for l2_index in range(10):
+            for l3_index in range(20):
+                _, questions, _ = TOPICS[0]
+                cases = [f"{rng.choice(questions)}（{rows}-{n}）" for n in range(rng.randint(0, len(case_columns)))]
+                path = [domain, l1, f"{l1}子类{l2_index}", f"{l1}细项{l2_index}-{l3_index}"]
+                writer.writerow(
+                    path
+                    + [f"市民反映{l1}相关的第{l3_index}类诉求"]
+                    + cases
+                    + [""] * (len(case_columns) - len(cases))
+                )
+                rows += 1
+    raw = buffer.getvalue().encode("utf-8-sig")
+    return (lambda: build_import_plan("water", raw, "taxonomy.csv")), rows
+
+
+@micro_benchmark("taxonomy.build_tree")
+def _bench_build_tree():
+    nodes: Dict[int, TaxonomyNodeInfo] = {}
+    children: Dict[Optional[int], List[int]] = {}
+
+    def add(level: int, name: str, parent_id: Optional[int]) -> int:
+        node_id = len(nodes) + 1
+        nodes[node_id] = TaxonomyNodeInfo(node_id, "water", level, name, parent_id, f"{name}的定义")
+        children.setdefault(parent_id, []).append(node_id)
+        return node_id
+
+    for l1 in ["供水服务", "水费缴纳", "管网维修", "水质问题", "用户报装"]:
+        l1_id = add(1, l1, None)
+        for l2_index in range(10):
+            l2_id = add(2, f"{l1}子类{l2_index}", l1_id)
+            for l3_index in range(20):
+                add(3, f"{l1}细项{l2_index}-{l3_index}", l2_id)
+    snapshot = TaxonomySnapshot(
+        scope="water",
+        version=0,
+        nodes=nodes,
+        children={parent_id: tuple(ids) for parent_id, ids in children.items()},
+        paths={},
+        etag='"bench"',
+        loaded_at=0.0,
+    )
+    return (lambda: _build_tree(snapshot)), len(nodes)
+
+
+@micro_benchmark("sync.build_csv_file")
+def _bench_build_csv_file():
+    scenario = Scenario(id=1, scenario_code="bench", scenario_name="bench")
+    items = [KnowledgeItem(**row) for row in generate_knowledge_items(1, 2000)]
+    orchestrator = AicoSyncOrchestrator()
+    return (lambda: orchestrator._build_csv_file(scenario, items)), len(items)  # pylint: disable=protected-access
+
+
+# --- running and comparing ----------------------------------------------------------
+
+
+def run_benchmark(benchmark: MicroBenchmark, repeat: int = 5, round_seconds: float = 0.5) -> MicroResult:
+    call, items = benchmark.setup()
+    timer = timeit.Timer(call)
+    number, elapsed = timer.autorange()
+    number = max(1, round(number * round_seconds / elapsed))
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+    return MicroResult(benchmark.name, items, best)
+
+
+def select_benchmarks(pattern: Optional[str]) -> List[MicroBenchmark]:
+    return [bench for name, bench in BENCHMARKS.items() if pattern is None or re.search(pattern, name)]
+
+
+def results_payload(results: List[MicroResult]) -> dict:
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": common.environment(),
+        "benchmarks": {
+            result.name: {
+                "items": result.items,
+                "seconds_per_call": result.seconds_per_call,
+                "items_per_second": round(result.items_per_second, 1),
+            }
+            for result in results
+        },
+    }
+
+
+def compare_results(current: dict, baseline: dict, threshold: float) -> Tuple[List[str], List[str]]:
+    """Return (report lines, names of benchmarks slower than baseline by more than `threshold`)."""
+    lines = [f"{'benchmark':40} {'baseline/s':>14} {'current/s':>14} {'change':>8}"]
+    regressions: List[str] = []
+    for name, entry in current["benchmarks"].items():
+        before = baseline["benchmarks"].get(name)
+        now = entry["items_per_second"]
+        if before is None:
+            lines.append(f"{name:40} {'-':>14} {now:>14.1f} {'new':>8}")
+            continue
+        change = now / before["items_per_second"] - 1 if before["items_per_second"] else 0.0
+        flag = ""
+        if change < -threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        lines.append(f"{name:40} {before['items_per_second']:>14.1f} {now:>14.1f} {change:>+8.1%}{flag}")
+    return lines, regressions
+
+
+def _load(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        raise SystemExit(f"{path} not found; record one with `run --save {path}`") from None
+
+
+def _run_selected(args: argparse.Namespace) -> dict:
+    benchmarks = select_benchmarks(args.k)
+    if not benchmarks:
+        raise SystemExit(f"No benchmark matches {args.k!r}; available: {', '.join(BENCHMARKS)}")
+    results = []
+    for benchmark in benchmarks:
+        result = run_benchmark(benchmark, repeat=args.repeat)
+        print(
+            f"{result.name:40} {result.items_per_second:>14.1f} items/s  "
+            f"({result.seconds_per_call * 1000:.3f} ms per {result.items})",
+            file=sys.stderr,
+        )
+        results.append(result)
+    return results_payload(results)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the micro-benchmarks")
+    run_parser.add_argument("--save", type=Path, help="write the results as JSON (e.g. a new baseline)")
+
+    compare_parser = commands.add_parser("compare", help="compare against a baseline; exit 1 on regression")
+    compare_parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    compare_parser.add_argument("--current", type=Path, help="compare a saved `run --save` file instead of running")
+    compare_parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed throughput drop (0.15 = 15%%)"
+    )
+
+    for sub in (run_parser, compare_parser):
+        sub.add_argument("-k", help="only run benchmarks whose name matches this regex")
+        sub.add_argument("--repeat", type=int, default=5, help="timing rounds per benchmark (best is kept)")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        payload = _run_selected(args)
+        if args.save:
+            args.save.parent.mkdir(parents=True, exist_ok=True)
+            args.save.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        else:
+            json.dump(payload["benchmarks"], sys.stdout, indent=2)
+            sys.stdout.write("\n")
+        return 0
+
+    baseline = _load(args.baseline)
+    current = _load(args.current) if args.current else _run_selected(args)
+    for key in ("python", "platform", "cpu_count"):
+        if baseline["environment"].get(key) != current["environment"].get(key):
+            print(f"warning: baseline {key} differs ({baseline['environment'].get(key)})", file=sys.stderr)
+    lines, regressions = compare_results(current, baseline, args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
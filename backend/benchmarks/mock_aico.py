@@ -0,0 +1,303 @@
+"""
+Local mock of the AICO HTTP APIs used by extraction and knowledge sync.
+
+Serves the token, project, kb, file upload/show/split/del, knowledge online and chatbot
+run endpoints on one port, with per-endpoint latency and error rates. Chatbot runs whose
+app id contains "review" or "compare" answer approved/rejected; others extract a
+question/answer from the first citizen/agent turns (or answer "否").
+
+    python -m backend.benchmarks.mock_aico --port 18080 --latency chatbot=800 --error-rate chatbot=0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+ENDPOINTS = {
+    ("POST", "/aicoapi/user/generate_user_token"): "token",
+    ("GET", "/api/project_manage/projects/search_project"): "project",
+    ("GET", "/aicoapi/kb_manage/kbm/search_kb"): "kb",
+    ("POST", "/aicoapi/knowledge_manage/file/upload"): "upload",
+    ("POST", "/aicoapi/knowledge_manage/file/show"): "file_show",
+    ("POST", "/aicoapi/knowledge_manage/file/split"): "split",
+    ("POST", "/aicoapi/knowledge_manage/file/del"): "delete",
+    ("POST", "/aicoapi/knowledge_manage/knowledge/online"): "online",
+}
+CHATBOT_PREFIX = "/aicoapi/gateway/v2/chatbot/api_run/"
+
+DEFAULT_LATENCY_MS = {
+    "token": 20.0,
+    "project": 20.0,
+    "kb": 20.0,
+    "upload": 200.0,
+    "file_show": 30.0,
+    "split": 30.0,
+    "delete": 50.0,
+    "online": 100.0,
+    "chatbot": 300.0,
+}
+
+_FILENAME = re.compile(rb'filename="([^"]+)"')
+_CITIZEN = re.compile(r"^市民：(.+)$", re.MULTILINE)
+_AGENT = re.compile(r"^客服：(.+)$", re.MULTILINE)
+
+
+@dataclass
+class MockAicoConfig:
+    latency_ms: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_LATENCY_MS))
+    error_rate: Dict[str, float] = field(default_factory=dict)
+    jitter: float = 0.2  # latency is drawn uniformly from ±jitter around the configured value
+    split_seconds: float = 0.0  # time from upload until file/show reports the split as done
+    no_faq_rate: float = 0.3
+    approve_rate: float = 0.8
+    seed: int = 42
+
+
+@dataclass
+class _File:
+    file_id: int
+    file_name: str
+    size: int
+    uploaded_at: float
+
+
+class MockAicoServer:
+    def __init__(self, config: Optional[MockAicoConfig] = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.config = config or MockAicoConfig()
+        self._lock = threading.Lock()
+        self._rng = random.Random(self.config.seed)
+        self._files: Dict[int, _File] = {}
+        self._next_file_id = 1
+        self._requests: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def host(self) -> str:
+        return self._httpd.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_address[1]
+
+    def url(self, path: str) -> str:
+        return f"http://{self.host}:{self.port}{path}"
+
+    def start(self) -> "MockAicoServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-aico", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "MockAicoServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {"requests": dict(self._requests), "errors": dict(self._errors)}
+
+    # --- request handling -------------------------------------------------------------
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802 - http.server naming
+                server._dispatch(self, "GET")
+
+            def do_POST(self) -> None:  # noqa: N802
+                server._dispatch(self, "POST")
+
+            def log_message(self, format: str, *args: object) -> None:  # pylint: disable=redefined-builtin
+                return
+
+        return Handler
+
+    def _dispatch(self, request: BaseHTTPRequestHandler, method: str) -> None:
+        parsed = urlparse(request.path)
+        length = int(request.headers.get("Content-Length") or 0)
+        body = request.rfile.read(length) if length else b""
+        if method == "POST" and parsed.path.startswith(CHATBOT_PREFIX):
+            endpoint = "chatbot"
+        else:
+            endpoint = ENDPOINTS.get((method, parsed.path))
+        if endpoint is None:
+            self._respond(request, 404, {"err_code": 404, "message": f"unknown endpoint {parsed.path}"})
+            return
+
+        with self._lock:
+            self._requests[endpoint] = self._requests.get(endpoint, 0) + 1
+            failed = self._rng.random() < self.config.error_rate.get(endpoint, 0.0)
+            latency = self.config.latency_ms.get(endpoint, 0.0) * (1 + self._rng.uniform(-1, 1) * self.config.jitter)
+            if failed:
+                self._errors[endpoint] = self._errors.get(endpoint, 0) + 1
+        if latency > 0:
+            time.sleep(latency / 1000)
+        if failed:
+            self._respond(request, 500, {"err_code": 500, "message": "injected failure"})
+            return
+
+        handler = getattr(self, f"_on_{endpoint}")
+        status, payload = handler(parsed, body)
+        self._respond(request, status, payload)
+
+    @staticmethod
+    def _respond(request: BaseHTTPRequestHandler, status: int, payload: dict) -> None:
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        request.send_response(status)
+        request.send_header("Content-Type", "application/json; charset=utf-8")
+        request.send_header("Content-Length", str(len(data)))
+        request.end_headers()
+        request.wfile.write(data)
+
+    @staticmethod
+    def _json(body: bytes) -> dict:
+        try:
+            value = json.loads(body or b"{}")
+        except ValueError:
+            return {}
+        return value if isinstance(value, dict) else {}
+
+    def _on_token(self, parsed, body: bytes) -> Tuple[int, dict]:
+        return 200, {"code": 200, "data": {"token": "mock-token"}}
+
+    def _on_project(self, parsed, body: bytes) -> Tuple[int, dict]:
+        name = (parse_qs(parsed.query).get("project_name") or [""])[0]
+        return 200, {"code": 200, "data": [{"id": 101, "project_name": name}]}
+
+    def _on_kb(self, parsed, body: bytes) -> Tuple[int, dict]:
+        name = (parse_qs(parsed.query).get("kb_name") or [""])[0]
+        return 200, {"code": 200, "data": [{"id": 202, "kb_name": name}]}
+
+    def _on_upload(self, parsed, body: bytes) -> Tuple[int, dict]:
+        match = _FILENAME.search(body)
+        file_name = match.group(1).decode("utf-8") if match else "upload.csv"
+        with self._lock:
+            for existing in [f for f in self._files.values() if f.file_name == file_name]:
+                del self._files[existing.file_id]
+            file_id = self._next_file_id
+            self._next_file_id += 1
+            self._files[file_id] = _File(file_id, file_name, len(body), time.monotonic())
+        return 200, {"err_code": 0, "data": {"file_id": file_id}}
+
+    def _on_file_show(self, parsed, body: bytes) -> Tuple[int, dict]:
+        title = str(self._json(body).get("title") or "")
+        now = time.monotonic()
+        with self._lock:
+            files: List[_File] = [f for f in self._files.values() if title in f.file_name]
+        return 200, {
+            "err_code": 0,
+            "data": [
+                {
+                    "id": f.file_id,
+                    "file_name": f.file_name,
+                    "size": f.size,
+                    "is_slice": 3 if now - f.uploaded_at >= self.config.split_seconds else 1,
+                }
+                for f in sorted(files, key=lambda f: f.file_id, reverse=True)
+            ],
+        }
+
+    def _on_split(self, parsed, body: bytes) -> Tuple[int, dict]:
+        return 200, {"err_code": 0}
+
+    def _on_delete(self, parsed, body: bytes) -> Tuple[int, dict]:
+        ids = self._json(body).get("file_ids") or []
+        with self._lock:
+            for file_id in ids:
+                self._files.pop(int(file_id), None)
+        return 200, {"err_code": 0}
+
+    def _on_online(self, parsed, body: bytes) -> Tuple[int, dict]:
+        return 200, {"err_code": 0}
+
+    def _on_chatbot(self, parsed, body: bytes) -> Tuple[int, dict]:
+        app_id = parsed.path[len(CHATBOT_PREFIX):]
+        query = str(self._json(body).get("query") or "")
+        # Decisions depend only on the query, so repeated runs over the same data agree.
+        rng = random.Random(f"{self.config.seed}:{app_id}:{query}")
+        if "review" in app_id or "compare" in app_id:
+            reply = "approved" if rng.random() < self.config.approve_rate else "rejected"
+        else:
+            citizen = _CITIZEN.search(query)
+            agent = _AGENT.search(query, citizen.end()) if citizen else None
+            if citizen is None or agent is None or rng.random() < self.config.no_faq_rate:
+                reply = "否"
+            else:
+                reply = f"问题：{citizen.group(1).strip()}\n答案：{agent.group(1).strip()}"
+        return 200, {"data": {"text": [reply]}}
+
+
+def endpoint_value(text: str) -> Tuple[str, float]:
+    """argparse type for `chatbot=800` style options."""
+    name, _, number = text.partition("=")
+    if name not in DEFAULT_LATENCY_MS:
+        choices = ", ".join(sorted(DEFAULT_LATENCY_MS))
+        raise argparse.ArgumentTypeError(f"unknown endpoint {name!r}; expected one of {choices}")
+    try:
+        return name, float(number)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected <endpoint>=<number>, got {text!r}") from None
+
+
+def add_mock_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--latency", action="append", type=endpoint_value, default=[], metavar="ENDPOINT=MS", help="per-endpoint latency"
+    )
+    parser.add_argument(
+        "--error-rate", action="append", type=endpoint_value, default=[], metavar="ENDPOINT=RATE", help="HTTP 500 rate"
+    )
+    parser.add_argument("--split-seconds", type=float, default=0.0, help="time until an upload is reported split")
+    parser.add_argument("--no-faq-rate", type=float, default=0.3, help="share of conversations answered with 否")
+    parser.add_argument("--approve-rate", type=float, default=0.8, help="share of reviews answered approved")
+
+
+def mock_config_from_args(args: argparse.Namespace) -> MockAicoConfig:
+    return MockAicoConfig(
+        latency_ms={**DEFAULT_LATENCY_MS, **dict(args.latency)},
+        error_rate=dict(args.error_rate),
+        split_seconds=args.split_seconds,
+        no_faq_rate=args.no_faq_rate,
+        approve_rate=args.approve_rate,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--seed", type=int, default=42)
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+    server = MockAicoServer(mock_config_from_args(args), host=args.host, port=args.port).start()
+    print(f"Mock AICO listening on http://{server.host}:{server.port} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
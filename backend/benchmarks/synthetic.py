@@ -0,0 +1,153 @@
+"""
+Synthetic `people_customer_dialog` rows and knowledge items for benchmarks.
+
+Output is deterministic for a given seed, so two runs (or two branches) load identical data.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from backend.app.models.dialog import PeopleCustomerDialog
+from backend.app.models.faq_review import KnowledgeItem
+
+
+GROUP_CODES = ["SW", "GJ", "RQ", "DL", "WY", "JT", "YL", "JY", "SB", "ZF"]
+
+# (topic, citizen questions, agent answers) per group; unknown groups reuse them round-robin.
+TOPICS: List[Tuple[str, List[str], List[str]]] = [
+    (
+        "供水",
+        ["我家里停水了，请问什么时候恢复供水", "这个月水费怎么比上个月高这么多", "小区水压很低，洗澡都不出水", "水表显示的读数好像不对"],
+        ["您好，您所在片区因管网抢修临时停水，预计今晚八点前恢复", "水费按阶梯计价，本月用水量超过第一阶梯，可以在公众号查询明细", "我们已经登记，维修人员会在二十四小时内上门检查加压设备", "可以预约上门校表，校验费用在表计误差超标时免收"],
+    ),
+    (
+        "公交",
+        ["请问十八路公交车末班车是几点", "公交卡丢了怎么挂失补办", "今天的公交车为什么一直不来", "老年卡在哪里办理"],
+        ["十八路末班车晚上十点从起点站发车", "携带身份证到任意客服网点办理挂失，补卡工本费二十元", "因道路施工线路临时绕行，发车间隔有所延长", "年满六十五周岁可携带身份证和照片到社区服务中心办理"],
+    ),
+    (
+        "燃气",
+        ["家里闻到燃气味怎么办", "燃气费怎么在网上缴纳", "新房子要开通燃气需要准备什么", "燃气表不走字了"],
+        ["请立即关闭阀门、开窗通风，不要开关电器，我们马上安排抢修", "可以通过支付宝生活缴费或者官方公众号缴纳", "需要房产证、身份证复印件，到营业厅申请开通并预约安检", "可能是表具电池没电，请更换电池后观察，仍有问题我们派人上门"],
+    ),
+    (
+        "电力",
+        ["突然停电了是什么原因", "电费账单怎么查询", "想申请增加用电容量", "家门口的路灯坏了"],
+        ["您所在线路正在进行故障抢修，预计一小时内恢复供电", "登录网上国网应用即可查询近十二个月的电费账单", "请准备产权证明和身份证，在营业厅或线上提交增容申请", "已为您登记路灯报修，三个工作日内安排维修"],
+    ),
+]
+
+FILLER_CITIZEN = ["好的", "明白了", "那大概要多久", "还有别的办法吗", "麻烦你们快一点", "我的地址是幸福路{n}号"]
+FILLER_AGENT = ["请问还有其他问题吗", "已经为您记录工单，编号{n}", "感谢您的耐心等待", "请您保持电话畅通", "您好，这里是市民服务热线"]
+
+
+@dataclass(frozen=True)
+class DialogProfile:
+    groups: int = 4
+    calls_per_day: int = 500
+    days: int = 1
+    turns_min: int = 6
+    turns_max: int = 20
+    skew: float = 1.0  # group weight ∝ 1 / rank**skew; 0 spreads calls evenly
+    seed: int = 42
+
+    def group_codes(self) -> List[str]:
+        codes = GROUP_CODES[: self.groups]
+        codes += [f"G{index}" for index in range(len(codes), self.groups)]
+        return codes
+
+    def calls_per_group(self) -> Dict[str, int]:
+        codes = self.group_codes()
+        weights = [1 / (rank ** self.skew) for rank in range(1, len(codes) + 1)]
+        total = sum(weights)
+        counts = {code: int(self.calls_per_day * weight / total) for code, weight in zip(codes, weights)}
+        counts[codes[0]] += self.calls_per_day - sum(counts.values())
+        return counts
+
+
+def _topic(group_index: int) -> Tuple[str, List[str], List[str]]:
+    return TOPICS[group_index % len(TOPICS)]
+
+
+def generate_dialogs(profile: DialogProfile, first_day: date) -> Iterator[dict]:
+    """Yield dialog rows (one per turn), ordered by day, group and call."""
+    rng = random.Random(profile.seed)
+    per_group = profile.calls_per_group()
+    for day_offset in range(profile.days):
+        day = first_day + timedelta(days=day_offset)
+        day_start = datetime.combine(day, datetime.min.time())
+        for group_index, (group_code, calls) in enumerate(per_group.items()):
+            _, questions, answers = _topic(group_index)
+            for call_index in range(calls):
+                call_id = f"{day:%Y%m%d}{group_code}{call_index:07d}"
+                started = day_start + timedelta(seconds=rng.randrange(86_000))
+                turns = rng.randint(profile.turns_min, profile.turns_max)
+                topic_index = rng.randrange(len(questions))
+                for seq in range(turns):
+                    source = 2 if seq % 2 == 0 else 1
+                    if seq == 1:
+                        text = questions[topic_index]
+                    elif seq == 2:
+                        text = answers[topic_index]
+                    else:
+                        filler = FILLER_CITIZEN if source == 1 else FILLER_AGENT
+                        text = rng.choice(filler).format(n=rng.randrange(1, 9999))
+                    yield {
+                        "group_code": group_code,
+                        "call_id": call_id,
+                        "text": text,
+                        "source": source,
+                        "seq": seq + 1,
+                        "create_time": started + timedelta(seconds=seq * 15),
+                    }
+
+
+def load_dialogs(session: Session, profile: DialogProfile, first_day: date, batch_size: int = 5000) -> int:
+    """Bulk-insert generated dialogs; returns the number of rows."""
+    table = PeopleCustomerDialog.__table__
+    batch: List[dict] = []
+    total = 0
+    for row in generate_dialogs(profile, first_day):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            session.execute(insert(table), batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        session.execute(insert(table), batch)
+        total += len(batch)
+    session.commit()
+    return total
+
+
+def generate_knowledge_items(scenario_id: int, count: int, seed: int = 42) -> List[dict]:
+    rng = random.Random(seed)
+    rows = []
+    for index in range(count):
+        _, questions, answers = TOPICS[index % len(TOPICS)]
+        topic_index = rng.randrange(len(questions))
+        rows.append(
+            {
+                "scenario_id": scenario_id,
+                "question": f"{questions[topic_index]}（{index}）",
+                "answer": f"{answers[topic_index]}。如有疑问请拨打服务热线，工单编号{rng.randrange(100000, 999999)}。",
+                "status": "active",
+                "revision": 0,
+            }
+        )
+    return rows
+
+
+def load_knowledge_items(session: Session, scenario_id: int, count: int, seed: int = 42) -> int:
+    rows = generate_knowledge_items(scenario_id, count, seed)
+    if rows:
+        session.execute(insert(KnowledgeItem.__table__), rows)
+    session.commit()
+    return len(rows)
@@ -0,0 +1,5 @@
+-- V1.16 后台任务结果：批量审核任务改走 background_jobs，按分块记录结果；ID 列表放入 payload
+
+ALTER TABLE background_jobs
+  MODIFY COLUMN payload MEDIUMTEXT NULL COMMENT '任务参数(JSON)，review_bulk 任务最多包含 20000 个ID',
+  ADD COLUMN result TEXT NULL COMMENT '任务结果(JSON)，如 review_bulk 的汇总与失败分块' AFTER error;
@@ -0,0 +1,27 @@
+-- V1.16 后台任务表：替代 admin 接口进程内线程，多进程共享单飞、进度、重试与取消
+
+CREATE TABLE IF NOT EXISTS background_jobs (
+  id VARCHAR(64) NOT NULL COMMENT '任务ID（jobId）',
+  kind VARCHAR(32) NOT NULL COMMENT 'aggregation|extraction|compare_kb_sync',
+  active_kind VARCHAR(32) NULL COMMENT '排队/运行中时等于kind（或更细的键，如scenario_sync:12），结束后置NULL；唯一索引保证同键任务单飞',
+  status VARCHAR(20) NOT NULL DEFAULT 'queued' COMMENT 'queued|running|succeeded|failed|cancelled',
+  payload TEXT NULL COMMENT '任务参数(JSON)',
+  progress_current INT NOT NULL DEFAULT 0 COMMENT '当前进度',
+  progress_total INT NULL COMMENT '总进度',
+  progress_message VARCHAR(255) NULL COMMENT '进度说明',
+  attempts INT NOT NULL DEFAULT 0 COMMENT '已执行次数',
+  max_attempts INT NOT NULL DEFAULT 1 COMMENT '最大执行次数',
+  cancel_requested TINYINT(1) NOT NULL DEFAULT 0 COMMENT '是否已请求取消',
+  worker_id VARCHAR(128) NULL COMMENT '持有任务的worker（host:pid:随机串）',
+  error TEXT NULL COMMENT '最近一次错误',
+  run_after DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '最早可执行时间（重试退避）',
+  heartbeat_at DATETIME NULL COMMENT '最近心跳时间',
+  started_at DATETIME NULL COMMENT '首次开始时间',
+  finished_at DATETIME NULL COMMENT '结束时间',
+  created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '创建时间',
+  updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
+  PRIMARY KEY (id),
+  UNIQUE KEY uk_background_jobs_active_kind (active_kind),
+  INDEX idx_background_jobs_kind (kind),
+  INDEX idx_background_jobs_status_run_after (status, run_after)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='后台任务队列';
@@ -0,0 +1,12 @@
+-- V1.16 分类导入计划：校验后的导入计划落库，preview/execute 可由任意进程按 uploadToken 读取
+
+CREATE TABLE IF NOT EXISTS kb_taxonomy_import_plans (
+  token VARCHAR(32) NOT NULL COMMENT 'uploadToken',
+  scope_code VARCHAR(16) NOT NULL COMMENT 'water|bus|bike',
+  owner_id INT NOT NULL COMMENT '上传用户ID',
+  plan LONGTEXT NOT NULL COMMENT '校验后的导入计划(JSON)',
+  expires_at DATETIME NOT NULL COMMENT '过期时间，默认上传后10分钟',
+  created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '创建时间',
+  PRIMARY KEY (token),
+  KEY idx_kb_taxonomy_import_plans_expires_at (expires_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='分类导入计划';
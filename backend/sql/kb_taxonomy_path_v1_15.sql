@@ -0,0 +1,20 @@
+-- V1.15 kb_taxonomy_nodes 物化路径（/祖先id/.../自身id/），用于单次查询路径与子树统计
+
+ALTER TABLE kb_taxonomy_nodes
+  ADD COLUMN path VARCHAR(255) NULL COMMENT '祖先ID物化路径，如 /1/2/3/' AFTER definition,
+  ADD INDEX idx_kb_taxonomy_nodes_path (path);
+
+-- 回填：按层级自上而下
+UPDATE kb_taxonomy_nodes
+SET path = CONCAT('/', id, '/')
+WHERE parent_id IS NULL;
+
+UPDATE kb_taxonomy_nodes c
+JOIN kb_taxonomy_nodes p ON p.id = c.parent_id
+SET c.path = CONCAT(p.path, c.id, '/')
+WHERE c.level = 2;
+
+UPDATE kb_taxonomy_nodes c
+JOIN kb_taxonomy_nodes p ON p.id = c.parent_id
+SET c.path = CONCAT(p.path, c.id, '/')
+WHERE c.level = 3;
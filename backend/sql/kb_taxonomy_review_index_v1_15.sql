@@ -0,0 +1,6 @@
+-- V1.15 待审核列表按 (scope_code, status, created_at) 做 keyset 分页
+-- 新索引覆盖原 (scope_code, status) 前缀，原索引一并删除
+
+ALTER TABLE kb_taxonomy_review_items
+  ADD INDEX idx_kb_taxonomy_review_scope_status_created (scope_code, status, created_at),
+  DROP INDEX idx_kb_taxonomy_review_scope_status;
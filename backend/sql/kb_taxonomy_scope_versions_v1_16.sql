@@ -0,0 +1,8 @@
+-- V1.16 分类树版本号：写入节点/案例的事务内 +1，各进程读取快照前比对，避免多进程缓存不一致
+
+CREATE TABLE IF NOT EXISTS kb_taxonomy_scope_versions (
+  scope_code VARCHAR(16) NOT NULL COMMENT 'water|bus|bike',
+  version BIGINT NOT NULL DEFAULT 0 COMMENT '每次写入该范围分类树时在同一事务内+1',
+  updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
+  PRIMARY KEY (scope_code)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='分类树版本';
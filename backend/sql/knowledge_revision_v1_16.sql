@@ -0,0 +1,6 @@
+-- V1.16 知识变更版本：写入 knowledge_items 时递增 scenario_sync_states.knowledge_revision 并记录到行上，
+-- 同步时版本未变化则跳过；revision 大于 synced_revision 的行即为上次同步后的变更
+
+ALTER TABLE knowledge_items
+  ADD COLUMN revision BIGINT NOT NULL DEFAULT 0 COMMENT '最后一次修改时场景的knowledge_revision' AFTER status,
+  ADD INDEX idx_knowledge_items_scenario_revision (scenario_id, revision);
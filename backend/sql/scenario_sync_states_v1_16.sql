@@ -0,0 +1,16 @@
+-- V1.16 场景同步状态：按 sync_schedule 定时同步时，内容指纹未变化则跳过上传
+
+CREATE TABLE IF NOT EXISTS scenario_sync_states (
+  scenario_id INT NOT NULL COMMENT '场景ID（scenarios.id，逻辑关联）',
+  knowledge_revision BIGINT NOT NULL DEFAULT 0 COMMENT '场景知识版本，每次写入knowledge_items时+1',
+  synced_revision BIGINT NULL COMMENT '上次成功同步时的knowledge_revision',
+  synced_target VARCHAR(64) NULL COMMENT '上次成功同步的AICO目标sha256（host/配置场景/项目/知识库）',
+  content_fingerprint VARCHAR(64) NULL COMMENT '上次成功同步内容的sha256（含AICO目标与条目id/问题/答案）',
+  item_count INT NOT NULL DEFAULT 0 COMMENT '上次成功同步的条目数',
+  last_status VARCHAR(20) NULL COMMENT '最近一次同步结果：success/skipped/failed',
+  last_message TEXT NULL COMMENT '最近一次同步说明或错误信息',
+  last_attempt_at DATETIME NULL COMMENT '最近一次同步时间',
+  last_success_at DATETIME NULL COMMENT '最近一次成功推送时间',
+  updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
+  PRIMARY KEY (scenario_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='场景AICO同步状态';
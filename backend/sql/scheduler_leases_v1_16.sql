@@ -0,0 +1,10 @@
+-- V1.16 调度器租约：多实例部署时仅持有租约的实例执行定时任务
+
+CREATE TABLE IF NOT EXISTS scheduler_leases (
+  name VARCHAR(64) NOT NULL COMMENT '租约名称（scheduler）',
+  holder VARCHAR(128) NOT NULL COMMENT '当前持有者 host:pid:随机串',
+  expires_at DATETIME NOT NULL COMMENT '到期时间（数据库时间），过期后其他实例可接管',
+  acquired_at DATETIME NOT NULL COMMENT '当前持有者获得租约的时间',
+  updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
+  PRIMARY KEY (name)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='调度器主节点租约';
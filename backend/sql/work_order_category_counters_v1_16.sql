@@ -0,0 +1,49 @@
+-- V1.16 work_order 三级分类月度增量统计（按 update_time 水位推进）
+
+CREATE TABLE IF NOT EXISTS work_order_category_counters (
+  id BIGINT NOT NULL AUTO_INCREMENT COMMENT '主键',
+  scope_code VARCHAR(16) NOT NULL COMMENT 'water|bus|bike',
+  stat_month CHAR(7) NOT NULL COMMENT '统计月份 YYYY-MM（update_time 自然月）',
+  l1_name VARCHAR(128) NOT NULL DEFAULT '' COMMENT '一级分类（公交/自行车为空串）',
+  l2_name VARCHAR(128) NOT NULL COMMENT '二级分类',
+  l3_name VARCHAR(128) NOT NULL COMMENT '三级分类',
+  occurrence_count INT NOT NULL DEFAULT 0 COMMENT '出现次数（work_order 记录数）',
+  created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '创建时间',
+  updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
+  PRIMARY KEY (id),
+  UNIQUE KEY uk_work_order_category_counters_key (scope_code, stat_month, l1_name, l2_name, l3_name)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='工单三级分类月度计数';
+
+CREATE TABLE IF NOT EXISTS work_order_category_hits (
+  work_order_id BIGINT NOT NULL COMMENT 'work_order.id',
+  counter_id BIGINT NOT NULL COMMENT '最近一次计入的 work_order_category_counters.id',
+  updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
+  PRIMARY KEY (work_order_id),
+  INDEX idx_work_order_category_hits_counter (counter_id),
+  CONSTRAINT fk_work_order_category_hits_counter
+    FOREIGN KEY (counter_id) REFERENCES work_order_category_counters(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='工单计入记录，用于重复更新时去重';
+
+CREATE TABLE IF NOT EXISTS work_order_category_samples (
+  id BIGINT NOT NULL AUTO_INCREMENT COMMENT '主键',
+  counter_id BIGINT NOT NULL COMMENT '关联work_order_category_counters.id',
+  slot SMALLINT NOT NULL COMMENT '蓄水池槽位 0..19',
+  work_order_id BIGINT NOT NULL COMMENT 'work_order.id',
+  appeal_content TEXT NOT NULL COMMENT '样本诉求内容',
+  updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
+  PRIMARY KEY (id),
+  UNIQUE KEY uk_work_order_category_samples_slot (counter_id, slot),
+  CONSTRAINT fk_work_order_category_samples_counter
+    FOREIGN KEY (counter_id) REFERENCES work_order_category_counters(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='工单三级分类蓄水池样本（每类最多20条）';
+
+CREATE TABLE IF NOT EXISTS work_order_aggregation_watermarks (
+  stat_month CHAR(7) NOT NULL COMMENT '统计月份 YYYY-MM',
+  last_update_time DATETIME NOT NULL COMMENT '已处理到的 update_time',
+  last_work_order_id BIGINT NOT NULL DEFAULT 0 COMMENT '同一 update_time 下已处理到的 id',
+  updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
+  PRIMARY KEY (stat_month)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='工单月度统计水位';
+
+-- 源库 work_order 需有 (update_time, id) 索引，增量扫描按该顺序翻页：
+-- ALTER TABLE work_order ADD INDEX idx_work_order_update_time_id (update_time, id);
@@ -0,0 +1,69 @@
+"""
+In-memory SQLite stand-in for the target database, for service tests that need real SQL.
+
+Service modules bind `TargetSessionLocal` at import time (and test_auto_review swaps
+`backend.app.core.db` for a stub), so each test patches that name on the modules it
+exercises instead of re-binding the application's session factory.
+"""
+
+from __future__ import annotations
+
+import importlib
+import pkgutil
+import unittest
+from types import ModuleType
+from typing import Any, Sequence
+from unittest import mock
+
+from sqlalchemy import BigInteger, create_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import backend.app.models as models_package
+from backend.app.models.base import Base
+
+
+@compiles(BigInteger, "sqlite")
+def _sqlite_big_integer(type_, compiler, **kw) -> str:
+    # SQLite only auto-increments INTEGER PRIMARY KEY columns.
+    return "INTEGER"
+
+
+for _module in pkgutil.iter_modules(models_package.__path__):
+    importlib.import_module(f"{models_package.__name__}.{_module.name}")
+
+
+class TargetDatabaseTestCase(unittest.TestCase):
+    """Creates every app table in a private in-memory database before each test."""
+
+    session_modules: Sequence[ModuleType] = ()
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        self.addCleanup(self.engine.dispose)
+        Base.metadata.create_all(self.engine)
+        self.session_local = sessionmaker(
+            bind=self.engine, autocommit=False, autoflush=False, expire_on_commit=False, future=True
+        )
+        for module in self.session_modules:
+            self.patch(module, "TargetSessionLocal", self.session_local)
+
+    def patch(self, target: Any, attribute: str, value: Any) -> Any:
+        patcher = mock.patch.object(target, attribute, value)
+        patched = patcher.start()
+        self.addCleanup(patcher.stop)
+        return patched
+
+    def session(self) -> Session:
+        return self.session_local()
+
+    def add_all(self, *rows: Any) -> None:
+        with self.session() as session:
+            session.add_all(rows)
+            session.commit()
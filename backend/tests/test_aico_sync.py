@@ -0,0 +1,94 @@
+import unittest
+from unittest import mock
+
+from sqlalchemy import update
+
+from backend.app.models.faq_review import KnowledgeItem
+from backend.app.models.scenario import Scenario
+from backend.app.models.scenario_sync_state import ScenarioSyncState
+from backend.app.services import aico_sync as aico_sync_module
+from backend.app.services.aico_sync import AicoSyncOrchestrator, SyncRunResult
+from backend.tests.sqlite_target import TargetDatabaseTestCase
+
+
+class SkipUnchangedTests(TargetDatabaseTestCase):
+    session_modules = (aico_sync_module,)
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.add_all(
+            Scenario(
+                id=1,
+                scenario_code="water",
+                scenario_name="水务",
+                aico_username="user",
+                aico_user_id=1,
+                aico_project_name="project",
+                aico_kb_name="kb",
+            ),
+            KnowledgeItem(id=1, scenario_id=1, question="怎么缴费", answer="线上缴费", status="active", revision=2),
+            ScenarioSyncState(scenario_id=1, knowledge_revision=2, item_count=0),
+        )
+        self.orchestrator = AicoSyncOrchestrator()
+        self.pushed = SyncRunResult(scenario_id=1, items=1, status="success", message="ok")
+
+    def state(self) -> ScenarioSyncState:
+        with self.session() as session:
+            return session.get(ScenarioSyncState, 1)
+
+    def sync(self, run_id: str, skip_unchanged: bool = True, **push) -> mock.Mock:
+        with mock.patch.object(self.orchestrator, "_push_items", **push) as push_items:
+            self.orchestrator.run_for_scenario(1, run_id=run_id, skip_unchanged=skip_unchanged)
+        return push_items
+
+    def mark_synced(self, revision: int) -> None:
+        with self.session() as session:
+            target = self.orchestrator._target_key(session.get(Scenario, 1))  # pylint: disable=protected-access
+            session.execute(
+                update(ScenarioSyncState)
+                .where(ScenarioSyncState.scenario_id == 1)
+                .values(synced_revision=revision, synced_target=target, item_count=1)
+            )
+            session.commit()
+
+    def run_for_items_calls(self, skip_unchanged: bool = True) -> list:
+        with mock.patch.object(self.orchestrator, "run_for_items", return_value=self.pushed) as run_for_items:
+            result = self.orchestrator.run_for_scenario(1, run_id="revision", skip_unchanged=skip_unchanged)
+        if not run_for_items.called:
+            self.assertEqual((result.status, result.items), ("skipped", 1))
+        return [call.kwargs["revision"] for call in run_for_items.call_args_list]
+
+    def test_matching_revision_and_target_skip_without_loading_items(self) -> None:
+        self.mark_synced(2)
+
+        self.assertEqual(self.run_for_items_calls(), [])
+        self.assertEqual(self.state().last_status, "skipped")
+        self.assertEqual(self.run_for_items_calls(skip_unchanged=False), [2])
+
+    def test_new_revision_or_target_is_pushed(self) -> None:
+        self.mark_synced(1)
+        self.assertEqual(self.run_for_items_calls(), [2])
+
+        self.mark_synced(2)
+        with self.session() as session:
+            session.execute(update(Scenario).where(Scenario.id == 1).values(aico_kb_name="kb_v2"))
+            session.commit()
+        self.assertEqual(self.run_for_items_calls(), [2])
+
+    def test_failed_push_is_not_skipped_by_the_next_run(self) -> None:
+        self.sync("first", return_value=self.pushed).assert_called_once()
+        self.sync("unchanged", return_value=self.pushed).assert_not_called()
+
+        # A forced sync deletes the old files and then fails, so AICO no longer matches the last success.
+        with self.assertRaises(RuntimeError):
+            self.sync("forced", skip_unchanged=False, side_effect=RuntimeError("split timed out"))
+        state = self.state()
+        self.assertEqual(state.last_status, "failed")
+        self.assertEqual((state.content_fingerprint, state.synced_revision, state.synced_target), (None, None, None))
+
+        self.sync("retry", return_value=self.pushed).assert_called_once()
+        self.assertEqual((self.state().last_status, self.state().synced_revision), ("success", 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import asyncio
+import importlib.util
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from backend.app.core import db
+from backend.app.models.faq_review import KnowledgeItem, PendingFAQ
+from backend.app.services import knowledge as knowledge_module
+from backend.app.services import review as review_module
+from backend.app.services import status_counters as status_counters_module
+from backend.app.services.knowledge import KnowledgeService
+from backend.app.services.review import ReviewService
+from backend.app.services.status_counters import StatusCounterCache
+
+
+class AsyncReadFallbackTests(unittest.TestCase):
+    def test_without_async_engine_runs_the_sync_method_on_the_threadpool(self) -> None:
+        service = ReviewService()
+        with mock.patch.object(review_module, "AsyncTargetSessionLocal", None), mock.patch.object(
+            service, "list_pending_faqs", return_value=([], 0)
+        ) as sync_list:
+            result = asyncio.run(service.list_pending_faqs_async(page=2, page_size=10, source_group_code="SW"))
+
+        self.assertEqual(result, ([], 0))
+        sync_list.assert_called_once_with(2, 10, None, "SW")
+
+
+@unittest.skipUnless(importlib.util.find_spec("aiosqlite"), "aiosqlite not installed")
+class AsyncReadEngineTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = f"{tmp.name}/reads.sqlite"
+        sync_engine = create_engine(f"sqlite:///{path}")
+        PendingFAQ.__table__.create(sync_engine)
+        KnowledgeItem.__table__.create(sync_engine)
+        now = datetime(2025, 1, 1)
+        with sync_engine.begin() as connection:
+            connection.execute(
+                insert(PendingFAQ.__table__),
+                [
+                    {
+                        "id": index + 1,
+                        "question": f"水费怎么交{index}",
+                        "answer": "可以在线缴纳",
+                        "status": "pending",
+                        "source_group_code": "SW" if index % 2 else "GJ",
+                        "created_at": now + timedelta(minutes=index),
+                        "updated_at": now,
+                    }
+                    for index in range(6)
+                ],
+            )
+            connection.execute(
+                insert(KnowledgeItem.__table__),
+                [
+                    {
+                        "id": index + 1,
+                        "scenario_id": 1,
+                        "question": f"停水什么时候恢复{index}",
+                        "answer": "预计今晚八点前恢复",
+                        "status": "active" if index < 3 else "disabled",
+                        "revision": 0,
+                        "created_at": now,
+                        "updated_at": now + timedelta(minutes=index),
+                    }
+                    for index in range(5)
+                ],
+            )
+        sync_engine.dispose()
+
+        self.async_engine = db._create_async_engine(f"sqlite+aiosqlite:///{path}", "test_async")
+        session_local = async_sessionmaker(bind=self.async_engine, autoflush=False, expire_on_commit=False)
+        for module in (review_module, knowledge_module, status_counters_module):
+            patcher = mock.patch.object(module, "AsyncTargetSessionLocal", session_local)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        counters = StatusCounterCache(ttl_seconds=60)
+        for module in (review_module, knowledge_module):
+            patcher = mock.patch.object(module, "status_counters", counters)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def run_on_engine(self, coroutine):
+        # aiosqlite connections belong to the loop that opened them, so dispose on the same loop.
+        async def run():
+            try:
+                return await coroutine
+            finally:
+                await self.async_engine.dispose()
+
+        return asyncio.run(run())
+
+    def test_pending_list_pages_and_counts_through_async_session(self) -> None:
+        service = ReviewService()
+
+        async def both_pages():
+            by_group = await service.list_pending_faqs_async(page=1, page_size=2, source_group_code="SW")
+            by_keyword = await service.list_pending_faqs_async(page=1, page_size=10, keyword="交5")
+            return by_group, by_keyword
+
+        (items, total), (keyword_items, keyword_total) = self.run_on_engine(both_pages())
+
+        self.assertEqual(total, 3)
+        self.assertEqual([item.id for item in items], [6, 4])
+        self.assertEqual((keyword_total, [item.id for item in keyword_items]), (1, [6]))
+
+    def test_knowledge_list_filters_by_status(self) -> None:
+        items, total = self.run_on_engine(
+            KnowledgeService().list_items_async(scenario_id=1, status="disabled", page=1, page_size=10)
+        )
+
+        self.assertEqual(total, 2)
+        self.assertEqual([item.id for item in items], [5, 4])
+        self.assertEqual(items[0].question, "停水什么时候恢复4")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -18,6 +18,8 @@ def _dummy_session_local():
 
 
 stub_db.TargetSessionLocal = _dummy_session_local
+stub_db.SourceSessionLocal = _dummy_session_local
+stub_db.AsyncTargetSessionLocal = None
 sys.modules["backend.app.core.db"] = stub_db
 
 from backend.app.services import faq_extraction
@@ -0,0 +1,49 @@
+import unittest
+from datetime import date
+
+import httpx
+
+from backend.benchmarks.mock_aico import CHATBOT_PREFIX, MockAicoConfig, MockAicoServer
+from backend.benchmarks.synthetic import DialogProfile, generate_dialogs
+
+
+class SyntheticDialogTests(unittest.TestCase):
+    def test_calls_are_split_across_groups_with_skew(self) -> None:
+        profile = DialogProfile(groups=4, calls_per_day=1000, skew=1.0)
+        counts = profile.calls_per_group()
+
+        self.assertEqual(sum(counts.values()), 1000)
+        self.assertEqual(list(counts), profile.group_codes())
+        self.assertGreater(counts[profile.group_codes()[0]], counts[profile.group_codes()[-1]])
+
+    def test_generation_is_deterministic_per_seed(self) -> None:
+        profile = DialogProfile(groups=2, calls_per_day=20)
+        first = list(generate_dialogs(profile, date(2025, 1, 1)))
+
+        self.assertEqual(first, list(generate_dialogs(profile, date(2025, 1, 1))))
+        reseeded = DialogProfile(groups=2, calls_per_day=20, seed=7)
+        self.assertNotEqual(first, list(generate_dialogs(reseeded, date(2025, 1, 1))))
+        self.assertEqual(len({row["call_id"] for row in first}), 20)
+
+
+class MockAicoServerTests(unittest.TestCase):
+    def test_serves_token_and_chatbot_with_injected_errors(self) -> None:
+        config = MockAicoConfig(latency_ms={}, error_rate={"online": 1.0}, no_faq_rate=0.0)
+        with MockAicoServer(config) as server:
+            token = httpx.post(server.url("/aicoapi/user/generate_user_token"), json={})
+            extraction = httpx.post(
+                server.url(f"{CHATBOT_PREFIX}extraction"),
+                json={"query": "客服：您好\n市民：水费怎么交？\n客服：可以在线缴纳。"},
+            )
+            online = httpx.post(server.url("/aicoapi/knowledge_manage/knowledge/online"), json={})
+            stats = server.stats()
+
+        self.assertEqual(token.json()["data"]["token"], "mock-token")
+        self.assertEqual(extraction.json()["data"]["text"], ["问题：水费怎么交？\n答案：可以在线缴纳。"])
+        self.assertEqual(online.status_code, 500)
+        self.assertEqual(stats["requests"], {"token": 1, "chatbot": 1, "online": 1})
+        self.assertEqual(stats["errors"], {"online": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
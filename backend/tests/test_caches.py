@@ -0,0 +1,115 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import update
+
+from backend.app.core import cache as cache_module
+from backend.app.core import security as security_module
+from backend.app.core.cache import TTLCache
+from backend.app.core.security import create_access_token, get_current_user, hash_password
+from backend.app.models.scenario import Scenario
+from backend.app.models.user import User
+from backend.app.services import auth as auth_module
+from backend.app.services import scenario as scenario_module
+from backend.app.services.auth import AuthService
+from backend.app.services.scenario import ScenarioService
+from backend.tests.sqlite_target import TargetDatabaseTestCase
+
+
+class TTLCacheTests(unittest.TestCase):
+    def test_entries_expire_after_ttl(self) -> None:
+        cache: TTLCache[str, int] = TTLCache(ttl_seconds=10)
+        with mock.patch.object(cache_module.time, "monotonic", return_value=100.0):
+            cache.set("a", 1)
+        with mock.patch.object(cache_module.time, "monotonic", return_value=109.0):
+            self.assertEqual(cache.get("a"), 1)
+        with mock.patch.object(cache_module.time, "monotonic", return_value=110.0):
+            self.assertIsNone(cache.get("a"))
+
+    def test_evicts_least_recently_used_entry(self) -> None:
+        cache: TTLCache[str, int] = TTLCache(ttl_seconds=60, max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual((cache.get("a"), cache.get("b"), cache.get("c")), (1, None, 3))
+
+    def test_zero_ttl_disables_caching(self) -> None:
+        cache: TTLCache[str, int] = TTLCache(ttl_seconds=0)
+        loader = mock.Mock(side_effect=[1, 2])
+
+        self.assertEqual(cache.get_or_load("a", loader), 1)
+        self.assertEqual(cache.get_or_load("a", loader), 2)
+
+
+class UserAndScenarioCacheTests(TargetDatabaseTestCase):
+    session_modules = (security_module, auth_module, scenario_module)
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.add_all(
+            Scenario(
+                id=1,
+                scenario_code="water",
+                scenario_name="水务",
+                aico_username="bot",
+                aico_user_id=1,
+                aico_project_name="p",
+                aico_kb_name="kb",
+            ),
+            User(id=5, username="alice", password_hash=hash_password("pw"), scenario_id=1, role="auditor"),
+        )
+        self.patch(security_module, "AsyncTargetSessionLocal", None)
+        self.patch(scenario_module, "AsyncTargetSessionLocal", None)
+        self.user_cache = self.patch(security_module, "_user_cache", TTLCache(ttl_seconds=30))
+        self.patch(scenario_module, "scenario_cache", TTLCache(ttl_seconds=30))
+        token = create_access_token(subject={"userId": 5, "username": "alice", "role": "auditor", "scenarioId": 1})
+        self.credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    def update_user(self, **values) -> None:
+        with self.session() as session:
+            session.execute(update(User).where(User.id == 5).values(**values))
+            session.commit()
+
+    def current_user(self) -> User:
+        return asyncio.run(get_current_user(self.credentials))
+
+    def test_user_changes_apply_once_the_entry_expires(self) -> None:
+        self.assertEqual(self.current_user().role, "auditor")
+        self.update_user(is_active=False)
+
+        self.assertTrue(self.current_user().is_active)
+
+        self.user_cache.clear()
+        with self.assertRaises(HTTPException) as raised:
+            self.current_user()
+        self.assertEqual(raised.exception.status_code, 403)
+
+    def test_login_recaches_the_fresh_row(self) -> None:
+        self.assertEqual(self.current_user().role, "auditor")
+        self.update_user(role="admin")
+
+        AuthService().login("alice", "pw")
+
+        self.assertEqual(self.current_user().role, "admin")
+
+    def test_update_scenario_invalidates_cached_entry(self) -> None:
+        service = ScenarioService()
+        self.assertEqual(service.get_scenario(1).scenario_name, "水务")
+        with self.session() as session:
+            session.execute(update(Scenario).where(Scenario.id == 1).values(scenario_name="直接修改"))
+            session.commit()
+        self.assertEqual(service.get_scenario(1).scenario_name, "水务")
+
+        service.update_scenario(1, sync_schedule="0 3 * * *")
+
+        cached = service.get_scenario(1)
+        self.assertEqual((cached.scenario_name, cached.sync_schedule), ("直接修改", "0 3 * * *"))
+
+
+if __name__ == "__main__":
+    unittest.main()
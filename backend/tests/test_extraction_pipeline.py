@@ -0,0 +1,113 @@
+import threading
+import time
+import unittest
+
+from datetime import datetime
+
+from backend.app.services.extraction_pipeline import ExtractionPipeline
+from backend.app.services.job_queue import JobConflictError, JobInfo
+
+
+class _FakeFaqService:
+    def __init__(self) -> None:
+        self.release = threading.Event()
+        self.seen = []
+
+    def process_conversation(self, conv_id: int) -> bool:
+        self.release.wait(2)
+        self.seen.append(conv_id)
+        return conv_id % 2 == 0
+
+
+class _FakeJobQueue:
+    def __init__(self, conflicts: int = 0) -> None:
+        self.conflicts = conflicts
+        self.calls = []
+        self.queued = []
+
+    def enqueue_job(self, kind: str, payload: dict) -> JobInfo:
+        self.calls.append((kind, payload))
+        job = JobInfo(
+            job_id=f"{kind}-{len(self.calls)}",
+            kind=kind,
+            status="queued",
+            payload=payload,
+            progress_current=0,
+            progress_total=None,
+            progress_message=None,
+            attempts=0,
+            max_attempts=2,
+            cancel_requested=False,
+            worker_id=None,
+            error=None,
+            result={},
+            created_at=datetime(2025, 1, 1),
+            started_at=None,
+            heartbeat_at=None,
+            finished_at=None,
+        )
+        if len(self.calls) <= self.conflicts:
+            raise JobConflictError(job)
+        self.queued.append(job)
+        return job
+
+
+class ExtractionPipelineTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.faq = _FakeFaqService()
+        self.jobs = _FakeJobQueue()
+        self.pipeline = self._pipeline(self.jobs)
+
+    def _pipeline(self, jobs: _FakeJobQueue) -> ExtractionPipeline:
+        return ExtractionPipeline(
+            faq_service=self.faq,
+            enqueue_job=jobs.enqueue_job,
+            workers=2,
+            sync_delay_seconds=0.05,
+        )
+
+    def tearDown(self) -> None:
+        self.faq.release.set()
+        self.pipeline.stop()
+
+    def _wait_idle(self) -> None:
+        deadline = time.monotonic() + 2
+        while time.monotonic() < deadline:
+            stats = self.pipeline.stats()
+            if stats.in_flight == 0 and stats.compare_syncs:
+                return
+            time.sleep(0.01)
+        self.fail("pipeline did not drain")
+
+    def test_duplicates_of_queued_ids_are_dropped(self) -> None:
+        self.assertEqual(self.pipeline.submit([1, 2, 3]), 3)
+        self.assertEqual(self.pipeline.submit([2, 3, 4]), 1)
+        self.faq.release.set()
+        self._wait_idle()
+        self.assertEqual(sorted(self.faq.seen), [1, 2, 3, 4])
+
+    def test_compare_sync_runs_once_after_queue_drains(self) -> None:
+        self.pipeline.submit(range(1, 7))
+        self.faq.release.set()
+        self._wait_idle()
+        time.sleep(0.1)
+        stats = self.pipeline.stats()
+        self.assertEqual(stats.processed, 6)
+        self.assertEqual(stats.faqs_created, 3)
+        self.assertEqual(self.jobs.calls, [("compare_kb_sync", {"skip_unchanged": True})])
+
+    def test_sync_already_running_is_retried_after_the_next_delay(self) -> None:
+        self.jobs = _FakeJobQueue(conflicts=2)
+        self.pipeline = self._pipeline(self.jobs)
+
+        self.pipeline.submit([2, 4])
+        self.faq.release.set()
+        self._wait_idle()
+
+        self.assertEqual(len(self.jobs.calls), 3)
+        self.assertEqual([job.job_id for job in self.jobs.queued], ["compare_kb_sync-3"])
+        self.assertEqual(self.pipeline.stats().compare_syncs, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
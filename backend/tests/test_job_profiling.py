@@ -0,0 +1,37 @@
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from backend.app.jobs.profiling import profile_run
+
+
+def busy_group_work(seconds: float) -> None:
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        sum(range(200))
+
+
+class ProfileRunTests(unittest.TestCase):
+    def test_writes_collapsed_stacks_for_job_and_executor_threads(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            output = Path(tmp) / "profiles" / "aggregation-job1-1.collapsed"
+            with profile_run(output, interval_seconds=0.002, thread_prefixes=("etl-group",)) as profiler:
+                with ThreadPoolExecutor(max_workers=1, thread_name_prefix="etl-group") as executor:
+                    executor.submit(busy_group_work, 0.15).result()
+                with ThreadPoolExecutor(max_workers=1, thread_name_prefix="unrelated") as executor:
+                    executor.submit(busy_group_work, 0.05).result()
+
+            lines = output.read_text(encoding="utf-8").splitlines()
+
+        self.assertGreater(profiler.samples, 0)
+        stacks = {line.rsplit(" ", 1)[0]: int(line.rsplit(" ", 1)[1]) for line in lines}
+        executor_stacks = [stack for stack in stacks if stack.startswith("etl-group;")]
+        self.assertTrue(any("busy_group_work (" in stack for stack in executor_stacks))
+        self.assertFalse(any(stack.startswith("unrelated") for stack in stacks))
+        self.assertEqual(sum(stacks.values()), sum(profiler.stacks.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
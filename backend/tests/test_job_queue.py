@@ -0,0 +1,65 @@
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from backend.app.models.background_job import BackgroundJob
+from backend.app.services import job_queue as job_queue_module
+from backend.app.services.job_queue import JobCancelled, JobContext, job_queue
+from backend.tests.sqlite_target import TargetDatabaseTestCase
+
+
+class StaleWorkerTests(TargetDatabaseTestCase):
+    session_modules = (job_queue_module,)
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.queued = job_queue.enqueue("compare_kb_sync", {}, max_attempts=2)
+        self.first = job_queue.claim("worker-a", ["compare_kb_sync"])
+        # worker-a stalls past the heartbeat timeout; another process re-queues the job and
+        # the retry backoff is skipped so worker-b can claim it straight away.
+        self.set_job(heartbeat_at=datetime.utcnow() - timedelta(minutes=5))
+        self.assertEqual(job_queue.requeue_stale(timedelta(minutes=1)), 1)
+        self.set_job(run_after=datetime.utcnow() - timedelta(seconds=1))
+        self.second = job_queue.claim("worker-b", ["compare_kb_sync"])
+
+    def set_job(self, **values) -> None:
+        with self.session() as session:
+            session.execute(update(BackgroundJob).where(BackgroundJob.id == self.queued.job_id).values(**values))
+            session.commit()
+
+    def test_stale_worker_cannot_settle_the_new_attempt(self) -> None:
+        self.assertEqual((self.second.worker_id, self.second.attempts), ("worker-b", 2))
+
+        job_queue.complete(self.queued.job_id, "worker-a")
+        job_queue.fail(self.queued.job_id, "worker-a", "boom")
+        job_queue.cancelled(self.queued.job_id, "worker-a")
+
+        job = job_queue.get(self.queued.job_id)
+        self.assertEqual((job.status, job.worker_id, job.error), ("running", "worker-b", None))
+        self.assertEqual(job_queue.get_active("compare_kb_sync").job_id, self.queued.job_id)
+
+        job_queue.complete(self.queued.job_id, "worker-b")
+
+        self.assertEqual(job_queue.get(self.queued.job_id).status, "succeeded")
+        self.assertIsNone(job_queue.get_active("compare_kb_sync"))
+
+    def test_stale_worker_progress_stops_its_handler_without_touching_the_row(self) -> None:
+        stale = JobContext(job_queue, self.first)
+
+        with self.assertRaises(JobCancelled):
+            stale.progress(5, 10, "stale", result={"stale": True})
+
+        self.assertTrue(stale.cancel_event.is_set())
+        job = job_queue.get(self.queued.job_id)
+        self.assertEqual((job.progress_current, job.progress_message, job.result), (0, None, {}))
+        self.assertEqual(job.heartbeat_at, self.second.heartbeat_at)
+
+        current = JobContext(job_queue, self.second)
+        current.progress(3, 10, "running")
+        self.assertEqual(job_queue.get(self.queued.job_id).progress_current, 3)
+        self.assertFalse(current.cancel_event.is_set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import unittest
+
+from sqlalchemy import event, select
+
+from backend.app.models.kb_taxonomy import KbTaxonomyCase, KbTaxonomyNode
+from backend.app.services import kb_taxonomy as kb_taxonomy_module
+from backend.app.services.kb_taxonomy import ImportRow, bulk_insert_rows
+from backend.tests.sqlite_target import TargetDatabaseTestCase
+
+
+def _row(l1: str, l2: str, l3: str, cases=()) -> ImportRow:
+    return ImportRow(domain="水务", l1=l1, l2=l2, l3=l3, definition=f"{l3}的定义", cases=list(cases))
+
+
+class BulkInsertRowsTests(TargetDatabaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.node_inserts = []
+
+        def count_inserts(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("INSERT INTO kb_taxonomy_nodes"):
+                self.node_inserts.append(len(parameters) if executemany else 1)
+
+        event.listen(self.engine, "before_cursor_execute", count_inserts)
+        self.addCleanup(event.remove, self.engine, "before_cursor_execute", count_inserts)
+
+    def insert(self, rows):
+        with self.session() as session:
+            with session.begin():
+                return bulk_insert_rows(session, scope="water", rows=rows)
+
+    def nodes(self):
+        with self.session() as session:
+            rows = session.execute(
+                select(
+                    KbTaxonomyNode.id,
+                    KbTaxonomyNode.level,
+                    KbTaxonomyNode.name,
+                    KbTaxonomyNode.parent_id,
+                    KbTaxonomyNode.path,
+                )
+            ).all()
+        return {int(row.id): row for row in rows}
+
+    def name_path(self, nodes, node_id):
+        names = []
+        while node_id is not None:
+            names.insert(0, nodes[node_id].name)
+            node_id = nodes[node_id].parent_id
+        return tuple(names)
+
+    def test_ids_are_read_back_by_parent_and_name_for_every_level(self) -> None:
+        # The same L2/L3 names under different parents must resolve to different nodes.
+        rows = [
+            _row("缴费", "线上", "微信", ["微信怎么交"]),
+            _row("缴费", "线上", "支付宝"),
+            _row("报修", "线上", "微信", ["微信报修", "公众号报修"]),
+            _row("报修", "线下", "营业厅"),
+        ]
+
+        path_ids = self.insert(rows)
+
+        nodes = self.nodes()
+        self.assertEqual(len(nodes), 2 + 3 + 4)
+        self.assertEqual(self.node_inserts, [2, 3, 4])
+        for path, node_id in path_ids.items():
+            self.assertEqual(self.name_path(nodes, node_id), path)
+            self.assertEqual(nodes[node_id].level, 3)
+        with self.session() as session:
+            cases = session.execute(select(KbTaxonomyCase.node_id, KbTaxonomyCase.content)).all()
+        self.assertEqual(
+            sorted((self.name_path(nodes, node_id), content) for node_id, content in cases),
+            [
+                (("报修", "线上", "微信"), "公众号报修"),
+                (("报修", "线上", "微信"), "微信报修"),
+                (("缴费", "线上", "微信"), "微信怎么交"),
+            ],
+        )
+
+    def test_paths_are_filled_from_the_parent_chain(self) -> None:
+        path_ids = self.insert([_row("缴费", "线上", "微信")])
+
+        nodes = self.nodes()
+        l3 = nodes[path_ids[("缴费", "线上", "微信")]]
+        l2 = nodes[l3.parent_id]
+        self.assertEqual(l3.path, f"/{l2.parent_id}/{l2.id}/{l3.id}/")
+
+    def test_existing_paths_are_reused_and_only_missing_levels_inserted(self) -> None:
+        first = self.insert([_row("缴费", "线上", "微信")])
+        self.node_inserts.clear()
+
+        second = self.insert([_row("缴费", "线上", "微信", ["新案例"]), _row("缴费", "线上", "银行卡")])
+
+        self.assertEqual(second[("缴费", "线上", "微信")], first[("缴费", "线上", "微信")])
+        self.assertEqual(self.node_inserts, [1])
+        self.assertEqual(len(self.nodes()), 4)
+
+    def test_cases_are_written_in_chunks(self) -> None:
+        self.patch(kb_taxonomy_module, "IMPORT_CASE_CHUNK_SIZE", 2)
+        case_batches = []
+
+        def count_case_inserts(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("INSERT INTO kb_taxonomy_cases"):
+                case_batches.append(len(parameters) if executemany else 1)
+
+        event.listen(self.engine, "before_cursor_execute", count_case_inserts)
+        self.addCleanup(event.remove, self.engine, "before_cursor_execute", count_case_inserts)
+
+        self.insert(
+            [
+                _row("缴费", "线上", "微信", ["一", "二", "三"]),
+                _row("缴费", "线上", "支付宝", ["四", "五"]),
+            ]
+        )
+
+        self.assertEqual(case_batches, [2, 2, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
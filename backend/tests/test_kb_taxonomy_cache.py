@@ -0,0 +1,109 @@
+import asyncio
+import unittest
+
+from sqlalchemy import event, select, update
+from sqlalchemy.sql import Select
+
+from backend.app.models.kb_taxonomy import KbTaxonomyNode, KbTaxonomyScopeVersion
+from backend.app.services import kb_taxonomy as kb_taxonomy_module
+from backend.app.services import kb_taxonomy_cache as cache_module
+from backend.app.services.kb_taxonomy import KbTaxonomyService
+from backend.app.services.kb_taxonomy_cache import TaxonomySnapshotCache, bump_taxonomy_version
+from backend.tests.sqlite_target import TargetDatabaseTestCase
+
+
+class TaxonomySnapshotVersionTests(TargetDatabaseTestCase):
+    session_modules = (cache_module, kb_taxonomy_module)
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.patch(cache_module, "AsyncTargetSessionLocal", None)
+        self.service = KbTaxonomyService()
+        self.root = self.service.create_node(scope="water", level=1, name="缴费", parent_id=None, definition=None)
+        self.child = self.service.create_node(
+            scope="water", level=2, name="线上缴费", parent_id=self.root.id, definition=None
+        )
+        # Two workers, each with its own in-process cache.
+        self.worker_a = TaxonomySnapshotCache(ttl_seconds=300)
+        self.worker_b = TaxonomySnapshotCache(ttl_seconds=300)
+
+    def version(self, scope: str = "water") -> int:
+        with self.session() as session:
+            return session.execute(
+                select(KbTaxonomyScopeVersion.version).where(KbTaxonomyScopeVersion.scope_code == scope)
+            ).scalar_one()
+
+    def test_writes_bump_the_scope_version_in_their_transaction(self) -> None:
+        self.assertEqual(self.version(), 2)
+
+        self.service.update_node(node_id=self.child.id, scope="water", name="网上缴费", definition=None)
+        self.service.delete_node(node_id=self.child.id, scope="water")
+
+        self.assertEqual(self.version(), 4)
+        with self.session() as session:
+            self.assertEqual(bump_taxonomy_version(session, "bus"), 1)
+            self.assertEqual(bump_taxonomy_version(session, "bus"), 2)
+
+    def test_write_on_one_worker_invalidates_the_others(self) -> None:
+        before_a = self.worker_a.get("water")
+        before_b = asyncio.run(self.worker_b.get_async("water"))
+        self.assertIs(self.worker_a.get("water"), before_a)
+
+        self.service.update_node(node_id=self.child.id, scope="water", name="网上缴费", definition=None)
+
+        after_a = self.worker_a.get("water")
+        after_b = asyncio.run(self.worker_b.get_async("water"))
+        self.assertEqual(after_a.nodes[self.child.id].name, "网上缴费")
+        self.assertEqual(after_b.nodes[self.child.id].name, "网上缴费")
+        self.assertNotEqual(after_a.etag, before_a.etag)
+        self.assertEqual(after_a.etag, after_b.etag)
+        self.assertEqual(before_b.etag, before_a.etag)
+
+    def test_edits_without_a_bump_wait_for_the_ttl(self) -> None:
+        cached = self.worker_a.get("water")
+        with self.session() as session:
+            session.execute(update(KbTaxonomyNode).where(KbTaxonomyNode.id == self.root.id).values(name="直接修改"))
+            session.commit()
+
+        self.assertIs(self.worker_a.get("water"), cached)
+        self.assertEqual(TaxonomySnapshotCache(ttl_seconds=0).get("water").nodes[self.root.id].name, "直接修改")
+
+    def test_write_committed_between_version_and_node_reads_is_not_cached_under_the_new_version(self) -> None:
+        writes = []
+
+        # A writer commits right after this worker has read the version, before it loads the nodes.
+        def concurrent_write(conn, cursor, statement, parameters, context, executemany):
+            if writes or not isinstance(context.compiled.statement, Select):
+                return
+            if "kb_taxonomy_scope_versions" in statement:
+                dbapi_connection = conn.connection.dbapi_connection
+                raw = dbapi_connection.cursor()
+                raw.execute("UPDATE kb_taxonomy_nodes SET name = '改名' WHERE id = ?", (self.root.id,))
+                raw.execute("UPDATE kb_taxonomy_scope_versions SET version = version + 1 WHERE scope_code = 'water'")
+                dbapi_connection.commit()
+                writes.append(True)
+
+        event.listen(self.engine, "after_cursor_execute", concurrent_write)
+        self.addCleanup(event.remove, self.engine, "after_cursor_execute", concurrent_write)
+
+        raced = self.worker_a.get("water")
+        fresh = self.worker_a.get("water")
+
+        # The first snapshot is labelled with the version it read, so the next read rebuilds it.
+        self.assertEqual((raced.version, fresh.version), (2, 3))
+        self.assertEqual(fresh.nodes[self.root.id].name, "改名")
+        self.assertIsNot(fresh, raced)
+        self.assertIs(self.worker_a.get("water"), fresh)
+
+    def test_slower_rebuild_does_not_replace_a_newer_snapshot(self) -> None:
+        old = self.worker_a.get("water")
+        self.service.update_node(node_id=self.root.id, scope="water", name="缴费服务", definition=None)
+        new = self.worker_a.get("water")
+
+        self.worker_a._publish(old)  # pylint: disable=protected-access
+
+        self.assertIs(self.worker_a._current("water", new.version), new)  # pylint: disable=protected-access
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+
+from backend.app.services.kb_taxonomy import ExistingNode, ImportRow, diff_import_plan
+
+
+def _row(l1, l2, l3, definition, cases):
+    return ImportRow(domain="水务", l1=l1, l2=l2, l3=l3, definition=definition, cases=list(cases))
+
+
+class ImportDiffTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.existing = [
+            ExistingNode(id=1, path=("缴费",)),
+            ExistingNode(id=2, path=("缴费", "线上缴费")),
+            ExistingNode(id=3, path=("缴费", "线上缴费", "微信缴费"), definition="通过微信缴纳水费", cases=("怎么用微信交水费",)),
+            ExistingNode(id=4, path=("报修",)),
+            ExistingNode(id=5, path=("报修", "漏水")),
+            ExistingNode(id=6, path=("报修", "漏水", "管道漏水"), definition="户内管道漏水", cases=("家里水管漏了", "水管爆了")),
+        ]
+
+    def test_identical_plan_is_empty(self) -> None:
+        rows = [
+            _row("缴费", "线上缴费", "微信缴费", "通过微信缴纳水费", ["怎么用微信交水费"]),
+            _row("报修", "漏水", "管道漏水", "户内管道漏水", ["水管爆了"]),
+            _row("报修", "漏水", "管道漏水", "户内管道漏水", ["家里水管漏了"]),
+        ]
+        diff = diff_import_plan(self.existing, rows)
+        self.assertTrue(diff.is_empty)
+        self.assertEqual(diff.unchanged, 6)
+
+    def test_added_removed_and_changed(self) -> None:
+        rows = [
+            _row("缴费", "线上缴费", "微信缴费", "使用微信缴纳水费", ["怎么用微信交水费"]),
+            _row("缴费", "线上缴费", "支付宝缴费", "通过支付宝缴纳水费", ["支付宝能交水费吗"]),
+        ]
+        diff = diff_import_plan(self.existing, rows)
+        self.assertEqual(diff.added, [("缴费", "线上缴费", "支付宝缴费")])
+        self.assertEqual(sorted(n.id for n in diff.removed), [4, 5, 6])
+        self.assertEqual([(n.id, d) for n, d in diff.definition_changed], [(3, "使用微信缴纳水费")])
+        self.assertEqual(diff.cases_changed, [])
+
+    def test_case_set_change(self) -> None:
+        rows = [
+            _row("缴费", "线上缴费", "微信缴费", "通过微信缴纳水费", ["怎么用微信交水费"]),
+            _row("报修", "漏水", "管道漏水", "户内管道漏水", ["家里水管漏了"]),
+        ]
+        diff = diff_import_plan(self.existing, rows)
+        self.assertEqual([n.id for n in diff.cases_changed], [6])
+        self.assertEqual(diff.definition_changed, [])
+        self.assertEqual(diff.added, [])
+        self.assertEqual(diff.removed, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
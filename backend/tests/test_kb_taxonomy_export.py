@@ -0,0 +1,122 @@
+import csv
+import io
+import os
+import tempfile
+import unittest
+
+from backend.app.services import kb_taxonomy as kb_taxonomy_module
+from backend.app.services.kb_taxonomy import (
+    ImportRow,
+    KbTaxonomyService,
+    ValidationError,
+    build_import_plan,
+    bulk_insert_rows,
+    iter_csv_chunks,
+    write_xlsx_file,
+)
+from backend.tests.sqlite_target import TargetDatabaseTestCase
+
+try:
+    import openpyxl
+except ImportError:  # pragma: no cover
+    openpyxl = None
+
+
+def _row(l1: str, l2: str, l3: str, cases=()) -> ImportRow:
+    return ImportRow(domain="水务", l1=l1, l2=l2, l3=l3, definition=f"{l3}的定义", cases=list(cases))
+
+
+class IterExportRowsTests(TargetDatabaseTestCase):
+    session_modules = (kb_taxonomy_module,)
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.service = KbTaxonomyService()
+
+    def seed(self, rows) -> None:
+        with self.session() as session:
+            with session.begin():
+                bulk_insert_rows(session, scope="water", rows=rows)
+
+    def export(self, scope: str = "water"):
+        return list(self.service.iter_export_rows(scope))
+
+    def test_header_has_one_case_column_per_case_of_the_largest_node(self) -> None:
+        self.seed([_row("缴费", "线上", "微信", ["一", "二", "三"]), _row("报修", "线下", "营业厅")])
+
+        header, *rows = self.export()
+
+        self.assertEqual(header, ["业务域", "一级", "二级", "三级", "定义", "案例1", "案例2", "案例3"])
+        self.assertEqual(
+            rows,
+            [
+                ["水务", "报修", "线下", "营业厅", "营业厅的定义", "", "", ""],
+                ["水务", "缴费", "线上", "微信", "微信的定义", "一", "二", "三"],
+            ],
+        )
+
+    def test_case_columns_are_capped_and_overflow_continues_on_rows_with_the_same_path(self) -> None:
+        cases = [f"案例内容{i}" for i in range(1, 26)]
+        self.seed([_row("缴费", "线上", "微信", cases)])
+
+        header, first, second = self.export()
+
+        self.assertEqual(len(header), 5 + kb_taxonomy_module.EXPORT_MAX_CASE_COLUMNS)
+        self.assertEqual(header[-1], "案例20")
+        self.assertEqual(first[5:], cases[:20])
+        self.assertEqual(second[:5], first[:5])
+        self.assertEqual(second[5:], [*cases[20:], *([""] * 15)])
+
+    def test_export_imports_back_into_the_same_rows(self) -> None:
+        self.patch(kb_taxonomy_module, "EXPORT_MAX_CASE_COLUMNS", 2)
+        self.seed([_row("缴费", "线上", "微信", ["一", "二", "三"]), _row("缴费", "线上", "支付宝", ["四"])])
+
+        raw = b"".join(iter_csv_chunks(self.export()))
+        plan, errors = build_import_plan("water", raw, "export.csv")
+
+        self.assertEqual(errors, [])
+        self.assertEqual(
+            [(row.l3, row.cases) for row in plan.rows],
+            [("微信", ["一", "二"]), ("微信", ["三"]), ("支付宝", ["四"])],
+        )
+        self.assertEqual((plan.category_count, plan.case_count), (2, 4))
+
+    def test_empty_scope_exports_only_the_header_and_unknown_scope_fails(self) -> None:
+        self.assertEqual(self.export(), [["业务域", "一级", "二级", "三级", "定义", "案例1"]])
+        with self.assertRaises(ValidationError):
+            self.export("metro")
+
+
+class ExportWriterTests(unittest.TestCase):
+    rows = [["业务域", "一级"], ["水务", "缴费"], ["水务", "报修"], ["水务", "含,逗号"]]
+
+    def test_csv_chunks_start_with_a_bom_and_split_every_n_rows(self) -> None:
+        chunks = list(iter_csv_chunks(self.rows, rows_per_chunk=3))
+
+        self.assertEqual(len(chunks), 2)
+        self.assertTrue(chunks[0].startswith("\ufeff".encode("utf-8")))
+        self.assertFalse(chunks[1].startswith("\ufeff".encode("utf-8")))
+        text = b"".join(chunks).decode("utf-8-sig")
+        self.assertEqual(list(csv.reader(io.StringIO(text))), self.rows)
+
+    def test_csv_chunks_for_no_rows_is_only_the_bom(self) -> None:
+        self.assertEqual(list(iter_csv_chunks([])), ["\ufeff".encode("utf-8")])
+
+    @unittest.skipIf(openpyxl is None, "openpyxl is not installed")
+    def test_xlsx_file_contains_the_rows(self) -> None:
+        fd, path = tempfile.mkstemp(suffix=".xlsx")
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+
+        write_xlsx_file(iter(self.rows), path)
+
+        wb = openpyxl.load_workbook(path, read_only=True)
+        try:
+            values = [list(row) for row in wb.active.iter_rows(values_only=True)]
+        finally:
+            wb.close()
+        self.assertEqual(values, self.rows)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import io
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update
+
+from backend.app.models.kb_taxonomy import KbTaxonomyImportPlan
+from backend.app.services import kb_taxonomy as kb_taxonomy_module
+from backend.app.services.kb_taxonomy import (
+    KbTaxonomyService,
+    _open_csv_stream,
+    _open_xlsx_stream,
+    build_import_plan_from_stream,
+    write_xlsx_file,
+)
+from backend.tests.sqlite_target import TargetDatabaseTestCase
+
+HEADER = ["业务域", "一级", "二级", "三级", "定义", "案例1", "案例2"]
+
+
+def _csv(*rows) -> io.BytesIO:
+    lines = [",".join(HEADER)] + [",".join(row) for row in rows]
+    return io.BytesIO(("\ufeff" + "\r\n".join(lines) + "\r\n").encode("utf-8"))
+
+
+def _xlsx(*rows) -> io.BytesIO:
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        write_xlsx_file([HEADER, *rows], path)
+        with open(path, "rb") as handle:
+            return io.BytesIO(handle.read())
+    finally:
+        os.remove(path)
+
+
+class TabularStreamTests(unittest.TestCase):
+    def test_csv_strips_bom_and_cells_and_skips_blank_rows(self) -> None:
+        fileobj = _csv(
+            ["水务", " 缴费 ", "线上", "微信", "定义", "案例", ""],
+            [""] * 7,
+            ["水务", "报修", "线下", "营业厅", "定义", "", ""],
+        )
+
+        with _open_csv_stream(fileobj) as (headers, rows):
+            self.assertEqual(headers, HEADER)
+            parsed = list(rows)
+
+        self.assertEqual([number for number, _ in parsed], [2, 4])
+        self.assertEqual(parsed[0][1]["一级"], "缴费")
+        self.assertFalse(fileobj.closed)
+
+    def test_xlsx_keeps_excel_row_numbers_and_skips_blank_rows(self) -> None:
+        fileobj = _xlsx(
+            ["水务", "缴费", "线上", "微信", "定义", "案例", None],
+            [None] * 7,
+            ["水务", "报修", "线下", "营业厅", "定义"],
+        )
+
+        with _open_xlsx_stream(fileobj) as (headers, rows):
+            self.assertEqual(headers, HEADER)
+            parsed = list(rows)
+
+        self.assertEqual([number for number, _ in parsed], [2, 4])
+        self.assertEqual(parsed[1][1]["案例2"], "")
+
+
+class BuildImportPlanTests(unittest.TestCase):
+    def build(self, fileobj, filename="taxonomy.csv", scope="water"):
+        return build_import_plan_from_stream(scope, fileobj, filename)
+
+    def test_plan_counts_categories_and_non_empty_cases(self) -> None:
+        rows = (["水务", "缴费", "线上", "微信", "定义", "微信交费", ""], ["水务", "缴费", "线上", "微信", "定义", "公众号", "小程序"])
+        for filename, fileobj in (("taxonomy.csv", _csv(*rows)), ("taxonomy.xlsx", _xlsx(*rows))):
+            with self.subTest(filename):
+                plan, errors = self.build(fileobj, filename)
+
+                self.assertEqual(errors, [])
+                self.assertEqual((plan.category_count, plan.case_count), (1, 3))
+                self.assertEqual([row.cases for row in plan.rows], [["微信交费"], ["公众号", "小程序"]])
+
+    def test_missing_headers_and_unknown_file_types(self) -> None:
+        plan, errors = self.build(io.BytesIO("业务域,一级\n水务,缴费\n".encode("utf-8")))
+        self.assertIsNone(plan)
+        self.assertEqual([e["column"] for e in errors], ["二级", "三级", "定义"])
+
+        plan, errors = self.build(io.BytesIO(b""), filename="taxonomy.txt")
+        self.assertIsNone(plan)
+        self.assertEqual(errors[0]["column"], "file")
+
+    def test_row_errors_are_collected_with_their_row_numbers(self) -> None:
+        plan, errors = self.build(
+            _csv(
+                ["公交", "缴费", "线上", "微信", "定义", "", ""],
+                ["水务", "缴费", "", "微信", "定义", "", ""],
+                ["水务", "缴费", "线上", "微信", "定义A", "", ""],
+                ["水务", "缴费", "线上", "微信", "定义B", "", ""],
+            )
+        )
+
+        self.assertIsNone(plan)
+        self.assertEqual(
+            [(e["row"], e["column"], e["message"]) for e in errors],
+            [
+                (2, "业务域", "业务域与当前范围不一致"),
+                (3, "二级", "必填字段不能为空"),
+                (5, "定义", "同一分类路径定义不一致"),
+            ],
+        )
+        self.assertEqual(errors[2]["expected"], "与第4行一致")
+
+    def test_unknown_scope(self) -> None:
+        plan, errors = self.build(_csv(["水务", "缴费", "线上", "微信", "定义", "", ""]), scope="metro")
+
+        self.assertIsNone(plan)
+        self.assertEqual(errors[0]["column"], "scope")
+
+
+class ImportPlanStoreTests(TargetDatabaseTestCase):
+    session_modules = (kb_taxonomy_module,)
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.service = KbTaxonomyService()
+        self.plan, _ = build_import_plan_from_stream(
+            "water", _csv(["水务", "缴费", "线上", "微信", "定义", "微信交费", "公众号"]), "taxonomy.csv"
+        )
+
+    def test_plan_round_trips_for_its_owner_and_scope_only(self) -> None:
+        token = self.service.remember_plan(self.plan, owner_id=7)
+
+        # A fresh service stands in for another worker process.
+        self.assertEqual(KbTaxonomyService().recall_plan(token, scope="water", owner_id=7), self.plan)
+        self.assertIsNone(self.service.recall_plan(token, scope="water", owner_id=8))
+        self.assertIsNone(self.service.recall_plan(token, scope="bus", owner_id=7))
+
+        self.service.forget_plan(token)
+        self.assertIsNone(self.service.recall_plan(token, scope="water", owner_id=7))
+
+    def test_expired_plans_are_not_returned_and_are_purged_on_the_next_store(self) -> None:
+        token = self.service.remember_plan(self.plan, owner_id=7)
+        with self.session() as session:
+            session.execute(update(KbTaxonomyImportPlan).values(expires_at=datetime.utcnow() - timedelta(seconds=1)))
+            session.commit()
+
+        self.assertIsNone(self.service.recall_plan(token, scope="water", owner_id=7))
+        fresh = self.service.remember_plan(self.plan, owner_id=7)
+
+        with self.session() as session:
+            tokens = session.execute(select(KbTaxonomyImportPlan.token)).scalars().all()
+        self.assertEqual(tokens, [fresh])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+
+from sqlalchemy import event, select
+
+from backend.app.models.kb_taxonomy import KbTaxonomyNode
+from backend.app.services import kb_taxonomy as kb_taxonomy_module
+from backend.app.services.kb_taxonomy import (
+    KbTaxonomyService,
+    NotFoundError,
+    ValidationError,
+    build_node_path,
+    fill_missing_paths,
+)
+from backend.tests.sqlite_target import TargetDatabaseTestCase
+
+
+class BuildNodePathTests(unittest.TestCase):
+    def test_root_and_child_paths(self) -> None:
+        self.assertEqual(build_node_path(None, 4), "/4/")
+        self.assertEqual(build_node_path("/4/", 9), "/4/9/")
+        self.assertEqual(build_node_path("/4/9/", 12), "/4/9/12/")
+
+
+class NodePathTests(TargetDatabaseTestCase):
+    session_modules = (kb_taxonomy_module,)
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.service = KbTaxonomyService()
+        create = self.service.create_node
+        self.l1 = create(scope="water", level=1, name="缴费", parent_id=None, definition=None)
+        self.l2 = create(scope="water", level=2, name="线上", parent_id=self.l1.id, definition=None)
+        self.l3 = create(scope="water", level=3, name="微信", parent_id=self.l2.id, definition="微信缴费")
+        self.sibling = create(scope="water", level=3, name="支付宝", parent_id=self.l2.id, definition="支付宝缴费")
+        self.other = create(scope="water", level=1, name="报修", parent_id=None, definition=None)
+        self.cases = [
+            self.service.create_case(scope="water", node_id=node.id, content=content)
+            for node, content in (
+                (self.l3, "微信怎么交"),
+                (self.sibling, "支付宝怎么交"),
+                (self.l3, "公众号交费"),
+                (self.sibling, "支付宝扣款失败"),
+            )
+        ]
+
+    def test_create_node_sets_the_path_from_the_parent(self) -> None:
+        self.assertEqual(self.l1.path, f"/{self.l1.id}/")
+        self.assertEqual(self.l3.path, f"/{self.l1.id}/{self.l2.id}/{self.l3.id}/")
+
+    def test_fill_missing_paths_fills_parents_before_children(self) -> None:
+        with self.session() as session:
+            session.execute(KbTaxonomyNode.__table__.update().values(path=None))
+            fill_missing_paths(session, "water")
+            session.commit()
+            paths = dict(session.execute(select(KbTaxonomyNode.id, KbTaxonomyNode.path)).all())
+
+        self.assertEqual(paths[self.l3.id], self.l3.path)
+        self.assertEqual(paths[self.other.id], self.other.path)
+
+    def test_get_ancestors_reads_the_path_ids_by_primary_key(self) -> None:
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(self.engine, "before_cursor_execute", record)
+        self.addCleanup(event.remove, self.engine, "before_cursor_execute", record)
+
+        nodes = self.service.get_ancestors(self.l3.id)
+
+        self.assertEqual([node.id for node in nodes], [self.l1.id, self.l2.id, self.l3.id])
+        self.assertEqual(len(statements), 2)
+        self.assertFalse(any("LIKE" in statement for statement in statements))
+        self.assertEqual(self.service.get_ancestors(999), [])
+
+    def test_subtree_stats_counts_descendants_and_cases(self) -> None:
+        self.assertEqual(self.service.subtree_stats(scope="water", node_id=self.l1.id), ({2: 1, 3: 2}, 4))
+        self.assertEqual(self.service.subtree_stats(scope="water", node_id=self.l3.id), ({}, 2))
+        self.assertEqual(self.service.subtree_stats(scope="water", node_id=self.other.id), ({}, 0))
+        with self.assertRaises(NotFoundError):
+            self.service.subtree_stats(scope="bus", node_id=self.l1.id)
+
+    def test_subtree_stats_requires_a_path(self) -> None:
+        with self.session() as session:
+            session.execute(
+                KbTaxonomyNode.__table__.update().where(KbTaxonomyNode.id == self.other.id).values(path=None)
+            )
+            session.commit()
+
+        with self.assertRaises(ValidationError):
+            self.service.subtree_stats(scope="water", node_id=self.other.id)
+
+    def test_list_subtree_cases_pages_by_case_id_and_filters_by_keyword(self) -> None:
+        def ids(**kwargs):
+            return [case.id for case in self.service.list_subtree_cases(scope="water", node_id=self.l2.id, **kwargs)]
+
+        all_ids = [case.id for case in self.cases]
+        self.assertEqual(ids(keyword=None, after_id=None, limit=3), all_ids[:3])
+        self.assertEqual(ids(keyword=None, after_id=all_ids[2], limit=3), all_ids[3:])
+        self.assertEqual(ids(keyword="支付宝", after_id=None, limit=10), [all_ids[1], all_ids[3]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,214 @@
+import unittest
+from datetime import datetime
+
+from sqlalchemy import select
+
+from backend.app.models.kb_taxonomy import KbTaxonomyCase, KbTaxonomyNode, KbTaxonomyScopeVersion
+from backend.app.models.kb_taxonomy_review import KbTaxonomyReviewCase, KbTaxonomyReviewItem
+from backend.app.services import kb_taxonomy_review as review_module
+from backend.app.services.kb_taxonomy_review import (
+    MAX_BATCH_SIZE,
+    BatchAcceptData,
+    KbTaxonomyReviewService,
+    NotFoundError,
+    ValidationError,
+)
+from backend.tests.sqlite_target import TargetDatabaseTestCase
+
+
+class BatchReviewTests(TargetDatabaseTestCase):
+    session_modules = (review_module,)
+
+    def setUp(self) -> None:
+        super().setUp()
+        items = [
+            (1, "water", "缴费", "线上", "微信", "pending"),
+            (2, "water", "缴费", "线上", "支付宝", "pending"),
+            (3, "water", "报修", "线下", "营业厅", "pending"),
+            (4, "water", "缴费", "线上", "银行卡", "accepted"),
+            (5, "bus", "乘车", "扫码", "乘车码", "pending"),
+        ]
+        self.add_all(
+            *[
+                KbTaxonomyReviewItem(
+                    id=item_id,
+                    scope_code=scope,
+                    l1_name=l1,
+                    l2_name=l2,
+                    l3_name=l3,
+                    definition=f"{l3}的定义",
+                    status=status,
+                    created_at=datetime(2025, 1, item_id),
+                )
+                for item_id, scope, l1, l2, l3, status in items
+            ],
+            *[
+                KbTaxonomyReviewCase(review_item_id=item_id, content=f"{l3}案例{n}")
+                for item_id, _, _, _, l3, _ in items
+                for n in (1, 2)
+            ],
+        )
+        self.service = KbTaxonomyReviewService()
+
+    def statuses(self) -> dict:
+        with self.session() as session:
+            return dict(session.execute(select(KbTaxonomyReviewItem.id, KbTaxonomyReviewItem.status)).all())
+
+    def l3_nodes(self) -> dict:
+        with self.session() as session:
+            nodes = session.execute(
+                select(KbTaxonomyNode.id, KbTaxonomyNode.name, KbTaxonomyNode.definition)
+                .where(KbTaxonomyNode.level == 3)
+            ).all()
+            cases = session.execute(
+                select(KbTaxonomyCase.node_id, KbTaxonomyCase.content).order_by(KbTaxonomyCase.id)
+            ).all()
+        return {
+            name: (definition, [content for node_id, content in cases if node_id == nid])
+            for nid, name, definition in nodes
+        }
+
+    def test_accept_uses_overrides_and_falls_back_to_stored_values(self) -> None:
+        accepted = self.service.batch_accept(
+            scope="water",
+            items=[
+                BatchAcceptData(review_item_id=1),
+                BatchAcceptData(review_item_id=2, l3_name=" 支付宝缴费 ", definition="新定义", cases=["新案例"]),
+            ],
+        )
+
+        self.assertEqual(accepted, 2)
+        self.assertEqual(
+            self.l3_nodes(),
+            {
+                "微信": ("微信的定义", ["微信案例1", "微信案例2"]),
+                "支付宝缴费": ("新定义", ["新案例"]),
+            },
+        )
+        with self.session() as session:
+            # The shared L1/L2 nodes are created once.
+            self.assertEqual(
+                session.execute(select(KbTaxonomyNode.name).where(KbTaxonomyNode.level < 3)).scalars().all(),
+                ["缴费", "线上"],
+            )
+            item = session.get(KbTaxonomyReviewItem, 2)
+            self.assertEqual((item.status, item.l3_name, item.definition), ("accepted", "支付宝缴费", "新定义"))
+            self.assertEqual(
+                session.execute(
+                    select(KbTaxonomyReviewCase.content).where(KbTaxonomyReviewCase.review_item_id == 2)
+                ).scalars().all(),
+                ["新案例"],
+            )
+            self.assertEqual(session.get(KbTaxonomyScopeVersion, "water").version, 1)
+
+    def test_one_invalid_item_rolls_back_the_whole_batch(self) -> None:
+        with self.assertRaises(ValidationError):
+            self.service.batch_accept(
+                scope="water",
+                items=[BatchAcceptData(review_item_id=1), BatchAcceptData(review_item_id=3, cases=["", "案例"])],
+            )
+
+        self.assertEqual(self.statuses()[1], "pending")
+        self.assertEqual(self.l3_nodes(), {})
+
+    def test_processed_missing_and_foreign_items_are_rejected(self) -> None:
+        cases = [
+            (ValidationError, [1, 4]),
+            (NotFoundError, [1, 99]),
+            (PermissionError, [1, 5]),
+        ]
+        for error, ids in cases:
+            with self.subTest(ids=ids):
+                with self.assertRaises(error):
+                    self.service.batch_accept(scope="water", items=[BatchAcceptData(review_item_id=i) for i in ids])
+                with self.assertRaises(error):
+                    self.service.batch_discard(scope="water", review_item_ids=ids)
+
+        self.assertEqual(self.statuses(), {1: "pending", 2: "pending", 3: "pending", 4: "accepted", 5: "pending"})
+
+    def test_batch_size_duplicates_and_empty_batches_are_rejected_before_any_query(self) -> None:
+        self.patch(review_module, "TargetSessionLocal", None)
+        for ids in ([], [1, 2, 1], list(range(1, MAX_BATCH_SIZE + 2))):
+            with self.subTest(count=len(ids)):
+                with self.assertRaises(ValidationError):
+                    self.service.batch_discard(scope="water", review_item_ids=ids)
+                with self.assertRaises(ValidationError):
+                    self.service.batch_accept(scope="water", items=[BatchAcceptData(review_item_id=i) for i in ids])
+
+    def test_discard_marks_only_the_given_items(self) -> None:
+        self.assertEqual(self.service.batch_discard(scope="water", review_item_ids=[1, 3]), 2)
+
+        self.assertEqual(self.statuses(), {1: "discarded", 2: "pending", 3: "discarded", 4: "accepted", 5: "pending"})
+        self.assertEqual(self.l3_nodes(), {})
+
+
+class ListPendingTests(TargetDatabaseTestCase):
+    session_modules = (review_module,)
+
+    def setUp(self) -> None:
+        super().setUp()
+        same_time = datetime(2025, 3, 1, 9, 30)
+
+        def item(item_id: int, created_at: datetime, scope: str = "water", status: str = "pending"):
+            return KbTaxonomyReviewItem(
+                id=item_id,
+                scope_code=scope,
+                l1_name="缴费",
+                l2_name="线上",
+                l3_name=f"分类{item_id}",
+                definition="定义",
+                status=status,
+                created_at=created_at,
+            )
+
+        self.add_all(
+            item(1, datetime(2025, 3, 2)),
+            item(2, same_time),
+            item(3, same_time),
+            item(4, same_time),
+            item(5, datetime(2025, 2, 1)),
+            item(6, datetime(2025, 4, 1), status="accepted"),
+            item(7, datetime(2025, 4, 1), scope="bus"),
+            KbTaxonomyReviewCase(review_item_id=3, content="案例A"),
+            KbTaxonomyReviewCase(review_item_id=3, content="案例B"),
+            KbTaxonomyReviewCase(review_item_id=5, content="案例C"),
+        )
+        self.service = KbTaxonomyReviewService()
+
+    def test_pages_follow_created_at_then_id_descending_across_ties(self) -> None:
+        pages = []
+        cursor = None
+        while True:
+            rows, _, cursor = self.service.list_pending("water", limit=2, cursor=cursor, include_cases=False)
+            pages.append([int(row.id) for row in rows])
+            if cursor is None:
+                break
+
+        # Items 2-4 share created_at; the id tie-break keeps the page boundary from skipping or repeating them.
+        self.assertEqual(pages, [[1, 4], [3, 2], [5]])
+
+    def test_cursor_encodes_the_last_row(self) -> None:
+        _, _, cursor = self.service.list_pending("water", limit=2)
+
+        self.assertEqual(cursor, "2025-03-01T09:30:00|4")
+        rows, _, next_cursor = self.service.list_pending("water", limit=10, cursor=cursor)
+        self.assertEqual([int(row.id) for row in rows], [3, 2, 5])
+        self.assertIsNone(next_cursor)
+
+    def test_invalid_cursor_is_rejected(self) -> None:
+        for cursor in ("garbage", "2025-03-01T09:30:00|x", "not-a-date|4"):
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(ValidationError):
+                    self.service.list_pending("water", cursor=cursor)
+
+    def test_cases_are_loaded_for_the_page_only_when_asked(self) -> None:
+        rows, case_map, _ = self.service.list_pending("water", limit=3)
+
+        self.assertEqual([int(row.id) for row in rows], [1, 4, 3])
+        contents = {item_id: [case.content for case in cases] for item_id, cases in case_map.items()}
+        self.assertEqual(contents, {3: ["案例A", "案例B"]})
+        self.assertEqual(self.service.list_pending("water", limit=3, include_cases=False)[1], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+
+from backend.app.models.faq_review import KnowledgeItem
+from backend.app.models.scenario_sync_state import ScenarioSyncState
+from backend.app.services import knowledge as knowledge_module
+from backend.app.services.knowledge import KnowledgeService
+from backend.app.services.knowledge_revision import bump_knowledge_revision, changed_item_ids
+from backend.app.services.status_counters import StatusCounterCache
+from backend.tests.sqlite_target import TargetDatabaseTestCase
+
+
+class KnowledgeRevisionTests(TargetDatabaseTestCase):
+    session_modules = (knowledge_module,)
+
+    def revision(self, scenario_id: int = 1) -> int:
+        with self.session() as session:
+            return session.get(ScenarioSyncState, scenario_id).knowledge_revision
+
+    def test_bump_creates_the_state_row_then_increments_it(self) -> None:
+        with self.session() as session:
+            self.assertEqual(bump_knowledge_revision(session, 1), 1)
+            session.commit()
+        with self.session() as session:
+            self.assertEqual(bump_knowledge_revision(session, 1), 2)
+            self.assertEqual(bump_knowledge_revision(session, 1), 3)
+            self.assertEqual(bump_knowledge_revision(session, 2), 1)
+            session.commit()
+
+        self.assertEqual((self.revision(1), self.revision(2)), (3, 1))
+
+    def test_changed_item_ids_are_those_written_after_the_revision(self) -> None:
+        self.add_all(
+            *[
+                KnowledgeItem(id=item_id, scenario_id=scenario_id, question="问", answer="答", status=status, revision=rev)
+                for item_id, scenario_id, status, rev in (
+                    (1, 1, "active", 2),
+                    (2, 1, "disabled", 5),
+                    (3, 1, "active", 6),
+                    (4, 2, "active", 9),
+                )
+            ]
+        )
+
+        with self.session() as session:
+            self.assertEqual(sorted(changed_item_ids(session, 1, 2)), [2, 3])
+            self.assertEqual(changed_item_ids(session, 1, 6), [])
+            self.assertEqual(changed_item_ids(session, 2, 0), [4])
+
+
+class UpdateItemRevisionTests(TargetDatabaseTestCase):
+    session_modules = (knowledge_module,)
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.patch(knowledge_module, "status_counters", StatusCounterCache(ttl_seconds=60))
+        self.add_all(
+            KnowledgeItem(id=1, scenario_id=1, question="怎么缴费", answer="线上缴费", status="active", revision=4),
+            ScenarioSyncState(scenario_id=1, knowledge_revision=4, item_count=0),
+        )
+        self.service = KnowledgeService()
+
+    def revision(self) -> int:
+        with self.session() as session:
+            return session.get(ScenarioSyncState, 1).knowledge_revision
+
+    def test_update_bumps_only_when_a_field_changes(self) -> None:
+        unchanged = self.service.update_item(
+            item_id=1, scenario_id=1, question="怎么缴费", answer="线上缴费", status="active"
+        )
+        self.assertEqual((unchanged.revision, self.revision()), (4, 4))
+
+        changed = self.service.update_item(item_id=1, scenario_id=1, answer="微信或支付宝缴费")
+        self.assertEqual((changed.revision, self.revision()), (5, 5))
+
+        disabled = self.service.update_item(item_id=1, scenario_id=1, status="disabled")
+        self.assertEqual((disabled.revision, self.revision()), (6, 6))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+
+from backend.app.core.metrics import MetricsRegistry
+
+
+class MetricsRegistryTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.registry = MetricsRegistry()
+
+    def test_counter_and_gauge_render_with_labels(self) -> None:
+        counter = self.registry.counter("rows_total", "Rows", ["group_code"])
+        counter.inc(3, group_code="SW")
+        counter.inc(group_code="SW")
+        gauge = self.registry.gauge("checked_out", "Connections", ["engine"])
+        gauge.set_function(lambda: 2, engine="target")
+
+        text = self.registry.render()
+        self.assertIn("# TYPE rows_total counter", text)
+        self.assertIn('rows_total{group_code="SW"} 4', text)
+        self.assertIn('checked_out{engine="target"} 2', text)
+        with self.assertRaises(ValueError):
+            counter.inc(step="x")
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        histogram = self.registry.histogram("latency_seconds", "Latency", ["route"], buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            histogram.observe(value, route="/a")
+
+        lines = self.registry.render().splitlines()
+        self.assertIn('latency_seconds_bucket{route="/a",le="0.1"} 1', lines)
+        self.assertIn('latency_seconds_bucket{route="/a",le="1"} 2', lines)
+        self.assertIn('latency_seconds_bucket{route="/a",le="+Inf"} 3', lines)
+        self.assertIn('latency_seconds_count{route="/a"} 3', lines)
+        self.assertIn('latency_seconds_sum{route="/a"} 5.55', lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+
+from backend.benchmarks.micro import BENCHMARKS, compare_results
+
+
+def payload(**items_per_second: float) -> dict:
+    return {"benchmarks": {name: {"items_per_second": value} for name, value in items_per_second.items()}}
+
+
+class MicroBenchmarkTests(unittest.TestCase):
+    def test_every_benchmark_runs_over_valid_fixtures(self) -> None:
+        for name, benchmark in BENCHMARKS.items():
+            with self.subTest(name):
+                call, items = benchmark.setup()
+                result = call()
+                self.assertGreater(items, 0)
+                if name == "taxonomy.build_import_plan":
+                    plan, errors = result
+                    self.assertEqual(errors, [])
+                    self.assertEqual(len(plan.rows), items)
+                elif name == "extraction.parse_auto_review_json":
+                    self.assertIn("approved", result)
+                    self.assertIn(None, result)
+
+    def test_compare_flags_only_drops_beyond_threshold(self) -> None:
+        baseline = payload(fast=1000.0, steady=1000.0, faster=1000.0)
+        current = payload(fast=800.0, steady=900.0, faster=1500.0, added=10.0)
+
+        lines, regressions = compare_results(current, baseline, threshold=0.15)
+
+        self.assertEqual(regressions, ["fast"])
+        self.assertTrue(any(line.startswith("added") and "new" in line for line in lines))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from unittest import mock
+
+from backend.app.core import query_stats as query_stats_module
+from backend.app.core.query_stats import QueryStats, fingerprint, parameter_shape, query_scope
+
+
+class FingerprintTests(unittest.TestCase):
+    def test_literals_placeholders_and_in_lists_collapse(self) -> None:
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id IN (%(id_1_1)s, %(id_1_2)s,\n %(id_1_3)s) AND code = 'SW' LIMIT 10"),
+            "SELECT * FROM t WHERE id IN (?, ...) AND code = ? LIMIT ?",
+        )
+        self.assertEqual(fingerprint("SELECT t1.a FROM t1 WHERE b = %s"), "SELECT t1.a FROM t1 WHERE b = ?")
+
+    def test_parameter_shape_has_no_values(self) -> None:
+        self.assertEqual(parameter_shape({"id": 7, "code": "secret"}), "{id: int, code: str}")
+        self.assertEqual(parameter_shape([{"id": 1}, {"id": 2}], executemany=True), "2 x {id: int}")
+
+
+class QueryStatsTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stats = QueryStats(slow_query_ms=100, n_plus_one_threshold=3)
+        patcher = mock.patch.object(query_stats_module, "query_stats", self.stats)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_top_orders_fingerprints_and_reports_percentiles(self) -> None:
+        for elapsed in (1.0, 2.0, 3.0, 4.0):
+            self.stats.record("target", "SELECT a FROM t WHERE id = %(id)s", {"id": 1}, False, elapsed)
+        with self.assertLogs("backend.app.core.query_stats", level="WARNING") as logs:
+            self.stats.record("source", "SELECT b FROM s", None, False, 250.0)
+
+        by_total, by_count = self.stats.top(order_by="total"), self.stats.top(order_by="count")
+        self.assertEqual(by_total[0].fingerprint, "SELECT b FROM s")
+        self.assertEqual((by_total[0].slow_count, by_total[0].parameter_shape), (1, "()"))
+        self.assertEqual((by_count[0].count, by_count[0].max_ms, by_count[0].p50_ms), (4, 4.0, 3.0))
+        self.assertIn("Slow query on source", logs.output[0])
+        with self.assertRaises(ValueError):
+            self.stats.top(order_by="bogus")
+
+    def test_repeated_fingerprint_in_scope_is_flagged(self) -> None:
+        with self.assertLogs("backend.app.core.query_stats", level="WARNING") as logs:
+            with query_scope("job:extraction"):
+                for conversation_id in range(3):
+                    self.stats.record("target", f"SELECT * FROM faq WHERE conversation_id = {conversation_id}", None, False, 1.0)
+                self.stats.record("target", "SELECT 1", None, False, 1.0)
+
+        stat = next(stat for stat in self.stats.top() if stat.count == 3)
+        self.assertEqual((stat.n_plus_one_count, stat.last_n_plus_one_scope), (1, "job:extraction"))
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("Possible N+1 in job:extraction: 3 x", logs.output[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from sqlalchemy import select
+
+from backend.app.jobs.handlers import enqueue_job
+from backend.app.jobs.worker import JobWorkerPool
+from backend.app.models.faq_review import KnowledgeItem, PendingFAQ
+from backend.app.services import job_queue as job_queue_module
+from backend.app.services import review as review_module
+from backend.app.services import review_bulk_jobs as review_bulk_jobs_module
+from backend.app.services.job_queue import JobConflictError, job_queue
+from backend.app.services.review import PendingFAQFilter
+from backend.app.services.review_bulk_jobs import (
+    CHUNK_ERROR_MAX_LENGTH,
+    MAX_BULK_JOB_IDS,
+    REVIEW_BULK_JOB_KIND,
+    ReviewBulkJobService,
+    review_bulk_jobs,
+)
+from backend.app.services.status_counters import StatusCounterCache
+from backend.tests.sqlite_target import TargetDatabaseTestCase
+
+
+class BuildPayloadTests(unittest.TestCase):
+    def test_dedupes_ids_and_keeps_the_callers_group(self) -> None:
+        payload = ReviewBulkJobService.build_payload(
+            action="accept", scenario_id=3, allowed_group_code="SW", pending_faq_ids=[5, 4, 5]
+        )
+
+        self.assertEqual(
+            payload, {"action": "accept", "scenario_id": 3, "source_group_code": "SW", "pending_faq_ids": [5, 4]}
+        )
+
+    def test_rejects_invalid_requests(self) -> None:
+        cases = {
+            "action": dict(action="delete", pending_faq_ids=[1]),
+            "neither": dict(action="accept"),
+            "both": dict(action="accept", pending_faq_ids=[1], pending_filter=PendingFAQFilter()),
+            "too many": dict(action="discard", pending_faq_ids=range(MAX_BULK_JOB_IDS + 1)),
+        }
+        for name, kwargs in cases.items():
+            with self.subTest(name), self.assertRaises(ValueError):
+                ReviewBulkJobService.build_payload(scenario_id=1, allowed_group_code=None, **kwargs)
+
+
+class ReviewBulkJobQueueTests(TargetDatabaseTestCase):
+    session_modules = (job_queue_module, review_module)
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.add_all(
+            *[
+                PendingFAQ(
+                    id=pending_id,
+                    question=f"停水问题{pending_id}" if pending_id % 2 else f"缴费问题{pending_id}",
+                    answer="答案",
+                    status="discarded" if pending_id == 3 else "pending",
+                    source_group_code="GJ" if pending_id == 7 else "SW",
+                    created_at=datetime(2025, 1, pending_id),
+                )
+                for pending_id in range(1, 8)
+            ]
+        )
+        self.patch(review_module, "status_counters", StatusCounterCache(ttl_seconds=60))
+        self.patch(review_bulk_jobs, "chunk_size", 2)
+        self.worker = JobWorkerPool(concurrency=1, kinds=[REVIEW_BULK_JOB_KIND], queue=job_queue)
+
+    def start(self, **kwargs):
+        payload = review_bulk_jobs.build_payload(scenario_id=9, allowed_group_code="SW", **kwargs)
+        return enqueue_job(REVIEW_BULK_JOB_KIND, payload, active_key=review_bulk_jobs.active_key(9))
+
+    def run_next_job(self) -> None:
+        job = job_queue.claim(self.worker.worker_id, self.worker.kinds)
+        self.assertIsNotNone(job)
+        self.worker._execute(job)  # pylint: disable=protected-access
+
+    def statuses(self) -> dict:
+        with self.session() as session:
+            return dict(session.execute(select(PendingFAQ.id, PendingFAQ.status)).all())
+
+    def test_id_job_commits_per_chunk_and_reports_counts_through_the_queue(self) -> None:
+        queued = self.start(action="accept", pending_faq_ids=[1, 2, 3, 4, 7])
+        self.assertEqual(review_bulk_jobs.get_job(queued.job_id).status, "queued")
+
+        self.run_next_job()
+
+        job = review_bulk_jobs.get_job(queued.job_id)
+        self.assertEqual((job.status, job.total, job.processed), ("succeeded", 5, 5))
+        self.assertEqual((job.applied, job.skipped, job.failed_chunks, job.chunks), (3, 2, 0, []))
+        self.assertEqual(self.statuses(), {
+            1: "processed", 2: "processed", 3: "discarded", 4: "processed", 5: "pending", 6: "pending", 7: "pending"
+        })
+        with self.session() as session:
+            questions = session.execute(select(KnowledgeItem.question).order_by(KnowledgeItem.id)).scalars().all()
+        self.assertEqual(questions, ["停水问题1", "缴费问题2", "缴费问题4"])
+
+    def test_filter_job_is_restricted_to_the_callers_group(self) -> None:
+        queued = self.start(action="discard", pending_filter=PendingFAQFilter(keyword="停水"))
+
+        self.run_next_job()
+
+        job = review_bulk_jobs.get_job(queued.job_id)
+        self.assertEqual((job.status, job.total, job.applied), ("succeeded", 2, 2))
+        self.assertEqual(self.statuses()[1], "discarded")
+        self.assertEqual(self.statuses()[5], "discarded")
+        self.assertEqual(self.statuses()[7], "pending")
+
+    def test_failed_chunk_is_recorded_and_later_chunks_still_run(self) -> None:
+        apply_chunk = review_bulk_jobs.review_service.apply_bulk_chunk
+        calls = []
+
+        def flaky_chunk(**kwargs):
+            calls.append(kwargs["pending_faq_ids"])
+            if len(calls) == 1:
+                raise RuntimeError("deadlock")
+            return apply_chunk(**kwargs)
+
+        queued = self.start(action="discard", pending_faq_ids=[1, 2, 4, 5])
+        with mock.patch.object(review_bulk_jobs.review_service, "apply_bulk_chunk", side_effect=flaky_chunk):
+            self.run_next_job()
+
+        job = review_bulk_jobs.get_job(queued.job_id)
+        self.assertEqual((job.status, job.processed, job.applied, job.failed_chunks), ("failed", 4, 2, 1))
+        self.assertEqual([(c.index, c.requested, c.error) for c in job.chunks], [(0, 2, "deadlock")])
+        self.assertIn("deadlock", job.error)
+        self.assertEqual([self.statuses()[pid] for pid in (1, 2, 4, 5)], ["pending", "pending", "discarded", "discarded"])
+
+    def test_recorded_failures_are_capped_and_their_errors_truncated(self) -> None:
+        self.patch(review_bulk_jobs, "chunk_size", 1)
+        self.patch(review_bulk_jobs_module, "MAX_RECORDED_FAILED_CHUNKS", 3)
+        queued = self.start(action="discard", pending_faq_ids=[1, 2, 4, 5])
+        error = RuntimeError("(pymysql.err.OperationalError) Lock wait timeout " + "x" * 5000)
+        with mock.patch.object(review_bulk_jobs.review_service, "apply_bulk_chunk", side_effect=error):
+            self.run_next_job()
+
+        job = review_bulk_jobs.get_job(queued.job_id)
+        self.assertEqual((job.status, job.processed, job.failed_chunks), ("failed", 4, 4))
+        self.assertEqual([c.index for c in job.chunks], [0, 1, 2])
+        self.assertTrue(all(len(c.error) == CHUNK_ERROR_MAX_LENGTH for c in job.chunks))
+
+    def test_one_active_job_per_scenario_and_lookup_by_kind(self) -> None:
+        queued = self.start(action="accept", pending_faq_ids=[1])
+        with self.assertRaises(JobConflictError):
+            self.start(action="discard", pending_faq_ids=[2])
+
+        other = job_queue.enqueue("compare_kb_sync", {})
+
+        self.assertIsNone(review_bulk_jobs.get_job(other.job_id))
+        self.assertIsNone(review_bulk_jobs.get_job("missing"))
+        self.assertEqual(review_bulk_jobs.get_job(queued.job_id).scenario_id, 9)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from sqlalchemy import event, func, select
+from sqlalchemy.sql import Insert
+
+from backend.app.models.faq_review import KnowledgeItem, PendingFAQ
+from backend.app.models.scenario import Scenario
+from backend.app.models.scenario_sync_state import ScenarioSyncState
+from backend.app.services import aico_sync as aico_sync_module
+from backend.app.services import review as review_module
+from backend.app.services import status_counters as status_counters_module
+from backend.app.services.aico_sync import AicoSyncOrchestrator, SyncRunResult
+from backend.app.services.review import PendingFAQFilter, ReviewService
+from backend.app.services.status_counters import StatusCounterCache
+from backend.tests.sqlite_target import TargetDatabaseTestCase
+
+
+class ApplyMatchingTests(TargetDatabaseTestCase):
+    session_modules = (review_module, status_counters_module)
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.add_all(
+            *[
+                PendingFAQ(
+                    id=pending_id,
+                    question=f"停水问题{pending_id}",
+                    answer=f"答案{pending_id}",
+                    status="auto_rejected" if pending_id == 2 else "pending",
+                    source_group_code="GJ" if pending_id == 5 else "SW",
+                    created_at=datetime(2025, 1, pending_id),
+                )
+                for pending_id in range(1, 7)
+            ]
+        )
+        self.counters = StatusCounterCache(ttl_seconds=60)
+        self.patch(review_module, "status_counters", self.counters)
+        self.service = ReviewService()
+
+    def statuses(self) -> dict:
+        with self.session() as session:
+            return dict(session.execute(select(PendingFAQ.id, PendingFAQ.status)).all())
+
+    def knowledge_questions(self) -> list:
+        with self.session() as session:
+            return session.execute(select(KnowledgeItem.question).order_by(KnowledgeItem.id)).scalars().all()
+
+    def test_dry_run_only_counts(self) -> None:
+        result = self.service.accept_matching(
+            pending_filter=PendingFAQFilter(source_group_code="SW"), scenario_id=1, dry_run=True
+        )
+
+        self.assertEqual(result, (4, 0))
+        self.assertEqual(self.knowledge_questions(), [])
+
+    def test_accept_inserts_and_marks_exactly_the_matching_rows_in_batches(self) -> None:
+        self.counters.pending_count("pending")
+        self.patch(review_module, "MATCHING_ID_BATCH_SIZE", 3)
+
+        result = self.service.accept_matching(pending_filter=PendingFAQFilter(source_group_code="SW"), scenario_id=1)
+
+        self.assertEqual(result, (4, 4))
+        self.assertEqual(self.knowledge_questions(), ["停水问题1", "停水问题3", "停水问题4", "停水问题6"])
+        self.assertEqual(
+            self.statuses(),
+            {1: "processed", 2: "auto_rejected", 3: "processed", 4: "processed", 5: "pending", 6: "processed"},
+        )
+        self.assertEqual(self.counters.pending_counts("SW"), {"pending": 0, "processed": 4, "auto_rejected": 1})
+        self.assertEqual(self.counters.knowledge_count(1, "active"), 4)
+
+    def test_discard_by_status(self) -> None:
+        result = self.service.discard_matching(pending_filter=PendingFAQFilter(status="auto_rejected"))
+
+        self.assertEqual(result, (1, 1))
+        self.assertEqual(self.statuses()[2], "discarded")
+
+    def test_rows_that_start_matching_after_the_lock_are_left_alone(self) -> None:
+        self.counters.pending_count("pending")
+
+        # Simulates another session committing between the locking SELECT and the
+        # INSERT ... SELECT: a re-opened row below the highest matched id and a new one.
+        late_rows = []
+
+        def insert_late_row(conn, clauseelement, multiparams, params, execution_options):
+            if late_rows or not isinstance(clauseelement, Insert):
+                return
+            if clauseelement.table.name == KnowledgeItem.__tablename__:
+                cursor = conn.connection.dbapi_connection.cursor()
+                cursor.execute("UPDATE pending_faqs SET status = 'pending' WHERE id = 2")
+                cursor.execute(
+                    "INSERT INTO pending_faqs (id, question, answer, status, source_group_code, created_at, updated_at)"
+                    " VALUES (99, '停水问题99', '答案', 'pending', 'SW', '2025-02-01', '2025-02-01')"
+                )
+                late_rows.append(99)
+
+        event.listen(self.engine, "before_execute", insert_late_row)
+        self.addCleanup(event.remove, self.engine, "before_execute", insert_late_row)
+        result = self.service.accept_matching(pending_filter=PendingFAQFilter(source_group_code="SW"), scenario_id=1)
+
+        self.assertEqual(result, (4, 4))
+        self.assertEqual((self.statuses()[2], self.statuses()[99]), ("pending", "pending"))
+        self.assertEqual(self.knowledge_questions(), ["停水问题1", "停水问题3", "停水问题4", "停水问题6"])
+        self.assertEqual(self.counters.knowledge_count(1, "active"), 4)
+        with self.session() as session:
+            self.assertEqual(session.execute(select(func.count()).select_from(KnowledgeItem)).scalar_one(), 4)
+
+    def test_accept_bumps_the_knowledge_revision_so_the_next_sync_is_not_skipped(self) -> None:
+        self.patch(aico_sync_module, "TargetSessionLocal", self.session_local)
+        orchestrator = AicoSyncOrchestrator()
+        scenario = Scenario(
+            id=1,
+            scenario_code="water",
+            scenario_name="水务",
+            aico_username="user",
+            aico_user_id=1,
+            aico_project_name="project",
+            aico_kb_name="kb",
+        )
+        self.add_all(scenario)
+        self.add_all(
+            ScenarioSyncState(
+                scenario_id=1,
+                knowledge_revision=3,
+                synced_revision=3,
+                synced_target=orchestrator._target_key(scenario),  # pylint: disable=protected-access
+                item_count=0,
+            )
+        )
+        self.assertEqual(orchestrator.run_for_scenario(1, run_id="before", skip_unchanged=True).status, "skipped")
+
+        self.service.accept_matching(pending_filter=PendingFAQFilter(source_group_code="SW"), scenario_id=1)
+
+        pushed = SyncRunResult(scenario_id=1, items=4, status="success", message="ok")
+        with mock.patch.object(orchestrator, "run_for_items", return_value=pushed) as run_for_items:
+            orchestrator.run_for_scenario(1, run_id="after", skip_unchanged=True)
+        run_for_items.assert_called_once()
+        self.assertEqual(run_for_items.call_args.kwargs["revision"], 4)
+        self.assertEqual(len(run_for_items.call_args.kwargs["items"]), 4)
+        with self.session() as session:
+            self.assertEqual(set(session.execute(select(KnowledgeItem.revision)).scalars()), {4})
+
+
+if __name__ == "__main__":
+    unittest.main()
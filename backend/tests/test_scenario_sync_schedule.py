@@ -0,0 +1,47 @@
+import unittest
+from datetime import datetime
+
+import pytz
+
+from backend.app.jobs.scenario_sync import build_trigger, plan_scenario_syncs
+
+
+class ScenarioSyncScheduleTests(unittest.TestCase):
+    def test_scenarios_sharing_a_cron_are_staggered_in_id_order(self) -> None:
+        plans = plan_scenario_syncs(
+            [
+                (3, "GJ", "0 2 * * *"),
+                (1, "SW", "0 2 * * *"),
+                (2, "ZXC", "30 4 * * *"),
+                (4, "SW_compare", "0  2 *  * *"),
+                (5, "EMPTY", ""),
+            ],
+            stagger_seconds=60,
+        )
+
+        self.assertEqual(
+            [(plan.scenario_id, plan.cron, plan.offset_seconds) for plan in plans],
+            [(1, "0 2 * * *", 0), (2, "30 4 * * *", 0), (3, "0 2 * * *", 60), (4, "0 2 * * *", 120)],
+        )
+        self.assertEqual(plans[0].job_id, "scenario_sync:1")
+        self.assertTrue(plans[3].is_compare)
+        self.assertFalse(plans[0].is_compare)
+
+    def test_offset_trigger_shifts_every_fire_time(self) -> None:
+        tz = pytz.timezone("Asia/Shanghai")
+        plan = plan_scenario_syncs([(1, "A", "0 2 * * *"), (2, "B", "0 2 * * *")], stagger_seconds=90)[1]
+        trigger = build_trigger(plan, "Asia/Shanghai")
+
+        first = trigger.get_next_fire_time(None, tz.localize(datetime(2024, 5, 1, 2, 0, 30)))
+        self.assertEqual(first, tz.localize(datetime(2024, 5, 1, 2, 1, 30)))
+        second = trigger.get_next_fire_time(first, first)
+        self.assertEqual(second, tz.localize(datetime(2024, 5, 2, 2, 1, 30)))
+
+    def test_invalid_cron_raises_value_error(self) -> None:
+        plan = plan_scenario_syncs([(1, "A", "not a cron")], stagger_seconds=60)[0]
+        with self.assertRaises(ValueError):
+            build_trigger(plan, "Asia/Shanghai")
+
+
+if __name__ == "__main__":
+    unittest.main()
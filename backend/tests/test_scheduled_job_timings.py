@@ -0,0 +1,50 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_MAX_INSTANCES, JobExecutionEvent, JobSubmissionEvent
+
+from backend.app.jobs.timings import ScheduledJobTimings
+
+
+class ScheduledJobTimingsTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.timings = ScheduledJobTimings()
+
+    def _timing(self, job_id: str):
+        return next(timing for timing in self.timings.snapshot() if timing.job_id == job_id)
+
+    def test_track_records_runs_and_failures(self) -> None:
+        calls = []
+        ok = self.timings.track("ok", lambda: calls.append(1))
+
+        def boom() -> None:
+            raise RuntimeError("boom")
+
+        failing = self.timings.track("failing", boom)
+
+        self.assertEqual(self._timing("ok").runs, 0)
+        ok()
+        ok()
+        with self.assertRaises(RuntimeError):
+            failing()
+
+        timing = self._timing("ok")
+        self.assertEqual((timing.runs, timing.failures, timing.last_status), (2, 0, "succeeded"))
+        self.assertFalse(timing.running)
+        self.assertIsNotNone(timing.last_duration_ms)
+        failed = self._timing("failing")
+        self.assertEqual((failed.runs, failed.failures, failed.last_error), (1, 1, "boom"))
+
+    def test_events_add_start_delay_and_skips(self) -> None:
+        scheduled = datetime.now(timezone.utc) - timedelta(seconds=2)
+        self.timings.track("job", lambda: None)()
+        self.timings._on_event(JobExecutionEvent(EVENT_JOB_EXECUTED, "job", "default", scheduled))
+        self.timings._on_event(JobSubmissionEvent(EVENT_JOB_MAX_INSTANCES, "job", "default", [scheduled]))
+
+        timing = self._timing("job")
+        self.assertGreaterEqual(timing.last_start_delay_ms, 2000)
+        self.assertEqual(timing.skipped, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+from datetime import datetime
+
+from backend.app.models.faq_review import KnowledgeItem, PendingFAQ
+from backend.app.services import review as review_module
+from backend.app.services import status_counters as status_counters_module
+from backend.app.services.review import PendingFAQFilter, ReviewService
+from backend.app.services.status_counters import StatusCounterCache
+from backend.tests.sqlite_target import TargetDatabaseTestCase
+
+
+def _pending(pending_id: int, group_code: str, status: str = "pending") -> PendingFAQ:
+    return PendingFAQ(
+        id=pending_id,
+        question=f"问题{pending_id}",
+        answer="答案",
+        status=status,
+        source_group_code=group_code,
+        created_at=datetime(2025, 1, 1),
+    )
+
+
+class StatusCounterCacheTests(TargetDatabaseTestCase):
+    session_modules = (status_counters_module, review_module)
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.add_all(
+            _pending(1, "SW"),
+            _pending(2, "SW"),
+            _pending(3, "GJ"),
+            _pending(4, "GJ", status="discarded"),
+            KnowledgeItem(id=1, scenario_id=7, question="q", answer="a", status="active"),
+        )
+        self.counters = StatusCounterCache(ttl_seconds=60)
+        self.patch(review_module, "status_counters", self.counters)
+
+    def test_seeds_from_group_by_and_sums_groups(self) -> None:
+        self.assertEqual(self.counters.pending_count("pending", group_code="SW"), 2)
+        self.assertEqual(self.counters.pending_count("pending"), 3)
+        self.assertEqual(self.counters.pending_counts("GJ"), {"pending": 1, "discarded": 1})
+        self.assertEqual(self.counters.knowledge_counts(7), {"active": 1})
+
+    def test_apply_moves_counts_without_reloading(self) -> None:
+        self.counters.pending_count("pending")
+        with self.session() as session:
+            session.add(_pending(5, "SW"))
+            session.commit()
+
+        self.counters.apply_pending("SW", "pending", "processed", 2)
+        self.counters.apply_knowledge(7, None, "active", 2)
+
+        # The uncommitted-by-us row 5 is not seen until the snapshot is re-seeded.
+        self.assertEqual(self.counters.pending_counts("SW"), {"pending": 0, "processed": 2})
+        self.assertEqual(self.counters.knowledge_count(7, "active"), 3)
+
+    def test_apply_clamps_at_zero_and_ignores_noops(self) -> None:
+        self.counters.pending_count("pending")
+
+        self.counters.apply_pending("GJ", "pending", "discarded", 5)
+        self.counters.apply_pending("GJ", "discarded", "pending", 0)
+        self.counters.apply_knowledge(7, "active", "active", 3)
+
+        self.assertEqual(self.counters.pending_counts("GJ"), {"pending": 0, "discarded": 6})
+        self.assertEqual(self.counters.knowledge_count(7, "active"), 1)
+
+    def test_apply_before_first_load_is_ignored(self) -> None:
+        self.counters.apply_pending("SW", "pending", "processed", 2)
+
+        self.assertEqual(self.counters.pending_counts("SW"), {"pending": 2})
+
+    def test_invalidate_reseeds_on_next_read(self) -> None:
+        self.assertEqual(self.counters.pending_count("pending", group_code="SW"), 2)
+        with self.session() as session:
+            session.add(_pending(5, "SW"))
+            session.commit()
+        self.assertEqual(self.counters.pending_count("pending", group_code="SW"), 2)
+
+        self.counters.invalidate()
+
+        self.assertEqual(self.counters.pending_count("pending", group_code="SW"), 3)
+
+    def test_expired_ttl_reseeds(self) -> None:
+        counters = StatusCounterCache(ttl_seconds=0)
+        self.assertEqual(counters.pending_count("pending"), 3)
+        with self.session() as session:
+            session.add(_pending(5, "GJ"))
+            session.commit()
+
+        self.assertEqual(counters.pending_count("pending"), 4)
+
+    def test_review_writes_keep_counters_in_step_with_the_table(self) -> None:
+        service = ReviewService()
+        self.counters.pending_count("pending")
+
+        service.accept_pending_faq(1, scenario_id=7, question="问题1", answer="答案")
+        service.discard_pending_faq(3)
+        service.discard_matching(pending_filter=PendingFAQFilter(source_group_code="SW"))
+
+        cached = (self.counters.pending_counts(), self.counters.knowledge_counts(7))
+        self.counters.invalidate()
+        reloaded = (self.counters.pending_counts(), self.counters.knowledge_counts(7))
+
+        self.assertEqual(cached, ({"pending": 0, "processed": 1, "discarded": 3}, {"active": 2}))
+        self.assertEqual(reloaded, ({"processed": 1, "discarded": 3}, {"active": 2}))
+
+
+if __name__ == "__main__":
+    unittest.main()
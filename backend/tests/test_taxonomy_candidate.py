@@ -0,0 +1,132 @@
+import json
+import random
+import unittest
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import select
+
+from backend.app.jobs import handlers as handlers_module
+from backend.app.jobs.handlers import enqueue_job
+from backend.app.jobs.worker import JobWorkerPool
+from backend.app.models.work_order import WorkOrder, WorkOrderAggregationWatermark, WorkOrderCategoryCounter
+from backend.app.services import job_queue as job_queue_module
+from backend.app.services import kb_taxonomy_cache as kb_taxonomy_cache_module
+from backend.app.services import taxonomy_candidate as taxonomy_candidate_module
+from backend.app.services.job_queue import job_queue
+from backend.app.services.taxonomy_candidate import (
+    CategoryKey,
+    TaxonomyCandidateService,
+    parse_work_order_category,
+    reservoir_slot,
+)
+from backend.tests.sqlite_target import TargetDatabaseTestCase
+
+
+class ParseWorkOrderCategoryTests(unittest.TestCase):
+    def test_water(self) -> None:
+        self.assertEqual(
+            parse_work_order_category(1, "报修", "漏水", "管道漏水"),
+            CategoryKey(scope_code="water", l1="报修", l2="漏水", l3="管道漏水"),
+        )
+        self.assertIsNone(parse_work_order_category(1, "报修", "漏水", " "))
+
+    def test_bus_and_bike(self) -> None:
+        self.assertEqual(
+            parse_work_order_category("2", "公交", json.dumps(["服务", "态度", "司机态度差"]), None),
+            CategoryKey(scope_code="bus", l1="", l2="服务", l3="司机态度差"),
+        )
+        self.assertEqual(
+            parse_work_order_category(2, "自行车", json.dumps(["租还车", "无法还车"]), None),
+            CategoryKey(scope_code="bike", l1="", l2="租还车", l3="无法还车"),
+        )
+
+    def test_bus_skips_malformed(self) -> None:
+        self.assertIsNone(parse_work_order_category(2, "公交", "服务/态度", None))
+        self.assertIsNone(parse_work_order_category(2, "公交", json.dumps(["服务", "态度"]), None))
+        self.assertIsNone(parse_work_order_category(2, "地铁", json.dumps(["a", "b", "c"]), None))
+        self.assertIsNone(parse_work_order_category(3, "公交", json.dumps(["a", "b", "c"]), None))
+
+
+class ReservoirSlotTests(unittest.TestCase):
+    def test_fills_then_keeps_uniform_sample(self) -> None:
+        rng = random.Random(7)
+        size, stream, rounds = 5, 50, 4000
+        kept = Counter()
+        for _ in range(rounds):
+            reservoir = []
+            for seen in range(1, stream + 1):
+                slot = reservoir_slot(seen, len(reservoir), size, rng)
+                if slot is None:
+                    continue
+                if slot == len(reservoir):
+                    reservoir.append(seen)
+                else:
+                    reservoir[slot] = seen
+            self.assertEqual(len(reservoir), size)
+            kept.update(reservoir)
+
+        expected = rounds * size / stream
+        for item in range(1, stream + 1):
+            self.assertAlmostEqual(kept[item] / expected, 1.0, delta=0.25)
+
+
+class TaxonomyCandidateJobTests(TargetDatabaseTestCase):
+    session_modules = (job_queue_module, kb_taxonomy_cache_module, taxonomy_candidate_module)
+
+    def setUp(self) -> None:
+        super().setUp()
+        # work_order lives in the source database; the test keeps both in one SQLite database.
+        self.patch(taxonomy_candidate_module, "SourceSessionLocal", self.session_local)
+        self.patch(kb_taxonomy_cache_module, "AsyncTargetSessionLocal", None)
+        self.patch(handlers_module, "taxonomy_candidate_service", TaxonomyCandidateService(batch_size=2))
+        self.worker = JobWorkerPool(concurrency=1, kinds=["taxonomy_candidates"], queue=job_queue)
+        self.add_work_orders(1, 2, 3)
+
+    def add_work_orders(self, *ids: int) -> None:
+        self.add_all(
+            *[
+                WorkOrder(
+                    id=work_order_id,
+                    group_code=1,
+                    nature="报修",
+                    ticket_type="漏水",
+                    work_order_type_details="管道漏水",
+                    appeal_content=f"诉求{work_order_id}",
+                    update_time=datetime(2025, 1, 10, work_order_id),
+                )
+                for work_order_id in ids
+            ]
+        )
+
+    def run_job(self) -> dict:
+        queued = enqueue_job("taxonomy_candidates", {"month": "2025-01"})
+        job = job_queue.claim(self.worker.worker_id, self.worker.kinds)
+        self.assertEqual(job.job_id, queued.job_id)
+        self.worker._execute(job)  # pylint: disable=protected-access
+        finished = job_queue.get(queued.job_id)
+        self.assertEqual(finished.status, "succeeded")
+        return finished.result["2025-01"]
+
+    def watermark(self):
+        with self.session() as session:
+            mark = session.get(WorkOrderAggregationWatermark, "2025-01")
+            count = session.execute(select(WorkOrderCategoryCounter.occurrence_count)).scalar_one()
+        return (mark.last_update_time, mark.last_work_order_id), count
+
+    def test_job_advances_the_watermark_and_counts_only_new_rows(self) -> None:
+        first = self.run_job()
+
+        self.assertEqual((first["scanned"], first["counted"]), (3, 3))
+        self.assertEqual(self.watermark(), ((datetime(2025, 1, 10, 3), 3), 3))
+
+        self.add_work_orders(4)
+        second = self.run_job()
+
+        self.assertEqual((second["scanned"], second["counted"]), (1, 1))
+        self.assertEqual(second["watermark"], "2025-01-10T04:00:00")
+        self.assertEqual(self.watermark(), ((datetime(2025, 1, 10, 4), 4), 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
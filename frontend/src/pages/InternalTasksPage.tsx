@@ -1,5 +1,5 @@
-import React, { useMemo, useState } from 'react';
-import { Card, DatePicker, Divider, InputNumber, Space, Typography, Button, message } from 'antd';
+import React, { useEffect, useMemo, useState } from 'react';
+import { Card, Checkbox, DatePicker, Divider, InputNumber, Space, Typography, Button, message } from 'antd';
 import dayjs, { Dayjs } from 'dayjs';
 import { apiClient } from '@/api/client';
 
@@ -11,6 +11,21 @@ interface TriggerJobResponse {
   message: string;
 }
 
+interface JobStatus {
+  jobId: string;
+  kind: string;
+  status: 'queued' | 'running' | 'succeeded' | 'failed' | 'cancelled';
+  progressCurrent: number;
+  progressTotal?: number | null;
+  progressMessage?: string | null;
+  attempts: number;
+  maxAttempts: number;
+  cancelRequested: boolean;
+  error?: string | null;
+}
+
+const ACTIVE_JOB_STATUSES = ['queued', 'running'];
+
 export const InternalTasksPage: React.FC = () => {
   const [range, setRange] = useState<[Dayjs, Dayjs]>(() => {
     const yesterday = dayjs().subtract(1, 'day');
@@ -20,6 +35,41 @@ export const InternalTasksPage: React.FC = () => {
   const [extLoading, setExtLoading] = useState(false);
   const [compareSyncLoading, setCompareSyncLoading] = useState(false);
   const [limit, setLimit] = useState<number | null>(null);
+  const [profile, setProfile] = useState(false);
+  const [lastJobId, setLastJobId] = useState<string | null>(null);
+  const [lastJob, setLastJob] = useState<JobStatus | null>(null);
+
+  useEffect(() => {
+    if (!lastJobId) return undefined;
+    let stopped = false;
+    let timer: ReturnType<typeof setTimeout> | undefined;
+    const poll = async () => {
+      try {
+        const { data } = await apiClient.get<JobStatus>(`/api/v1.10/admin/jobs/${lastJobId}`);
+        if (stopped) return;
+        setLastJob(data);
+        if (!ACTIVE_JOB_STATUSES.includes(data.status)) return;
+      } catch {
+        if (stopped) return;
+      }
+      timer = setTimeout(poll, 3000);
+    };
+    poll();
+    return () => {
+      stopped = true;
+      if (timer) clearTimeout(timer);
+    };
+  }, [lastJobId]);
+
+  const cancelLastJob = async () => {
+    if (!lastJobId) return;
+    try {
+      const { data } = await apiClient.post<JobStatus>(`/api/v1.10/admin/jobs/${lastJobId}/cancel`);
+      setLastJob(data);
+    } catch (error: any) {
+      message.error(error?.response?.data?.detail || '取消任务失败');
+    }
+  };
 
   const startTime = useMemo(() => range[0].startOf('day').toISOString(), [range]);
   const endTime = useMemo(() => range[1].endOf('day').toISOString(), [range]);
@@ -29,10 +79,12 @@ export const InternalTasksPage: React.FC = () => {
     try {
       const { data } = await apiClient.post<TriggerJobResponse>(
         '/api/v1.10/admin/trigger-aggregation',
-        { startTime, endTime },
+        { startTime, endTime, profile },
         { timeout: 30_000 },
       );
       message.success(`${data.message} jobId=${data.jobId}`);
+      setLastJob(null);
+      setLastJobId(data.jobId);
     } catch (error: any) {
       message.error(error?.response?.data?.detail || '触发数据预处理失败');
     } finally {
@@ -43,13 +95,15 @@ export const InternalTasksPage: React.FC = () => {
   const triggerExtraction = async () => {
     setExtLoading(true);
     try {
-      const payload = limit ? { limit } : {};
+      const payload = limit ? { limit, profile } : { profile };
       const { data } = await apiClient.post<TriggerJobResponse>(
         '/api/v1.10/admin/trigger-extraction',
         payload,
         { timeout: 30_000 },
       );
       message.success(`${data.message} jobId=${data.jobId}`);
+      setLastJob(null);
+      setLastJobId(data.jobId);
     } catch (error: any) {
       message.error(error?.response?.data?.detail || '触发AI提取失败');
     } finally {
@@ -66,6 +120,8 @@ export const InternalTasksPage: React.FC = () => {
         { timeout: 30_000 },
       );
       message.success(`${data.message} jobId=${data.jobId}`);
+      setLastJob(null);
+      setLastJobId(data.jobId);
     } catch (error: any) {
       message.error(error?.response?.data?.detail || '触发审核区知识库同步失败');
     } finally {
@@ -82,6 +138,34 @@ export const InternalTasksPage: React.FC = () => {
         后台任务触发（内部测试页）
       </Paragraph>
 
+      {lastJobId && (
+        <Card title="最近触发的任务" bordered={false} style={{ marginBottom: 16 }}>
+          <Space direction="vertical" size="small">
+            <Text>jobId：{lastJobId}</Text>
+            {lastJob && (
+              <>
+                <Text>
+                  状态：{lastJob.status}
+                  {lastJob.cancelRequested && lastJob.status === 'running' ? '（取消中）' : ''}
+                  {'  '}第 {lastJob.attempts}/{lastJob.maxAttempts} 次
+                </Text>
+                <Text>
+                  进度：{lastJob.progressCurrent}
+                  {lastJob.progressTotal != null ? ` / ${lastJob.progressTotal}` : ''}
+                  {lastJob.progressMessage ? `（${lastJob.progressMessage}）` : ''}
+                </Text>
+                {lastJob.error && <Text type="danger">错误：{lastJob.error}</Text>}
+                {ACTIVE_JOB_STATUSES.includes(lastJob.status) && !lastJob.cancelRequested && (
+                  <Button danger size="small" onClick={cancelLastJob}>
+                    取消任务
+                  </Button>
+                )}
+              </>
+            )}
+          </Space>
+        </Card>
+      )}
+
       <Card title="数据预处理与聚合" bordered={false}>
         <Space direction="vertical" size="middle" style={{ width: '100%' }}>
           <div>
@@ -97,6 +181,9 @@ export const InternalTasksPage: React.FC = () => {
               />
             </div>
           </div>
+          <Checkbox checked={profile} onChange={(e) => setProfile(e.target.checked)}>
+            采样分析本次运行（输出火焰图 collapsed stacks 到服务器 profile 目录）
+          </Checkbox>
           <div>
             <Button type="primary" loading={aggLoading} onClick={triggerAggregation}>
               执行数据预处理
@@ -125,6 +212,9 @@ export const InternalTasksPage: React.FC = () => {
               onChange={(v) => setLimit(v ?? null)}
             />
           </Space>
+          <Checkbox checked={profile} onChange={(e) => setProfile(e.target.checked)}>
+            采样分析本次运行（输出火焰图 collapsed stacks 到服务器 profile 目录）
+          </Checkbox>
           <div>
             <Button type="primary" loading={extLoading} onClick={triggerExtraction}>
               执行AI提取
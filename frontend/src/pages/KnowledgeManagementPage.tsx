@@ -172,8 +172,11 @@ export const KnowledgeManagementPage: React.FC = () => {
             undefined,
             { timeout: 15 * 60 * 1000 },
           );
-          void data;
-          message.success('同步成功');
+          if (data?.status === 'skipped') {
+            message.info('无需同步：知识无变化或没有已生效的知识');
+          } else {
+            message.success('同步成功');
+          }
         } catch (error: any) {
           const timeoutHint =
             error?.code === 'ECONNABORTED' || String(error?.message || '').toLowerCase().includes('timeout');
@@ -82,6 +82,7 @@ interface ImportValidateResponse {
   ok: boolean;
   summary?: ImportSummary | null;
   errors: ImportError[];
+  uploadToken?: string | null;
 }
 
 function toAntTreeData(nodes: TreeNode[]): any[] {
@@ -434,10 +435,14 @@ export const TaxonomyKBPage: React.FC = () => {
       onOk: async () => {
         setImportExecuting(true);
         try {
+          // Reuse the plan parsed during validation when available; otherwise upload the file again.
+          const uploadToken = importResult?.ok ? importResult.uploadToken : null;
           const formData = new FormData();
-          formData.append('file', importFile.originFileObj);
+          if (!uploadToken) {
+            formData.append('file', importFile.originFileObj);
+          }
           const { data } = await apiClient.post<ImportValidateResponse>('/api/v1.12/kb-taxonomy/import/execute', formData, {
-            params: { scope },
+            params: uploadToken ? { scope, uploadToken } : { scope },
             headers: { 'Content-Type': 'multipart/form-data' },
             timeout: 5 * 60_000,
           });
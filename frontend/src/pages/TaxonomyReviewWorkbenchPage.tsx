@@ -50,6 +50,7 @@ interface ReviewItem {
 
 interface ReviewListResponse {
   items: ReviewItem[];
+  nextCursor?: string | null;
 }
 
 const scopeLabels: Record<ScopeCode, string> = {
@@ -65,6 +66,8 @@ export const TaxonomyReviewWorkbenchPage: React.FC = () => {
   const [scope, setScope] = useState<ScopeCode>(isBusUser ? 'bus' : 'water');
   const [loading, setLoading] = useState(false);
   const [items, setItems] = useState<ReviewItem[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [drawerOpen, setDrawerOpen] = useState(false);
   const [editingItem, setEditingItem] = useState<ReviewItem | null>(null);
   const [actionLoadingId, setActionLoadingId] = useState<number | null>(null);
@@ -79,14 +82,35 @@ export const TaxonomyReviewWorkbenchPage: React.FC = () => {
         { params: { scope: nextScope } },
       );
       setItems(data.items || []);
+      setNextCursor(data.nextCursor || null);
     } catch (error: any) {
       message.error(error?.response?.data?.detail || '加载待审核列表失败');
       setItems([]);
+      setNextCursor(null);
     } finally {
       setLoading(false);
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor) {
+      return;
+    }
+    setLoadingMore(true);
+    try {
+      const { data } = await apiClient.get<ReviewListResponse>(
+        '/api/v1.14/kb-taxonomy-review/pending',
+        { params: { scope, cursor: nextCursor } },
+      );
+      setItems((prev) => [...prev, ...(data.items || [])]);
+      setNextCursor(data.nextCursor || null);
+    } catch (error: any) {
+      message.error(error?.response?.data?.detail || '加载更多失败');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     void loadData(scope);
     setDrawerOpen(false);
@@ -359,6 +383,13 @@ export const TaxonomyReviewWorkbenchPage: React.FC = () => {
             ),
           }}
         />
+        {nextCursor ? (
+          <div style={{ textAlign: 'center', marginTop: 12 }}>
+            <Button onClick={loadMore} loading={loadingMore}>
+              加载更多
+            </Button>
+          </div>
+        ) : null}
       </Card>
 
       <Drawer